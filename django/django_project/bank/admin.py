@@ -45,6 +45,10 @@ from .models import currentaffairs_descriptive_info_2027
 from .models import currentaffairs_descriptive_info_2028
 
 from .models import total_mcq
+from .models import category_counter
+from .models import calendar_day
+from .models import subject_stat
+from .models import question_signature
 from .models import polity
 from .models import total_polity
 from .models import history
@@ -67,6 +71,8 @@ from django.db import models
 from django.forms import TextInput, Textarea
 from django.contrib.admin import AdminSite
 from django.urls import reverse
+from django.template.response import TemplateResponse
+from django.core.cache import cache
 
 
 
@@ -100,6 +106,61 @@ class SubjectMetaAdmin(admin.ModelAdmin):
     list_display = ('id', 'subject_name', 'sub_chapter', 'section')
     search_fields = ('subject_name', 'sub_chapter', 'section')
 
+
+class QuestionSignatureAdmin(admin.ModelAdmin):
+    """The changelist is a report of near-duplicate question clusters."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        from bank.services import near_duplicates
+        from bank.services.fingerprints import MCQ_MODELS
+        try:
+            min_similarity = float(request.GET.get('threshold', near_duplicates.threshold()))
+        except ValueError:
+            min_similarity = near_duplicates.threshold()
+        index = near_duplicates.get_index()
+        # Clustering walks every bucket of the index; keep the report for a while
+        clusters = cache.get_or_set(
+            'bank:near_duplicates:report:%s:%s' % (min_similarity, len(index)),
+            lambda: index.clusters(min_similarity, limit=100),
+            600,
+        )
+
+        # One query per table for the question text of every listed row
+        wanted = {}
+        for cluster in clusters:
+            for table, row_id in cluster:
+                wanted.setdefault(table, set()).add(row_id)
+        questions = {}
+        for table, ids in wanted.items():
+            for row_id, question in MCQ_MODELS[table].objects.filter(id__in=ids).values_list('id', 'question'):
+                questions[(table, row_id)] = question
+
+        rows = []
+        for cluster in clusters:
+            members = []
+            for table, row_id in cluster:
+                try:
+                    url = reverse('admin:bank_%s_change' % table, args=[row_id])
+                except Exception:
+                    url = '#'
+                members.append({'table': table, 'id': row_id, 'url': url,
+                                'question': questions.get((table, row_id), '')})
+            rows.append(members)
+
+        context = dict(
+            self.admin_site.each_context(request),
+            title='Near-duplicate questions',
+            opts=self.model._meta,
+            clusters=rows,
+            threshold=min_similarity,
+            indexed=len(index),
+        )
+        context.update(extra_context or {})
+        return TemplateResponse(request, 'admin/bank/near_duplicate_report.html', context)
+
 # Lists of models for grouping on admin index
 mcq_info_tables = [
     currentaffairs_mcq_info_2018,
@@ -195,6 +256,10 @@ admin_site.register(currentaffairs_descriptive,MessageAdmin)
 admin_site.register(current_affairs_slide)
 admin_site.register(currentaffairs_mcq)
 admin_site.register(total_mcq)
+admin_site.register(category_counter)
+admin_site.register(calendar_day)
+admin_site.register(subject_stat)
+admin_site.register(question_signature, QuestionSignatureAdmin)
 
 admin_site.register(total)
 admin_site.register(the_hindu_word_Header1)
@@ -0,0 +1,12 @@
+"""
+Template context processors for the bank app.
+"""
+from bank.services import fragments
+
+
+def fragment_versions(request):
+    """Versions and TTL used as ``{% cache %}`` keys for the shared fragments."""
+    return {
+        'fragment_versions': fragments.versions(),
+        'fragment_ttl': fragments.FRAGMENT_TTL,
+    }
@@ -0,0 +1,3 @@
+"""
+Bank Management Commands
+"""
@@ -0,0 +1,43 @@
+"""
+Management command to fill the content fingerprint of existing MCQ rows
+Usage: python manage.py backfill_fingerprints [--table=polity] [--batch-size=1000] [--rebuild]
+"""
+
+from django.core.management.base import BaseCommand
+
+from bank.services import fingerprints
+
+
+class Command(BaseCommand):
+    help = 'Compute the normalized-content fingerprint for MCQ rows that do not have one yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            type=str,
+            choices=sorted(fingerprints.MCQ_MODELS),
+            default=None,
+            help='Only backfill one MCQ table (default: all)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_update (default: 1000)'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every row, e.g. after the normalization changed'
+        )
+
+    def handle(self, *args, **options):
+        tables = [options['table']] if options['table'] else sorted(fingerprints.MCQ_MODELS)
+
+        for table in tables:
+            updated = fingerprints.backfill(
+                fingerprints.MCQ_MODELS[table],
+                batch_size=options['batch_size'],
+                rebuild=options['rebuild'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'✓ {table}: {updated} rows fingerprinted'))
@@ -0,0 +1,50 @@
+"""
+Management command to store MinHash signatures for the near-duplicate index
+Usage: python manage.py build_near_duplicate_index [--table=polity] [--batch-size=1000] [--rebuild]
+"""
+
+from django.core.management.base import BaseCommand
+
+from bank.services import near_duplicates
+from bank.services.fingerprints import MCQ_MODELS
+
+
+class Command(BaseCommand):
+    help = 'Compute question_signature rows for MCQs that are not in the near-duplicate index yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            type=str,
+            choices=sorted(MCQ_MODELS),
+            default=None,
+            help='Only index one MCQ table (default: all)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per batch (default: 1000)'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every signature, e.g. after the shingling changed'
+        )
+
+    def handle(self, *args, **options):
+        tables = [options['table']] if options['table'] else sorted(MCQ_MODELS)
+
+        for table in tables:
+            stored = near_duplicates.backfill(
+                MCQ_MODELS[table],
+                batch_size=options['batch_size'],
+                rebuild=options['rebuild'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'✓ {table}: {stored} signatures stored'))
+
+        index = near_duplicates.get_index()
+        clusters = index.clusters(limit=None)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {len(index)} questions indexed, {len(clusters)} near-duplicate clusters'
+        ))
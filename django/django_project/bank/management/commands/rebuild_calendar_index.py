@@ -0,0 +1,45 @@
+"""
+Management command to rebuild the current-affairs calendar index
+Usage: python manage.py rebuild_calendar_index [--type=mcq|descriptive] [--year=2026] [--legacy]
+"""
+
+from django.core.management.base import BaseCommand
+
+from bank.services import calendar_index
+
+
+class Command(BaseCommand):
+    help = 'Recount calendar_day rows with one GROUP BY query per content type'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            type=str,
+            choices=sorted(calendar_index.CONTENT_MODELS),
+            default=None,
+            help='Only rebuild one content type (default: all)'
+        )
+        parser.add_argument(
+            '--year',
+            type=int,
+            default=None,
+            help='Only rebuild one year (default: all years)'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also refresh the currentaffairs_*_info_20XX rows from the index'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = calendar_index.rebuild(options['type'], options['year'])
+
+        for content_type, days in rebuilt.items():
+            self.stdout.write(self.style.SUCCESS(f'✓ {content_type}: {days} published days indexed'))
+
+        if options['legacy']:
+            for content_type in rebuilt:
+                years = [options['year']] if options['year'] else sorted(calendar_index.calendars(content_type))
+                for year in years:
+                    if calendar_index.write_legacy_info(content_type, year):
+                        self.stdout.write(f'Refreshed {content_type} info {year}')
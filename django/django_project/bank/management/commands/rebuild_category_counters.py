@@ -0,0 +1,43 @@
+"""
+Management command to reconcile category counters with the content tables
+Usage: python manage.py rebuild_category_counters [--type=mcq|descriptive] [--legacy]
+"""
+
+from django.core.management.base import BaseCommand
+
+from bank.models import total, total_mcq
+from bank.services import counters
+
+
+class Command(BaseCommand):
+    help = 'Recount category_counter rows with one aggregate query per content type'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            type=str,
+            choices=sorted(counters.CONTENT_MODELS),
+            default=None,
+            help='Only rebuild one content type (default: all)'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also refresh the legacy total / total_mcq rows'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = counters.rebuild(options['type'])
+
+        for content_type, counts in rebuilt.items():
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {content_type}: {counts[counters.ALL_ROWS]} live rows, '
+                f'{len(counts) - 1} categories'
+            ))
+
+        if options['legacy']:
+            for legacy_model in (total, total_mcq):
+                row = legacy_model.objects.first()
+                if row:
+                    row.save()
+                    self.stdout.write(f'Refreshed {legacy_model.__name__}')
@@ -0,0 +1,42 @@
+"""
+Management command to rebuild the subject chapter statistics
+Usage: python manage.py rebuild_subject_stats [--subject=polity] [--legacy]
+"""
+
+from django.core.management.base import BaseCommand
+
+from bank import models as bank_models
+from bank.services import subject_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount subject_stat rows with one GROUP BY query per subject'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--subject',
+            type=str,
+            choices=sorted(subject_stats.SUBJECT_MODELS),
+            default=None,
+            help='Only rebuild one subject (default: all)'
+        )
+        parser.add_argument(
+            '--legacy',
+            action='store_true',
+            help='Also re-save the total_<subject> rows from the new stats'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = subject_stats.rebuild(options['subject'])
+
+        for subject, stats in rebuilt.items():
+            chapters = sum(1 for dimension, _value in stats if dimension == 'chapter')
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {subject}: {stats[(subject_stats.ALL, "")]} rows in {chapters} chapters'
+            ))
+
+        if options['legacy']:
+            for subject in rebuilt:
+                for row in getattr(bank_models, 'total_' + subject).objects.all():
+                    row.save()
+                    self.stdout.write(f'Refreshed total_{subject}')
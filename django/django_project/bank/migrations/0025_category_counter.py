@@ -0,0 +1,46 @@
+# Generated by Django 3.0 on 2026-10-18 11:23
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    category_counter = apps.get_model('bank', 'category_counter')
+    sources = {
+        'descriptive': apps.get_model('bank', 'currentaffairs_descriptive'),
+        'mcq': apps.get_model('bank', 'currentaffairs_mcq'),
+    }
+    for content_type, model in sources.items():
+        aggregates = {'all_rows': Count('id')}
+        for f in model._meta.concrete_fields:
+            if isinstance(f, models.BooleanField) and f.name != 'is_live':
+                aggregates[f.name] = Count('id', filter=Q(**{f.name: True}))
+        counts = model.objects.filter(is_live=True).order_by().aggregate(**aggregates)
+        category_counter.objects.bulk_create([
+            category_counter(content_type=content_type, category=key, row_count=value or 0)
+            for key, value in counts.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0024_auto_20260202_2052'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='category_counter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('descriptive', 'descriptive'), ('mcq', 'mcq')], db_index=True, max_length=20)),
+                ('category', models.CharField(max_length=50)),
+                ('row_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('content_type', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
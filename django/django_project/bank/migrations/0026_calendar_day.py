@@ -0,0 +1,48 @@
+# Generated by Django 3.0 on 2026-10-18 11:25
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_calendar(apps, schema_editor):
+    calendar_day = apps.get_model('bank', 'calendar_day')
+    sources = {
+        'descriptive': apps.get_model('bank', 'currentaffairs_descriptive'),
+        'mcq': apps.get_model('bank', 'currentaffairs_mcq'),
+    }
+    for content_type, model in sources.items():
+        per_day = model.objects.filter(is_live=True).order_by().values('day').annotate(n=Count('id'))
+        calendar_day.objects.bulk_create([
+            calendar_day(content_type=content_type, year=r['day'].year, month=r['day'].month, day=r['day'], live_count=r['n'])
+            for r in per_day
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0025_category_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='calendar_day',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('descriptive', 'descriptive'), ('mcq', 'mcq')], max_length=20)),
+                ('year', models.SmallIntegerField()),
+                ('month', models.SmallIntegerField()),
+                ('day', models.DateField()),
+                ('live_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='calendar_day',
+            index=models.Index(fields=['content_type', 'year', 'month', 'day'], name='bank_calend_content_2e18dd_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='calendar_day',
+            unique_together={('content_type', 'day')},
+        ),
+        migrations.RunPython(populate_calendar, migrations.RunPython.noop),
+    ]
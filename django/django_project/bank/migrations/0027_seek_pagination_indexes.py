@@ -0,0 +1,25 @@
+# Generated by Django 3.0 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0026_calendar_day'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='currentaffairs_descriptive',
+            index=models.Index(fields=['day', 'creation_time', 'id'], name='ca_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='currentaffairs_mcq',
+            index=models.Index(fields=['day', 'creation_time', 'id'], name='ca_mcq_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['day', 'creation_time', 'id'], name='job_seek_idx'),
+        ),
+    ]
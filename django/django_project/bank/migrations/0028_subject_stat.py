@@ -0,0 +1,56 @@
+# Generated by Django 3.0 on 2026-10-18 11:34
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+SUBJECTS = ('polity', 'history', 'geography', 'economics', 'physics', 'biology', 'chemistry', 'math', 'reasoning')
+
+
+def populate_stats(apps, schema_editor):
+    subject_stat = apps.get_model('bank', 'subject_stat')
+    for subject in SUBJECTS:
+        model = apps.get_model('bank', subject)
+        names = {f.name for f in model._meta.concrete_fields}
+        fields = {}
+        for dimension, candidates in (('chapter', ('chapter',)), ('difficulty', ('difficulty', 'level')), ('sub_chapter', ('sub_chapter',))):
+            found = [c for c in candidates if c in names]
+            if found:
+                fields[dimension] = found[0]
+        stats = {('all', ''): 0}
+        for row in model.objects.order_by().values(*fields.values()).annotate(n=Count('id')):
+            stats[('all', '')] += row['n']
+            for dimension, field in fields.items():
+                if row[field] not in (None, ''):
+                    key = (dimension, str(row[field]))
+                    stats[key] = stats.get(key, 0) + row['n']
+        subject_stat.objects.bulk_create([
+            subject_stat(subject=subject, dimension=dimension, value=value, row_count=n, page_count=(n + 4) // 5)
+            for (dimension, value), n in stats.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0027_seek_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='subject_stat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=30)),
+                ('dimension', models.CharField(choices=[('all', 'all'), ('chapter', 'chapter'), ('difficulty', 'difficulty'), ('sub_chapter', 'sub_chapter')], max_length=20)),
+                ('value', models.CharField(blank=True, default='', max_length=100)),
+                ('row_count', models.IntegerField(default=0)),
+                ('page_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('subject', 'dimension', 'value')},
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
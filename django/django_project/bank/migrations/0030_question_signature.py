@@ -0,0 +1,26 @@
+# Generated by Django 3.0 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0029_mcq_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='question_signature',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=30)),
+                ('row_id', models.IntegerField()),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'unique_together': {('table', 'row_id')},
+            },
+        ),
+    ]
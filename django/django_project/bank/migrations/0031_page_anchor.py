@@ -0,0 +1,39 @@
+# Generated by Django 3.0 on 2026-10-18 12:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0030_question_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='page_list',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('list_key', models.CharField(max_length=32, unique=True)),
+                ('model', models.CharField(db_index=True, max_length=100)),
+                ('query', models.BinaryField()),
+                ('ordering', models.CharField(max_length=200)),
+                ('row_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='page_anchor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.IntegerField()),
+                ('key', models.TextField()),
+                ('page_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anchors', to='bank.page_list')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='page_anchor',
+            index=models.Index(fields=['page_list', 'rank'], name='bank_page_a_page_li_c54b39_idx'),
+        ),
+    ]
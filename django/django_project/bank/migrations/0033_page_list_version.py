@@ -0,0 +1,33 @@
+# Generated by Django 3.0 on 2026-10-18 12:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bank', '0032_question_tombstone'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='page_list',
+            name='query',
+        ),
+        migrations.AddField(
+            model_name='page_list',
+            name='built_version',
+            field=models.IntegerField(default=-1),
+        ),
+        migrations.AddField(
+            model_name='page_list',
+            name='used_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='page_list',
+            name='version',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -111,6 +111,9 @@ class currentaffairs_descriptive(models.Model):
 
     class Meta:
         ordering = ["-day"]
+        indexes = [
+            models.Index(fields=['day', 'creation_time', 'id'], name='ca_desc_seek_idx'),
+        ]
 
         
    
@@ -119,8 +122,11 @@ class currentaffairs_descriptive(models.Model):
     def __str__(self):
         return self.day.strftime('%d/%m/%Y') + '     '+ self.upper_heading
 
+    def make_new_id(self):
+        return self.upper_heading +'===' +self.day.strftime('%d-%m-%Y')
+
     def save(self, *args, **kwargs):
-        self.new_id= self.upper_heading +'===' +self.day.strftime('%d-%m-%Y')
+        self.new_id= self.make_new_id()
         super(currentaffairs_descriptive, self).save(*args, **kwargs)
 
 
@@ -168,166 +174,16 @@ class total(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=currentaffairs_descriptive.objects.count()
+        from bank.services.counters import ALL_ROWS, aggregate_counts, page_count
+
+        counts = aggregate_counts(currentaffairs_descriptive, live_only=False)
+        totall = counts.pop(ALL_ROWS)
         self.total_current_affairs= totall
         self.total_current_affairs_page=int(totall+300)/3
+        for category, rows in counts.items():
+            if hasattr(self, category):
+                setattr(self, category, page_count(rows))
 
-        total_st=currentaffairs_descriptive.objects.filter(Science_Techonlogy=True).count()
-        total_n=currentaffairs_descriptive.objects.filter(National=True).count()
-        total_State=currentaffairs_descriptive.objects.filter(State=True).count()
-        total_International=currentaffairs_descriptive.objects.filter(International=True).count()
-        total_Business_Economy_Banking=currentaffairs_descriptive.objects.filter(Business_Economy_Banking=True).count()
-        total_Environment=currentaffairs_descriptive.objects.filter(Environment=True).count()
-        total_Defence=currentaffairs_descriptive.objects.filter(Defence=True).count()
-        total_Persons_in_News=currentaffairs_descriptive.objects.filter(Persons_in_News=True).count()
-        total_Awards_Honours=currentaffairs_descriptive.objects.filter(Awards_Honours=True).count()
-        total_Sports=currentaffairs_descriptive.objects.filter(Sports=True).count()
-        total_Art_Culture=currentaffairs_descriptive.objects.filter(Art_Culture=True).count()
-        total_Government_Schemes=currentaffairs_descriptive.objects.filter(Government_Schemes=True).count()
-        total_rank=currentaffairs_descriptive.objects.filter(rank=True).count()
-        total_appointment=currentaffairs_descriptive.objects.filter(appointment=True).count()
-        total_obituary=currentaffairs_descriptive.objects.filter(obituary=True).count()
-        total_static_gk=currentaffairs_descriptive.objects.filter(static_gk=True).count()
-        if total_st !=0:
-            
-            if(int(total_st)%3==0):
-                total_page_Science_Techonlogy=(int(total_st)/3)
-            else:
-                total_page_Science_Techonlogy=(int(total_st)/3)+1
-
-            self.Science_Techonlogy= total_page_Science_Techonlogy        
-
-                
-
-
-        if total_n !=0:
-            
-            if(int(total_n)%3==0):
-                total_page_National=(int(total_n)/3)
-            else:
-                total_page_National=(int(total_n)/3)+1
-            self.National= total_page_National       
-
-        if total_State !=0:
-            
-            if(int(total_State)%3==0):
-                total_page_State=(int(total_State)/3)
-
-            else:
-                total_page_State=(int(total_State)/3)+1
-            self.State= total_page_State     
-
-        if total_International !=0:
-            
-            if(int(total_International)%3==0):
-                total_page_International=(int(total_International)/3)
-            else:
-                total_page_International=(int(total_International)/3)+1
-            self.International= total_page_International     
-
-        if total_Business_Economy_Banking !=0:
-            
-            if(int(total_Business_Economy_Banking)%3==0):
-                total_page_Business_Economy_Banking=(int(total_Business_Economy_Banking)/3)
-
-            else:
-                total_page_Business_Economy_Banking=(int(total_Business_Economy_Banking)/3)+1
-
-            self.Business_Economy_Banking= total_page_Business_Economy_Banking    
-
-        if total_Environment !=0:
-            
-            if(int(total_Environment)%3==0):
-                total_page_Environment=(int(total_Environment)/3)
-            else:
-                total_page_Environment=(int(total_Environment)/3)+1
-            self.Environment= total_page_Environment     
-
-        if total_Defence !=0:
-            
-            if(int(total_Defence)%3==0):
-                total_page_Defence=(int(total_Defence)/3)
-            else:
-                total_page_Defence=(int(total_Defence)/3)+1
-
-            self.Defence= total_page_Defence     
-
-        if total_Persons_in_News !=0:
-            
-            if(int(total_Persons_in_News)%3==0):
-                total_page_Persons_in_News=(int(total_Persons_in_News)/3)
-            else:
-                total_page_Persons_in_News=(int(total_Persons_in_News)/3)+1
-
-            self.Persons_in_News= total_page_Persons_in_News     
-
-        if total_Awards_Honours !=0:
-            
-            if(int(total_Awards_Honours)%3==0):
-                total_page_Awards_Honours=(int(total_Awards_Honours)/3)
-            else:
-                total_page_Awards_Honours=(int(total_Awards_Honours)/3)+1
-            self.Awards_Honours= total_page_Awards_Honours    
-
-        if total_Sports !=0:
-            
-            if(int(total_Sports)%3==0):
-                total_page_Sports=(int(total_Sports)/3)
-            else:
-                total_page_Sports=(int(total_Sports)/3)+1
-
-            self.Sports= total_page_Sports    
-
-        if total_Art_Culture !=0:
-            
-            if(int(total_Art_Culture)%3==0):
-                total_page_Art_Culture=(int(total_Art_Culture)/3)
-            else:
-                total_page_Art_Culture=(int(total_Art_Culture)/3)+1
-
-            self.Art_Culture= total_page_Art_Culture     
-
-        if total_Government_Schemes !=0:
-            
-            if(int(total_Government_Schemes)%3==0):
-                total_page_Government_Schemes=(int(total_Government_Schemes)/3)
-            else:
-                total_page_Government_Schemes=(int(total_Government_Schemes)/3)+1
-            self.Government_Schemes= total_page_Government_Schemes
-        if total_rank !=0:
-            
-            if(int(total_rank)%3==0):
-                total_page_rank=(int(total_rank)/3)
-            else:
-                total_page_rank=(int(total_rank)/3)+1
-            self.rank= total_page_rank
-
-        if total_obituary !=0:
-            
-            if(int(total_obituary)%3==0):
-                total_page_obituary=(int(total_obituary)/3)
-            else:
-                total_page_obituary=(int(total_obituary)/3)+1
-            self.obituary= total_page_obituary
-
-        
-        if total_appointment !=0:
-            
-            if(int(total_appointment)%3==0):
-                total_page_appointment=(int(total_appointment)/3)
-            else:
-                total_page_appointment=(int(total_appointment)/3)+1
-            self.appointment= total_page_appointment
-
-        if total_static_gk !=0:
-            
-            if(int(total_static_gk)%3==0):
-                total_page_static_gk=(int(total_static_gk)/3)
-            else:
-                total_page_static_gk=(int(total_static_gk)/3)+1
-            self.static_gk= total_page_static_gk
-
-            
         super(total, self).save(*args, **kwargs)
 
 
@@ -693,6 +549,7 @@ class math(models.Model):
     level=models.CharField(max_length=100,default='',blank=True,null=True,db_index=True)
     ans = models.IntegerField (default=1)
     new_id=models.CharField(max_length=100,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
 
     shortcut = models.TextField(blank=True,null=True)
     shortcut_image = models.FileField(upload_to='math/math/%Y/%m/%d/short',blank=True,null=True)
@@ -751,6 +608,11 @@ class math(models.Model):
 
     def __str__(self):
             return self.day.strftime('%d/%m/%Y')+'========  ' +self.question[:30]+' ========    ' +str(self.chapter)+'========='+str(self.question_no)         
+
+    def save(self, *args, **kwargs):
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
+        super(math, self).save(*args, **kwargs)
     
 
 
@@ -837,237 +699,8 @@ class total_math(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall_profit_n_loss=math.objects.filter(chapter='profit_n_loss').count()
-        totall_squre_n_cube=math.objects.filter(chapter='squre_n_cube').count()
-        totall_simplification=math.objects.filter(chapter='simplification').count()
-        totall_average=math.objects.filter(chapter='average').count()
-        totall_percentage=math.objects.filter(chapter='percentage').count()
-        totall_problem_on_age=math.objects.filter(chapter='problem_on_age').count()
-        totall_ratio_n_proportion=math.objects.filter(chapter='ratio_n_proportion').count()
-        totall_partnership=math.objects.filter(chapter='partnership').count()
-        totall_time_n_work=math.objects.filter(chapter='time_n_work').count()
-        totall_pipe_cistern=math.objects.filter(chapter='pipe_cistern').count()
-        totall_time_n_distance=math.objects.filter(chapter='time_n_distance').count()
-        totall_problem_on_age=math.objects.filter(chapter='problem_on_age').count()
-        totall_boats_n_stream=math.objects.filter(chapter='boats_n_stream').count()
-        totall_simple_interest=math.objects.filter(chapter='simple_interest').count()
-        totall_alligation_n_mixture=math.objects.filter(chapter='alligation_n_mixture').count()
-        totall_compound_interest=math.objects.filter(chapter='compound_interest').count()
-        totall_volume_n_surface_area=math.objects.filter(chapter='volume_n_surface_area').count()
-        totall_probability=math.objects.filter(chapter='probability').count()
-        totall_permutation_combination=math.objects.filter(chapter='permutation_combination').count()
-        totall_bar_graph=math.objects.filter(chapter='bar_graph').count()
-        totall_pie_charts=math.objects.filter(chapter='pie_charts').count()
-        totall_line_graph=math.objects.filter(chapter='line_graph').count()
-       
-        
-
-     
-        if totall_profit_n_loss !=0:
-            
-            if(int(totall_profit_n_loss)%5==0):
-                total_profit_n_loss_page=(int(totall_profit_n_loss)/5)
-            else:
-                total_profit_n_loss_page=(int(totall_profit_n_loss)/5)+1
-
-            self.total_profit_n_loss_page= total_profit_n_loss_page
-
-        if totall_squre_n_cube !=0:
-            
-            if(int(totall_squre_n_cube)%5==0):
-                total_squre_n_cube_page=(int(totall_squre_n_cube)/5)
-            else:
-                total_squre_n_cube_page=(int(totall_squre_n_cube)/5)+1
-
-            self.total_squre_n_cube_page= total_squre_n_cube_page        
-
-
-        if totall_simplification !=0:
-            
-            if(int(totall_simplification)%5==0):
-                total_simplification_page=(int(totall_simplification)/5)
-            else:
-                total_simplification_page=(int(totall_simplification)/5)+1
-
-            self.total_simplification_page= total_simplification_page        
-
-        if totall_average !=0:
-            
-            if(int(totall_average)%5==0):
-                total_average_page=(int(totall_average)/5)
-            else:
-                total_average_page=(int(totall_average)/5)+1
-
-            self.total_average_page= total_average_page        
-
-        if totall_percentage !=0:
-            
-            if(int(totall_profit_n_loss)%5==0):
-                total_percentage_page=(int(totall_profit_n_loss)/5)
-            else:
-                total_percentage_page=(int(totall_profit_n_loss)/5)+1
-
-            self.total_percentage_page= total_percentage_page        
-
-        if totall_problem_on_age !=0:
-            
-            if(int(totall_problem_on_age)%5==0):
-                total_problem_on_age_page=(int(totall_problem_on_age)/5)
-            else:
-                total_problem_on_age_page=(int(totall_problem_on_age)/5)+1
-
-            self.total_problem_on_age_page= total_problem_on_age_page        
-
-        if totall_ratio_n_proportion !=0:
-            
-            if(int(totall_ratio_n_proportion)%5==0):
-                total_ratio_n_proportion_page=(int(totall_ratio_n_proportion)/5)
-            else:
-                total_ratio_n_proportion_page=(int(totall_ratio_n_proportion)/5)+1
-
-            self.total_ratio_n_proportion_page= total_ratio_n_proportion_page        
-
-        if totall_partnership !=0:
-            
-            if(int(totall_partnership)%5==0):
-                total_partnership_page=(int(totall_partnership)/5)
-            else:
-                total_partnership_page=(int(totall_partnership)/5)+1
-
-            self.total_partnership_page= total_partnership_page        
-
-        if totall_time_n_work !=0:
-            
-            if(int(totall_time_n_work)%5==0):
-                total_time_n_work_page=(int(totall_time_n_work)/5)
-            else:
-                total_time_n_work_page=(int(totall_time_n_work)/5)+1
-
-            self.total_time_n_work_page= total_time_n_work_page        
-
-        if totall_pipe_cistern !=0:
-            
-            if(int(totall_pipe_cistern)%5==0):
-                total_time_n_distance_page=(int(totall_pipe_cistern)/5)
-            else:
-                total_pipe_cistern_page=(int(totall_pipe_cistern)/5)+1
-
-            self.total_pipe_cistern_page= total_pipe_cistern_page        
-
-        if totall_time_n_distance !=0:
-            
-            if(int(totall_time_n_distance)%5==0):
-                total_time_n_distance_page=(int(totall_time_n_distance)/5)
-            else:
-                total_time_n_distance_page=(int(totall_time_n_distance)/5)+1
-
-            self.total_time_n_distance_page= total_time_n_distance_page        
-
-        if totall_problem_on_age !=0:
-            
-            if(int(totall_problem_on_age)%5==0):
-                total_problem_on_age_page=(int(totall_problem_on_age)/5)
-            else:
-                total_problem_on_age_page=(int(totall_problem_on_age)/5)+1
-
-            self.total_problem_on_age_page= total_problem_on_age_page        
-
-        if totall_boats_n_stream !=0:
-            
-            if(int(totall_boats_n_stream)%5==0):
-                total_boats_n_stream_page=(int(totall_boats_n_stream)/5)
-            else:
-                total_boats_n_stream_page=(int(totall_boats_n_stream)/5)+1
-
-            self.total_boats_n_stream_page= total_boats_n_stream_page        
-
-        if totall_alligation_n_mixture !=0:
-            
-            if(int(totall_alligation_n_mixture)%5==0):
-                total_alligation_n_mixture_page=(int(totall_alligation_n_mixture)/5)
-            else:
-                total_alligation_n_mixture_page=(int(totall_alligation_n_mixture)/5)+1
-
-            self.total_alligation_n_mixture_page= total_alligation_n_mixture_page        
-
-        if totall_simple_interest !=0:
-            
-            if(int(totall_simple_interest)%5==0):
-                total_simple_interest_page=(int(totall_simple_interest)/5)
-            else:
-                total_simple_interest_page=(int(totall_simple_interest)/5)+1
-
-            self.total_simple_interest_page= total_simple_interest_page        
-
-        if totall_compound_interest !=0:
-            
-            if(int(totall_compound_interest)%5==0):
-                total_compound_interest_page=(int(totall_compound_interest)/5)
-            else:
-                total_compound_interest_page=(int(totall_compound_interest)/5)+1
-
-            self.total_compound_interest_page= total_compound_interest_page        
-
-        if totall_volume_n_surface_area !=0:
-            
-            if(int(totall_volume_n_surface_area)%5==0):
-                total_volume_n_surface_area_page=(int(totall_volume_n_surface_area)/5)
-            else:
-                total_volume_n_surface_area_page=(int(totall_volume_n_surface_area)/5)+1
-
-            self.total_volume_n_surface_area_page= total_volume_n_surface_area_page        
-
-        if totall_probability !=0:
-            
-            if(int(totall_probability)%5==0):
-                total_probability_page=(int(totall_probability)/5)
-            else:
-                total_probability_page=(int(totall_probability)/5)+1
-
-            self.total_probability_page= total_probability_page        
-
-        if totall_permutation_combination !=0:
-            
-            if(int(totall_permutation_combination)%5==0):
-                total_permutation_combination_page=(int(totall_permutation_combination)/5)
-            else:
-                total_permutation_combination_page=(int(totall_permutation_combination)/5)+1
-
-            self.total_permutation_combination_page= total_permutation_combination_page        
-
-        if totall_bar_graph !=0:
-            
-            if(int(totall_bar_graph)%5==0):
-                total_bar_graph_page=(int(totall_bar_graph)/5)
-            else:
-                total_bar_graph_page=(int(totall_bar_graph)/5)+1
-
-            self.total_bar_graph_page= total_bar_graph_page        
-
-        if totall_pie_charts !=0:
-            
-            if(int(totall_pie_charts)%5==0):
-                total_pie_charts_page=(int(totall_pie_charts)/5)
-            else:
-                total_pie_charts_page=(int(totall_pie_charts)/5)+1
-
-            self.total_pie_charts_page= total_pie_charts_page        
-
-        if totall_line_graph !=0:
-            
-            if(int(totall_line_graph)%5==0):
-                total_line_graph_page=(int(totall_line_graph)/5)
-            else:
-                total_line_graph_page=(int(totall_line_graph)/5)+1
-
-            self.total_line_graph_page= total_line_graph_page        
-
-    
-
-                
-
-
-            
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'math')
         super(total_math, self).save(*args, **kwargs)
 
 class job(models.Model):
@@ -1213,6 +846,9 @@ class job(models.Model):
 
     class Meta:
         ordering = ['-day','-creation_time']
+        indexes = [
+            models.Index(fields=['day', 'creation_time', 'id'], name='job_seek_idx'),
+        ]
 
         
    
@@ -2457,6 +2093,7 @@ class reasoning(models.Model):
     level=models.CharField(max_length=100,default='',blank=True,null=True,db_index=True)
     ans = models.CharField(max_length=100,default='',blank=True,null=True)
     new_id=models.CharField(max_length=100,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
 
     shortcut = models.TextField(blank=True,null=True)
     shortcut_image = models.FileField(upload_to='reasoning/reasoning/%Y/%m/%d/short',blank=True,null=True)
@@ -2513,6 +2150,8 @@ class reasoning(models.Model):
        
 
     
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(reasoning, self).save(*args, **kwargs)
         
     
@@ -2594,232 +2233,8 @@ class total_reasoning(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall_analogy=reasoning.objects.filter(chapter='analogy').count()
-        totall_classification=reasoning.objects.filter(chapter='classification').count()
-        totall_alpha_numaric_symbol=reasoning.objects.filter(chapter='alpha_numaric_symbol').count()
-        totall_coding_decoding=reasoning.objects.filter(chapter='coding_decoding').count()
-        totall_fictious_symbol=reasoning.objects.filter(chapter='fictious_symbol').count()
-        totall_Ranking_test=reasoning.objects.filter(chapter='Ranking_test').count()
-        totall_inequality_and_coded_inequality=reasoning.objects.filter(chapter='inequality_and_coded_inequality').count()
-        totall_input_output=reasoning.objects.filter(chapter='input_output').count()
-        totall_squere_puzzle=reasoning.objects.filter(chapter='squere_puzzle').count()
-        totall_problem_on_age=reasoning.objects.filter(chapter='problem_on_age').count()
-        totall_blood_relation=reasoning.objects.filter(chapter='blood_relation').count()
-        totall_syllogism=reasoning.objects.filter(chapter='syllogism').count()
-        totall_decision_making=reasoning.objects.filter(chapter='decision_making').count()
-        totall_clock=reasoning.objects.filter(chapter='clock').count()
-        totall_calender=reasoning.objects.filter(chapter='calender').count()
-        totall_arrangment=reasoning.objects.filter(chapter='arrangment').count()
-        totall_cause_n_effect=reasoning.objects.filter(chapter='cause_n_effect').count()
-        totall_direction_test=reasoning.objects.filter(chapter='direction_test').count()
-
-        totall_seating_arrangment=reasoning.objects.filter(chapter='seating_arrangment').count()
-       
-        totall_coded_relationship=reasoning.objects.filter(chapter='coded_relationship').count()
-
-        totall_flore_puzzle=reasoning.objects.filter(chapter='flore_puzzle').count()
-        totall_circle_puzzle=reasoning.objects.filter(chapter='circle_puzzle').count()
-        totall_arguments=reasoning.objects.filter(chapter='arguments').count()
-
-     
-        if totall_analogy !=0:
-            
-            if(int(totall_analogy)%5==0):
-                total_analogy_page=(int(totall_analogy)/5)
-            else:
-                total_analogy_page=(int(totall_analogy)/5)+1
-
-            self.total_analogy_page= total_analogy_page
-
-        if totall_classification !=0:
-            
-            if(int(totall_classification)%5==0):
-                total_classification_page=(int(totall_classification)/5)
-            else:
-                total_classification_page=(int(totall_classification)/5)+1
-
-            self.total_classification_page= total_classification_page        
-
-
-        if totall_alpha_numaric_symbol !=0:
-            
-            if(int(totall_alpha_numaric_symbol)%5==0):
-                total_alpha_numaric_symbol_page=(int(totall_alpha_numaric_symbol)/5)
-            else:
-                total_alpha_numaric_symbol_page=(int(totall_alpha_numaric_symbol)/5)+1
-
-            self.total_alpha_numaric_symbol_page= total_alpha_numaric_symbol_page        
-
-        if totall_coding_decoding !=0:
-            
-            if(int(totall_coding_decoding)%5==0):
-                total_coding_decoding_page=(int(totall_coding_decoding)/5)
-            else:
-                total_coding_decoding_page=(int(totall_coding_decoding)/5)+1
-
-            self.total_coding_decoding_page= total_coding_decoding_page        
-
-        if totall_fictious_symbol !=0:
-            
-            if(int(totall_fictious_symbol)%5==0):
-                total_fictious_symbol_page=(int(totall_fictious_symbol)/5)
-            else:
-                total_fictious_symbol_page=(int(totall_fictious_symbol)/5)+1
-
-            self.total_fictious_symbol_page= total_fictious_symbol_page        
-
-     
-        if totall_flore_puzzle !=0:
-            
-            if(int(totall_flore_puzzle)%5==0):
-               total_flore_puzzle_page=(int(totall_flore_puzzle)/5)
-            else:
-               total_flore_puzzle_page=(int(totall_flore_puzzle)/5)+1
-
-            self.total_flore_puzzle_page=total_flore_puzzle_page    
-
-        if totall_Ranking_test !=0:
-            
-            if(int(totall_Ranking_test)%5==0):
-                total_Ranking_test_page=(int(totall_Ranking_test)/5)
-            else:
-                total_Ranking_test_page=(int(totall_Ranking_test)/5)+1
-
-            self.total_Ranking_test_page= total_Ranking_test_page        
-
-        if totall_inequality_and_coded_inequality !=0:
-            
-            if(int(totall_inequality_and_coded_inequality)%5==0):
-                total_inequality_and_coded_inequality_page=(int(totall_inequality_and_coded_inequality)/5)
-            else:
-                total_inequality_and_coded_inequality_page=(int(totall_inequality_and_coded_inequality)/5)+1
-
-            self.total_inequality_and_coded_inequality_page= total_inequality_and_coded_inequality_page        
-
-        if totall_input_output !=0:
-            
-            if(int(totall_input_output)%5==0):
-                total_input_output_page=(int(totall_input_output)/5)
-            else:
-                total_input_output_page=(int(totall_input_output)/5)+1
-
-            self.total_input_output_page= total_input_output_page        
-
-        if totall_circle_puzzle !=0:
-            
-            if(int(totall_circle_puzzle)%5==0):
-                total_squere_puzzle_page=(int(totall_circle_puzzle)/5)
-            else:
-                total_circle_puzzle_page=(int(totall_circle_puzzle)/5)+1
-
-            self.total_circle_puzzle_page= total_circle_puzzle_page        
-
-        if totall_squere_puzzle !=0:
-            
-            if(int(totall_squere_puzzle)%5==0):
-                total_squere_puzzle_page=(int(totall_squere_puzzle)/5)
-            else:
-                total_squere_puzzle_page=(int(totall_squere_puzzle)/5)+1
-
-            self.total_squere_puzzle_page= total_squere_puzzle_page        
-
-               
-
-        if totall_blood_relation !=0:
-            
-            if(int(totall_blood_relation)%5==0):
-                total_blood_relation_page=(int(totall_blood_relation)/5)
-            else:
-                total_blood_relation_page=(int(totall_blood_relation)/5)+1
-
-            self.total_blood_relation_page= total_blood_relation_page        
-
-        if totall_decision_making !=0:
-            
-            if(int(totall_decision_making)%5==0):
-                total_decision_making_page=(int(totall_decision_making)/5)
-            else:
-                total_decision_making_page=(int(totall_decision_making)/5)+1
-
-            self.total_decision_making_page= total_decision_making_page        
-
-        if totall_syllogism !=0:
-            
-            if(int(totall_syllogism)%5==0):
-                total_syllogism_page=(int(totall_syllogism)/5)
-            else:
-                total_syllogism_page=(int(totall_syllogism)/5)+1
-
-            self.total_syllogism_page= total_syllogism_page        
-
-        if totall_clock !=0:
-            
-            if(int(totall_clock)%5==0):
-                total_clock_page=(int(totall_clock)/5)
-            else:
-                total_clock_page=(int(totall_clock)/5)+1
-
-            self.total_clock_page= total_clock_page        
-
-        if totall_calender !=0:
-            
-            if(int(totall_calender)%5==0):
-                total_calender_page=(int(totall_calender)/5)
-            else:
-                total_calender_page=(int(totall_calender)/5)+1
-
-            self.total_calender_page= total_calender_page        
-
-        if totall_arguments !=0:
-            
-            if(int(totall_arguments)%5==0):
-                total_arguments_page=(int(totall_arguments)/5)
-            else:
-                total_arguments_page=(int(totall_arguments)/5)+1
-
-            self.total_arguments_page= total_arguments_page        
-
-        if totall_cause_n_effect !=0:
-            
-            if(int(totall_cause_n_effect)%5==0):
-                total_cause_n_effect_page=(int(totall_cause_n_effect)/5)
-            else:
-                total_cause_n_effect_page=(int(totall_cause_n_effect)/5)+1
-
-            self.total_cause_n_effect_page= total_cause_n_effect_page        
-
-	
-  
-        if totall_seating_arrangment !=0:
-            
-            if(int(totall_seating_arrangment)%5==0):
-                total_seating_arrangment_page=(int(totall_seating_arrangment)/5)
-            else:
-                total_seating_arrangment_page=(int(totall_seating_arrangment)/5)+1
-
-            self.total_seating_arrangment_page= total_seating_arrangment_page
-  
-        if totall_coded_relationship !=0:
-            
-            if(int(totall_coded_relationship)%5==0):
-                total_coded_relationship_page=(int(totall_coded_relationship)/5)
-            else:
-                total_coded_relationship_page=(int(totall_coded_relationship)/5)+1
-
-            self.total_coded_relationship_page= total_coded_relationship_page
-
-        if totall_direction_test !=0:
-            
-            if(int(totall_direction_test)%5==0):
-                total_direction_test_page=(int(totall_direction_test)/5)
-            else:
-                total_direction_test_page=(int(totall_direction_test)/5)+1
-
-            self.total_direction_test_page= total_direction_test_page    
-                
-
-
-            
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'reasoning')
         super(total_reasoning, self).save(*args, **kwargs)
 
 
@@ -3284,10 +2699,14 @@ class currentaffairs_mcq(models.Model):
 
     extra=models.TextField(default='',blank=True,null=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
         ordering = ["-day"]
+        indexes = [
+            models.Index(fields=['day', 'creation_time', 'id'], name='ca_mcq_seek_idx'),
+        ]
 
         
    
@@ -3296,8 +2715,13 @@ class currentaffairs_mcq(models.Model):
     def __str__(self):
         return self.day.strftime('%d/%m/%Y') + '     '+ self.question
 
+    def make_new_id(self):
+        return self.question +'===' +self.day.strftime('%d-%m-%Y')
+
     def save(self, *args, **kwargs):
-        self.new_id= self.question +'===' +self.day.strftime('%d-%m-%Y')
+        self.new_id= self.make_new_id()
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(currentaffairs_mcq, self).save(*args, **kwargs)
 
 
@@ -3349,180 +2773,159 @@ class total_mcq(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=currentaffairs_mcq.objects.count()
+        from bank.services.counters import ALL_ROWS, aggregate_counts, page_count
+
+        counts = aggregate_counts(currentaffairs_mcq, live_only=False)
+        totall = counts.pop(ALL_ROWS)
         self.total_mcq= totall
         self.total_mcq_page=int(totall+300)/3
+        for category, rows in counts.items():
+            if hasattr(self, category):
+                setattr(self, category, page_count(rows))
 
-        total_st=currentaffairs_mcq.objects.filter(Science_Techonlogy=True).count()
-        total_n=currentaffairs_mcq.objects.filter(National=True).count()
-        total_State=currentaffairs_mcq.objects.filter(State=True).count()
-        total_International=currentaffairs_mcq.objects.filter(International=True).count()
-        total_Business_Economy_Banking=currentaffairs_mcq.objects.filter(Business_Economy_Banking=True).count()
-        total_Environment=currentaffairs_mcq.objects.filter(Environment=True).count()
-        total_Defence=currentaffairs_mcq.objects.filter(Defence=True).count()
-        total_Persons_in_News=currentaffairs_mcq.objects.filter(Persons_in_News=True).count()
-        total_Awards_Honours=currentaffairs_mcq.objects.filter(Awards_Honours=True).count()
-        total_Sports=currentaffairs_mcq.objects.filter(Sports=True).count()
-        total_Art_Culture=currentaffairs_mcq.objects.filter(Art_Culture=True).count()
-        total_Government_Schemes=currentaffairs_mcq.objects.filter(Government_Schemes=True).count()
-        total_medical=currentaffairs_mcq.objects.filter(medical=True).count()
-        total_rank=currentaffairs_mcq.objects.filter(rank=True).count()
-        total_obituary=currentaffairs_mcq.objects.filter(obituary=True).count()
-        total_appointment=currentaffairs_mcq.objects.filter(appointment=True).count()
-        total_static_gk =currentaffairs_mcq.objects.filter(static_gk=True).count()
-        if total_st !=0:
-            
-            if(int(total_st)%3==0):
-                total_page_Science_Techonlogy=(int(total_st)/3)
-            else:
-                total_page_Science_Techonlogy=(int(total_st)/3)+1
-
-            self.Science_Techonlogy= total_page_Science_Techonlogy        
+        super(total_mcq, self).save(*args, **kwargs)
 
-                
 
+class category_counter(models.Model):
+    """Live row count per category for currentaffairs_descriptive / currentaffairs_mcq.
 
-        if total_n !=0:
-            
-            if(int(total_n)%3==0):
-                total_page_National=(int(total_n)/3)
-            else:
-                total_page_National=(int(total_n)/3)+1
-            self.National= total_page_National       
+    Kept in sync with atomic deltas by bank.signals; rebuilt from scratch with
+    ``manage.py rebuild_category_counters``. Page counts are derived on read.
+    """
+    content_ch = (
+    ("descriptive", "descriptive"),
+    ("mcq", "mcq"),
+    )
+    content_type = models.CharField(max_length=20, choices=content_ch, db_index=True)
+    category = models.CharField(max_length=50)
+    row_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
-        if total_State !=0:
-            
-            if(int(total_State)%3==0):
-                total_page_State=(int(total_State)/3)
+    class Meta:
+        unique_together = ('content_type', 'category')
 
-            else:
-                total_page_State=(int(total_State)/3)+1
-            self.State= total_page_State     
+    def __str__(self):
+        return self.content_type + ' / ' + self.category + ' = ' + str(self.row_count)
 
-        if total_International !=0:
-            
-            if(int(total_International)%3==0):
-                total_page_International=(int(total_International)/3)
-            else:
-                total_page_International=(int(total_International)/3)+1
-            self.International= total_page_International     
 
-        if total_Business_Economy_Banking !=0:
-            
-            if(int(total_Business_Economy_Banking)%3==0):
-                total_page_Business_Economy_Banking=(int(total_Business_Economy_Banking)/3)
+class calendar_day(models.Model):
+    """Live row count per publication day for the current-affairs tables.
 
-            else:
-                total_page_Business_Economy_Banking=(int(total_Business_Economy_Banking)/3)+1
+    Replaces the per-year currentaffairs_*_info_20XX rebuilds: maintained
+    incrementally by bank.signals and read by bank.services.calendar_index,
+    so month lists, day lists and date-wise page counts come from one indexed
+    query for any year.
+    """
+    content_type = models.CharField(max_length=20, choices=category_counter.content_ch)
+    year = models.SmallIntegerField()
+    month = models.SmallIntegerField()
+    day = models.DateField()
+    live_count = models.IntegerField(default=0)
 
-            self.Business_Economy_Banking= total_page_Business_Economy_Banking    
+    class Meta:
+        unique_together = ('content_type', 'day')
+        indexes = [
+            models.Index(fields=['content_type', 'year', 'month', 'day']),
+        ]
 
-        if total_Environment !=0:
-            
-            if(int(total_Environment)%3==0):
-                total_page_Environment=(int(total_Environment)/3)
-            else:
-                total_page_Environment=(int(total_Environment)/3)+1
-            self.Environment= total_page_Environment     
+    def __str__(self):
+        return self.content_type + ' ' + self.day.strftime('%d/%m/%Y') + ' = ' + str(self.live_count)
 
-        if total_Defence !=0:
-            
-            if(int(total_Defence)%3==0):
-                total_page_Defence=(int(total_Defence)/3)
-            else:
-                total_page_Defence=(int(total_Defence)/3)+1
 
-            self.Defence= total_page_Defence     
+class subject_stat(models.Model):
+    """Row and page count per subject chapter / difficulty / sub_chapter.
 
-        if total_Persons_in_News !=0:
-            
-            if(int(total_Persons_in_News)%3==0):
-                total_page_Persons_in_News=(int(total_Persons_in_News)/3)
-            else:
-                total_page_Persons_in_News=(int(total_Persons_in_News)/3)+1
+    Written by bank.services.subject_stats from one GROUP BY per subject and
+    read directly by the subject, math and reasoning views.  dimension 'all'
+    (value '') holds the subject total.
+    """
+    dimension_ch = (
+    ("all", "all"),
+    ("chapter", "chapter"),
+    ("difficulty", "difficulty"),
+    ("sub_chapter", "sub_chapter"),
+    )
+    subject = models.CharField(max_length=30)
+    dimension = models.CharField(max_length=20, choices=dimension_ch)
+    value = models.CharField(max_length=100, blank=True, default='')
+    row_count = models.IntegerField(default=0)
+    page_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
-            self.Persons_in_News= total_page_Persons_in_News     
+    class Meta:
+        unique_together = ('subject', 'dimension', 'value')
 
-        if total_Awards_Honours !=0:
-            
-            if(int(total_Awards_Honours)%3==0):
-                total_page_Awards_Honours=(int(total_Awards_Honours)/3)
-            else:
-                total_page_Awards_Honours=(int(total_Awards_Honours)/3)+1
-            self.Awards_Honours= total_page_Awards_Honours    
+    def __str__(self):
+        return self.subject + ' / ' + self.dimension + ' ' + self.value + ' = ' + str(self.row_count)
+
+
+class page_list(models.Model):
+    """One paginated list (model, filter and ordering) with stored page anchors.
+
+    Created by bank.services.pagination the first time a deep numbered page
+    is requested.  list_key is a hash of the filter; writes to the model bump
+    version, and the anchors are rebuilt from the next reading request's
+    queryset once built_version is behind.  updated_at is the last rebuild,
+    used_at the last read (to an hour).
+    """
+    list_key = models.CharField(max_length=32, unique=True)
+    model = models.CharField(max_length=100, db_index=True)
+    ordering = models.CharField(max_length=200)
+    row_count = models.IntegerField(default=0)
+    version = models.IntegerField(default=0)
+    built_version = models.IntegerField(default=-1)
+    updated_at = models.DateTimeField(auto_now=True)
+    used_at = models.DateTimeField(default=timezone.now)
 
-        if total_Sports !=0:
-            
-            if(int(total_Sports)%3==0):
-                total_page_Sports=(int(total_Sports)/3)
-            else:
-                total_page_Sports=(int(total_Sports)/3)+1
+    def __str__(self):
+        return self.model + ' ' + self.ordering + ' (' + str(self.row_count) + ' rows)'
 
-            self.Sports= total_page_Sports    
 
-        if total_Art_Culture !=0:
-            
-            if(int(total_Art_Culture)%3==0):
-                total_page_Art_Culture=(int(total_Art_Culture)/3)
-            else:
-                total_page_Art_Culture=(int(total_Art_Culture)/3)+1
+class page_anchor(models.Model):
+    """Ordering key of one row of a page_list and its 0-based position (rank) in it."""
+    page_list = models.ForeignKey(page_list, on_delete=models.CASCADE, related_name='anchors')
+    rank = models.IntegerField()
+    key = models.TextField()
 
-            self.Art_Culture= total_page_Art_Culture     
+    class Meta:
+        indexes = [
+            models.Index(fields=['page_list', 'rank']),
+        ]
 
-        if total_Government_Schemes !=0:
-            
-            if(int(total_Government_Schemes)%3==0):
-                total_page_Government_Schemes=(int(total_Government_Schemes)/3)
-            else:
-                total_page_Government_Schemes=(int(total_Government_Schemes)/3)+1
-            self.Government_Schemes= total_page_Government_Schemes
+    def __str__(self):
+        return str(self.page_list_id) + ' @' + str(self.rank)
 
-        if total_medical !=0:
-            
-            if(int(total_medical)%3==0):
-                total_page_medical=(int(total_medical)/3)
-            else:
-                total_page_medical=(int(total_medical)/3)+1
 
-            self.medical= total_page_medical
+class question_signature(models.Model):
+    """MinHash signature of one MCQ question for near-duplicate lookup.
 
-        if total_rank !=0:
-            
-            if(int(total_rank)%3==0):
-                total_page_rank=(int(total_rank)/3)
-            else:
-                total_page_rank=(int(total_rank)/3)+1
-            self.rank= total_page_rank
+    Written by bank.services.near_duplicates after every MCQ save and loaded
+    into its in-memory LSH index.  table is the MCQ model name, row_id its id.
+    """
+    table = models.CharField(max_length=30)
+    row_id = models.IntegerField()
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
-        if total_obituary !=0:
-            
-            if(int(total_obituary)%3==0):
-                total_page_obituary=(int(total_obituary)/3)
-            else:
-                total_page_obituary=(int(total_obituary)/3)+1
-            self.obituary= total_page_obituary
+    class Meta:
+        unique_together = ('table', 'row_id')
 
-        
-        if total_appointment !=0:
-            
-            if(int(total_appointment)%3==0):
-                total_page_appointment=(int(total_appointment)/3)
-            else:
-                total_page_appointment=(int(total_appointment)/3)+1
-            self.appointment= total_page_appointment
+    def __str__(self):
+        return self.table + ' #' + str(self.row_id)
 
-        if total_static_gk !=0:
-            
-            if(int(total_static_gk)%3==0):
-                total_page_static_gk=(int(total_static_gk)/3)
-            else:
-                total_page_static_gk=(int(total_static_gk)/3)+1
-            self.static_gk= total_page_static_gk
 
+class question_tombstone(models.Model):
+    """A deleted MCQ row whose signature other processes still have to drop.
 
+    Written by bank.services.near_duplicates.remove() and read back with the
+    periodic index refresh; rows older than TOMBSTONE_TTL are pruned.
+    """
+    table = models.CharField(max_length=30)
+    row_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
-        
-        super(total_mcq, self).save(*args, **kwargs)
+    def __str__(self):
+        return self.table + ' #' + str(self.row_id) + ' (deleted)'
 
 
 class currentaffairs_mcq_info_2018(models.Model):
@@ -6372,6 +5775,7 @@ class polity(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -6383,6 +5787,8 @@ class polity(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(polity, self).save(*args, **kwargs)
 
 
@@ -6438,26 +5844,8 @@ class total_polity(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=polity.objects.count()
-        self.total_polity= totall
-        self.total_polity_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=polity.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'polity')
         super(total_polity, self).save(*args, **kwargs)
 
 
@@ -6527,6 +5915,7 @@ class history(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -6538,6 +5927,8 @@ class history(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(history, self).save(*args, **kwargs)
 
 
@@ -6593,26 +5984,8 @@ class total_history(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=history.objects.count()
-        self.total_history= totall
-        self.total_history_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=history.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'history')
         super(total_history, self).save(*args, **kwargs)
 
 
@@ -6682,6 +6055,7 @@ class geography(models.Model):
     mocktest = models.BooleanField(default=False,db_index=True)
 
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -6693,6 +6067,8 @@ class geography(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(geography, self).save(*args, **kwargs)
 
 
@@ -6748,26 +6124,8 @@ class total_geography(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=geography.objects.count()
-        self.total_geography= totall
-        self.total_geography_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=geography.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'geography')
         super(total_geography, self).save(*args, **kwargs)
 
 
@@ -6835,6 +6193,7 @@ class economics(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -6846,6 +6205,8 @@ class economics(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(economics, self).save(*args, **kwargs)
 
 
@@ -6901,26 +6262,8 @@ class total_economics(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=economics.objects.count()
-        self.total_economics= totall
-        self.total_economics_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=economics.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'economics')
         super(total_economics, self).save(*args, **kwargs)
 
 class physics(models.Model):
@@ -6986,6 +6329,7 @@ class physics(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -6997,6 +6341,8 @@ class physics(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(physics, self).save(*args, **kwargs)
 
 
@@ -7052,26 +6398,8 @@ class total_physics(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=physics.objects.count()
-        self.total_physics= totall
-        self.total_physics_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=physics.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'physics')
         super(total_physics, self).save(*args, **kwargs)
 
 
@@ -7138,6 +6466,7 @@ class biology(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -7149,6 +6478,8 @@ class biology(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(biology, self).save(*args, **kwargs)
 
 
@@ -7204,26 +6535,8 @@ class total_biology(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=biology.objects.count()
-        self.total_biology= totall
-        self.total_biology_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=biology.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'biology')
         super(total_biology, self).save(*args, **kwargs)
 
 
@@ -7290,6 +6603,7 @@ class chemistry(models.Model):
     home = models.BooleanField(default=False,db_index=True)
     mocktest = models.BooleanField(default=False,db_index=True)
     new_id=models.CharField(max_length=300,default='',blank=True,null=True,db_index=True)
+    fingerprint = models.BigIntegerField(blank=True,null=True,db_index=True,editable=False)
     
 
     class Meta:
@@ -7301,6 +6615,8 @@ class chemistry(models.Model):
 
     def save(self, *args, **kwargs):
         self.new_id= self.question[:100] +'===' +self.day.strftime('%d-%m-%Y')
+        from bank.services import fingerprints
+        self.fingerprint = fingerprints.for_instance(self)
         super(chemistry, self).save(*args, **kwargs)
 
 
@@ -7356,26 +6672,8 @@ class total_chemistry(models.Model):
 
 
     def save(self, *args, **kwargs):
-        totall=chemistry.objects.count()
-        self.total_chemistry= totall
-        self.total_chemistry_page=int(totall)/5
-
-        
-        for x in range(1,41):
-            total=chemistry.objects.filter(chapter=str(x)).count()
-            if total !=0:
-                
-                if(int(total)%5==0):
-                    total_page=(int(total)/5)
-                else:
-                    total_page=(int(total)/5)+1
-                y='chapter_'+ str(x)
-
-                #self.chapter_1= total_page_1
-                self.__dict__[y]=total_page
-
-
-        
+        from bank.services import subject_stats
+        subject_stats.fill_legacy(self, 'chemistry')
         super(total_chemistry, self).save(*args, **kwargs)
 
 
@@ -0,0 +1,4 @@
+"""
+Service helpers for the bank app (counters, indexes and other derived data
+maintained alongside the content tables).
+"""
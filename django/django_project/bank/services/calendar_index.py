@@ -0,0 +1,233 @@
+"""
+Year-agnostic calendar of published current-affairs days.
+
+``calendar_day`` keeps one row per (content type, day) with the number of
+live rows published that day.  The post_save / post_delete receivers in
+``bank.signals`` move the counts as rows are inserted, deleted, re-dated or
+toggle ``is_live``, so nothing walks ``distinct('month')`` / ``distinct('day')``
+on the write path any more.  Any year can be served from a single indexed
+query on (content_type, year, month, day).
+
+The old ``currentaffairs_*_info_20XX`` rows are still shown in the admin;
+``write_legacy_info()`` refreshes one of them from the index without running
+its expensive ``save()``.
+"""
+import calendar
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Sum, Value
+
+from bank import models as bank_models
+from bank.models import calendar_day, currentaffairs_descriptive, currentaffairs_mcq
+
+
+CONTENT_MODELS = {
+    "descriptive": currentaffairs_descriptive,
+    "mcq": currentaffairs_mcq,
+}
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+_SNAPSHOT_ATTR = "_calendar_snapshot"
+_UNKNOWN = object()
+
+
+def content_type_for(model):
+    for content_type, content_model in CONTENT_MODELS.items():
+        if content_model is model:
+            return content_type
+    return None
+
+
+def month_number(name):
+    """'January' / 'january' -> 1; None for anything else."""
+    try:
+        return MONTH_NAMES.index(str(name).title()) + 1
+    except ValueError:
+        return None
+
+
+def instance_day(instance):
+    """``instance.day`` as a date, also when it was assigned a datetime/string."""
+    day = getattr(instance, "day", None)
+    if isinstance(day, datetime.datetime):
+        return day.date()
+    if isinstance(day, str):
+        return type(instance)._meta.get_field("day").to_python(day)
+    return day
+
+
+def live_day(instance):
+    """The day an instance is counted under, or None when it is not live."""
+    if not getattr(instance, "is_live", True):
+        return None
+    return instance_day(instance)
+
+
+def remember_state(instance):
+    if instance.pk is None:
+        setattr(instance, _SNAPSHOT_ATTR, None)
+        return
+    if {"day", "is_live"} & instance.get_deferred_fields():
+        setattr(instance, _SNAPSHOT_ATTR, _UNKNOWN)
+        return
+    setattr(instance, _SNAPSHOT_ATTR, live_day(instance))
+
+
+def load_stored_state(instance):
+    if getattr(instance, _SNAPSHOT_ATTR, _UNKNOWN) is not _UNKNOWN or instance.pk is None:
+        return
+    stored = type(instance).objects.filter(pk=instance.pk).values("day", "is_live").first()
+    if stored is None or not stored["is_live"]:
+        setattr(instance, _SNAPSHOT_ATTR, None)
+    else:
+        setattr(instance, _SNAPSHOT_ATTR, stored["day"])
+
+
+def touched_years(instance):
+    """Years whose calendar a save/delete of ``instance`` can change."""
+    years = set()
+    before = getattr(instance, _SNAPSHOT_ATTR, None)
+    if before is not None and before is not _UNKNOWN:
+        years.add(before.year)
+    day = instance_day(instance)
+    if day is not None:
+        years.add(day.year)
+    return years
+
+
+def apply_deltas(content_type, deltas):
+    """Add ``deltas`` ({date: +n/-n}) to the matching calendar_day rows."""
+    for day, delta in deltas.items():
+        if not delta or day is None:
+            continue
+        updated = calendar_day.objects.filter(content_type=content_type, day=day).update(
+            live_count=F("live_count") + Value(delta)
+        )
+        if not updated:
+            calendar_day.objects.bulk_create(
+                [calendar_day(content_type=content_type, year=day.year, month=day.month, day=day, live_count=0)],
+                ignore_conflicts=True,
+            )
+            calendar_day.objects.filter(content_type=content_type, day=day).update(
+                live_count=F("live_count") + Value(delta)
+            )
+
+
+def record_save(instance, created):
+    content_type = content_type_for(type(instance))
+    if content_type is None:
+        return
+    before = None if created else getattr(instance, _SNAPSHOT_ATTR, None)
+    if before is _UNKNOWN:
+        before = None
+    after = live_day(instance)
+    if before != after:
+        deltas = {}
+        if before is not None:
+            deltas[before] = deltas.get(before, 0) - 1
+        if after is not None:
+            deltas[after] = deltas.get(after, 0) + 1
+        apply_deltas(content_type, deltas)
+    setattr(instance, _SNAPSHOT_ATTR, after)
+
+
+def record_delete(instance):
+    content_type = content_type_for(type(instance))
+    if content_type is None:
+        return
+    before = getattr(instance, _SNAPSHOT_ATTR, _UNKNOWN)
+    if before is _UNKNOWN:
+        before = live_day(instance)
+    if before is not None:
+        apply_deltas(content_type, {before: -1})
+    setattr(instance, _SNAPSHOT_ATTR, None)
+
+
+def rebuild(content_type=None, year=None):
+    """Recount calendar_day rows with one GROUP BY per content type."""
+    content_types = [content_type] if content_type else list(CONTENT_MODELS)
+    rebuilt = {}
+    for ct in content_types:
+        qs = CONTENT_MODELS[ct].objects.filter(is_live=True)
+        stale = calendar_day.objects.filter(content_type=ct)
+        if year:
+            qs = qs.filter(day__year=int(year))
+            stale = stale.filter(year=int(year))
+        per_day = qs.order_by().values("day").annotate(live_count=Count("id"))
+        rows = [
+            calendar_day(content_type=ct, year=r["day"].year, month=r["day"].month, day=r["day"], live_count=r["live_count"])
+            for r in per_day
+        ]
+        with transaction.atomic():
+            stale.delete()
+            calendar_day.objects.bulk_create(rows, batch_size=500)
+        rebuilt[ct] = len(rows)
+    return rebuilt
+
+
+def calendars(content_type, years=None):
+    """{year: {month: [date, ...]}} of days with live rows, in one query."""
+    qs = calendar_day.objects.filter(content_type=content_type, live_count__gt=0)
+    if years is not None:
+        qs = qs.filter(year__in=[int(y) for y in years])
+    result = {}
+    for year, month, day in qs.order_by("year", "month", "day").values_list("year", "month", "day"):
+        result.setdefault(year, {}).setdefault(month, []).append(day)
+    return result
+
+
+def format_day(day):
+    # Same "05 Jan, 2018" labels the sidebar script in mcq.html /
+    # current_descriptive.html splits on and slices the day number from.
+    return day.strftime("%d %b, %Y")
+
+
+def legacy_info(months):
+    """Shape one year's calendar like a currentaffairs_*_info_20XX row."""
+    info = {"month_list": " ".join(MONTH_NAMES[m - 1] for m in sorted(months))}
+    for number, name in enumerate(MONTH_NAMES, start=1):
+        days = months.get(number, [])
+        info[name] = "///".join(format_day(d) for d in days)
+        info[name + "_page"] = len(days)
+    return info
+
+
+def sidebar_context(content_type, years_wanted=None):
+    """[{'year', 'info': [legacy-shaped info]}] for the sidebar panels, in one query.
+
+    Without ``years_wanted`` every year that has published days is listed,
+    oldest first.
+    """
+    by_year = calendars(content_type, years_wanted)
+    years = sorted(by_year) if years_wanted is None else [int(y) for y in years_wanted]
+    return [{"year": year, "info": [legacy_info(by_year.get(year, {}))]} for year in years]
+
+
+def day_pages(content_type, year, month):
+    """Number of published days in a month (the date-wise page count)."""
+    if month is None or not str(year).isdigit():
+        return 0
+    return calendar_day.objects.filter(
+        content_type=content_type, year=int(year), month=int(month), live_count__gt=0
+    ).count()
+
+
+def legacy_model(content_type, year):
+    prefix = "currentaffairs_mcq_info_" if content_type == "mcq" else "currentaffairs_descriptive_info_"
+    return getattr(bank_models, prefix + str(year), None)
+
+
+def write_legacy_info(content_type, year):
+    """Refresh the legacy info row for a year straight from the index."""
+    model = legacy_model(content_type, year)
+    if model is None:
+        return False
+    info = legacy_info(calendars(content_type, [year]).get(int(year), {}))
+    total_field = "total_mcq" if content_type == "mcq" else "total_current_affairs"
+    info[total_field] = calendar_day.objects.filter(
+        content_type=content_type, year=int(year)
+    ).aggregate(rows=Sum("live_count"))["rows"] or 0
+    info[total_field + "_page"] = (info[total_field] + 2) // 3
+    return bool(model.objects.update(**info))
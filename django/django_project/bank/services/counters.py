@@ -0,0 +1,198 @@
+"""
+Per-category row/page counters for the current-affairs tables.
+
+The legacy ``total`` / ``total_mcq`` rows recount every category with a
+separate ``COUNT(*)`` on each save.  ``category_counter`` instead holds one row
+per (content type, category) that is moved by atomic ``F()`` deltas from the
+post_save / post_delete receivers in ``bank.signals``, so the views can read a
+page count with a single indexed lookup.
+
+Only live rows (``is_live=True``) are counted, matching what the pages show.
+``rebuild()`` recomputes everything with one conditional-aggregation query and
+is used by ``manage.py rebuild_category_counters`` for reconciliation after
+``QuerySet.update()`` / ``bulk_create()`` writes that bypass the signals.
+"""
+from django.db import models, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+
+from bank.models import category_counter, currentaffairs_descriptive, currentaffairs_mcq
+
+
+ALL_ROWS = "all_rows"
+PER_PAGE = 3
+
+CONTENT_MODELS = {
+    "descriptive": currentaffairs_descriptive,
+    "mcq": currentaffairs_mcq,
+}
+
+_SNAPSHOT_ATTR = "_counter_snapshot"
+
+
+def content_type_for(model):
+    for content_type, content_model in CONTENT_MODELS.items():
+        if content_model is model:
+            return content_type
+    return None
+
+
+def category_fields(model):
+    """Boolean category flags of a content model (everything except is_live)."""
+    return [
+        f.name
+        for f in model._meta.concrete_fields
+        if isinstance(f, models.BooleanField) and f.name != "is_live"
+    ]
+
+
+def page_count(rows, per_page=PER_PAGE):
+    rows = int(rows or 0)
+    return (rows + per_page - 1) // per_page
+
+
+def aggregate_counts(model, live_only=True):
+    """Row count for every category of ``model`` in a single query.
+
+    Returns ``{ALL_ROWS: n, "<category>": n, ...}``.
+    """
+    qs = model.objects.all()
+    if live_only:
+        qs = qs.filter(is_live=True)
+    aggregates = {ALL_ROWS: Count("id")}
+    for field in category_fields(model):
+        aggregates[field] = Count("id", filter=Q(**{field: True}))
+    result = qs.order_by().aggregate(**aggregates)
+    return {key: value or 0 for key, value in result.items()}
+
+
+def counted_keys(instance):
+    """Counter keys an instance currently contributes to."""
+    if not getattr(instance, "is_live", True):
+        return frozenset()
+    keys = {ALL_ROWS}
+    for field in category_fields(type(instance)):
+        if getattr(instance, field, False):
+            keys.add(field)
+    return frozenset(keys)
+
+
+def remember_state(instance):
+    """Snapshot what the stored row counts towards (called from post_init)."""
+    if instance.pk is None:
+        setattr(instance, _SNAPSHOT_ATTR, frozenset())
+        return
+    watched = set(category_fields(type(instance))) | {"is_live"}
+    if watched & instance.get_deferred_fields():
+        # Loaded with only()/defer(); resolving the fields here would cost a
+        # query per row, so leave it to load_stored_state() on save.
+        setattr(instance, _SNAPSHOT_ATTR, None)
+        return
+    setattr(instance, _SNAPSHOT_ATTR, counted_keys(instance))
+
+
+def load_stored_state(instance):
+    """Fill in the snapshot from the database when post_init could not."""
+    if getattr(instance, _SNAPSHOT_ATTR, None) is not None or instance.pk is None:
+        return
+    model = type(instance)
+    fields = category_fields(model) + ["is_live"]
+    stored = model.objects.filter(pk=instance.pk).values(*fields).first()
+    if stored is None:
+        setattr(instance, _SNAPSHOT_ATTR, frozenset())
+        return
+    keys = set()
+    if stored["is_live"]:
+        keys.add(ALL_ROWS)
+        keys.update(f for f in fields if f != "is_live" and stored[f])
+    setattr(instance, _SNAPSHOT_ATTR, frozenset(keys))
+
+
+def diff_state(before, after):
+    deltas = {}
+    for key in after - before:
+        deltas[key] = 1
+    for key in before - after:
+        deltas[key] = -1
+    return deltas
+
+
+def apply_deltas(content_type, deltas):
+    """Atomically add ``deltas`` ({category: +n/-n}) with a single UPDATE."""
+    deltas = {key: value for key, value in deltas.items() if value}
+    if not deltas:
+        return
+    updated = _update_counters(content_type, deltas)
+    if updated < len(deltas):
+        existing = set(
+            category_counter.objects.filter(
+                content_type=content_type, category__in=list(deltas)
+            ).values_list("category", flat=True)
+        )
+        missing = {key: value for key, value in deltas.items() if key not in existing}
+        category_counter.objects.bulk_create(
+            [category_counter(content_type=content_type, category=key, row_count=0) for key in missing],
+            ignore_conflicts=True,
+        )
+        _update_counters(content_type, missing)
+
+
+def _update_counters(content_type, deltas):
+    delta_expr = Case(
+        *[When(category=key, then=Value(value)) for key, value in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return category_counter.objects.filter(
+        content_type=content_type, category__in=list(deltas)
+    ).update(row_count=F("row_count") + delta_expr)
+
+
+def record_save(instance, created):
+    content_type = content_type_for(type(instance))
+    if content_type is None:
+        return
+    before = frozenset() if created else getattr(instance, _SNAPSHOT_ATTR, None)
+    if before is None:
+        before = frozenset()
+    after = counted_keys(instance)
+    apply_deltas(content_type, diff_state(before, after))
+    setattr(instance, _SNAPSHOT_ATTR, after)
+
+
+def record_delete(instance):
+    content_type = content_type_for(type(instance))
+    if content_type is None:
+        return
+    before = getattr(instance, _SNAPSHOT_ATTR, None)
+    if before is None:
+        before = counted_keys(instance)
+    apply_deltas(content_type, diff_state(before, frozenset()))
+    setattr(instance, _SNAPSHOT_ATTR, frozenset())
+
+
+def rebuild(content_type=None):
+    """Recount from scratch. Returns {content_type: {category: rows}}."""
+    content_types = [content_type] if content_type else list(CONTENT_MODELS)
+    rebuilt = {}
+    for ct in content_types:
+        counts = aggregate_counts(CONTENT_MODELS[ct], live_only=True)
+        with transaction.atomic():
+            category_counter.objects.filter(content_type=ct).delete()
+            category_counter.objects.bulk_create(
+                [category_counter(content_type=ct, category=key, row_count=value) for key, value in counts.items()]
+            )
+        rebuilt[ct] = counts
+    return rebuilt
+
+
+def get_count(content_type, category=ALL_ROWS):
+    rows = (
+        category_counter.objects.filter(content_type=content_type, category=category)
+        .values_list("row_count", flat=True)
+        .first()
+    )
+    return max(int(rows or 0), 0)
+
+
+def get_pages(content_type, category=ALL_ROWS, per_page=PER_PAGE):
+    return page_count(get_count(content_type, category), per_page)
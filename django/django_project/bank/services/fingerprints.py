@@ -0,0 +1,151 @@
+"""
+Normalized content fingerprints for the MCQ tables.
+
+``new_id`` is ``question + '===' + date`` - up to 300 characters in a
+B-tree index - and only catches the same question text on the same day.
+``fingerprint`` is a signed 64-bit hash (one ``bigint`` per row, an 8-byte
+index key) of the normalized question plus the normalized options in sorted
+order, so the same question matches regardless of day, letter case,
+whitespace, punctuation or option order.
+
+Every MCQ model's ``save()`` fills it through ``for_instance()``; bulk
+writers call ``for_instance()`` themselves.  ``exists_many()`` answers "which
+of these fingerprints are already stored" for a whole generated batch with
+one query, and ``backfill()`` (``manage.py backfill_fingerprints``) fills the
+rows that predate the column.
+"""
+import hashlib
+import re
+import unicodedata
+
+from django.db import transaction
+
+from bank.models import (
+    biology,
+    chemistry,
+    currentaffairs_mcq,
+    economics,
+    geography,
+    history,
+    math,
+    physics,
+    polity,
+    reasoning,
+)
+
+
+MCQ_MODELS = {
+    "currentaffairs_mcq": currentaffairs_mcq,
+    "polity": polity,
+    "history": history,
+    "geography": geography,
+    "economics": economics,
+    "physics": physics,
+    "biology": biology,
+    "chemistry": chemistry,
+    "math": math,
+    "reasoning": reasoning,
+}
+
+# The GK tables call their options option_1..option_5, math / reasoning a..e.
+OPTION_FIELDS = (
+    ("option_1", "option_2", "option_3", "option_4", "option_5"),
+    ("a", "b", "c", "d", "e"),
+)
+
+LOOKUP_BATCH = 5000
+
+_TAG = re.compile(r"<[^>]+>")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """Case-, whitespace- and punctuation-insensitive form of ``text``."""
+    text = unicodedata.normalize("NFKC", str(text or ""))
+    text = _TAG.sub(" ", text).casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def compute(question, options=()):
+    """Fingerprint of a question and its options (order-insensitive)."""
+    parts = sorted(p for p in (normalize(o) for o in options) if p)
+    payload = "\x1f".join([normalize(question)] + parts).encode("utf-8")
+    digest = hashlib.blake2b(payload, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def option_fields(model):
+    names = {f.name for f in model._meta.concrete_fields}
+    for fields in OPTION_FIELDS:
+        if fields[0] in names:
+            return fields
+    return ()
+
+
+def for_instance(obj):
+    return compute(obj.question, [getattr(obj, f) for f in option_fields(type(obj))])
+
+
+def for_record(model, record):
+    """Fingerprint of a not-yet-saved row given as a dict of model field values."""
+    return compute(record.get("question"), [record.get(f) for f in option_fields(model)])
+
+
+def exists_many(model, fingerprints):
+    """The subset of ``fingerprints`` already stored in ``model``'s table.
+
+    One query for up to ``LOOKUP_BATCH`` fingerprints; larger sets are split
+    to stay under the database's bound-parameter limit.
+    """
+    wanted = list({fp for fp in fingerprints if fp is not None})
+    found = set()
+    for start in range(0, len(wanted), LOOKUP_BATCH):
+        found.update(
+            model.objects.filter(fingerprint__in=wanted[start:start + LOOKUP_BATCH])
+            .order_by()
+            .values_list("fingerprint", flat=True)
+        )
+    return found
+
+
+def backfill(model, batch_size=1000, rebuild=False):
+    """Fill ``fingerprint`` on rows that lack it (all rows with ``rebuild``).
+
+    Walks the table by primary key and writes each batch with one
+    ``bulk_update``, so it is safe to interrupt and re-run.  Returns the
+    number of rows updated.
+    """
+    fields = ["id", "question"] + list(option_fields(model))
+    queryset = model.objects.order_by("id").only(*fields)
+    if not rebuild:
+        queryset = queryset.filter(fingerprint__isnull=True)
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return updated
+        for obj in batch:
+            obj.fingerprint = for_instance(obj)
+        with transaction.atomic():
+            model.objects.bulk_update(batch, ["fingerprint"])
+        updated += len(batch)
+        last_id = batch[-1].id
+
+
+def filter_new(model, items, fingerprint_of):
+    """Drop items already stored in ``model`` or repeated earlier in ``items``.
+
+    ``fingerprint_of(item)`` maps an item (e.g. an LLM question dict) to its
+    fingerprint.  Returns ``(new_items, skipped)`` after one ``exists_many()``
+    lookup for the whole batch.
+    """
+    keyed = [(fingerprint_of(item), item) for item in items]
+    seen = exists_many(model, [fp for fp, _item in keyed])
+    fresh = []
+    for fp, item in keyed:
+        if fp in seen:
+            continue
+        seen.add(fp)
+        fresh.append(item)
+    return fresh, len(keyed) - len(fresh)
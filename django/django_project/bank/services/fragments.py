@@ -0,0 +1,160 @@
+"""
+Cached shared page fragments: the home-page job sidebar, the ``home``
+singleton and The Hindu / Economic Times word panels.
+
+Each group has a version token in the cache.  The post_save / post_delete
+receivers in ``bank.signals`` replace it with a new random token whenever a
+``job``, ``home`` or word row changes, which orphans every entry built from
+the old version - nothing has to know which keys exist.  Tokens rather than
+a counter: the file cache culls entries when it is full and its ``incr`` is
+a read-then-write, so a culled counter would restart at a value whose old
+entries may still be live, and two concurrent bumps could collapse into
+one.  A culled or replaced token only ever moves to a value never used
+before.
+
+Two layers are cached:
+
+* the data the views branch on (``home_days()``, ``word_panels()``), so
+  ``index()`` no longer queries ``home`` four times and the word tables on
+  every request;
+* the rendered HTML.  ``bank.context_processors.fragment_versions`` exposes
+  the versions to every template, and the sidebar / word-panel markup is
+  wrapped in ``{% cache FRAGMENT_TTL <name> fragment_versions.<group> %}``.
+  On a hit the lazy ``job_sidebar()`` queryset is never evaluated, so the
+  sidebar costs no queries at all.
+"""
+import uuid
+
+from django.core.cache import cache
+
+from bank.models import (
+    home,
+    job,
+    the_economy_word_Header1,
+    the_economy_word_Header2,
+    the_economy_word_list1,
+    the_economy_word_list2,
+    the_hindu_word_Header1,
+    the_hindu_word_Header2,
+    the_hindu_word_list1,
+    the_hindu_word_list2,
+)
+
+
+FRAGMENT_TTL = 60 * 60 * 6
+
+JOBS = "jobs"
+HOME = "home"
+WORDS = "words"
+GROUPS = (JOBS, HOME, WORDS)
+
+# Which group every watched model invalidates.
+MODEL_GROUPS = {
+    job: JOBS,
+    home: HOME,
+    the_hindu_word_list1: WORDS,
+    the_hindu_word_list2: WORDS,
+    the_hindu_word_Header1: WORDS,
+    the_hindu_word_Header2: WORDS,
+    the_economy_word_list1: WORDS,
+    the_economy_word_list2: WORDS,
+    the_economy_word_Header1: WORDS,
+    the_economy_word_Header2: WORDS,
+}
+
+SIDEBAR_FIELDS = (
+    "extra_day", "first_day", "last_day", "heading", "eligibility", "age",
+    "amount", "day", "new_id", "des", "ca_img",
+)
+WORD_FIELDS = ("word", "meaning", "synonym", "example", "word_img")
+HOME_DAYS = ("word1_day", "word2_day", "word_e1_day", "word_e2_day")
+
+# (context name, word model, header model, header field, home day field)
+WORD_PANELS = (
+    ("1", the_hindu_word_list1, the_hindu_word_Header1, "Heading_for_list1", "word1_day"),
+    ("2", the_hindu_word_list2, the_hindu_word_Header2, "Heading_for_list2", "word2_day"),
+    ("_e1", the_economy_word_list1, the_economy_word_Header1, "Heading_for_list1", "word_e1_day"),
+    ("_e2", the_economy_word_list2, the_economy_word_Header2, "Heading_for_list2", "word_e2_day"),
+)
+
+
+def _version_key(group):
+    return "bank:fragments:version:%s" % group
+
+
+def _new_version():
+    return uuid.uuid4().hex[:16]
+
+
+def versions():
+    """{group: version token} for every group, in one cache round trip.
+
+    A missing token (never set, or culled) is replaced by a fresh one.
+    """
+    found = cache.get_many([_version_key(g) for g in GROUPS])
+    result = {}
+    for group in GROUPS:
+        version = found.get(_version_key(group))
+        if version is None:
+            version = _new_version()
+            if not cache.add(_version_key(group), version, None):
+                # Another request set it first
+                version = cache.get(_version_key(group), version)
+        result[group] = version
+    return result
+
+
+def bump(group):
+    """Invalidate every fragment and data entry of ``group``."""
+    cache.set(_version_key(group), _new_version(), None)
+
+
+def invalidate_for(model):
+    group = MODEL_GROUPS.get(model)
+    if group is not None:
+        bump(group)
+
+
+def _cached(group, name, build):
+    key = "bank:fragments:%s:%s:%s" % (group, versions()[group], name)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, FRAGMENT_TTL)
+    return value
+
+
+def job_sidebar():
+    """Lazy queryset for the job sidebar; only runs when the fragment misses."""
+    return job.objects.values(*SIDEBAR_FIELDS).filter(home=True).order_by("-day", "-creation_time")
+
+
+def home_days():
+    """The four word-of-the-day dates from the latest ``home`` row."""
+    def build():
+        row = home.objects.values(*HOME_DAYS).first()
+        return row or dict.fromkeys(HOME_DAYS)
+    return _cached(HOME, "days", build)
+
+
+def word_panels(days=None):
+    """Word lists and headers for the home page, keyed like ``index()`` used to.
+
+    ``days`` defaults to ``home_days()``.  A list with no rows comes back as
+    None, which is what ``home/new.html`` tests for.
+    """
+    days = days or home_days()
+    day_values = [days.get(field) for _n, _w, _h, _f, field in WORD_PANELS]
+
+    def build():
+        panels = {}
+        for name, word_model, header_model, heading, field in WORD_PANELS:
+            day = days.get(field)
+            words = list(word_model.objects.values(*WORD_FIELDS).filter(day=day))
+            panels["word" + name] = words or None
+            panels["header" + name] = (
+                list(header_model.objects.values(heading, "link").filter(day=day)) if words else None
+            )
+        return panels
+
+    return _cached(WORDS, "panels:%s" % ":".join(str(d) for d in day_values), build)
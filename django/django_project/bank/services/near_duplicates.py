@@ -0,0 +1,418 @@
+"""
+Near-duplicate detection for MCQ questions with MinHash and LSH.
+
+Exact fingerprints (``bank.services.fingerprints``) miss the reworded copies
+LLMs produce on re-runs.  Here each question's normalized text is split into
+words and word pairs and summarised by a ``NUM_PERM``-value MinHash
+signature; the fraction of equal values between two signatures estimates the
+Jaccard similarity of their shingle sets.
+
+Signatures are persisted in ``question_signature`` (256 bytes per question)
+and loaded into ``NearDuplicateIndex``, a locality-sensitive hash index of
+``BANDS`` bands x ``ROWS`` values.  Two questions become candidates when a
+whole band matches - with 16 x 4 a pair at 0.8 similarity collides with
+probability ~0.9998, one at 0.3 with ~0.12 - and candidates are confirmed
+against ``NEAR_DUPLICATE_THRESHOLD``.  The index keeps the packed signatures
+in one bytearray and every band as a sorted ``array('q')`` of bucket hashes,
+so millions of questions fit in a few hundred MB and a lookup is 16 binary
+searches plus a handful of comparisons - no external service involved.
+
+MCQ saves queue their row; after commit the signatures are stored and added
+to the loaded index.  Other processes pick the new rows up every
+``REFRESH_INTERVAL`` seconds, deletions through ``question_tombstone`` rows
+read the same way (``since=`` the last refresh).  Only a process that has
+not refreshed for ``TOMBSTONE_TTL`` reloads everything.  Deleted slots stay
+in the packed arrays until they make up ``DEAD_SLOT_RATIO`` of them, then
+``compact()`` packs the live rows again.
+``filter_new()`` is what the genai save paths call before saving a batch.
+"""
+import bisect
+import hashlib
+import logging
+import struct
+import threading
+import time
+from array import array
+
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bank.models import question_signature, question_tombstone
+from bank.services.fingerprints import MCQ_MODELS, normalize
+
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 2
+
+REFRESH_INTERVAL = 60
+COMPACT_AFTER = 20000
+LOAD_BATCH = 5000
+TOMBSTONE_TTL = datetime.timedelta(days=1)
+DEAD_SLOT_RATIO = 0.25
+DEAD_SLOT_MIN = 1000
+
+_SIGNATURE = struct.Struct("<%dI" % NUM_PERM)
+# Each shingle is hashed into NUM_PERM independent 32-bit values with one
+# SHAKE-256 call (a fixed, keyless function, so stored signatures stay
+# comparable across processes and deploys).
+_HASH_PREFIX = b"bank.minhash:"
+
+
+def threshold():
+    return getattr(settings, "NEAR_DUPLICATE_THRESHOLD", 0.8)
+
+
+def shingles(text):
+    """Words and word pairs of the normalized text."""
+    words = normalize(text).split()
+    pairs = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return set(words) | set(pairs)
+
+
+def _shingle_values(shingle):
+    digest = hashlib.shake_256(_HASH_PREFIX + shingle.encode("utf-8")).digest(_SIGNATURE.size)
+    return _SIGNATURE.unpack(digest)
+
+
+def signature(text):
+    """MinHash signature (tuple of NUM_PERM 32-bit ints), or None for empty text."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    # Element-wise minimum over every shingle's hash values, in C.
+    return tuple(map(min, *[_shingle_values(g) for g in grams])) if len(grams) > 1 else _shingle_values(grams.pop())
+
+
+def similarity(left, right):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(left, right) if x == y) / NUM_PERM
+
+
+def band_hashes(sig):
+    return [hash(sig[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS)]
+
+
+class NearDuplicateIndex(object):
+    """In-memory LSH index over packed MinHash signatures."""
+
+    def __init__(self):
+        self.signatures = bytearray()
+        self.table_codes = array("B")
+        self.row_ids = array("q")
+        self.alive = bytearray()
+        self.positions = {}
+        self.dead = 0
+        self.table_names = []
+        self._codes = {}
+        # Sorted bucket hashes per band, the parallel positions, and an
+        # unsorted overlay of recent additions merged in by compact().
+        self.band_keys = [array("q") for _ in range(BANDS)]
+        self.band_positions = [array("q") for _ in range(BANDS)]
+        self.overlay = [{} for _ in range(BANDS)]
+        self.overlay_size = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _code(self, table):
+        if table not in self._codes:
+            self._codes[table] = len(self.table_names)
+            self.table_names.append(table)
+        return self._codes[table]
+
+    def add(self, table, row_id, sig):
+        self.discard(table, row_id)
+        pos = len(self.alive)
+        self.signatures += _SIGNATURE.pack(*sig)
+        self.table_codes.append(self._code(table))
+        self.row_ids.append(row_id)
+        self.alive.append(1)
+        self.positions[(table, row_id)] = pos
+        for band, h in enumerate(band_hashes(sig)):
+            self.overlay[band].setdefault(h, []).append(pos)
+        self.overlay_size += 1
+        if self.overlay_size >= COMPACT_AFTER:
+            self.compact()
+
+    def discard(self, table, row_id):
+        pos = self.positions.pop((table, row_id), None)
+        if pos is not None:
+            self.alive[pos] = 0
+            self.dead += 1
+
+    def compact(self):
+        """Merge the overlay into the sorted band arrays, dropping dead rows.
+
+        Once dead slots make up DEAD_SLOT_RATIO of the packed arrays they are
+        packed again too.
+        """
+        if self.dead >= max(DEAD_SLOT_MIN, DEAD_SLOT_RATIO * len(self.alive)):
+            self._repack()
+        for band in range(BANDS):
+            pairs = [
+                (h, p) for h, p in zip(self.band_keys[band], self.band_positions[band]) if self.alive[p]
+            ]
+            pairs.extend(
+                (h, p) for h, members in self.overlay[band].items() for p in members if self.alive[p]
+            )
+            pairs.sort()
+            self.band_keys[band] = array("q", (h for h, _p in pairs))
+            self.band_positions[band] = array("q", (p for _h, p in pairs))
+            self.overlay[band] = {}
+        self.overlay_size = 0
+
+    def _repack(self):
+        """Copy the live slots into fresh packed arrays and renumber every position."""
+        moved = {}
+        signatures, table_codes, row_ids = bytearray(), array("B"), array("q")
+        for old, live in enumerate(self.alive):
+            if live:
+                moved[old] = len(row_ids)
+                signatures += self.signatures[old * _SIGNATURE.size:(old + 1) * _SIGNATURE.size]
+                table_codes.append(self.table_codes[old])
+                row_ids.append(self.row_ids[old])
+        self.signatures, self.table_codes, self.row_ids = signatures, table_codes, row_ids
+        self.alive = bytearray(b"\x01" * len(row_ids))
+        self.positions = {key: moved[pos] for key, pos in self.positions.items()}
+        for band in range(BANDS):
+            pairs = [
+                (h, moved[p]) for h, p in zip(self.band_keys[band], self.band_positions[band]) if p in moved
+            ]
+            self.band_keys[band] = array("q", (h for h, _p in pairs))
+            self.band_positions[band] = array("q", (p for _h, p in pairs))
+            self.overlay[band] = {
+                h: [moved[p] for p in members if p in moved] for h, members in self.overlay[band].items()
+            }
+        self.dead = 0
+
+    def signature_at(self, pos):
+        return _SIGNATURE.unpack_from(self.signatures, pos * _SIGNATURE.size)
+
+    def candidates(self, sig):
+        found = set()
+        for band, h in enumerate(band_hashes(sig)):
+            keys = self.band_keys[band]
+            start = bisect.bisect_left(keys, h)
+            end = start
+            while end < len(keys) and keys[end] == h:
+                end += 1
+            found.update(self.band_positions[band][start:end])
+            found.update(self.overlay[band].get(h, ()))
+        return found
+
+    def query(self, sig, min_similarity=None, limit=None):
+        """[(table, row_id, similarity)] at or above the threshold, best first."""
+        min_similarity = threshold() if min_similarity is None else min_similarity
+        matches = []
+        for pos in self.candidates(sig):
+            if not self.alive[pos]:
+                continue
+            score = similarity(sig, self.signature_at(pos))
+            if score >= min_similarity:
+                matches.append((self.table_names[self.table_codes[pos]], self.row_ids[pos], score))
+        matches.sort(key=lambda m: -m[2])
+        return matches[:limit] if limit else matches
+
+    def clusters(self, min_similarity=None, limit=100):
+        """Groups of near-duplicate questions, largest first: [[(table, row_id), ...]]."""
+        min_similarity = threshold() if min_similarity is None else min_similarity
+        self.compact()
+        parent = {}
+
+        def find(p):
+            root = p
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while p != root:
+                parent[p], p = root, parent[p]
+            return root
+
+        for band in range(BANDS):
+            keys, positions = self.band_keys[band], self.band_positions[band]
+            start = 0
+            while start < len(keys):
+                end = start + 1
+                while end < len(keys) and keys[end] == keys[start]:
+                    end += 1
+                if end - start > 1:
+                    # Compare every member with the bucket's first member.
+                    first = positions[start]
+                    first_sig = self.signature_at(first)
+                    for i in range(start + 1, end):
+                        other = positions[i]
+                        if find(other) != find(first) and similarity(first_sig, self.signature_at(other)) >= min_similarity:
+                            root = find(first)
+                            parent.setdefault(root, root)
+                            parent[find(other)] = root
+                start = end
+
+        groups = {}
+        for pos in list(parent):
+            groups.setdefault(find(pos), set()).add(pos)
+        ordered = sorted(groups.values(), key=len, reverse=True)[:limit]
+        return [
+            sorted((self.table_names[self.table_codes[p]], self.row_ids[p]) for p in group)
+            for group in ordered
+        ]
+
+
+_lock = threading.RLock()
+_index = None
+_loaded_at = None
+_checked_at = 0.0
+_pending = threading.local()
+
+
+def _load(since=None):
+    """Add stored signatures (changed ``since``) to the index; returns the count."""
+    rows = question_signature.objects.order_by().values_list("table", "row_id", "signature", "updated_at")
+    deleted = {}
+    if since is not None:
+        rows = rows.filter(updated_at__gte=since)
+        # Deletions since the last refresh, applied before the additions
+        tombstones = question_tombstone.objects.filter(deleted_at__gte=since).values_list("table", "row_id", "deleted_at")
+        for table, row_id, deleted_at in tombstones.iterator(chunk_size=LOAD_BATCH):
+            _index.discard(table, row_id)
+            deleted[(table, row_id)] = max(deleted_at, deleted.get((table, row_id), deleted_at))
+    loaded = 0
+    for table, row_id, packed, updated_at in rows.iterator(chunk_size=LOAD_BATCH):
+        if deleted.get((table, row_id), updated_at) > updated_at:
+            continue
+        _index.add(table, row_id, _SIGNATURE.unpack(bytes(packed)))
+        loaded += 1
+    return loaded
+
+
+def get_index():
+    """The process-wide index, loaded on first use and refreshed periodically."""
+    global _index, _loaded_at, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _index is not None and now - _checked_at < REFRESH_INTERVAL:
+            return _index
+        _checked_at = now
+        started = timezone.now()
+        if _index is None or started - _loaded_at > TOMBSTONE_TTL:
+            # Tombstones this old are pruned, so deletions could be missed
+            _index = NearDuplicateIndex()
+            loaded = _load()
+            logger.info("Loaded %d question signatures into the near-duplicate index", loaded)
+        else:
+            _load(since=_loaded_at)
+        _index.compact()
+        _loaded_at = started
+        return _index
+
+
+def check(text, min_similarity=None, limit=5):
+    """Stored questions similar to ``text``: [(table, row_id, similarity)]."""
+    sig = signature(text)
+    if sig is None:
+        return []
+    return get_index().query(sig, min_similarity, limit)
+
+
+def filter_new(items, text_of, min_similarity=None):
+    """Drop items whose question is a near duplicate of a stored question or
+    of an earlier item in the batch.  Returns ``(new_items, skipped)``."""
+    index = get_index()
+    batch = NearDuplicateIndex()
+    fresh = []
+    for n, item in enumerate(items):
+        sig = signature(text_of(item))
+        if sig is not None:
+            if index.query(sig, min_similarity, limit=1) or batch.query(sig, min_similarity, limit=1):
+                continue
+            batch.add("batch", n, sig)
+        fresh.append(item)
+    return fresh, len(items) - len(fresh)
+
+
+def table_for(model):
+    for table, mcq_model in MCQ_MODELS.items():
+        if mcq_model is model:
+            return table
+    return None
+
+
+def store(model, objs):
+    """Compute, persist and index the signatures of saved ``objs``."""
+    table = table_for(model)
+    rows = []
+    for obj in objs:
+        sig = signature(obj.question)
+        if sig is not None:
+            rows.append((obj.id, sig))
+    ids = [obj.id for obj in objs]
+    with transaction.atomic():
+        question_signature.objects.filter(table=table, row_id__in=ids).delete()
+        question_signature.objects.bulk_create(
+            [question_signature(table=table, row_id=row_id, signature=_SIGNATURE.pack(*sig)) for row_id, sig in rows],
+            batch_size=LOAD_BATCH,
+        )
+    with _lock:
+        if _index is not None:
+            for row_id in ids:
+                _index.discard(table, row_id)
+            for row_id, sig in rows:
+                _index.add(table, row_id, sig)
+    return len(rows)
+
+
+def remove(model, row_ids):
+    """Forget the signatures of deleted rows here and, with tombstones, in every other process."""
+    table = table_for(model)
+    row_ids = list(row_ids)
+    with transaction.atomic():
+        question_signature.objects.filter(table=table, row_id__in=row_ids).delete()
+        question_tombstone.objects.bulk_create(
+            [question_tombstone(table=table, row_id=row_id) for row_id in row_ids], batch_size=LOAD_BATCH
+        )
+        question_tombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_TTL).delete()
+    with _lock:
+        if _index is not None:
+            for row_id in row_ids:
+                _index.discard(table, row_id)
+
+
+def mark_dirty(model, row_id):
+    """Re-index ``model`` row ``row_id`` (saved or deleted) once after commit."""
+    if not hasattr(_pending, "rows"):
+        _pending.rows = {}
+    _pending.rows.setdefault(model, set()).add(row_id)
+    if connection.in_atomic_block and any(func is flush for _sids, func in connection.run_on_commit):
+        return
+    transaction.on_commit(flush)
+
+
+def flush():
+    rows, _pending.rows = getattr(_pending, "rows", {}), {}
+    for model, row_ids in rows.items():
+        objs = list(model.objects.filter(id__in=row_ids).only("id", "question"))
+        store(model, objs)
+        gone = row_ids - {obj.id for obj in objs}
+        if gone:
+            remove(model, gone)
+
+
+def backfill(model, batch_size=1000, rebuild=False):
+    """Store signatures for rows of ``model`` that have none (all with ``rebuild``)."""
+    table = table_for(model)
+    done = set()
+    if not rebuild:
+        done = set(question_signature.objects.filter(table=table).values_list("row_id", flat=True))
+    stored = 0
+    last_id = 0
+    while True:
+        batch = list(model.objects.filter(id__gt=last_id).order_by("id").only("id", "question")[:batch_size])
+        if not batch:
+            return stored
+        stored += store(model, [obj for obj in batch if obj.id not in done])
+        last_id = batch[-1].id
@@ -0,0 +1,423 @@
+"""
+Shared pagination for the paginated bank views.
+
+Two parts:
+
+``page_window()`` computes the numbered-page strip (``[1, '...', 8, 9, 10,
+11, 12, '...', 40]``) plus next/previous, which every view used to copy as a
+~150-line if/else block.
+
+``seek_page()`` fetches one page with keyset (seek) pagination on the
+ordering columns - normally (day, creation_time, id) - instead of
+``OFFSET`` slicing, so page 400 costs the same as page 1:
+
+- ``?cursor=`` links (the signed key of a page's first row, emitted by the
+  pager as ``cursor`` / ``next_cursor`` / ``previous_cursor``) seek straight
+  to the page.
+- Numbered page URLs start from the nearest stored anchor: ``page_anchor``
+  keeps the ordering key and position of every ``ANCHOR_SPACING``-th row of
+  each list (model + filter + ordering, ``page_list``), so a page is one
+  indexed anchor lookup, a seek and an ``OFFSET`` of less than
+  ``2 * ANCHOR_SPACING`` key-only rows.
+
+Anchors are rebuilt lazily with one key-only scan.  Writes (``bank.signals``,
+or ``invalidate()`` for writes that skip signals) only bump the version of
+the model's lists after commit; a read that finds its list stale rebuilds it,
+at most once per ``REBUILD_INTERVAL``, and uses plain ``OFFSET`` until then.
+The number of lists per model is capped and unread lists are pruned, so
+crawling every filter combination cannot make writes or storage grow.
+"""
+import datetime
+import functools
+import hashlib
+import json
+import logging
+
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from bank.models import (
+    biology,
+    chemistry,
+    close,
+    currentaffairs_descriptive,
+    currentaffairs_mcq,
+    economics,
+    error,
+    geography,
+    history,
+    job,
+    math,
+    page_anchor,
+    page_list,
+    physics,
+    polity,
+    reasoning,
+)
+from bank.services import recompute
+
+
+logger = logging.getLogger(__name__)
+
+DOT = '...'
+
+ANCHOR_SPACING = 100
+# A stale list is rebuilt at most this often; in between pages use OFFSET
+REBUILD_INTERVAL = datetime.timedelta(minutes=5)
+MAX_LISTS_PER_MODEL = 200
+LIST_TTL = datetime.timedelta(days=7)
+USED_AT_RESOLUTION = datetime.timedelta(hours=1)
+_CURSOR_SALT = 'bank.pagination.cursor'
+
+# Models listed with seek_page() by bank.views; bank.signals marks their lists stale on write
+PAGINATED_MODELS = (
+    currentaffairs_descriptive, currentaffairs_mcq, job, math, reasoning, close, error,
+    history, polity, economics, geography, physics, chemistry, biology,
+)
+
+
+def page_window(current, total):
+    """Numbered-page strip for ``current`` out of ``total`` pages.
+
+    Returns ``{'page': [...], 'next': n, 'previous': n, 'diff_from_top': n}``
+    with ``next`` / ``previous`` set to 0 when there is no such page, the same
+    values the templates have always received.
+    """
+    current = int(current)
+    t = int(total)
+    left = current - 2
+    right = current + 2
+    diff_from_top = t - right
+    diff_from_bottom = left - 1
+
+    if (t - current) <= 4 or current <= 5:
+        if (t - current) <= 4:
+            tail = [t - 4, t - 3, t - 2, t - 1, t]
+            if t <= 5:
+                page = list(range(1, t + 1))
+            elif diff_from_bottom < 10:
+                page = [1, DOT] + tail
+            else:
+                mile = diff_from_bottom // 10
+                if mile >= 2:
+                    mile1 = mile * 10
+                    page = [1, DOT, mile1 - 10, mile1, DOT] + tail
+                else:
+                    page = [1, DOT, (t // 10) * 10, DOT] + tail
+        else:
+            head = [1, 2, 3, 4, 5]
+            if diff_from_top < 10:
+                es_mile = current // 10 + 10
+                if diff_from_top >= 4 and es_mile < t:
+                    page = head + [DOT, es_mile, DOT, t]
+                else:
+                    page = head + [DOT, t]
+            else:
+                mile = diff_from_top // 10
+                if mile >= 2:
+                    mile1 = (current // 10) * 10 + 10
+                    page = head + [DOT, mile1, mile1 + 10, DOT, t]
+                else:
+                    page = head + [DOT, current // 10 + 10, DOT, t]
+    else:
+        middle = [current - 2, current - 1, current, current + 1, current + 2]
+        if diff_from_top < 10:
+            if diff_from_bottom > 10:
+                mile = diff_from_bottom // 10
+                if mile >= 2:
+                    mile1 = mile * 10
+                    page = [1, DOT, mile1 - 10, mile1, DOT] + middle + [DOT, t]
+                else:
+                    page = [1, DOT, (t // 10) * 10, DOT] + middle + [t]
+            else:
+                page = [1, DOT] + middle + [DOT, t]
+        elif diff_from_bottom < 10:
+            if diff_from_top > 10:
+                mile = diff_from_top // 10
+                if mile >= 2:
+                    mile1 = (right // 10) * 10 + 10
+                    mile2 = mile1 + 10
+                    if right == mile1:
+                        mile1 = mile1 + 5
+                    page = [1, DOT] + middle + [DOT, mile1, mile2, DOT, t]
+                else:
+                    page = [1, DOT] + middle + [DOT, current // 10 + 10, DOT, t]
+            else:
+                page = [1, DOT] + middle + [DOT, t]
+        else:
+            mile_bottom = diff_from_bottom // 10
+            mile1_bottom = mile_bottom * 10
+            if mile_bottom >= 2:
+                bottom = [mile1_bottom - 10, mile1_bottom]
+            else:
+                bottom = [mile1_bottom]
+            mile_top = diff_from_top // 10
+            mile1_top = (right // 10) * 10 + 10
+            if mile_top >= 2:
+                top = [mile1_top, mile1_top + 10]
+            else:
+                top = [mile1_top]
+            page = [1, DOT] + bottom + [DOT] + middle + [DOT] + top + [DOT, t]
+
+    return {
+        'page': page,
+        'next': current + 1 if t > current else 0,
+        'previous': current - 1 if current > 1 else 0,
+        'diff_from_top': diff_from_top,
+    }
+
+
+class SeekPage(object):
+    """One page of rows plus the cursors needed to link to its neighbours."""
+
+    def __init__(self, rows, number, cursor=None, next_cursor=None, previous_cursor=None):
+        self.rows = rows
+        self.number = number
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def links(self):
+        """Cursor context for the pager links (``?cursor=``)."""
+        return {
+            'cursor': self.cursor or '',
+            'next_cursor': self.next_cursor or '',
+            'previous_cursor': self.previous_cursor or '',
+        }
+
+
+def _ordering_terms(model, ordering):
+    """[(field_name, descending, nullable)] with a unique pk tiebreaker."""
+    terms = []
+    for item in ordering:
+        name = item.lstrip('-')
+        terms.append((name, item.startswith('-'), model._meta.get_field(name).null))
+    pk_name = model._meta.pk.name
+    if not any(name in (pk_name, 'pk') for name, _desc, _null in terms):
+        terms.append((pk_name, terms[-1][1] if terms else False, False))
+    return terms
+
+
+def _order_by(terms):
+    # NULLs are treated as the largest value on every backend so the seek
+    # predicate below matches the ORDER BY exactly.
+    expressions = []
+    for name, descending, nullable in terms:
+        if descending:
+            expressions.append(F(name).desc(nulls_first=True) if nullable else F(name).desc())
+        else:
+            expressions.append(F(name).asc(nulls_last=True) if nullable else F(name).asc())
+    return expressions
+
+
+def _after(name, descending, nullable, value):
+    """Rows strictly after ``value`` in this column's sort order."""
+    if value is None:
+        return Q(**{name + '__isnull': False}) if descending else None
+    condition = Q(**{name + ('__lt' if descending else '__gt'): value})
+    if nullable and not descending:
+        condition |= Q(**{name + '__isnull': True})
+    return condition
+
+
+def _equal(name, value):
+    if value is None:
+        return Q(**{name + '__isnull': True})
+    return Q(**{name: value})
+
+
+def seek_filter(terms, key):
+    """Rows at or after ``key`` (inclusive) for the ordering ``terms``."""
+    condition = Q()
+    prefix = Q()
+    for (name, descending, nullable), value in zip(terms, key):
+        after = _after(name, descending, nullable, value)
+        if after is not None:
+            condition = (condition | (prefix & after)) if condition else (prefix & after)
+        prefix &= _equal(name, value)
+    return (condition | prefix) if condition else prefix
+
+
+def _plain(key):
+    """Key tuple as JSON-ready values."""
+    values = []
+    for value in key:
+        if isinstance(value, (datetime.date, datetime.time)):
+            value = value.isoformat()
+        values.append(value)
+    return values
+
+
+def _typed(values, terms, model):
+    key = []
+    for (name, _descending, _nullable), value in zip(terms, values):
+        if value is not None:
+            value = model._meta.get_field(name).to_python(value)
+        key.append(value)
+    return tuple(key)
+
+
+def encode_cursor(key):
+    return signing.dumps(_plain(key), salt=_CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor, terms, model):
+    """Key tuple from a cursor string, or None if it is missing/tampered."""
+    if not cursor:
+        return None
+    try:
+        values = signing.loads(cursor, salt=_CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(values, list) or len(values) != len(terms):
+        return None
+    return _typed(values, terms, model)
+
+
+# ---------------------------------------------------------------------------
+# Stored page anchors
+# ---------------------------------------------------------------------------
+
+def _ordering_string(terms):
+    return ','.join(('-' if descending else '') + name for name, descending, _nullable in terms)
+
+
+def _key_rows(queryset, terms):
+    key_fields = [name for name, _descending, _nullable in terms]
+    return queryset.order_by(*_order_by(terms)).values_list(*key_fields)
+
+
+def _build(list_row, terms, queryset, version):
+    """Anchors of a whole list from one key-only scan, current as of ``version``."""
+    anchors, count = [], 0
+    for rank, key in enumerate(_key_rows(queryset, terms).iterator(chunk_size=2000)):
+        if rank and rank % ANCHOR_SPACING == 0:
+            anchors.append(page_anchor(page_list=list_row, rank=rank, key=json.dumps(_plain(key))))
+        count = rank + 1
+    with transaction.atomic():
+        page_anchor.objects.filter(page_list=list_row).delete()
+        page_anchor.objects.bulk_create(anchors, batch_size=500)
+        page_list.objects.filter(pk=list_row.pk).update(row_count=count, built_version=version)
+
+
+def _rebuild_if_due(list_row, terms, queryset):
+    """Rebuild a stale list unless it was rebuilt within REBUILD_INTERVAL; True if it is current now.
+
+    The claim is a conditional UPDATE on updated_at, so of several requests
+    that find the list stale only one scans it; the others use OFFSET.
+    """
+    now = timezone.now()
+    if list_row.built_version >= 0 and list_row.updated_at > now - REBUILD_INTERVAL:
+        return False
+    claimed = page_list.objects.filter(
+        pk=list_row.pk, updated_at=list_row.updated_at,
+    ).update(updated_at=now)
+    if not claimed:
+        return False
+    _build(list_row, terms, queryset, list_row.version)
+    return True
+
+
+def page_list_for(queryset, terms):
+    """The stored page_list of ``queryset`` in ``terms`` order, or None when it cannot be used.
+
+    Lists are created on first use, at most MAX_LISTS_PER_MODEL per model;
+    lists not read for LIST_TTL are dropped to make room.  Only the hash of
+    the filter is stored - the anchors are always rebuilt from the queryset
+    of the request that reads them.
+    """
+    model = queryset.model
+    label = model._meta.label_lower
+    ordering = _ordering_string(terms)
+    query = queryset.order_by().values('pk').query
+    list_key = hashlib.md5(('%s|%s|%s' % (label, query, ordering)).encode('utf-8')).hexdigest()
+    now = timezone.now()
+    list_row = page_list.objects.filter(list_key=list_key).first()
+    if list_row is None:
+        page_list.objects.filter(model=label, used_at__lt=now - LIST_TTL).delete()
+        if page_list.objects.filter(model=label).count() >= MAX_LISTS_PER_MODEL:
+            return None
+        try:
+            with transaction.atomic():
+                list_row = page_list.objects.create(list_key=list_key, model=label, ordering=ordering, used_at=now)
+        except IntegrityError:
+            # Another request created it first
+            list_row = page_list.objects.get(list_key=list_key)
+    elif list_row.used_at < now - USED_AT_RESOLUTION:
+        page_list.objects.filter(pk=list_row.pk).update(used_at=now)
+    if list_row.built_version == list_row.version or _rebuild_if_due(list_row, terms, queryset):
+        return list_row
+    return None
+
+
+def _bump(label):
+    page_list.objects.filter(model=label).update(version=F('version') + 1)
+
+
+def invalidate(model):
+    """Mark the stored lists of ``model`` stale; the next read past REBUILD_INTERVAL rebuilds them.
+
+    One UPDATE per model after commit, or once per deferred_recompute() block.
+    """
+    label = model._meta.label_lower
+    recompute.defer(('pagination', label), functools.partial(_bump, label))
+
+
+def mark_stale(sender, raw=False, **kwargs):
+    """post_save / post_delete receiver for PAGINATED_MODELS."""
+    if not raw:
+        invalidate(sender)
+
+
+def seek_page(queryset, page_number=1, per_page=3, ordering=('-day', '-creation_time'), cursor=None):
+    """Fetch one page of ``queryset`` by seeking on the ``ordering`` key.
+
+    ``queryset`` may be a ``values()`` queryset; its own ordering is replaced.
+    A valid ``cursor`` wins over ``page_number``.
+    """
+    model = queryset.model
+    terms = _ordering_terms(model, ordering)
+    ordered = queryset.order_by(*_order_by(terms))
+    page_number = max(int(page_number or 1), 1)
+
+    start = decode_cursor(cursor, terms, model)
+    if start is not None:
+        page_number = None
+        keys = list(_key_rows(queryset, terms).filter(seek_filter(terms, start))[:per_page + 1])
+    else:
+        target = (page_number - 1) * per_page
+        keys_qs, skip = _key_rows(queryset, terms), target
+        list_row = page_list_for(queryset, terms) if target >= ANCHOR_SPACING else None
+        if list_row is not None:
+            anchor = page_anchor.objects.filter(page_list=list_row, rank__lte=target).order_by('-rank').first()
+            if anchor is not None:
+                keys_qs = keys_qs.filter(seek_filter(terms, _typed(json.loads(anchor.key), terms, model)))
+                skip = target - anchor.rank
+        keys = list(keys_qs[skip:skip + per_page + 1])
+        if not keys:
+            return SeekPage([], page_number)
+        start = keys[0]
+
+    rows = list(ordered.filter(seek_filter(terms, start))[:per_page]) if keys else []
+    next_key = keys[per_page] if len(keys) > per_page else None
+
+    # The previous page starts per_page rows before this one (reverse seek)
+    reverse = [(name, not descending, nullable) for name, descending, nullable in terms]
+    before = list(_key_rows(queryset, reverse).filter(seek_filter(reverse, start))[1:per_page + 1])
+    previous_key = before[-1] if before else None
+
+    return SeekPage(
+        rows,
+        page_number,
+        cursor=encode_cursor(start),
+        next_cursor=encode_cursor(next_key) if next_key is not None else None,
+        previous_cursor=encode_cursor(previous_key) if previous_key is not None else None,
+    )
@@ -0,0 +1,174 @@
+"""
+Commit-time coalescing of the derived current-affairs data.
+
+Every save or delete of a ``currentaffairs_mcq`` / ``currentaffairs_descriptive``
+row marks its (content type, year) pair dirty.  The pairs are collected for
+the whole transaction and each one is recomputed once from a
+``transaction.on_commit`` callback, so importing 500 MCQs refreshes the
+year's ``currentaffairs_*_info_20XX`` row once instead of 500 times.
+
+Bulk writers wrap their loop in ``deferred_recompute()``::
+
+    with deferred_recompute():
+        for record in records:
+            ...save()...
+
+or decorate the function with ``@deferred_recompute()``.
+
+Inside the block the per-row counter and calendar deltas from
+``bank.signals`` are skipped as well.  On exit every dirty pair is rebuilt
+with one GROUP BY (``counters.rebuild`` / ``calendar_index.rebuild``) after
+commit.  Other derived data (subject stats, stored page anchors) registers
+its own rebuild with ``defer()``, which runs once per key at the same point.
+Batches that touched more than ``BACKGROUND_THRESHOLD`` rows are handed to a
+background worker thread so the request that imported them does not wait for
+the rebuild.
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+from bank.services import calendar_index, counters
+
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_THRESHOLD = 500
+
+_local = threading.local()
+_worker_queue = queue.Queue()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def _state():
+    if not hasattr(_local, "depth"):
+        _local.depth = 0
+        _local.pending = {}
+        _local.rebuild = set()
+        _local.callbacks = {}
+        _local.rows = 0
+    return _local
+
+
+def is_deferred():
+    """True inside ``deferred_recompute()``: per-row deltas are skipped."""
+    return _state().depth > 0
+
+
+def mark_dirty(content_type, years, rebuild=False, rows=1):
+    """Queue ``(content_type, year)`` for recomputation after commit.
+
+    ``rows`` is how many row changes this call stands for; bulk writers that
+    bypass the signals pass their batch size.
+    """
+    state = _state()
+    for year in years:
+        if year is None:
+            continue
+        pair = (content_type, int(year))
+        state.pending[pair] = state.pending.get(pair, 0) + rows
+        if rebuild:
+            state.rebuild.add(pair)
+    state.rows += rows
+    if not state.depth:
+        _schedule_flush()
+
+
+def defer(key, callback, rows=1):
+    """Run ``callback()`` once per ``key`` when the dirty data is flushed.
+
+    Inside ``deferred_recompute()`` that is after the outermost block exits
+    (and the transaction commits); outside it, after commit.
+    """
+    state = _state()
+    state.callbacks.setdefault(key, callback)
+    state.rows += rows
+    if not state.depth:
+        _schedule_flush()
+
+
+def _schedule_flush():
+    # Registered once per transaction.  Checked against the connection's own
+    # callback list rather than a flag so a rolled-back savepoint, which
+    # discards its callbacks, cannot leave dirty pairs without a flush.
+    if connection.in_atomic_block and any(func is flush for _sids, func in connection.run_on_commit):
+        return
+    transaction.on_commit(flush)
+
+
+def flush():
+    """Recompute every dirty pair once; large batches go to the worker."""
+    state = _state()
+    if state.depth or not (state.pending or state.callbacks):
+        return
+    pending, rebuild, callbacks, rows = state.pending, state.rebuild, state.callbacks, state.rows
+    state.pending, state.rebuild, state.callbacks, state.rows = {}, set(), {}, 0
+    if rows > BACKGROUND_THRESHOLD:
+        _submit(pending, rebuild, callbacks)
+    else:
+        recompute(pending, rebuild, callbacks)
+
+
+def recompute(pending, rebuild=(), callbacks=None):
+    """Refresh derived data for ``pending`` ({(content_type, year): rows}) and run ``callbacks``."""
+    for key, callback in sorted((callbacks or {}).items(), key=lambda item: str(item[0])):
+        try:
+            callback()
+        except Exception:
+            logger.exception("Deferred rebuild %s failed", key)
+    if not pending:
+        return
+    rebuilt_counters = set()
+    for content_type, year in sorted(pending):
+        if (content_type, year) in rebuild:
+            calendar_index.rebuild(content_type, year)
+            if content_type not in rebuilt_counters:
+                counters.rebuild(content_type)
+                rebuilt_counters.add(content_type)
+        calendar_index.write_legacy_info(content_type, year)
+    logger.info(
+        "Recomputed %d current-affairs year(s) for %d row change(s)",
+        len(pending), sum(pending.values()),
+    )
+
+
+@contextmanager
+def deferred_recompute():
+    """Skip per-row recomputation inside the block and flush once at the end.
+
+    Nestable; only the outermost block flushes.  The flush still runs after
+    commit when the block is inside ``transaction.atomic()``.
+    """
+    state = _state()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if not state.depth and (state.pending or state.callbacks):
+            _schedule_flush()
+
+
+def _submit(pending, rebuild, callbacks=None):
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name="bank-recompute", daemon=True)
+            _worker.start()
+    _worker_queue.put((pending, rebuild, callbacks))
+
+
+def _work():
+    while True:
+        pending, rebuild, callbacks = _worker_queue.get()
+        try:
+            recompute(pending, rebuild, callbacks)
+        except Exception:
+            logger.exception("Background recompute failed for %s", sorted(pending))
+        finally:
+            connection.close()
+            _worker_queue.task_done()
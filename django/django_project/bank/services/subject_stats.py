@@ -0,0 +1,176 @@
+"""
+Chapter / difficulty / sub_chapter statistics for the subject MCQ tables.
+
+The legacy ``total_<subject>.save()`` methods issued one
+``filter(chapter=x).count()`` per chapter (40 for the GK subjects, ~20 for
+math and reasoning).  ``compute()`` instead groups the whole table once on
+every dimension the model has - ``values('chapter', 'difficulty',
+'sub_chapter').annotate(Count('id'))`` - and rolls the combinations up in
+Python, so a refresh is a single query per subject.
+
+The results live in ``subject_stat`` (one row per subject, dimension, value)
+which the subject(), math_all() and reasoning_all() views read directly.
+Changes to a subject table mark it dirty and it is recomputed once after
+commit, or once when a ``recompute.deferred_recompute()`` block (bulk
+imports, generated MCQ batches) flushes.
+"""
+import functools
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from bank.models import (
+    biology,
+    chemistry,
+    economics,
+    geography,
+    history,
+    math,
+    physics,
+    polity,
+    reasoning,
+    subject_stat,
+)
+from bank.services import recompute
+
+
+PER_PAGE = 5
+ALL = "all"
+
+SUBJECT_MODELS = {
+    "polity": polity,
+    "history": history,
+    "geography": geography,
+    "economics": economics,
+    "physics": physics,
+    "biology": biology,
+    "chemistry": chemistry,
+    "math": math,
+    "reasoning": reasoning,
+}
+
+# dimension -> model field; math and reasoning call difficulty "level".
+DIMENSION_FIELDS = {
+    "chapter": ("chapter",),
+    "difficulty": ("difficulty", "level"),
+    "sub_chapter": ("sub_chapter",),
+}
+
+
+def subject_for(model):
+    for subject, subject_model in SUBJECT_MODELS.items():
+        if subject_model is model:
+            return subject
+    return None
+
+
+def page_count(rows, per_page=PER_PAGE):
+    rows = int(rows or 0)
+    return (rows + per_page - 1) // per_page
+
+
+def dimensions(model):
+    """{dimension: field} for the dimensions ``model`` actually has."""
+    names = {f.name for f in model._meta.concrete_fields}
+    found = {}
+    for dimension, candidates in DIMENSION_FIELDS.items():
+        for field in candidates:
+            if field in names:
+                found[dimension] = field
+                break
+    return found
+
+
+def compute(subject):
+    """{(dimension, value): rows} for ``subject`` from one GROUP BY query."""
+    model = SUBJECT_MODELS[subject]
+    fields = dimensions(model)
+    grouped = model.objects.order_by().values(*fields.values()).annotate(rows=Count("id"))
+    stats = {}
+    for row in grouped:
+        stats[(ALL, "")] = stats.get((ALL, ""), 0) + row["rows"]
+        for dimension, field in fields.items():
+            if row[field] in (None, ""):
+                continue
+            key = (dimension, str(row[field]))
+            stats[key] = stats.get(key, 0) + row["rows"]
+    stats.setdefault((ALL, ""), 0)
+    return stats
+
+
+def rebuild(subject=None):
+    """Recompute and store the stats. Returns {subject: {(dimension, value): rows}}."""
+    subjects = [subject] if subject else list(SUBJECT_MODELS)
+    rebuilt = {}
+    for name in subjects:
+        stats = compute(name)
+        rows = [
+            subject_stat(subject=name, dimension=dimension, value=value, row_count=n, page_count=page_count(n))
+            for (dimension, value), n in stats.items()
+        ]
+        with transaction.atomic():
+            subject_stat.objects.filter(subject=name).delete()
+            subject_stat.objects.bulk_create(rows)
+        rebuilt[name] = stats
+    return rebuilt
+
+
+def get_count(subject, dimension=ALL, value=""):
+    rows = (
+        subject_stat.objects.filter(subject=subject, dimension=dimension, value=str(value))
+        .values_list("row_count", flat=True)
+        .first()
+    )
+    return int(rows or 0)
+
+
+def get_pages(subject, dimension=ALL, value=""):
+    return page_count(get_count(subject, dimension, value))
+
+
+def chapters(subject):
+    """Chapters of ``subject`` that have rows, in natural order ("2" before "10")."""
+    values = subject_stat.objects.filter(
+        subject=subject, dimension="chapter", row_count__gt=0
+    ).values_list("value", flat=True)
+    return sorted(values, key=lambda v: (0, int(v), v) if v.isdigit() else (1, 0, v))
+
+
+def fill_legacy(total_row, subject):
+    """Refresh the stats and copy them onto a legacy ``total_<subject>`` row."""
+    stats = rebuild(subject)[subject]
+    fields = {f.name for f in total_row._meta.concrete_fields}
+    rows = stats[(ALL, "")]
+    if "total_" + subject in fields:
+        setattr(total_row, "total_" + subject, rows)
+        setattr(total_row, "total_" + subject + "_page", rows // PER_PAGE)
+    for name in fields:
+        if name.startswith("chapter_"):
+            # GK subjects: chapter_<n> holds the chapter's page count.
+            setattr(total_row, name, page_count(stats.get(("chapter", name[len("chapter_"):]), 0)))
+        elif name.startswith("total_") and name.endswith("_page") and name != "total_" + subject + "_page":
+            # math / reasoning: total_<chapter> and total_<chapter>_page.
+            chapter = name[len("total_"):-len("_page")]
+            n = stats.get(("chapter", chapter), 0)
+            setattr(total_row, name, page_count(n))
+            if "total_" + chapter in fields:
+                setattr(total_row, "total_" + chapter, n)
+
+
+def mark_dirty(subject):
+    """Recompute ``subject`` once after the current transaction commits.
+
+    Inside ``recompute.deferred_recompute()`` the rebuild waits for the block
+    to flush, so a batch of rows saved outside a transaction rebuilds once
+    instead of once per row.
+    """
+    if recompute.is_deferred():
+        recompute.defer(("subject_stats", subject), functools.partial(rebuild, subject))
+        return
+    if connection.in_atomic_block and any(
+        getattr(func, "subject_stats", None) == subject for _sids, func in connection.run_on_commit
+    ):
+        return
+    callback = functools.partial(rebuild, subject)
+    callback.subject_stats = subject
+    transaction.on_commit(callback)
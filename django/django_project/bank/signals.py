@@ -1,84 +1,103 @@
 """
-Signals for bank app - Auto-update info tables for mcq and current_affairs
+Signals for bank app - Keep category counters and the calendar index in sync
+with currentaffairs_mcq and currentaffairs_descriptive, and invalidate the
+cached sidebar / home-page fragments when job, home or word rows change.
+Subject MCQ tables (polity, math, reasoning, ...) queue a one-query
+subject_stat refresh after commit, every MCQ table queues its row for the
+near-duplicate index, and every paginated table marks its stored page lists
+stale after commit.
+
+The per-year currentaffairs_*_info_20XX rows used to be rebuilt here with a
+full save() on every row.  Each change now only marks its (content type,
+year) dirty in bank.services.recompute, which refreshes every dirty year once
+after commit.  Inside recompute.deferred_recompute() the per-row counter and
+calendar deltas are skipped too and rebuilt in one pass at the end.
 """
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
-from bank.models import mcq, mcq_info_2018, mcq_info_2019, mcq_info_2020, mcq_info_2025, mcq_info_2026, mcq_info_2027, mcq_info_2028, current_affairs, current_affairs_info_2018, current_affairs_info_2019, current_affairs_info_2020, current_affairs_info_2025, current_affairs_info_2026, current_affairs_info_2027, current_affairs_info_2028
+from bank.models import currentaffairs_mcq as mcq
+from bank.models import currentaffairs_descriptive as current_affairs
+from bank.services import calendar_index, counters, fingerprints, fragments, near_duplicates, pagination, recompute, subject_stats
 
 
-@receiver(post_save, sender=mcq)
-def update_mcq_info_on_save(sender, instance, created, **kwargs):
-    """
-    Auto-update mcq_info tables when MCQ is saved.
-    Recalculates pagination and month lists for the year.
-    """
-    try:
-        if instance.year_now == '2018':
-            info = mcq_info_2018.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2019':
-            info = mcq_info_2019.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2020':
-            info = mcq_info_2020.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2025':
-            info = mcq_info_2025.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2026':
-            info = mcq_info_2026.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2027':
-            info = mcq_info_2027.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2028':
-            info = mcq_info_2028.objects.all().first()
-            if info:
-                info.save()
-    except Exception as e:
-        print(f"Error updating mcq_info: {e}")
+@receiver(post_init, sender=mcq)
+@receiver(post_init, sender=current_affairs)
+def remember_stored_state(sender, instance, **kwargs):
+    counters.remember_state(instance)
+    calendar_index.remember_state(instance)
+
 
+@receiver(pre_save, sender=mcq)
+@receiver(pre_save, sender=current_affairs)
+def load_stored_state(sender, instance, **kwargs):
+    counters.load_stored_state(instance)
+    calendar_index.load_stored_state(instance)
 
+
+@receiver(post_save, sender=mcq)
 @receiver(post_save, sender=current_affairs)
-def update_current_affairs_info_on_save(sender, instance, created, **kwargs):
-    """
-    Auto-update current_affairs_info tables when Current Affairs is saved.
-    Recalculates pagination and month lists for the year.
-    """
-    try:
-        if instance.year_now == '2018':
-            info = current_affairs_info_2018.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2019':
-            info = current_affairs_info_2019.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2020':
-            info = current_affairs_info_2020.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2025':
-            info = current_affairs_info_2025.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2026':
-            info = current_affairs_info_2026.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2027':
-            info = current_affairs_info_2027.objects.all().first()
-            if info:
-                info.save()
-        elif instance.year_now == '2028':
-            info = current_affairs_info_2028.objects.all().first()
-            if info:
-                info.save()
-    except Exception as e:
-        print(f"Error updating current_affairs_info: {e}")
+def update_derived_on_save(sender, instance, created, raw=False, **kwargs):
+    """Move counters and the calendar by this save, then queue its years."""
+    if raw:
+        return
+    content_type = counters.content_type_for(sender)
+    years = calendar_index.touched_years(instance)
+    if recompute.is_deferred():
+        recompute.mark_dirty(content_type, years, rebuild=True)
+        counters.remember_state(instance)
+        calendar_index.remember_state(instance)
+        return
+    counters.record_save(instance, created)
+    calendar_index.record_save(instance, created)
+    recompute.mark_dirty(content_type, years)
+
+
+@receiver(post_delete, sender=mcq)
+@receiver(post_delete, sender=current_affairs)
+def update_derived_on_delete(sender, instance, **kwargs):
+    content_type = counters.content_type_for(sender)
+    years = calendar_index.touched_years(instance)
+    if recompute.is_deferred():
+        recompute.mark_dirty(content_type, years, rebuild=True)
+        return
+    counters.record_delete(instance)
+    calendar_index.record_delete(instance)
+    recompute.mark_dirty(content_type, years)
+
+
+def invalidate_fragments(sender, **kwargs):
+    """Bump the fragment version once the write is visible to other requests."""
+    transaction.on_commit(lambda: fragments.invalidate_for(sender))
+
+
+for _model in fragments.MODEL_GROUPS:
+    post_save.connect(invalidate_fragments, sender=_model, dispatch_uid='bank.fragments.save.%s' % _model.__name__)
+    post_delete.connect(invalidate_fragments, sender=_model, dispatch_uid='bank.fragments.delete.%s' % _model.__name__)
+
+
+def refresh_subject_stats(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    subject_stats.mark_dirty(subject_stats.subject_for(sender))
+
+
+for _model in subject_stats.SUBJECT_MODELS.values():
+    post_save.connect(refresh_subject_stats, sender=_model, dispatch_uid='bank.subject_stats.save.%s' % _model.__name__)
+    post_delete.connect(refresh_subject_stats, sender=_model, dispatch_uid='bank.subject_stats.delete.%s' % _model.__name__)
+
+
+def refresh_question_signature(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    near_duplicates.mark_dirty(sender, instance.pk)
+
+
+for _model in fingerprints.MCQ_MODELS.values():
+    post_save.connect(refresh_question_signature, sender=_model, dispatch_uid='bank.near_duplicates.save.%s' % _model.__name__)
+    post_delete.connect(refresh_question_signature, sender=_model, dispatch_uid='bank.near_duplicates.delete.%s' % _model.__name__)
+
+
+for _model in pagination.PAGINATED_MODELS:
+    post_save.connect(pagination.mark_stale, sender=_model, dispatch_uid='bank.pagination.save.%s' % _model.__name__)
+    post_delete.connect(pagination.mark_stale, sender=_model, dispatch_uid='bank.pagination.delete.%s' % _model.__name__)
@@ -1,3 +1,392 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from bank.models import calendar_day, currentaffairs_mcq, page_anchor, page_list, polity, question_signature, question_tombstone
+from bank.services import calendar_index, near_duplicates, pagination, recompute, subject_stats
+from genai.utils import document_chunker, rate_limiter
+from genai.utils.json_stream import QuestionStreamParser
+
+
+class PageWindowTests(SimpleTestCase):
+
+    def test_short_range_lists_every_page(self):
+        self.assertEqual(pagination.page_window(1, 1)['page'], [1])
+        self.assertEqual(pagination.page_window(2, 4)['page'], [1, 2, 3, 4])
+        self.assertEqual(pagination.page_window(5, 5)['page'], [1, 2, 3, 4, 5])
+
+    def test_first_pages(self):
+        window = pagination.page_window(1, 40)
+        self.assertEqual(window['page'], [1, 2, 3, 4, 5, '...', 10, 20, '...', 40])
+        self.assertEqual(window['next'], 2)
+        self.assertEqual(window['previous'], 0)
+
+    def test_last_pages(self):
+        window = pagination.page_window(40, 40)
+        self.assertEqual(window['page'], [1, '...', 20, 30, '...', 36, 37, 38, 39, 40])
+        self.assertEqual(window['next'], 0)
+        self.assertEqual(window['previous'], 39)
+
+    def test_middle_page_has_milestones_both_sides(self):
+        window = pagination.page_window(50, 100)
+        self.assertEqual(
+            window['page'],
+            [1, '...', 30, 40, '...', 48, 49, 50, 51, 52, '...', 60, 70, '...', 100],
+        )
+        self.assertEqual(window['diff_from_top'], 48)
+
+    def test_current_page_always_in_window(self):
+        for total in range(1, 60):
+            for current in range(1, total + 1):
+                self.assertIn(current, pagination.page_window(current, total)['page'])
+
+
+class SeekRowsMixin(object):
+
+    def setUp(self):
+        start = datetime.date(2026, 1, 1)
+        for n in range(23):
+            currentaffairs_mcq.objects.create(
+                question='q%d' % n,
+                option_1='a', option_2='b', option_3='c',
+                day=start + datetime.timedelta(days=n // 4),
+                creation_time=None if n % 5 == 0 else datetime.time(n % 24, 0),
+            )
+
+    def offset_page(self, number, per_page=3):
+        # NULL creation_time sorts first in descending order, as on PostgreSQL.
+        qs = currentaffairs_mcq.objects.order_by(
+            '-day', F('creation_time').desc(nulls_first=True), '-id'
+        )
+        return list(qs.values_list('id', flat=True)[(number - 1) * per_page:number * per_page])
+
+
+class SeekPageTests(SeekRowsMixin, TestCase):
+
+    def test_numbered_pages_match_offset_slicing(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        for number in range(1, 10):
+            page = pagination.seek_page(qs, number, 3, ('-day', '-creation_time'))
+            self.assertEqual([row['id'] for row in page], self.offset_page(number))
+
+    def test_cursor_walk_visits_every_row_once(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        seen = []
+        cursor = None
+        while True:
+            page = pagination.seek_page(qs, 1, 3, ('-day', '-creation_time'), cursor)
+            seen.extend(row['id'] for row in page)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.offset_page(1, per_page=100))
+
+    def test_tampered_cursor_falls_back_to_page_number(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        page = pagination.seek_page(qs, 2, 3, ('-day', '-creation_time'), 'not-a-cursor')
+        self.assertEqual([row['id'] for row in page], self.offset_page(2))
+
+    def test_previous_cursor_points_at_the_page_before(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        page = pagination.seek_page(qs, 4, 3, ('-day', '-creation_time'))
+        previous = pagination.seek_page(qs, 1, 3, ('-day', '-creation_time'), page.previous_cursor)
+        self.assertEqual([row['id'] for row in previous], self.offset_page(3))
+        self.assertIsNone(pagination.seek_page(qs, 1, 3, ('-day', '-creation_time')).previous_cursor)
+
+
+@mock.patch.object(pagination, 'ANCHOR_SPACING', 2)
+@mock.patch.object(pagination, 'REBUILD_INTERVAL', datetime.timedelta(0))
+class PageAnchorTests(SeekRowsMixin, TransactionTestCase):
+    """Stored anchors are rebuilt lazily once writes make them stale."""
+
+    def assert_pages_match(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        total = currentaffairs_mcq.objects.count()
+        for number in range(1, total // 3 + 2):
+            page = pagination.seek_page(qs, number, 3, ('-day', '-creation_time'))
+            self.assertEqual([row['id'] for row in page], self.offset_page(number), 'page %d' % number)
+        # Every anchor sits at the rank of the row it was taken from
+        ordered = self.offset_page(1, per_page=1000)
+        self.assertGreater(page_anchor.objects.count(), 5)
+        for anchor in page_anchor.objects.all():
+            self.assertEqual(ordered[anchor.rank], json.loads(anchor.key)[-1])
+        list_row = page_list.objects.get()
+        self.assertEqual((list_row.row_count, list_row.built_version), (total, list_row.version))
+
+    def test_writes_mark_lists_stale_and_reads_rebuild_them(self):
+        self.assert_pages_match()
+        currentaffairs_mcq.objects.create(
+            question='new', option_1='a', option_2='b', option_3='c', day=datetime.date(2026, 1, 3),
+        )
+        self.assertGreater(page_list.objects.get().version, page_list.objects.get().built_version)
+        self.assert_pages_match()
+        currentaffairs_mcq.objects.order_by('id').first().delete()
+        row = currentaffairs_mcq.objects.order_by('-id').first()
+        row.day = datetime.date(2026, 1, 1)
+        row.save()
+        self.assert_pages_match()
+
+    def test_stale_list_uses_offset_until_rebuild_is_due(self):
+        self.assert_pages_match()
+        currentaffairs_mcq.objects.order_by('id').first().delete()
+        qs = currentaffairs_mcq.objects.values('id')
+        with mock.patch.object(pagination, 'REBUILD_INTERVAL', datetime.timedelta(hours=1)):
+            for number in range(1, 9):
+                page = pagination.seek_page(qs, number, 3, ('-day', '-creation_time'))
+                self.assertEqual([row['id'] for row in page], self.offset_page(number))
+        self.assertLess(page_list.objects.get().built_version, page_list.objects.get().version)
+
+    def test_lists_per_model_are_capped(self):
+        qs = currentaffairs_mcq.objects.values('id')
+        with mock.patch.object(pagination, 'MAX_LISTS_PER_MODEL', 1):
+            pagination.seek_page(qs, 4, 3, ('-day', '-creation_time'))
+            page = pagination.seek_page(qs.filter(day__gte=datetime.date(2026, 1, 2)), 3, 3, ('-day', '-creation_time'))
+        self.assertEqual(page_list.objects.count(), 1)
+        self.assertEqual(len(page), 3)
+
+
+class SubjectStatsDeferralTests(TransactionTestCase):
+
+    def test_deferred_block_rebuilds_each_subject_once(self):
+        with mock.patch.object(subject_stats, 'rebuild') as rebuild:
+            with recompute.deferred_recompute():
+                for n in range(3):
+                    polity.objects.create(question='q%d' % n, option_1='a', option_2='b', option_3='c')
+                rebuild.assert_not_called()
+        rebuild.assert_called_once_with('polity')
+
+
+class NearDuplicateIndexTests(SimpleTestCase):
+
+    def test_compact_repacks_dead_slots(self):
+        index = near_duplicates.NearDuplicateIndex()
+        questions = ['Which river flows through city number %d of the valley?' % n for n in range(40)]
+        for n, question in enumerate(questions):
+            index.add('polity', n, near_duplicates.signature(question))
+        for n in range(0, 40, 2):
+            index.discard('polity', n)
+        with mock.patch.object(near_duplicates, 'DEAD_SLOT_MIN', 10):
+            index.compact()
+        self.assertEqual(len(index.alive), 20)
+        self.assertEqual(index.dead, 0)
+        for n in range(1, 40, 2):
+            match = index.query(near_duplicates.signature(questions[n]), 1.0, limit=1)
+            self.assertEqual(match[0][:2], ('polity', n))
+
+
+class NearDuplicateRefreshTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(setattr, near_duplicates, '_index', None)
+        near_duplicates._index = None
+        self.rows = [
+            polity.objects.create(question='Who appoints the governor of state %d?' % n, option_1='a', option_2='b', option_3='c')
+            for n in range(3)
+        ]
+        near_duplicates.store(polity, self.rows)
+
+    def test_deletes_from_other_processes_arrive_without_a_reload(self):
+        index = near_duplicates.get_index()
+        self.assertEqual(len(index), 3)
+        # Another process deleted a row: its signature is gone and a tombstone is left
+        gone = self.rows[0]
+        question_signature.objects.filter(row_id=gone.id).delete()
+        question_tombstone.objects.create(table='polity', row_id=gone.id)
+        near_duplicates._checked_at = 0.0
+        near_duplicates._loaded_at -= datetime.timedelta(seconds=1)
+        self.assertIs(near_duplicates.get_index(), index)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(near_duplicates.check(gone.question, 1.0), [])
+
+
+class SidebarContextTests(TestCase):
+
+    def test_lists_every_published_year_oldest_first(self):
+        for day, live in ((datetime.date(2024, 3, 5), 2), (datetime.date(2018, 1, 9), 1), (datetime.date(2021, 7, 1), 0)):
+            calendar_day.objects.create(content_type='mcq', year=day.year, month=day.month, day=day, live_count=live)
+        sidebar = calendar_index.sidebar_context('mcq')
+        self.assertEqual([panel['year'] for panel in sidebar], [2018, 2024])
+        self.assertEqual(sidebar[1]['info'][0]['March'], '05 Mar, 2024')
+        self.assertEqual(sidebar[1]['info'][0]['month_list'], 'March')
+
+
+class QuestionStreamParserTests(SimpleTestCase):
+
+    def feed_in_pieces(self, text, size):
+        parser = QuestionStreamParser()
+        emitted = []
+        for start in range(0, len(text), size):
+            emitted.append([q['question'] for q in parser.feed(text[start:start + size])])
+        return parser, emitted
+
+    def test_items_fed_in_pieces_are_emitted_when_they_close(self):
+        text = '{"questions": [{"question": "one"}, {"question": "two"}], "category": "gk"}'
+        parser, emitted = self.feed_in_pieces(text, 7)
+        self.assertEqual([q for piece in emitted for q in piece], ['one', 'two'])
+        # "one" closes before the stream reaches "two"
+        self.assertLess(
+            next(i for i, piece in enumerate(emitted) if 'one' in piece),
+            next(i for i, piece in enumerate(emitted) if 'two' in piece),
+        )
+        self.assertEqual(parser.finish()['category'], 'gk')
+
+    def test_escaped_quotes_and_braces_inside_strings(self):
+        question = {'question': 'Is "{x}" a set \\ or [a list]?', 'answer': '}]"'}
+        text = json.dumps({'questions': [question, {'question': 'next'}]})
+        parser, emitted = self.feed_in_pieces(text, 3)
+        self.assertEqual(parser.questions, [question, {'question': 'next'}])
+
+    def test_bare_top_level_array(self):
+        parser, emitted = self.feed_in_pieces('[{"question": "a"}, {"question": "b"}]', 5)
+        self.assertEqual([q for piece in emitted for q in piece], ['a', 'b'])
+        self.assertEqual(parser.finish(), {'questions': [{'question': 'a'}, {'question': 'b'}]})
+
+    def test_nested_questions_key_does_not_match(self):
+        text = '{"meta": {"questions": [{"question": "nested"}]}, "questions": [{"question": "top"}]}'
+        parser, emitted = self.feed_in_pieces(text, 4)
+        self.assertEqual([q['question'] for q in parser.questions], ['top'])
+
+    def test_finish_keeps_the_closed_prefix_of_a_truncated_stream(self):
+        parser, emitted = self.feed_in_pieces('{"questions": [{"question": "a"}, {"question": "b"}, {"quest', 6)
+        self.assertEqual(parser.finish(), {'questions': [{'question': 'a'}, {'question': 'b'}], 'truncated': True})
+
+
+class RateLimiterTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.limiter = rate_limiter.RateLimiter(os.path.join(directory.name, 'limits.sqlite3'))
+        self.addCleanup(lambda: self.limiter._connect().close())
+        patcher = mock.patch.object(rate_limiter, 'time')
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clock.time.return_value = 1000.0
+
+    def advance(self, seconds):
+        self.clock.time.return_value += seconds
+
+    def test_buckets_refill_over_time(self):
+        self.assertEqual(self.limiter._try_take('b', 2, 600, 600), 0)
+        self.assertAlmostEqual(self.limiter._try_take('b', 2, 600, 60), 6.0)
+        self.advance(6)
+        self.assertEqual(self.limiter._try_take('b', 2, 600, 60), 0)
+        # Two requests taken, the third waits for one request's refill (60 / rpm seconds)
+        self.assertAlmostEqual(self.limiter._try_take('b', 2, 0, 0), 30.0 - 6.0)
+
+    def test_call_larger_than_the_bucket_only_waits_for_a_full_bucket(self):
+        self.assertEqual(self.limiter._try_take('b', 0, 100, 500), 0)
+        # The bucket is 400 tokens in debt after the oversized call
+        self.assertAlmostEqual(self.limiter._try_take('b', 0, 100, 10), 410 * 60.0 / 100)
+        self.advance(5 * 60)
+        self.assertEqual(self.limiter._try_take('b', 0, 100, 500), 0)
+
+    def test_adjust_refunds_unused_tokens(self):
+        self.assertEqual(self.limiter._try_take('b', 0, 100, 100), 0)
+        self.assertGreater(self.limiter._try_take('b', 0, 100, 50), 0)
+        self.limiter.adjust('b', -50)
+        self.assertEqual(self.limiter._try_take('b', 0, 100, 50), 0)
+
+    def failing(self, *statuses):
+        calls = []
+
+        def func():
+            calls.append(1)
+            if len(calls) <= len(statuses):
+                error = Exception('HTTP %d' % statuses[len(calls) - 1])
+                error.status_code = statuses[len(calls) - 1]
+                raise error
+            return 'ok'
+        return func, calls
+
+    def test_retryable_status_is_retried(self):
+        func, calls = self.failing(429, 503)
+        self.assertEqual(self.limiter.with_backoff('b', func, max_retries=3, base_delay=1), 'ok')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.clock.sleep.call_count, 2)
+        stats = self.limiter.stats()[0]
+        self.assertEqual((stats['retries'], stats['rate_limited'], stats['server_errors']), (2, 1, 1))
+
+    def test_other_status_is_raised_without_retry(self):
+        func, calls = self.failing(400)
+        with self.assertRaises(Exception):
+            self.limiter.with_backoff('b', func, max_retries=3, base_delay=1)
+        self.assertEqual(len(calls), 1)
+        self.clock.sleep.assert_not_called()
+
+    def test_last_retryable_failure_is_raised(self):
+        func, calls = self.failing(503, 503, 503)
+        with self.assertRaises(Exception):
+            self.limiter.with_backoff('b', func, max_retries=2, base_delay=1)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.limiter.stats()[0]['failures'], 1)
+
+
+class ChunkTextTests(SimpleTestCase):
+
+    def setUp(self):
+        self.text = '\n'.join(
+            '%d. Which river flows through the city number %d of the country?' % (n, n) for n in range(1, 31)
+        )
+
+    def chunk_units(self, budget, overlap):
+        chunks = document_chunker.chunk_text(self.text, budget=budget, overlap=overlap)
+        return [chunk.split('\n\n') for chunk in chunks]
+
+    def test_text_within_budget_is_one_chunk(self):
+        self.assertEqual(document_chunker.chunk_text(self.text, budget=10000), [self.text])
+        self.assertEqual(document_chunker.chunk_text('', budget=10), [])
+
+    def test_chunks_stay_within_budget_and_cover_the_text(self):
+        for budget, overlap in ((60, 20), (60, 0), (100, 50), (40, 40)):
+            chunks = self.chunk_units(budget, overlap)
+            self.assertGreater(len(chunks), 1)
+            for units in chunks:
+                self.assertLessEqual(sum(rate_limiter.estimate_tokens(unit) for unit in units), budget)
+            seen = [unit for units in chunks for unit in units]
+            self.assertEqual(sorted(set(seen), key=seen.index), self.text.split('\n'))
+
+    def test_every_chunk_starts_after_the_previous_one(self):
+        for budget, overlap in ((60, 20), (100, 50), (40, 40)):
+            starts = [int(units[0].split('.')[0]) for units in self.chunk_units(budget, overlap)]
+            self.assertEqual(starts, sorted(set(starts)))
+
+    def test_overlap_units_are_repeated_at_the_next_start(self):
+        chunks = self.chunk_units(60, 20)
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertEqual(previous[-1], current[0])
+        chunks = self.chunk_units(60, 0)
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertNotIn(current[0], previous)
+
+
+class ResultMergerTests(SimpleTestCase):
+
+    question = (
+        'Which article of the Indian constitution deals with the appointment and removal of the governor '
+        'of a state and the powers of the governor during an emergency'
+    )
+
+    def add(self, merger, chunk, text):
+        return merger.add(chunk, {'question': text, 'options': ['a', 'b']})
+
+    def test_overlap_duplicates_are_dropped(self):
+        merger = document_chunker.ResultMerger()
+        self.assertTrue(self.add(merger, 0, self.question))
+        self.assertFalse(self.add(merger, 1, self.question))
+        self.assertFalse(self.add(merger, 1, self.question.replace('emergency', 'national emergency')))
+        self.assertTrue(self.add(merger, 1, 'Who was the first president of the Indian national congress session'))
+        self.assertEqual(merger.duplicates, 2)
+        self.assertEqual([q['question'][:5] for q in merger.questions], ['Which', 'Who w'])
+
+    def test_similar_questions_within_one_chunk_are_kept(self):
+        merger = document_chunker.ResultMerger()
+        self.assertTrue(self.add(merger, 0, self.question))
+        self.assertTrue(self.add(merger, 0, self.question.replace('emergency', 'national emergency')))
+        self.assertFalse(self.add(merger, 0, self.question))
+        self.assertEqual(len(merger.questions), 2)
@@ -40,10 +40,6 @@ from .models import total_job_category
 from .models import total_mcq
 from .models import home
 from .models import currentaffairs_mcq
-from .models import currentaffairs_mcq_info_2018
-from .models import currentaffairs_mcq_info_2019
-from .models import currentaffairs_descriptive_info_2018
-from .models import currentaffairs_descriptive_info_2019
 from .models import total_history
 from .models import history
 from .models import total_polity
@@ -58,6 +54,7 @@ from .models import total_chemistry
 from .models import chemistry
 from .models import total_biology
 from .models import biology
+from .services import calendar_index, counters, fragments, pagination, subject_stats
 
 import json
 from django.contrib.auth import authenticate
@@ -94,66 +91,14 @@ from time import gmtime, strftime
 def index(request):
     userform = UserForm(request.POST or None)
     login = Login(request.POST or None)
-    hindu=0
-    e=0
-    header1=None
-    header2=None
-    header_e1=None
-    header_e2=None
-    word1_obj=home.objects.values('word1_day')[0]
-    word1_day=(word1_obj['word1_day'])
-    
-    word2_obj=home.objects.values('word2_day')[0]
-    word2_day=(word2_obj['word2_day'])
-
-    word_e1_obj=home.objects.values('word_e1_day')[0]
-    word_e1_day=(word_e1_obj['word_e1_day'])
-
-    word_e2_obj=home.objects.values('word_e2_day')[0]
-    word_e2_day=(word_e2_obj['word_e2_day'])
-
-    
-    word1 = the_hindu_word_list1.objects.values('word','meaning','synonym','example','word_img').filter(day=word1_day)
-    word2 = the_hindu_word_list2.objects.values('word','meaning','example','word_img','synonym').filter(day=word2_day)
-    if(word1.count()>0):
-        hindu=1
-        header1 = the_hindu_word_Header1.objects.values('Heading_for_list1','link').filter(day=word1_day)
-        if(header1==None):
-            header1=None
-    else:
-        word1=None
-            
-                
-    if(word2.count()>0):
-        hindu=2
-        header2 = the_hindu_word_Header2.objects.values('Heading_for_list2','link').filter(day=word2_day)
-        if(header2==None):
-            header2=None
-
-    else:
-        word2=None        
-
-
-    word_e1 = the_economy_word_list1.objects.values('word','meaning','example','word_img','synonym').filter(day=word_e1_day)
-    word_e2 = the_economy_word_list2.objects.values('word','meaning','example','word_img','synonym').filter(day=word_e2_day)
-        
-    if(word_e1.count()>0):
-        e=1
-        header_e1 = the_economy_word_Header1.objects.values('Heading_for_list1','link').filter(day=word_e1_day)
-        if(header_e1==None):
-            header_e1=None
-    else:
-        word_e1=None        
-    if(word_e2.count()>0):
-        e=2
-        header_e2 = the_economy_word_Header2.objects.values('Heading_for_list2','link').filter(day=word_e2_day)
-            
-        if(header_e2==None):
-            header_e2=None
-    else:
-        word_e2=None
+    days=fragments.home_days()
+    word1_day=days['word1_day']
+    word2_day=days['word2_day']
+    word_e1_day=days['word_e1_day']
+    word_e2_day=days['word_e2_day']
+    panels=fragments.word_panels(days)
 
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
 
     mathh = math.objects.values().filter(home=True).all().order_by('day','creation_time')[:4]
     reasoningh = reasoning.objects.values().filter(home=True).all().order_by('day','creation_time')
@@ -191,7 +136,7 @@ def index(request):
    
     else:
         slide = currentaffairs_descriptive.objects.values('link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(is_live=True).order_by('-day')[:10]
-        return render(request,'home/new.html',{'close':cloze,'job': jobs,'reasoning':reasoningh,'math':mathh,'word_e2_day':word_e2_day,'word_e1_day':word_e1_day,'word2_day':word2_day,'word1_day':word1_day,'word1':word1,'word_e1':word_e1,'word2':word2,'word_e2':word_e2,'header1':header1,'header2':header2,'header_e1':header_e1,'header_e2':header_e2,'p':'','slide': slide,'form':userform,'login':login})
+        return render(request,'home/new.html',{'close':cloze,'job': jobs,'reasoning':reasoningh,'math':mathh,'word_e2_day':word_e2_day,'word_e1_day':word_e1_day,'word2_day':word2_day,'word1_day':word1_day,'word1':panels['word1'],'word_e1':panels['word_e1'],'word2':panels['word2'],'word_e2':panels['word_e2'],'header1':panels['header1'],'header2':panels['header2'],'header_e1':panels['header_e1'],'header_e2':panels['header_e2'],'p':'','slide': slide,'form':userform,'login':login})
 
 
 def ca(request,user_year_month,user_page_no):
@@ -202,21 +147,18 @@ def ca(request,user_year_month,user_page_no):
     category=0
     today=0
     user_month='January'
-    page_var='January_page'#just emni emni ...only for mcq category initilization
     if "category"  in user_year_month:
         category=1
         user_year=user_year_month[1]
         user_category=user_year
         user_category=user_category.replace("-","_")
-        obj=total.objects.values(user_category)
-        t= int(obj[0][user_category])
+        t=counters.get_pages('descriptive',user_category)
         print('cat'+str(t))
         #t=int(obj[0].total_current_affairs_page)
     elif "today"  in user_year_month:
         today=1
         user_year=user_year_month[1]
-        obj=total.objects.all()
-        t=int(obj[0].total_current_affairs_page)
+        t=counters.get_pages('descriptive')
         print('cat'+str(t))
         #t=int(obj[0].total_current_affairs_page)
         
@@ -252,15 +194,8 @@ def ca(request,user_year_month,user_page_no):
         print('dat='+user_date)
         print('year='+user_year)
         print('month='+user_month)
-        page_var=user_month.title() +'_page'
-        if user_year=='2018':     
-            obj=currentaffairs_descriptive_info_2018.objects.values(page_var)
-            t= int(obj[0][page_var])
-            print('date wise'+ str(t))
-        elif user_year=='2019':     
-            obj=currentaffairs_descriptive_info_2019.objects.values(page_var)
-            t= int(obj[0][page_var])
-            print('date wise 2019'+ str(t))
+        t=calendar_index.day_pages('descriptive',user_year,calendar_index.month_number(user_month))
+        print('date wise'+ str(t))
     page=['2','3']
     login = Login(request.POST or None)
     #name = NameForm(request.POST or None)
@@ -272,233 +207,45 @@ def ca(request,user_year_month,user_page_no):
         params_int=int(params)
         mul=int(int(params))*3
         p=int(mul)-3
-        obj=total.objects.all()
         next=0
         previous=0
         #t=int(obj[0].total_current_affairs_page)
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-
-                print('this')
-                
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                if t==5:
-                    page=[1,2,3,4,5]
-                elif t==4:
-                    page=[1,2,3,4]
-                elif t==3:
-                    page=[1,2,3]
-                elif t==2:
-                    page=[1,2]
-                elif t==1:
-                    page=[1]
-                    
-                    
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    
-                    if(diff_from_top>=4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,last]
-                    else:
-                        print("access")
-                        mile=0
-                        page=[one,tow,three,four,five,dot,last]
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-                            
-    current_affairs_2018_info = currentaffairs_descriptive_info_2018.objects.values('month_list',page_var,'January','February','March','April','May','June','July','August','September','October','November','December')
-    #ultimate_date=(current_affairs_2018_info[0][user_month]).split('///')
-    #ultimate_date=ultimate_date[int(user_page_no)]
-    #ultimate_date=ultimate_date[0:2]
-    #print('df'+ultimate_date)
-    current_affairs_2019_info = currentaffairs_descriptive_info_2019.objects.values('month_list',page_var,'January','February','March','April','May','June','July','August','September','October','November','December')
-    print('2019='+str(current_affairs_2019_info))
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+        diff_from_top=window['diff_from_top']
+    sidebar_years = calendar_index.sidebar_context('descriptive')
+    jobs = fragments.job_sidebar()
  
     #jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
     if today==1:
         #current_affairs_all = current_affairs.objects.values('year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').order_by('-day','-creation_time')[p:mul]
-        slide = currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(is_live=True).order_by('-day','-creation_time')[p:mul]
+        pager = pagination.seek_page(currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(is_live=True),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        slide = pager.rows
         
     elif category==1:
-        slide = currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(**{user_category: True}, is_live=True).order_by('-day','-creation_time')[p:mul]
+        pager = pagination.seek_page(currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(**{user_category: True}, is_live=True),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        slide = pager.rows
         #return render(request,'home/current_affairs.html',{'current_affairs_all': current_affairs_all,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':'current-affairs-category-'+user_category})
-        return render(request,'home/current_descriptive.html',{'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'current_affairs_2019_info': current_affairs_2019_info,
-                                                           'current_affairs_2018_info': current_affairs_2018_info,'job': jobs,'slide': slide,
+        return render(request,'home/current_descriptive.html',{'pager':pager,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'sidebar_years': sidebar_years,
+                                                           'job': jobs,'slide': slide,
                                                            'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,
                                                            'next':next,'previous':previous,'tag_page':tag_page})
 
 
     else:
         #date wise..      
-        slide = currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(year_now=user_year,month=user_month,day=user_date,is_live=True).order_by('-day','-creation_time')
+        slide = currentaffairs_descriptive.objects.values('year_now','month','link','url','upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(day=user_date,is_live=True).order_by('-day','-creation_time')
         #return render(request,'home/current_affairs.html',{'current_affairs_2019_info': current_affairs_2019_info,'current_affairs_2018_info': current_affairs_2018_info,'current_affairs_all': current_affairs_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
-        return render(request,'home/current_descriptive.html',{'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'current_affairs_2019_info': current_affairs_2019_info,
-                                                           'current_affairs_2018_info': current_affairs_2018_info,'job': jobs,
+        return render(request,'home/current_descriptive.html',{'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'sidebar_years': sidebar_years,
+                                                           'job': jobs,
                                                            'slide': slide,'form':userform,'login':login,'p':diff_from_top,'page':page,
                                                            'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
         
    
                 
-    return render(request,'home/current_descriptive.html',{'current_affairs_2019_info': current_affairs_2019_info,'current_affairs_2018_info': current_affairs_2018_info,
+    return render(request,'home/current_descriptive.html',{'pager':pager,'sidebar_years': sidebar_years,
                                                        'slide': slide,'user_year':user_year,'user_month':user_month,
                                                        'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,
                                                        'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
@@ -781,180 +528,14 @@ def current(request,params,string):
         next=0
         previous=0
         #t=105
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-                
-                
-                
-
-
-    slide = currentaffairs_descriptive.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(**{field_name: True}, is_live=True).order_by('-day','-creation_time')[p:mul]
-    return render(request,'home/ca.html',{'job': jobs,'slide': slide,'form':userform,'login':login,'p':t,'page':page,'params':params_int,'next':next,'previous':previous})
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+    pager = pagination.seek_page(currentaffairs_descriptive.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(**{field_name: True}, is_live=True),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+    slide = pager.rows
+    jobs = fragments.job_sidebar()
+    return render(request,'home/ca.html',{'pager':pager,'job': jobs,'slide': slide,'form':userform,'login':login,'p':t,'page':page,'params':params_int,'next':next,'previous':previous})
 
 
 
@@ -977,7 +558,7 @@ def cuttent_affirs_single(request,string):
                 
                 
                 
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
 
 
     slide = currentaffairs_descriptive.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').filter(new_id=id, is_live=True)
@@ -1021,179 +602,10 @@ def word(request,string,no):
         next=0
         previous=0
         t=int(obj['total_page'])
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-        
-            
-        
-
-        
-            
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
         hindu=0
         e=0
         header1=None
@@ -1259,7 +671,7 @@ def word(request,string,no):
              return render(request,'home/english.html',{'form':userform,'login':login,'p':header1,'page':page,'params':word1,'next':next,'previous':previous,'word1':None,'word_e1':word_e1,'word2':None,'word_e2':word_e2,'header1':header1,'header2':header2,'header_e1':header_e1,'header_e2':header_e2})'''
     
             
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
                 
 
 
@@ -1309,15 +721,7 @@ def math_all(request,string,params):
         mul=int(int(params))*5
         p=int(mul)-5
         field_name=string
-        field_page='total_'+string+'_page'
-        t=1
-        if(string=='profit_n_loss'):
-            obj=total_math.objects.values(field_page)
-    
-            t= int(obj[0][field_page])
-        
-        obj=total_math.objects.values(field_page)
-        t= int(obj[0][field_page])
+        t=subject_stats.get_pages('math','chapter',string)
         next=0
         previous=0
         #t=105
@@ -1326,10 +730,6 @@ def math_all(request,string,params):
         if(params_int>1):
             previous=params_int-1
         
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
         
         today=time.strftime("%Y-%m-%d")
         
@@ -1339,196 +739,10 @@ def math_all(request,string,params):
         mul=int(int(params))*5
         p=int(mul)-5
         
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-
-                print('this')
-                
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                if t==5:
-                    page=[1,2,3,4,5]
-                elif t==4:
-                    page=[1,2,3,4]
-                elif t==3:
-                    page=[1,2,3]
-                elif t==2:
-                    page=[1,2]
-                elif t==1:
-                    page=[1]
-                    
-                    
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    
-                    if(diff_from_top>=4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,last]
-                    else:
-                        print("access")
-                        mile=0
-                        page=[one,tow,three,four,five,dot,last]
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]        
-
-        
-            
-       
-
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
         ''' if(hindu==1 and e==1):
              return render(request,'home/english.html',{'form':userform,'login':login,'p':header1,'page':page,'params':word1,'next':next,'previous':previous,'word1':word1,'word_e1':word_e1,'word2':None,'word_e2':None,'header1':header1,'header2':header2,'header_e1':header_e1,'header_e2':header_e2})
 
@@ -1546,14 +760,15 @@ def math_all(request,string,params):
         
     
             
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
                 
 
 
     #slide = current_affairs.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').order_by('-day','-creation_time')[p:mul]
-    mathh = math.objects.values().filter(chapter=string).all().order_by('day')[p:mul]
+    pager = pagination.seek_page(math.objects.values().filter(chapter=string).all(),params_int,mul-p,('day',),request.GET.get('cursor'))
+    mathh = pager.rows
 
-    return render(request,'home/math.html',{'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'math':mathh,'chapter':string.replace('_',' '),'tag_page':string})
+    return render(request,'home/math.html',{'pager':pager,'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'math':mathh,'chapter':string.replace('_',' '),'tag_page':string})
 
 
 
@@ -1601,178 +816,10 @@ def job_view(request,params,after_string,string):
         next=0
         previous=0
         #t=105
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-                
-                
-                
-
-
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
     #slide = current_affairs.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').order_by('-day','-creation_time')[p:mul]
         top_list = job.objects.values('heading','new_id','first_day','last_day','ca_img','apply_link','detail_link').filter(top=True).order_by('-day','-creation_time')[:8]
         
@@ -1794,34 +841,40 @@ def job_view(request,params,after_string,string):
             field_name=after_string
             if(field_name=='bank'):
                 flag=1
-                bank = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'bank': bank,'form':userform,'login':login,'p':bank,'page':page,'params':params_int,'next':next,'previous':previous})
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                bank = pager.rows
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'bank': bank,'form':userform,'login':login,'p':bank,'page':page,'params':params_int,'next':next,'previous':previous})
 
             elif(field_name=='ssc'):
                 flag=2;
-                ssc = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'ssc': ssc,'form':userform,'login':login,'p':ssc,'page':page,'params':params_int,'next':next,'previous':previous})
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                ssc = pager.rows
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'ssc': ssc,'form':userform,'login':login,'p':ssc,'page':page,'params':params_int,'next':next,'previous':previous})
 
             elif(field_name=='upsc'):
                 flag=3;
-                upsc = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'upsc': upsc,'form':userform,'login':login,'p':upsc,'page':page,'params':params_int,'next':next,'previous':previous})
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                upsc = pager.rows
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'upsc': upsc,'form':userform,'login':login,'p':upsc,'page':page,'params':params_int,'next':next,'previous':previous})
     
             elif(field_name=='rail'):
                 flag=4;
-                rail = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'rail': rail,'form':userform,'login':login,'p':rail,'page':page,'params':params_int,'next':next,'previous':previous})
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                rail = pager.rows
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'rail': rail,'form':userform,'login':login,'p':rail,'page':page,'params':params_int,'next':next,'previous':previous})
 
             elif(field_name=='defence'):
                 flag=5;
-                defence = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'defence': defence,'form':userform,'login':login,'p':defence,'page':page,'params':params_int,'next':next,'previous':previous})
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                defence = pager.rows
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'defence': defence,'form':userform,'login':login,'p':defence,'page':page,'params':params_int,'next':next,'previous':previous})
 
             elif(field_name=='other'):
                 flag=6;
-                other = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name).order_by('-day','-creation_time')[p:mul]
+                pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(category=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+                other = pager.rows
 
-                return render(request,'home/job.html',{'string':string,'after_string':field_name,'top_list':top_list,'other': other,'form':userform,'login':login,'p':other,'page':page,'params':params_int,'next':next,'previous':previous})
+                return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name,'top_list':top_list,'other': other,'form':userform,'login':login,'p':other,'page':page,'params':params_int,'next':next,'previous':previous})
 
             
             
@@ -1837,16 +890,18 @@ def job_view(request,params,after_string,string):
             field_name=after_string
             enddate = date.today() + timedelta(days=5)
             
-            jobs = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(state=field_name).order_by('-day','-creation_time')[p:mul]
-            return render(request,'home/job.html',{'string':string,'after_string':field_name.replace("_", " ").title(),'top_list':top_list,'job': jobs,'form':userform,'login':login,'p':jobs,'page':page,'params':params_int,'next':next,'previous':previous})
+            pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(state=field_name),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+            jobs = pager.rows
+            return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name.replace("_", " ").title(),'top_list':top_list,'job': jobs,'form':userform,'login':login,'p':jobs,'page':page,'params':params_int,'next':next,'previous':previous})
 
         elif(string=='qualification'):
            
             field_name=after_string
             enddate = date.today() + timedelta(days=5)
             
-            jobs = job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(**{field_name: True}).order_by('-day','-creation_time')[p:mul]
-            return render(request,'home/job.html',{'string':string,'after_string':field_name.replace("_", " ").title(),'top_list':top_list,'job': jobs,'form':userform,'login':login,'p':jobs,'page':page,'params':params_int,'next':next,'previous':previous})
+            pager = pagination.seek_page(job.objects.values('apply_link','detail_link','extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(**{field_name: True}),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+            jobs = pager.rows
+            return render(request,'home/job.html',{'pager':pager,'string':string,'after_string':field_name.replace("_", " ").title(),'top_list':top_list,'job': jobs,'form':userform,'login':login,'p':jobs,'page':page,'params':params_int,'next':next,'previous':previous})
         
     
         elif(string=='goto'):
@@ -1910,11 +965,8 @@ def reasoning_all(request,string,params):
         mul=int(int(params))*5
         p=int(mul)-5
         field_name=string
-        field_page='total_'+string+'_page'
         
-        obj=total_reasoning.objects.values(field_page)
-    
-        t= int(obj[0][field_page])
+        t=subject_stats.get_pages('reasoning','chapter',string)
         
         
         next=0
@@ -1925,10 +977,6 @@ def reasoning_all(request,string,params):
         if(params_int>1):
             previous=params_int-1
         
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
         
         today=time.strftime("%Y-%m-%d")
         
@@ -1938,193 +986,19 @@ def reasoning_all(request,string,params):
         mul=int(int(params))*5
         p=int(mul)-5
         
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-        
-            
-        
-
-        
-            
-       
-
-
-        
-    
-            
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+    jobs = fragments.job_sidebar()
                 
 
 
     #slide = current_affairs.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').order_by('-day','-creation_time')[p:mul]
-    reasoningh = reasoning.objects.values().filter(chapter=string).all().order_by('day','creation_time')[p:mul]
+    pager = pagination.seek_page(reasoning.objects.values().filter(chapter=string).all(),params_int,mul-p,('day','creation_time'),request.GET.get('cursor'))
+    reasoningh = pager.rows
 
-    return render(request,'home/reasoning.html',{'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'reasoning':reasoningh})
+    return render(request,'home/reasoning.html',{'pager':pager,'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'reasoning':reasoningh})
 
 
 
@@ -2146,7 +1020,7 @@ def reasoning_single(request,string):
        
                         
                 
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
                 
                 
 
@@ -2186,10 +1060,6 @@ def close_all(request,string,params):
         if(params_int>1):
             previous=params_int-1
         
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
         
         today=time.strftime("%Y-%m-%d")
         
@@ -2199,193 +1069,21 @@ def close_all(request,string,params):
         mul=int(int(params))*1
         p=int(mul)-1
         
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-        
-            
-        
-
-        
-            
-       
-
-
-        
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+    jobs = fragments.job_sidebar()
     
             
                 
 
 
     #slide = current_affairs.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').order_by('-day','-creation_time')[p:mul]
-    closee = close.objects.all().order_by('day','creation_time')[p:mul]
+    pager = pagination.seek_page(close.objects.all(),params_int,mul-p,('day','creation_time'),request.GET.get('cursor'))
+    closee = pager.rows
 
-    return render(request,'home/close.html',{'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'close':closee})
+    return render(request,'home/close.html',{'pager':pager,'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'close':closee})
 
 
 
@@ -2418,10 +1116,6 @@ def error_all(request,string,params):
         if(params_int>1):
             previous=params_int-1
         
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
         
         today=time.strftime("%Y-%m-%d")
         
@@ -2431,181 +1125,10 @@ def error_all(request,string,params):
         mul=int(int(params))*5
         p=int(mul)-5
         
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1
-        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):
-                                                                       
-                page=[first,second,one,tow,three,four,five]
-                
-            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]
-               
-               
-               
-                elif(mile==1):
-                    mile1=(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-                
-            
-                    
-
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):
-                    if(diff_from_top>4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,dot,last]       
-                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                    
-
-                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):
-                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):
-                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5
-                            
-                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]
-               
-               
-               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]
-                       
-                   
-                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-        
-            
-        
-
-        
-            
-       
-
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
         ''' if(hindu==1 and e==1):
              return render(request,'home/english.html',{'form':userform,'login':login,'p':header1,'page':page,'params':word1,'next':next,'previous':previous,'word1':word1,'word_e1':word_e1,'word2':None,'word_e2':None,'header1':header1,'header2':header2,'header_e1':header_e1,'header_e2':header_e2})
 
@@ -2621,16 +1144,17 @@ def error_all(request,string,params):
         elif(hindu==0 and e==2):
              return render(request,'home/english.html',{'form':userform,'login':login,'p':header1,'page':page,'params':word1,'next':next,'previous':previous,'word1':None,'word_e1':word_e1,'word2':None,'word_e2':word_e2,'header1':header1,'header2':header2,'header_e1':header_e1,'header_e2':header_e2})'''
         
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
     
             
                 
 
 
     #slide = current_affairs.objects.values('upper_heading','yellow_heading','key_1','key_2','key_3','day','new_id','paragraph','all_key_points','ca_img').order_by('-day','-creation_time')[p:mul]
-    errorr = error.objects.values().filter(chapter=string).all().order_by('day','creation_time')[p:mul]
+    pager = pagination.seek_page(error.objects.values().filter(chapter=string).all(),params_int,mul-p,('day','creation_time'),request.GET.get('cursor'))
+    errorr = pager.rows
 
-    return render(request,'home/error.html',{'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'error':errorr})
+    return render(request,'home/error.html',{'pager':pager,'job': jobs,'form':userform,'login':login,'params':params_int,'p':2,'page':page,'params':params,'next':next,'previous':previous,'error':errorr})
 
 
 
@@ -2642,7 +1166,7 @@ def formula(request,string):
     userform = UserForm(request.POST or None)
     
     field_name = string
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
 
     login = Login(request.POST or None)
     #name = NameForm(request.POST or None)
@@ -2710,7 +1234,7 @@ def gk(request,subject,folder,html,no):
     userform = UserForm(request.POST or None)
     
     
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
 
     login = Login(request.POST or None)
     address = subject +'/'+ folder +'/'+html+'/'+html +'-'+ str(no)+'.html'
@@ -2737,7 +1261,7 @@ def gk_index(request,subject):
     userform = UserForm(request.POST or None)
     
     
-    jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
+    jobs = fragments.job_sidebar()
 
     login = Login(request.POST or None)
     address = subject +'/'+subject+'.html'
@@ -2766,14 +1290,12 @@ def mcq_current(request,user_year_month,user_page_no):
     user_year_month=user_year_month.split('-')
     category=0
     user_month='January'
-    page_var='January_page'#just emni emni ...only for mcq category initilization
     if "category"  in user_year_month:
         category=1
         user_year=user_year_month[1]
         user_category=user_year
         user_category=user_category.replace("-","_")
-        obj=total_mcq.objects.values(user_category)
-        t= int(obj[0][user_category])
+        t=counters.get_pages('mcq',user_category)
         print('cat'+str(t))
         #t=int(obj[0].total_current_affairs_page)
         
@@ -2809,15 +1331,11 @@ def mcq_current(request,user_year_month,user_page_no):
         print('dat='+user_date)
         print('year='+user_year)
         print('month='+user_month)
-        page_var=user_month.title() +'_page'
-        if user_year=='2018':     
-            obj=currentaffairs_mcq_info_2018.objects.values(page_var)
-            t= int(obj[0][page_var])
+        if user_year=='latest':
+            t=counters.get_pages('mcq')
+        else:
+            t=calendar_index.day_pages('mcq',user_year,calendar_index.month_number(user_month))
             print('date wise'+ str(t))
-        elif user_year=='2019':     
-            obj=currentaffairs_mcq_info_2019.objects.values(page_var)
-            t= int(obj[0][page_var])
-            print('date wise 2019'+ str(t))
     
     page=['2','3']
     login = Login(request.POST or None)
@@ -2833,172 +1351,32 @@ def mcq_current(request,user_year_month,user_page_no):
         previous=0
         print('tttttttt'+str(t))
         #t=5
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):                                                                       
-                page=[first,second,one,tow,three,four,five]
-                if t==5:
-                    page=[1,2,3,4,5]
-                elif t==4:
-                    page=[1,2,3,4]
-                elif t==3:
-                    page=[1,2,3]
-                elif t==2:
-                    page=[1,2]
-                elif t==1:
-                    page=[1]            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]               
-                elif(mile==1):
-                    mile1=int(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):                    
-                    if(diff_from_top>=4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,last]
-                    else:
-                        print("access")
-                        mile=0
-                        page=[one,tow,three,four,five,dot,last]                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-                    
-                        
-    mcq_2018_info = currentaffairs_mcq_info_2018.objects.values('month_list',page_var,'January','February','March','April','May','June','July','August','September','October','November','December')
-    #ultimate_date=(mcq_2018_info[0][user_month]).split('///')
-    #ultimate_date=ultimate_date[int(user_page_no)]
-    #ultimate_date=ultimate_date[0:2]
-    #print('df'+ultimate_date)
-    mcq_2019_info = currentaffairs_mcq_info_2019.objects.values('month_list',page_var,'January','February','March','April','May','June','July','August','September','October','November','December')
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+        diff_from_top=window['diff_from_top']
+    sidebar_years = calendar_index.sidebar_context('mcq')
      
     #jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
     if user_year=='latest':
-        mcq_all = currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(is_live=True).order_by('-day','-creation_time')[p:mul]
+        pager = pagination.seek_page(currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(is_live=True),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
         
     elif category==1:
-        mcq_all = currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(**{user_category: True}, is_live=True).order_by('-day','-creation_time')[p:mul]
-        return render(request,'home/mcq.html',{'mcq_2019_info': mcq_2019_info,'mcq_2018_info': mcq_2018_info,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':'current-affairs-category-'+user_category})
+        pager = pagination.seek_page(currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(**{user_category: True}, is_live=True),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        return render(request,'home/mcq.html',{'pager':pager,'sidebar_years': sidebar_years,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':'current-affairs-category-'+user_category})
 
 
     else:
                
-        mcq_all = currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(year_now=user_year,month=user_month,day=user_date,is_live=True).order_by('-day','-creation_time')
-        return render(request,'home/mcq.html',{'mcq_2019_info': mcq_2019_info,'mcq_2018_info': mcq_2018_info,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
+        mcq_all = currentaffairs_mcq.objects.values('ans','year_now','month','question','option_1','option_2','option_3','option_4','option_5','extra').filter(day=user_date,is_live=True).order_by('-day','-creation_time')
+        return render(request,'home/mcq.html',{'sidebar_years': sidebar_years,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
         
    
                 
-    return render(request,'home/mcq.html',{'mcq_2019_info': mcq_2019_info,'mcq_2018_info': mcq_2018_info,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
+    return render(request,'home/mcq.html',{'pager':pager,'sidebar_years': sidebar_years,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
 
 
 #.............................subject.......................
@@ -3010,7 +1388,6 @@ def subject(request,subject,topic,subtopic,chapter,user_page_no):
     
     category=0
     user_month='January'
-    page_var='January_page'#just emni emni ...only for mcq category initilization
     if "_"  in subtopic:
         category=1
         subtopic2=subtopic.split('_')[1]
@@ -3022,27 +1399,7 @@ def subject(request,subject,topic,subtopic,chapter,user_page_no):
         
         #print('cat'+str(t))
         #t=int(obj[0].total_current_affairs_page)
-    if subject=='history':
-        obj=total_history.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='geography':
-        obj=total_geography.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='polity':
-        obj=total_polity.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='economics':
-        obj=total_economics.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='physics':
-        obj=total_physics.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='biology':
-        obj=total_biology.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
-    if subject=='chemistry':
-        obj=total_chemistry.objects.values('chapter_'+chapter)
-        t= int(obj[0]['chapter_'+chapter])
+    t=subject_stats.get_pages(subject,'chapter',chapter)
 
     
     page=['2','3']
@@ -3058,253 +1415,73 @@ def subject(request,subject,topic,subtopic,chapter,user_page_no):
         previous=0
         print('tttttttt'+str(t))
         #t=5
-        if(t>params_int):
-            next=params_int+1
-        if(params_int>1):
-            previous=params_int-1        
-        left=int(int(params)-2)
-        right=int(int(params)+2)
-        diff_from_top=int(t-right)
-        diff_from_bottom=int(left-1)
-        if(((t-params_int)<= 4) or (params_int<=5)):
-          if(((t-params_int)<= 4)):
-            one=t-4
-            tow=t-3
-            three=t-2
-            four=t-1
-            five=t
-            first=1
-            second='...'
-            dot='...'
-            if(diff_from_bottom<10):                                                                       
-                page=[first,second,one,tow,three,four,five]
-                if t==5:
-                    page=[1,2,3,4,5]
-                elif t==4:
-                    page=[1,2,3,4]
-                elif t==3:
-                    page=[1,2,3]
-                elif t==2:
-                    page=[1,2]
-                elif t==1:
-                    page=[1]            
-            else:
-                mile=int(diff_from_bottom/10)
-                if(mile>=2):
-                   mile1=int(mile)*10
-                   mile2=mile1-10
-                   page=[first,second,mile2,mile1,dot,one,tow,three,four,five]               
-                elif(mile==1):
-                    mile1=int(t/10)*10
-                    page=[first,dot,mile1,dot,one,tow,three,four,five]
-          else:
-                one=1
-                tow=2
-                three=3
-                four=4
-                five=5
-                
-                last=t
-                dot='...'
-                if(diff_from_top<10):                    
-                    if(diff_from_top>=4):
-                       es_mile=int((params_int/10)+10)
-                       if (es_mile<t):
-                           mile=es_mile
-                           page=[one,tow,three,four,five,dot,mile,dot,last]
-                       else:
-                           mile=0
-                           page=[one,tow,three,four,five,dot,last]
-                    else:
-                        print("access")
-                        mile=0
-                        page=[one,tow,three,four,five,dot,last]                
-                else:
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                       mile1=int((params_int/10))*10+10
-                       mile2=mile1+10
-                       page=[one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[one,tow,three,four,five,dot,mile1,dot,last]                    
-        else:
-            first=1
-            dot='...'
-            one=params_int-2
-            tow=params_int-1
-            three=params_int
-            four=params_int+1
-            five=params_int+2
-            last=t
-            if(diff_from_top<10):
-                if(diff_from_bottom>10):                    
-                    mile=int(diff_from_bottom/10)
-                    if(mile>=2):
-                       mile1=int(mile)*10
-                       mile2=mile1-10
-                       page=[first,dot,mile2,mile1,dot,one,tow,three,four,five,dot,last]               
-                    elif(mile==1):
-                        mile1=(t/10)*10
-                        page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]
-
-            elif(diff_from_bottom<10):
-                if(diff_from_top>10):                    
-                    mile=int(diff_from_top/10)
-                    if(mile>=2):
-                        
-                        mile1=(int(right/10))*10+10
-                        mile2=int(mile1)+10
-                        if(right==mile1):
-                            mile1=mile1+5                        
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                    elif(mile==1):
-                        mile1=(params_int/10)+10
-                        page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                else:
-                    page=[first,dot,one,tow,three,four,five,dot,last]                    
-            else:
-                sign_bottom=0
-                sign_top=0
-                mile_bottom=int(diff_from_bottom/10)
-                if(mile_bottom>=2):
-                    mile1_bottom=int(mile_bottom)*10
-                    mile2_bottom=mile1_bottom-10
-                    sign_bottom=1
-                    #page=[first,dot,mile1,mile2,dot,one,tow,three,four,five,dot,last]               
-                elif(mile_bottom==1):
-                    mile1_bottom=(mile_bottom)*10
-                    #page=[first,dot,mile1,dot,one,tow,three,four,five,last]
-                    
-                mile_top=int(diff_from_top/10)
-                if(mile_top>=2):
-                    mile1_top=(int(right/10))*10+10
-                    mile2_top=int(mile1_top)+10
-                    sign_top=1
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,mile2,dot,last]                   
-                elif(mile_top==1):
-                    mile1_top=(int(right/10))*10+10
-                    #page=[first,dot,one,tow,three,four,five,dot,mile1,dot,last]
-                    
-                if(sign_bottom==1 and sign_top==1):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                elif(sign_bottom==0 and sign_top==1):
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,mile2_top,dot,last]
-                    
-                elif(sign_bottom==1 and sign_top==0):
-                    page=[first,dot,mile2_bottom,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-                else:
-                    page=[first,dot,mile1_bottom,dot,one,tow,three,four,five,dot,mile1_top,dot,last]
-
-    
-     
+        window=pagination.page_window(params_int,t)
+        page=window['page']
+        next=window['next']
+        previous=window['previous']
+        diff_from_top=window['diff_from_top']
     #jobs = job.objects.values('extra_day','first_day','last_day','heading','eligibility','age','amount','day','new_id','des','ca_img').filter(home=True).order_by('-day','-creation_time')
     if subject=='history':
-        mcq_all = history.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_history.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_history') or (key=='total_history_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(history.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('history')]
         print(chapter_list)
            
-        return render(request,'home/history.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/history.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
             
         
     elif subject=='polity':
-        mcq_all = polity.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_polity.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_polity') or (key=='total_polity_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(polity.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('polity')]
         print(chapter_list)
            
-        return render(request,'home/polity.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/polity.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
     elif subject=='economics':
-        mcq_all = economics.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_economics.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_economics') or (key=='total_economics_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(economics.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('economics')]
         print(chapter_list)
            
-        return render(request,'home/economics.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/economics.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
 
     elif subject=='geography':
-        mcq_all = geography.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_geography.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_geography') or (key=='total_geography_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(geography.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('geography')]
         print(chapter_list)
            
-        return render(request,'home/geography.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/geography.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
 
     elif subject=='physics':
-        mcq_all = physics.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_physics.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_physics') or (key=='total_physics_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(physics.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('physics')]
         print(chapter_list)
            
-        return render(request,'home/physics.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/physics.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
 
     elif subject=='chemistry':
-        mcq_all = chemistry.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_chemistry.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_chemistry') or (key=='total_chemistry_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(chemistry.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('chemistry')]
         print(chapter_list)
            
-        return render(request,'home/chemistry.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/chemistry.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
 
     elif subject=='biology':
-        mcq_all = biology.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter).order_by('-day','-creation_time')[p:mul]
-        a=total_biology.objects.values()
-        chapter_list=[]
-        for key, value in a[0].items():
-            if (key == 'total_biology') or (key=='total_biology_page')or (key=='id'):
-                pass
-            else:
-                if value >=1:
-                    chapter_list.append(key)
+        pager = pagination.seek_page(biology.objects.values('ans','topic','subtopic','subtopic_2','year_exam','question','option_1','option_2','option_3','option_4','option_5','extra').filter(chapter=chapter),params_int,mul-p,('-day','-creation_time'),request.GET.get('cursor'))
+        mcq_all = pager.rows
+        chapter_list=['chapter_'+c for c in subject_stats.chapters('biology')]
         print(chapter_list)
            
-        return render(request,'home/biology.html',{'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
+        return render(request,'home/biology.html',{'pager':pager,'chapter':chapter,'chapter_list':chapter_list,'mcq_all': mcq_all,'subject':subject,'topic':topic,'subtopic':subtopic,'subtopic2':subtopic2,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':chapter})
 
 
         
    
                 
-    return render(request,'home/mcq.html',{'mcq_2019_info': mcq_2019_info,'mcq_2018_info': mcq_2018_info,'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
+    return render(request,'home/mcq.html',{'sidebar_years': calendar_index.sidebar_context('mcq'),'mcq_all': mcq_all,'user_year':user_year,'user_month':user_month,'user_day':user_page_no,'form':userform,'login':login,'p':diff_from_top,'page':page,'params':params_int,'next':next,'previous':previous,'tag_page':tag_page})
 
 
 def database(request):
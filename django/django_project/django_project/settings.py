@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/1.8/ref/settings/
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 import os
+import tempfile
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -72,7 +73,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
-                
+                'bank.context_processors.fragment_versions',
             ],
         },
     },
@@ -105,6 +106,20 @@ DATABASES = {
     }
 }
 
+# Shared by every worker process so version bumps from bank.signals
+# invalidate cached fragments everywhere (LocMemCache is per process).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'tutionplus_cache'),
+        'TIMEOUT': 60 * 60 * 6,
+    }
+}
+
+# Estimated Jaccard similarity of question word-pairs at or above which
+# bank.services.near_duplicates treats a new MCQ as a reworded duplicate.
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
 # Disable UTC timezone assertion for Windows PostgreSQL (development only)
 import psycopg2
 from psycopg2 import extensions
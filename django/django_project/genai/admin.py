@@ -12,8 +12,9 @@ from django.shortcuts import render, redirect
 from django.http import HttpResponseRedirect
 from django.template.response import TemplateResponse
 from bank.admin import admin_site
-from .models import PDFUpload, CurrentAffairsGeneration, MathProblemGeneration, ProcessingTask, ProcessingLog, ContentSource, LLMPrompt, JobFetch, JsonImport
+from .models import PDFUpload, CurrentAffairsGeneration, MathProblemGeneration, ProcessingTask, ProcessingLog, LLMCallLog, ContentSource, LLMPrompt, JobFetch, JsonImport
 from .bulk_import import BulkImporter
+from .stream_import import StreamingImporter
 from genai.tasks.job_scraper import run_job_fetch
 
 
@@ -608,7 +609,7 @@ class ProcessingLogAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Task Information', {
-            'fields': ('id', 'task_type', 'status', 'created_by', 'pdf_upload')
+            'fields': ('id', 'task_type', 'status', 'created_by', 'pdf_upload', 'json_import')
         }),
         ('Subject Routing (NEW)', {
             'fields': ('subject', 'difficulty_level', 'output_format', 'num_items'),
@@ -1500,8 +1501,8 @@ class JsonImportAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Configuration', {
-            'fields': ('to_table', 'json_data'),
-            'description': 'Select the target table and paste your JSON array of objects'
+            'fields': ('to_table', 'json_data', 'json_file'),
+            'description': 'Select the target table and paste your JSON array of objects, or upload a JSON array / NDJSON file for a streaming import'
         }),
         ('Metadata', {
             'fields': ('created_by', 'created_at', 'updated_at'),
@@ -1521,6 +1522,10 @@ class JsonImportAdmin(admin.ModelAdmin):
     
     def record_count(self, obj):
         """Count records in JSON"""
+        if obj.json_file:
+            # Never load an uploaded file here; show the streaming progress instead
+            log = obj.processing_logs.order_by('-created_at').first()
+            return f"{log.status} ({log.progress_percentage}%)" if log else 'file'
         try:
             import json
             data = json.loads(obj.json_data)
@@ -1580,6 +1585,7 @@ class JsonImportAdmin(admin.ModelAdmin):
                 # Process each selected JsonImport record
                 success_count = 0
                 error_count = 0
+                queued_count = 0
                 
                 print(f"\n📥 [ADMIN] Processing {queryset.count()} JsonImport records...")
                 for idx, json_import in enumerate(queryset, 1):
@@ -1587,13 +1593,21 @@ class JsonImportAdmin(admin.ModelAdmin):
                     print(f"      - ID: {json_import.id}")
                     print(f"      - JSON Data Length: {len(json_import.json_data)} chars")
                     
+                    if json_import.json_file:
+                        # Large files are imported in committed chunks outside the request
+                        log = StreamingImporter(json_import, form_date=import_date).log
+                        queued_count += 1
+                        print(f"      📤 Queued streaming import (ProcessingLog {log.id})")
+                        continue
+                    
                     # Run the importer
                     print(f"      [INIT] Creating BulkImporter instance...")
                     importer = BulkImporter(
                         table_name=json_import.to_table,
                         json_data=json_import.json_data,
                         form_date=import_date,
-                        form_time=time(10, 0, 0)  # Default time
+                        form_time=time(10, 0, 0),  # Default time
+                        bulk=True
                     )
                     print(f"      ✅ BulkImporter created")
                     
@@ -1617,6 +1631,8 @@ class JsonImportAdmin(admin.ModelAdmin):
                 
                 # Show success message
                 message = f'✅ Bulk import completed! Records created/updated: {success_count}. Errors: {error_count}'
+                if queued_count:
+                    message += f'. Queued {queued_count} file import(s) - run "python manage.py import_json_stream"'
                 print(f"   Message: {message}")
                 self.message_user(request, message)
                 print(f"   [REDIRECT] Redirecting to {request.path}")
@@ -1657,12 +1673,36 @@ class JsonImportAdmin(admin.ModelAdmin):
     bulk_import_action.short_description = '📥 Bulk Import (Select records & proceed)'
 
 
+class LLMCallLogAdmin(admin.ModelAdmin):
+    """Read-only admin for per-call LLM telemetry (written by genai/utils/llm_telemetry.py)"""
+    
+    list_display = ('created_at', 'provider', 'model', 'call_type', 'task_type', 'prompt_tokens', 'completion_tokens', 'latency_display', 'retries', 'cache_hit', 'success', 'cost', 'processing_log')
+    list_filter = ('provider', 'call_type', 'cache_hit', 'success', 'tokens_estimated', 'created_at')
+    search_fields = ('source_url', 'error_message', 'model')
+    list_select_related = ('processing_log',)
+    date_hierarchy = 'created_at'
+    
+    def latency_display(self, obj):
+        """Total latency with time to first byte"""
+        if obj.time_to_first_byte is None:
+            return f"{obj.latency:.2f}s"
+        return f"{obj.latency:.2f}s (first byte {obj.time_to_first_byte:.2f}s)"
+    latency_display.short_description = 'Latency'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # Register models with admin
 admin_site.register(PDFUpload, PDFUploadAdmin)
 admin_site.register(CurrentAffairsGeneration, CurrentAffairsGenerationAdmin)
 admin_site.register(MathProblemGeneration, MathProblemGenerationAdmin)
 admin_site.register(ProcessingTask, ProcessingTaskAdmin)
 admin_site.register(ProcessingLog, ProcessingLogAdmin)
+admin_site.register(LLMCallLog, LLMCallLogAdmin)
 admin_site.register(ContentSource, ContentSourceAdmin)
 admin_site.register(LLMPrompt, LLMPromptAdmin)
 admin_site.register(JobFetch, JobFetchAdmin)
@@ -18,5 +18,5 @@ class GenaiConfig(AppConfig):
         """Initialize the GenAI app"""
         logger.info("GenAI Content Generation System initialized")
         
-        # You can add signal handlers here if needed
-        # from . import signals  # if you create a signals.py file
+        # Keeps the prompt registry in sync with LLMPrompt
+        import genai.signals
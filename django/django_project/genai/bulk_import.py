@@ -5,17 +5,49 @@ Handles mapping JSON fields to model fields and saving records
 
 import json
 import logging
+import time as clock
 from datetime import datetime, date, time
 from typing import Dict, Any, List, Tuple
 from decimal import Decimal
 
+from django.db import transaction
+
+from bank.services import counters, fingerprints, near_duplicates, pagination, recompute
+from bank.services.recompute import deferred_recompute
+
 logger = logging.getLogger(__name__)
 
+# Boolean category flags on currentaffairs_mcq / currentaffairs_descriptive
+CATEGORY_FIELDS = [
+    'Science_Techonlogy', 'National', 'International',
+    'Business_Economy_Banking', 'Environment', 'Defence',
+    'Sports', 'Art_Culture', 'Awards_Honours', 'Persons_in_News',
+    'Government_Schemes', 'State', 'appointment', 'obituary',
+    'important_day', 'rank', 'mythology', 'agreement', 'medical', 'static_gk'
+]
+
+# Tables with a bulk write path: table -> the field that, with day, identifies a row
+BULK_KEY_FIELDS = {
+    'currentaffairs_mcq': 'question',
+    'currentaffairs_descriptive': 'upper_heading',
+}
+
+# Record keys a default is read from when it is not the field's own name; a
+# bulk update leaves a field alone when the record has none of them
+FIELD_SOURCES = {
+    'year_now': ('year_now', 'year'),
+    'ans': ('ans', 'correct_answer'),
+    'extra': ('extra', 'explanation'),
+}
+
+DEFAULT_CHUNK_SIZE = 500
+
 
 class BulkImporter:
     """Handles bulk import of JSON data to bank models"""
     
-    def __init__(self, table_name: str, json_data: str, form_date: date = None, form_time: time = None):
+    def __init__(self, table_name: str, json_data: str, form_date: date = None, form_time: time = None,
+                 bulk: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
         """
         Initialize bulk importer
         
@@ -24,6 +56,8 @@ class BulkImporter:
             json_data: JSON string containing array of objects
             form_date: Date from the intermediate form (fallback if not in JSON)
             form_time: Time from the intermediate form (fallback if not in JSON)
+            bulk: Use chunked bulk_create/bulk_update for the current affairs tables
+            chunk_size: Rows per bulk chunk (each chunk is one transaction)
         """
         print("\n" + "="*80)
         print(f"📦 [IMPORTER_INIT] BulkImporter.__init__() called")
@@ -41,6 +75,9 @@ class BulkImporter:
         self.errors = []
         self.created_count = 0
         self.updated_count = 0
+        self.bulk = bulk and table_name in BULK_KEY_FIELDS
+        self.chunk_size = max(int(chunk_size), 1)
+        self.chunk_stats = []
         
         print(f"   ✅ Importer initialized")
         print(f"   Using date: {self.form_date}")
@@ -162,191 +199,111 @@ class BulkImporter:
         
         return str(year_now), str(month), day_date
     
+    def parse_creation_time(self, record: Dict) -> time:
+        """creation_time from the record ('%H:%M:%S'), falling back to the form time"""
+        creation_time = record.get('creation_time')
+        if isinstance(creation_time, str):
+            try:
+                return datetime.strptime(creation_time, '%H:%M:%S').time()
+            except ValueError:
+                return self.form_time
+        return creation_time or self.form_time
+    
+    def build_currentaffairs_mcq(self, record: Dict) -> Tuple[Dict, Dict, Any]:
+        """Map a record to (lookup, defaults, categories) for currentaffairs_mcq"""
+        year_now, month, day_date = self.extract_date_from_record(record)
+        
+        # Handle correct answer
+        ans = record.get('ans', record.get('correct_answer', 1))
+        if isinstance(ans, str):
+            ans_map = {'A': 1, 'B': 2, 'C': 3, 'D': 4, '1': 1, '2': 2, '3': 3, '4': 4}
+            ans = ans_map.get(ans.upper(), 1)
+        
+        lookup = {
+            'question': record.get('question', ''),
+            'day': day_date,
+        }
+        defaults = {
+            'year_now': year_now,
+            'month': month,
+            'option_1': record.get('option_1', ''),
+            'option_2': record.get('option_2', ''),
+            'option_3': record.get('option_3', ''),
+            'option_4': record.get('option_4', ''),
+            'option_5': record.get('option_5', ''),
+            'ans': int(ans),
+            'creation_time': self.parse_creation_time(record),
+            'extra': record.get('extra', record.get('explanation', '')),
+            'is_live': record.get('is_live', True),
+        }
+        return lookup, defaults, record.get('categories', [])
+    
+    def build_currentaffairs_descriptive(self, record: Dict) -> Tuple[Dict, Dict, Any]:
+        """Map a record to (lookup, defaults, categories) for currentaffairs_descriptive"""
+        year_now, month, day_date = self.extract_date_from_record(record)
+        lookup = {
+            'upper_heading': record.get('upper_heading', ''),
+            'day': day_date,
+        }
+        defaults = {
+            'year_now': year_now,
+            'month': month,
+            'yellow_heading': record.get('yellow_heading', ''),
+            'key_1': record.get('key_1', ''),
+            'key_2': record.get('key_2', ''),
+            'key_3': record.get('key_3', ''),
+            'key_4': record.get('key_4', ''),
+            'creation_time': self.parse_creation_time(record),
+            'all_key_points': record.get('all_key_points', ''),
+            'paragraph': record.get('paragraph', ''),
+            'link': record.get('link', ''),
+            'url': record.get('url', ''),
+        }
+        return lookup, defaults, record.get('categories', [])
+    
+    def apply_categories(self, obj, categories) -> bool:
+        """Reset the category flags on obj and set the listed ones; False if not a list"""
+        if isinstance(categories, str):
+            categories = [categories]
+        if not isinstance(categories, list):
+            return False
+        
+        # Reset all categories to False first
+        for field in CATEGORY_FIELDS:
+            if hasattr(obj, field):
+                setattr(obj, field, False)
+        
+        # Set specified categories to True
+        for cat in categories:
+            if isinstance(cat, str):
+                cat = cat.strip()
+                if hasattr(obj, cat):
+                    setattr(obj, cat, True)
+        return True
+    
     def process_currentaffairs_mcq(self, record: Dict, model_class) -> bool:
         """Process and save currentaffairs_mcq records"""
         print(f"\n   [PROCESS_MCQ] Processing MCQ record...")
-        try:
-            print(f"      [EXTRACT_DATE] Extracting date information...")
-            year_now, month, day_date = self.extract_date_from_record(record)
-            print(f"         Year: {year_now}, Month: {month}, Day: {day_date}")
-            
-            # Extract fields
-            question = record.get('question', '')
-            option_1 = record.get('option_1', '')
-            option_2 = record.get('option_2', '')
-            option_3 = record.get('option_3', '')
-            option_4 = record.get('option_4', '')
-            option_5 = record.get('option_5', '')
-            
-            print(f"      [FIELDS] Extracted question: {question[:80]}...")
-            print(f"               Option fields extracted: 5")
-            
-            # Handle correct answer
-            ans = record.get('ans', record.get('correct_answer', 1))
-            if isinstance(ans, str):
-                ans_map = {'A': 1, 'B': 2, 'C': 3, 'D': 4, '1': 1, '2': 2, '3': 3, '4': 4}
-                ans = ans_map.get(ans.upper(), 1)
-            print(f"      [ANSWER] Correct answer: {ans}")
-            
-            # Extract creation time
-            creation_time = record.get('creation_time')
-            if isinstance(creation_time, str):
-                try:
-                    creation_time = datetime.strptime(creation_time, '%H:%M:%S').time()
-                except ValueError:
-                    creation_time = self.form_time
-            elif not creation_time:
-                creation_time = self.form_time
-            print(f"      [TIME] Creation time: {creation_time}")
-            
-            # Create or update record
-            print(f"      [DB] Calling update_or_create()...")
-            obj, created = model_class.objects.update_or_create(
-                question=question,
-                day=day_date,
-                defaults={
-                    'year_now': year_now,
-                    'month': month,
-                    'option_1': option_1,
-                    'option_2': option_2,
-                    'option_3': option_3,
-                    'option_4': option_4,
-                    'option_5': option_5,
-                    'ans': int(ans),
-                    'creation_time': creation_time,
-                    'extra': record.get('extra', record.get('explanation', '')),
-                    'is_live': record.get('is_live', True),
-                }
-            )
-            print(f"         {'✅ CREATED' if created else '✏️  UPDATED'} Record (ID: {obj.id})")
-            
-            # Handle categories (boolean fields)
-            categories = record.get('categories', [])
-            if isinstance(categories, str):
-                categories = [categories]
-            
-            print(f"      [CATEGORIES] Setting categories: {categories}")
-            if isinstance(categories, list):
-                category_fields = [
-                    'Science_Techonlogy', 'National', 'International',
-                    'Business_Economy_Banking', 'Environment', 'Defence',
-                    'Sports', 'Art_Culture', 'Awards_Honours', 'Persons_in_News',
-                    'Government_Schemes', 'State', 'appointment', 'obituary',
-                    'important_day', 'rank', 'mythology', 'agreement', 'medical', 'static_gk'
-                ]
-                
-                # Reset all categories to False first
-                for field in category_fields:
-                    if hasattr(obj, field):
-                        setattr(obj, field, False)
-                
-                # Set specified categories to True
-                for cat in categories:
-                    if isinstance(cat, str):
-                        cat = cat.strip()
-                        if hasattr(obj, cat):
-                            setattr(obj, cat, True)
-                            print(f"         ✓ {cat} = True")
-                
-                obj.save()
-                print(f"         ✅ Categories saved")
-            
-            if created:
-                self.created_count += 1
-            else:
-                self.updated_count += 1
-            
-            print(f"      ✅ MCQ processing complete")
-            logger.info(f"{'Created' if created else 'Updated'} MCQ: {question[:50]}...")
-            return True
-        
-        except Exception as e:
-            error_msg = f"Error processing MCQ: {str(e)}"
-            print(f"      ❌ {error_msg}")
-            self.errors.append(error_msg)
-            logger.error(error_msg)
-            return False
+        return self.process_keyed_record(record, model_class, self.build_currentaffairs_mcq, 'MCQ')
     
     def process_currentaffairs_descriptive(self, record: Dict, model_class) -> bool:
         """Process and save currentaffairs_descriptive records"""
         print(f"\n   [PROCESS_DESC] Processing descriptive record...")
+        return self.process_keyed_record(record, model_class, self.build_currentaffairs_descriptive, 'Descriptive')
+    
+    def process_keyed_record(self, record: Dict, model_class, build, label: str) -> bool:
+        """update_or_create one current-affairs record, then set its category flags"""
         try:
-            print(f"      [EXTRACT_DATE] Extracting date information...")
-            year_now, month, day_date = self.extract_date_from_record(record)
-            print(f"         Year: {year_now}, Month: {month}, Day: {day_date}")
-            
-            # Extract fields
-            upper_heading = record.get('upper_heading', '')
-            yellow_heading = record.get('yellow_heading', '')
-            key_1 = record.get('key_1', '')
-            key_2 = record.get('key_2', '')
-            key_3 = record.get('key_3', '')
-            key_4 = record.get('key_4', '')
-            
-            print(f"      [FIELDS] Extracted upper_heading: {upper_heading[:80]}...")
-            print(f"               Key fields extracted: 4")
-            
-            # Extract creation time
-            creation_time = record.get('creation_time')
-            if isinstance(creation_time, str):
-                try:
-                    creation_time = datetime.strptime(creation_time, '%H:%M:%S').time()
-                except ValueError:
-                    creation_time = self.form_time
-            elif not creation_time:
-                creation_time = self.form_time
-            print(f"      [TIME] Creation time: {creation_time}")
+            lookup, defaults, categories = build(record)
+            print(f"      [FIELDS] {lookup} (creation_time {defaults['creation_time']})")
             
             # Create or update record
             print(f"      [DB] Calling update_or_create()...")
-            obj, created = model_class.objects.update_or_create(
-                upper_heading=upper_heading,
-                day=day_date,
-                defaults={
-                    'year_now': year_now,
-                    'month': month,
-                    'yellow_heading': yellow_heading,
-                    'key_1': key_1,
-                    'key_2': key_2,
-                    'key_3': key_3,
-                    'key_4': key_4,
-                    'creation_time': creation_time,
-                    'all_key_points': record.get('all_key_points', ''),
-                    'paragraph': record.get('paragraph', ''),
-                    'link': record.get('link', ''),
-                    'url': record.get('url', ''),
-                }
-            )
+            obj, created = model_class.objects.update_or_create(defaults=defaults, **lookup)
             print(f"         {'✅ CREATED' if created else '✏️  UPDATED'} Record (ID: {obj.id})")
             
-            # Handle categories (boolean fields)
-            categories = record.get('categories', [])
-            if isinstance(categories, str):
-                categories = [categories]
-            
             print(f"      [CATEGORIES] Setting categories: {categories}")
-            if isinstance(categories, list):
-                category_fields = [
-                    'Science_Techonlogy', 'National', 'International',
-                    'Business_Economy_Banking', 'Environment', 'Defence',
-                    'Sports', 'Art_Culture', 'Awards_Honours', 'Persons_in_News',
-                    'Government_Schemes', 'State', 'appointment', 'obituary',
-                    'important_day', 'rank', 'mythology', 'agreement', 'medical', 'static_gk'
-                ]
-                
-                # Reset all categories to False first
-                for field in category_fields:
-                    if hasattr(obj, field):
-                        setattr(obj, field, False)
-                
-                # Set specified categories to True
-                for cat in categories:
-                    if isinstance(cat, str):
-                        cat = cat.strip()
-                        if hasattr(obj, cat):
-                            setattr(obj, cat, True)
-                            print(f"         ✓ {cat} = True")
-                
+            if self.apply_categories(obj, categories):
                 obj.save()
                 print(f"         ✅ Categories saved")
             
@@ -355,12 +312,13 @@ class BulkImporter:
             else:
                 self.updated_count += 1
             
-            print(f"      ✅ Descriptive processing complete")
-            logger.info(f"{'Created' if created else 'Updated'} Descriptive: {upper_heading[:50]}...")
+            first_value = str(next(iter(lookup.values())))
+            print(f"      ✅ {label} processing complete")
+            logger.info(f"{'Created' if created else 'Updated'} {label}: {first_value[:50]}...")
             return True
         
         except Exception as e:
-            error_msg = f"Error processing descriptive: {str(e)}"
+            error_msg = f"Error processing {label}: {str(e)}"
             print(f"      ❌ {error_msg}")
             self.errors.append(error_msg)
             logger.error(error_msg)
@@ -461,6 +419,145 @@ class BulkImporter:
             logger.error(error_msg)
             return False
     
+    def import_bulk(self, model_class) -> None:
+        """
+        Import all records with chunked bulk_create / bulk_update
+        
+        Existing (key, day) rows are preloaded in one query and an update only
+        changes the fields its record carries (a record without 'categories'
+        keeps the stored flags); new_id and the category flags are computed in
+        memory, and each chunk is written in its own transaction. The bank signals do not fire for bulk writes, so the
+        counters, calendar and info rows are rebuilt once for the touched years
+        when import_data() leaves deferred_recompute().
+        """
+        key_field = BULK_KEY_FIELDS[self.table_name]
+        build = getattr(self, 'build_' + self.table_name)
+        
+        # Map records in memory; a repeated key updates the earlier record
+        pending = {}
+        for idx, record in enumerate(self.records, 1):
+            if not isinstance(record, dict):
+                self.errors.append(f"Record {idx} is not a dict: {type(record)}")
+                continue
+            try:
+                lookup, defaults, categories = build(record)
+            except Exception as e:
+                self.errors.append(f"Record {idx}: {str(e)}")
+                continue
+            carried = {
+                field for field in defaults
+                if any(source in record for source in FIELD_SOURCES.get(field, (field,)))
+            }
+            if 'categories' not in record:
+                categories = None
+            key = (lookup[key_field], lookup['day'])
+            if key in pending:
+                self.updated_count += 1
+                _lookup, earlier, earlier_carried, earlier_categories = pending[key]
+                defaults = dict(earlier, **{field: defaults[field] for field in carried})
+                carried |= earlier_carried
+                if categories is None:
+                    categories = earlier_categories
+            pending[key] = (lookup, defaults, carried, categories)
+        
+        # Preload the keys that already exist in one query
+        existing = {}
+        if pending:
+            rows = model_class.objects.filter(
+                day__in={day for _value, day in pending},
+                **{key_field + '__in': {value for value, _day in pending}}
+            ).order_by('id').values_list('id', key_field, 'day')
+            for pk, value, day in rows:
+                existing.setdefault((value, day), pk)
+        print(f"   [BULK] {len(pending)} distinct records, {len(existing)} already stored")
+        
+        stored = model_class.objects.in_bulk(set(existing.values())) if existing else {}
+        
+        inserts, updates = [], []
+        update_fields = {'new_id'}
+        for key, (lookup, defaults, carried, categories) in pending.items():
+            obj = stored.get(existing.get(key))
+            if obj is None:
+                obj = model_class(**lookup, **defaults)
+                self.apply_categories(obj, [] if categories is None else categories)
+            else:
+                # Fields the record omits keep their stored values
+                for field in carried:
+                    setattr(obj, field, defaults[field])
+                update_fields |= carried
+                if self.apply_categories(obj, categories):
+                    update_fields.update(f for f in CATEGORY_FIELDS if hasattr(model_class, f))
+            obj.new_id = obj.make_new_id()
+            if hasattr(obj, 'fingerprint'):
+                obj.fingerprint = fingerprints.for_instance(obj)
+            (updates if obj.id else inserts).append(obj)
+        if hasattr(model_class, 'fingerprint'):
+            update_fields.add('fingerprint')
+        
+        for kind, objs in (('insert', inserts), ('update', updates)):
+            for start in range(0, len(objs), self.chunk_size):
+                chunk = objs[start:start + self.chunk_size]
+                started = clock.monotonic()
+                with transaction.atomic():
+                    if kind == 'insert':
+                        model_class.objects.bulk_create(chunk)
+                    else:
+                        model_class.objects.bulk_update(chunk, sorted(update_fields))
+                    if near_duplicates.table_for(model_class):
+                        # bulk writes skip the signals; pk is unset after bulk_create on sqlite
+                        for obj in chunk:
+                            if obj.pk:
+                                near_duplicates.mark_dirty(model_class, obj.pk)
+                elapsed = clock.monotonic() - started
+                stats = {
+                    'chunk': len(self.chunk_stats) + 1,
+                    'operation': kind,
+                    'rows': len(chunk),
+                    'seconds': round(elapsed, 3),
+                    'rows_per_second': round(len(chunk) / elapsed) if elapsed else len(chunk),
+                }
+                self.chunk_stats.append(stats)
+                print(f"   [BULK] chunk {stats['chunk']}: {kind} {stats['rows']} rows "
+                      f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s)")
+        
+        self.created_count += len(inserts)
+        self.updated_count += len(updates)
+        
+        if inserts or updates:
+            years = {day.year for _value, day in pending}
+            recompute.mark_dirty(
+                counters.content_type_for(model_class), years, rebuild=True, rows=len(inserts) + len(updates)
+            )
+            pagination.invalidate(model_class)
+    
+    def process_records(self, model_class) -> None:
+        """Write self.records with the bulk path or the per-record processors"""
+        if self.bulk:
+            self.import_bulk(model_class)
+            return
+        for idx, record in enumerate(self.records, 1):
+            print(f"\n   ['RECORD {idx}/{len(self.records)}]")
+        
+            if not isinstance(record, dict):
+                print(f"      ❌ Record is not a dict: {type(record)}")
+                self.errors.append(f"Record {idx} is not a dict: {type(record)}")
+                continue
+        
+            # Use specific processor based on table name
+            if self.table_name == 'currentaffairs_mcq':
+                print(f"      [ROUTE] → process_currentaffairs_mcq()")
+                self.process_currentaffairs_mcq(record, model_class)
+            elif self.table_name == 'currentaffairs_descriptive':
+                print(f"      [ROUTE] → process_currentaffairs_descriptive()")
+                self.process_currentaffairs_descriptive(record, model_class)
+            elif self.table_name == 'current_affairs_slide':
+                print(f"      [ROUTE] → process_current_affairs_slide()")
+                self.process_current_affairs_slide(record, model_class)
+            else:
+                print(f"      [ROUTE] → process_generic_model()")
+                self.process_generic_model(record, model_class)
+    
+    @deferred_recompute()
     def import_data(self) -> Dict[str, Any]:
         """Main import method"""
         print("\n" + "="*80)
@@ -506,27 +603,7 @@ class BulkImporter:
         print(f"[STEP 3] PROCESSING RECORDS")
         print(f"   Total records to process: {len(self.records)}\n")
         
-        for idx, record in enumerate(self.records, 1):
-            print(f"\n   ['RECORD {idx}/{len(self.records)}]")
-            
-            if not isinstance(record, dict):
-                print(f"      ❌ Record is not a dict: {type(record)}")
-                self.errors.append(f"Record {idx} is not a dict: {type(record)}")
-                continue
-            
-            # Use specific processor based on table name
-            if self.table_name == 'currentaffairs_mcq':
-                print(f"      [ROUTE] → process_currentaffairs_mcq()")
-                self.process_currentaffairs_mcq(record, model_class)
-            elif self.table_name == 'currentaffairs_descriptive':
-                print(f"      [ROUTE] → process_currentaffairs_descriptive()")
-                self.process_currentaffairs_descriptive(record, model_class)
-            elif self.table_name == 'current_affairs_slide':
-                print(f"      [ROUTE] → process_current_affairs_slide()")
-                self.process_current_affairs_slide(record, model_class)
-            else:
-                print(f"      [ROUTE] → process_generic_model()")
-                self.process_generic_model(record, model_class)
+        self.process_records(model_class)
         
         # Prepare final result
         print(f"\n[STEP 4] FINALIZING RESULTS")
@@ -534,6 +611,7 @@ class BulkImporter:
         result['created'] = self.created_count
         result['updated'] = self.updated_count
         result['errors'] = self.errors
+        result['chunks'] = self.chunk_stats
         result['message'] = f"Import completed! Created: {self.created_count}, Updated: {self.updated_count}, Errors: {len(self.errors)}"
         
         print(f"   Created Records: {self.created_count}")
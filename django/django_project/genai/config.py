@@ -3,7 +3,9 @@ GenAI Configuration File
 Configure your LLM API keys and endpoints here
 """
 
+import json
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load .env from project root (3 directories up from this file)
@@ -54,6 +56,24 @@ CURRENT_AFFAIRS_SOURCES = {
 # PDF Processing Configuration
 PDF_UPLOAD_PATH = os.path.join(os.path.dirname(__file__), 'uploaded_pdfs')
 MAX_PDF_SIZE = 50 * 1024 * 1024  # 50MB
+# Extracted page text, keyed by file content (see genai/utils/pdf_text_cache.py)
+PDF_TEXT_CACHE_ENABLED = os.getenv('PDF_TEXT_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+PDF_TEXT_CACHE_PATH = os.getenv('PDF_TEXT_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_pdf_text.sqlite3'))
+# Page extraction on a process pool (see genai/utils/parallel_extract.py), 0 workers = CPU count
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', '0'))
+PDF_OCR_WORKERS = int(os.getenv('PDF_OCR_WORKERS', '2'))  # every OCR worker loads its own models
+PDF_EXTRACT_MIN_PAGES = int(os.getenv('PDF_EXTRACT_MIN_PAGES', '24'))  # smaller requests run serially
+PDF_EXTRACT_WORKER_MEMORY_MB = int(os.getenv('PDF_EXTRACT_WORKER_MEMORY_MB', '2048'))  # 0 = no cap
+PDF_EXTRACT_TASKS_PER_WORKER = int(os.getenv('PDF_EXTRACT_TASKS_PER_WORKER', '32'))  # shards before a worker is replaced (reloads its OCR models)
+
+# OCR: pages are rendered in memory and recognized OCR_BATCH_SIZE at a time
+OCR_BATCH_SIZE = int(os.getenv('OCR_BATCH_SIZE', '4'))
+OCR_RENDER_ZOOM = float(os.getenv('OCR_RENDER_ZOOM', '2.0'))  # 2x = 144 dpi, when the glyph size is unknown
+# Page triage picks skip / text / image regions / full-page OCR per page (see genai/utils/page_triage.py)
+OCR_PAGE_TRIAGE = os.getenv('OCR_PAGE_TRIAGE', 'true').lower() in ('1', 'true', 'yes')
+OCR_TARGET_GLYPH_PX = int(os.getenv('OCR_TARGET_GLYPH_PX', '24'))  # rendered text height full-page OCR aims for
+OCR_MIN_ZOOM = float(os.getenv('OCR_MIN_ZOOM', '1.0'))
+OCR_MAX_ZOOM = float(os.getenv('OCR_MAX_ZOOM', '3.0'))
 
 # Request Headers
 REQUEST_HEADERS = {
@@ -64,6 +84,95 @@ REQUEST_HEADERS = {
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
+# Concurrent LLM calls per provider (current affairs pipeline worker threads)
+GROQ_CONCURRENCY = int(os.getenv('GROQ_CONCURRENCY', '4'))
+GEMINI_CONCURRENCY = int(os.getenv('GEMINI_CONCURRENCY', '4'))
+OPENAI_CONCURRENCY = int(os.getenv('OPENAI_CONCURRENCY', '4'))
+
+# LLM Rate Limits, shared by all worker processes (see genai/utils/rate_limiter.py)
+# RPM = requests per minute, TPM = prompt + completion tokens per minute, 0 = unlimited
+LLM_RATE_LIMIT_ENABLED = os.getenv('LLM_RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_RATE_LIMIT_PATH = os.getenv('LLM_RATE_LIMIT_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_llm_ratelimit.sqlite3'))
+GROQ_RPM = int(os.getenv('GROQ_RPM', '30'))
+GROQ_TPM = int(os.getenv('GROQ_TPM', '60000'))
+GEMINI_RPM = int(os.getenv('GEMINI_RPM', '15'))
+GEMINI_TPM = int(os.getenv('GEMINI_TPM', '1000000'))
+OPENAI_RPM = int(os.getenv('OPENAI_RPM', '60'))
+OPENAI_TPM = int(os.getenv('OPENAI_TPM', '90000'))
+# Completion tokens reserved per call before the response length is known
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv('LLM_COMPLETION_TOKEN_ESTIMATE', '2048'))
+LLM_BACKOFF_MAX_DELAY = float(os.getenv('LLM_BACKOFF_MAX_DELAY', '60'))
+
+# LLM Provider Failover (see FailoverLLMProvider / genai/utils/provider_health.py)
+# Backup providers are only used when their API key is configured
+LLM_FAILOVER_ENABLED = os.getenv('LLM_FAILOVER_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_FAILOVER_ORDER = [p.strip().lower() for p in os.getenv('LLM_FAILOVER_ORDER', 'groq,gemini,openai').split(',') if p.strip()]
+LLM_HEALTH_PATH = os.getenv('LLM_HEALTH_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_llm_health.sqlite3'))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '3'))  # consecutive failures that open the circuit
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '120'))  # seconds before a probe call
+# Hedging: send the prompt to the next provider too when the primary is slower than its p95
+LLM_HEDGE_ENABLED = os.getenv('LLM_HEDGE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv('LLM_HEDGE_DEFAULT_DELAY', '45'))  # seconds, until enough samples
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+
+# Streaming generation: save questions while the LLM is still writing (see genai/utils/json_stream.py)
+LLM_STREAMING_ENABLED = os.getenv('LLM_STREAMING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_STREAM_SAVE_BATCH = int(os.getenv('LLM_STREAM_SAVE_BATCH', '5'))  # questions per progressive save
+
+# Math PDF processing: classify chapter / difficulty and extract MCQs in one LLM call per page range
+MATH_COMBINED_EXTRACTION = os.getenv('MATH_COMBINED_EXTRACTION', 'true').lower() in ('1', 'true', 'yes')
+
+# LLM Response Cache (see genai/utils/llm_cache.py)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_llm_cache.sqlite3'))
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))  # seconds
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# LLM Call Telemetry: one LLMCallLog row per call (see genai/utils/llm_telemetry.py)
+LLM_TELEMETRY_ENABLED = os.getenv('LLM_TELEMETRY_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# USD per 1M tokens as [input, output], by model name; LLM_TOKEN_PRICES='{"model": [in, out]}' overrides
+LLM_TOKEN_PRICES = {
+    'openai/gpt-oss-120b': [0.15, 0.75],
+    'llama-3.3-70b-versatile': [0.59, 0.79],
+    'gemini-1.5-flash': [0.075, 0.30],
+    'gpt-4': [30.0, 60.0],
+}
+try:
+    LLM_TOKEN_PRICES.update(json.loads(os.getenv('LLM_TOKEN_PRICES', '{}')))
+except ValueError:
+    print("[CONFIG] LLM_TOKEN_PRICES is not valid JSON, using default prices")
+
+# Content compaction: scraped pages and extracted text are fitted into a token budget (see genai/utils/content_compactor.py)
+LLM_CONTENT_TOKEN_BUDGET = int(os.getenv('LLM_CONTENT_TOKEN_BUDGET', '3000'))  # models not listed below
+# Tokens of source content per prompt, by model name; LLM_CONTENT_TOKEN_BUDGETS='{"model": tokens}' overrides
+LLM_CONTENT_TOKEN_BUDGETS = {
+    'openai/gpt-oss-120b': 6000,
+    'llama-3.3-70b-versatile': 6000,
+    'gemini-1.5-flash': 12000,
+    'gpt-4': 3000,
+}
+try:
+    LLM_CONTENT_TOKEN_BUDGETS.update(json.loads(os.getenv('LLM_CONTENT_TOKEN_BUDGETS', '{}')))
+except ValueError:
+    print("[CONFIG] LLM_CONTENT_TOKEN_BUDGETS is not valid JSON, using default budgets")
+# Blocks seen on this many pages of one site are treated as boilerplate (navigation, footers, banners)
+BOILERPLATE_PATH = os.getenv('BOILERPLATE_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_boilerplate.sqlite3'))
+BOILERPLATE_MIN_PAGES = int(os.getenv('BOILERPLATE_MIN_PAGES', '3'))
+
+# Whole-document MCQ generation: long PDFs are sent in chunks of the content budget (see genai/utils/document_chunker.py)
+LLM_CHUNK_OVERLAP_TOKENS = int(os.getenv('LLM_CHUNK_OVERLAP_TOKENS', '200'))  # repeated at the start of the next chunk
+LLM_CHUNK_MAX = int(os.getenv('LLM_CHUNK_MAX', '0'))  # chunks per call, 0 = unlimited
+
+# LLM Record / Replay for offline benchmarking (see genai/utils/llm_cassette.py)
+# 'off', 'record' (store real calls and downloaded pages) or 'replay' (serve them, no network)
+LLM_CASSETTE_MODE = os.getenv('LLM_CASSETTE_MODE', 'off').lower()
+LLM_CASSETTE_PATH = os.getenv('LLM_CASSETTE_PATH', os.path.join(tempfile.gettempdir(), 'tutionplus_llm_cassette.sqlite3'))
+# recorded[:scale], none, fixed:S, uniform:A,B, normal:MEAN,SD or lognormal:MEDIAN,SIGMA
+LLM_REPLAY_LATENCY = os.getenv('LLM_REPLAY_LATENCY', 'recorded')
+LLM_REPLAY_ERROR_RATE = float(os.getenv('LLM_REPLAY_ERROR_RATE', '0'))  # fraction of calls failing with 429 / 5xx
+LLM_REPLAY_SEED = int(os.getenv('LLM_REPLAY_SEED', '0'))
+LLM_REPLAY_CONCURRENCY = int(os.getenv('LLM_REPLAY_CONCURRENCY', '4'))
+
 # Task Queue Configuration (if using Celery)
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379')
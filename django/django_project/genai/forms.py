@@ -23,7 +23,14 @@ class MathPDFProcessingForm(forms.Form):
         label="Let LLM Decide Difficulty",
         help_text="If checked, LLM will determine difficulty level"
     )
-    
+
+    combined_llm_call = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Classify and Extract in One LLM Call",
+        help_text="Chapter, difficulty and MCQs come from a single prompt per page range (falls back to separate calls on failure)"
+    )
+
     # OCR Engine Selection
     use_paddle_ocr = forms.BooleanField(
         required=False,
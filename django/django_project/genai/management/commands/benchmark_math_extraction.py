@@ -0,0 +1,145 @@
+"""
+Management command to compare the combined (one call) and separate (three call)
+LLM modes of MathPDFProcessor on the same pages
+Usage: python manage.py benchmark_math_extraction --pdf=book.pdf --pages=1-6 [--pages-per-chunk=2] [--provider=groq]
+       python manage.py benchmark_math_extraction --problem=12 --pages=1-6
+       python manage.py benchmark_math_extraction --text-file=pages.txt   (pages separated by form feeds)
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from genai.tasks.math_processor import MathPDFProcessor, OCRDispatcher
+from genai.utils.llm_provider import get_llm_provider
+from genai.utils.rate_limiter import estimate_tokens
+
+
+class TokenCountingLLM:
+    """Forwards generate_json() to a provider and counts calls and estimated tokens"""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def generate_json(self, prompt, **kwargs):
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        response = self.provider.generate_json(prompt, **kwargs)
+        self.completion_tokens += estimate_tokens(json.dumps(response or {}))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark wall time and tokens per page of the combined vs separate math PDF LLM modes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pdf', type=str, default=None, help='PDF file to read')
+        parser.add_argument('--problem', type=int, default=None, help='MathProblemGeneration ID whose PDF to read')
+        parser.add_argument('--text-file', type=str, default=None,
+                            help='Already extracted text, one page per form feed (skips OCR)')
+        parser.add_argument('--pages', type=str, default='1-2', help='1-based page range, e.g. 1-6 (default: 1-2)')
+        parser.add_argument('--pages-per-chunk', type=int, default=2,
+                            help='Pages sent to the LLM together, like no_of_pages_at_a_time_For_EntirePDF (default: 2)')
+        parser.add_argument('--provider', type=str, default=None, help='LLM provider (default: DEFAULT_LLM_PROVIDER)')
+        parser.add_argument('--chapter', type=str, default=None,
+                            help='Fixed chapter (default: let the LLM decide)')
+        parser.add_argument('--difficulty', type=str, default=None,
+                            help='Fixed difficulty (default: let the LLM decide)')
+
+    def handle(self, *args, **options):
+        pages = self._load_pages(options)
+        if not pages:
+            raise CommandError('No text extracted from the selected pages')
+
+        size = max(1, options['pages_per_chunk'])
+        chunks = [
+            ''.join(f"\n\n=== Page {number} ===\n\n{text}" for number, text in pages[i:i + size])
+            for i in range(0, len(pages), size)
+        ]
+        self.stdout.write(f"Pages: {len(pages)}  Chunks: {len(chunks)}  Provider: {options['provider'] or 'default'}")
+
+        # The response cache would answer the second mode's repeated prompts for free
+        provider = get_llm_provider(options['provider'], cache=False)
+        config = {
+            'chapter_decide_by_llm': not options['chapter'],
+            'difficulty_level_decide_by_llm': not options['difficulty'],
+        }
+
+        rows = []
+        for mode in ('separate', 'combined'):
+            processor = MathPDFProcessor()
+            processor.llm = llm = TokenCountingLLM(provider)
+            mode_config = dict(config, combined_llm_call=mode == 'combined')
+            mcq_count = 0
+            fallbacks = 0
+            started = time.perf_counter()
+            for text in chunks:
+                _, _, mcqs, used = processor._classify_and_extract_chunk(
+                    text, mode_config, options['chapter'] or 'any', options['difficulty'] or 'medium'
+                )
+                mcq_count += len(mcqs)
+                fallbacks += used != mode
+            elapsed = time.perf_counter() - started
+            rows.append((mode, llm.calls, elapsed, llm.prompt_tokens, llm.completion_tokens, mcq_count, fallbacks))
+
+        page_count = len(pages)
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'Mode':<10}{'Calls':>7}{'Wall s':>9}{'s/page':>9}{'In tok/page':>13}"
+            f"{'Out tok/page':>14}{'MCQs':>6}{'Fallbacks':>11}"
+        )
+        for mode, calls, elapsed, prompt_tokens, completion_tokens, mcq_count, fallbacks in rows:
+            self.stdout.write(
+                f"{mode:<10}{calls:>7}{elapsed:>9.1f}{elapsed / page_count:>9.2f}"
+                f"{prompt_tokens / page_count:>13.0f}{completion_tokens / page_count:>14.0f}"
+                f"{mcq_count:>6}{fallbacks:>11}"
+            )
+
+        separate, combined = rows
+        if combined[6]:
+            self.stdout.write(self.style.WARNING(
+                f"{combined[6]} chunk(s) fell back to separate calls in combined mode"
+            ))
+        if separate[2] and combined[2]:
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ Combined mode: {separate[2] / combined[2]:.2f}x wall-time speedup, input tokens per page "
+                f"{separate[3] / page_count:.0f} → {combined[3] / page_count:.0f}"
+            ))
+
+    def _load_pages(self, options):
+        """[(1-based page number, text), ...] for the requested pages"""
+        try:
+            first, _, last = options['pages'].partition('-')
+            first = int(first)
+            last = int(last or first)
+        except ValueError:
+            raise CommandError(f"Invalid --pages value: {options['pages']}")
+
+        if options['text_file']:
+            with open(options['text_file'], encoding='utf-8') as handle:
+                texts = handle.read().split('\f')
+            return [
+                (number, texts[number - 1]) for number in range(first, min(last, len(texts)) + 1)
+                if texts[number - 1].strip()
+            ]
+
+        pdf_path = options['pdf']
+        if options['problem']:
+            from genai.models import MathProblemGeneration
+            problem = MathProblemGeneration.objects.filter(pk=options['problem']).first()
+            if not problem or not problem.pdf_file:
+                raise CommandError(f"Math problem {options['problem']} has no PDF")
+            pdf_path = problem.pdf_file.path
+        if not pdf_path:
+            raise CommandError('Give --pdf, --problem or --text-file')
+
+        ocr = OCRDispatcher(use_paddle=False, use_easy=False, use_tesseract=True)
+        texts = ocr.extract_pages(pdf_path, range(first - 1, last))
+        return [(page + 1, texts[page]) for page in sorted(texts) if texts[page]]
@@ -0,0 +1,159 @@
+"""
+Management command to benchmark and profile the processing pipelines against
+recorded LLM calls and pages (see genai/utils/llm_cassette.py)
+Usage: LLM_CASSETTE_MODE=record python manage.py fetch_all_content --type=currentaffairs_mcq   (record once, online)
+       LLM_CASSETTE_MODE=replay python manage.py benchmark_pipeline --pipeline=pdf --log-id=12 [--repeat=3]
+       LLM_CASSETTE_MODE=replay python manage.py benchmark_pipeline --pipeline=current_affairs --type=currentaffairs_mcq
+       LLM_CASSETTE_MODE=replay python manage.py benchmark_pipeline --pipeline=jobs --job-fetch=3 --max-jobs=20
+       python manage.py benchmark_pipeline --stats
+Options: --latency=lognormal:4,0.5 --error-rate=0.05 --seed=7 --profile=pipeline.prof
+
+Every run saves what the pipeline produces, like a real run: use a scratch database.
+"""
+
+import cProfile
+import io
+import pstats
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from genai.config import LLM_CASSETTE_MODE
+from genai.utils.llm_cassette import get_cassette
+
+
+class Command(BaseCommand):
+    help = 'Benchmark a processing pipeline deterministically against recorded LLM calls (LLM_CASSETTE_MODE=replay)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pipeline', choices=['pdf', 'current_affairs', 'jobs'], default=None,
+                            help='route_pdf_processing_task, run_complete_pipeline or scrape_freejobalert')
+        parser.add_argument('--log-id', type=int, default=None, help='ProcessingLog to re-run (pdf pipeline)')
+        parser.add_argument('--type', type=str, default='currentaffairs_mcq',
+                            choices=['currentaffairs_mcq', 'currentaffairs_descriptive'],
+                            help='Content type (current_affairs pipeline)')
+        parser.add_argument('--skip-scraping', action='store_true', help='current_affairs pipeline option')
+        parser.add_argument('--send-url-directly', action='store_true', help='current_affairs pipeline option')
+        parser.add_argument('--concurrency', type=int, default=None, help='current_affairs worker threads')
+        parser.add_argument('--job-fetch', type=int, default=None, help='JobFetch whose prompt to use (jobs pipeline)')
+        parser.add_argument('--max-jobs', type=int, default=10, help='Jobs to fetch (jobs pipeline, default: 10)')
+        parser.add_argument('--repeat', type=int, default=1, help='Runs to time (default: 1)')
+        parser.add_argument('--latency', type=str, default=None,
+                            help='Replay latency: recorded[:scale], none, fixed:S, uniform:A,B, normal:M,SD, lognormal:MEDIAN,SIGMA')
+        parser.add_argument('--error-rate', type=float, default=None, help='Fraction of replayed calls failing with 429 / 5xx')
+        parser.add_argument('--seed', type=int, default=None, help='Seed of the latency / error draws')
+        parser.add_argument('--profile', type=str, default=None, help='Write cProfile stats of all runs to this file')
+        parser.add_argument('--stats', action='store_true', help='Show what the cassette contains and exit')
+
+    def handle(self, *args, **options):
+        cassette = get_cassette()
+        if options['stats']:
+            stats = cassette.stats()
+            self.stdout.write(
+                f"Cassette {stats['path']}: {stats['calls']} LLM calls "
+                f"(avg {stats['avg_latency']}s, by provider {stats['providers']}), {stats['pages']} pages"
+            )
+            return
+        if not options['pipeline']:
+            raise CommandError('Give --pipeline (or --stats)')
+
+        from genai.utils.llm_provider import ReplayLLMProvider, default_llm
+        replay = default_llm
+        while replay is not None and not isinstance(replay, ReplayLLMProvider):
+            replay = replay.__dict__.get('provider')
+        if LLM_CASSETTE_MODE != 'replay' or replay is None:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ LLM_CASSETTE_MODE is not replay: the pipeline calls the live APIs and downloads pages'
+            ))
+        else:
+            replay.configure(latency=options['latency'], error_rate=options['error_rate'], seed=options['seed'])
+            self.stdout.write(
+                f"Replaying {cassette.path} (latency {replay.latency}, error rate {replay.error_rate}, seed {replay.seed})"
+            )
+
+        run = self._pipeline(options)
+        profiler = cProfile.Profile() if options['profile'] else None
+        rows = []
+        for index in range(1, max(1, options['repeat']) + 1):
+            if replay is not None:
+                replay.configure()
+            started = time.perf_counter()
+            if profiler:
+                profiler.enable()
+            try:
+                items = run()
+            finally:
+                if profiler:
+                    profiler.disable()
+            elapsed = time.perf_counter() - started
+            counters = (replay.calls, replay.misses, replay.injected_errors, replay.simulated_seconds) if replay else (0, 0, 0, 0.0)
+            rows.append((index, elapsed, items) + counters)
+
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'Run':<5}{'Wall s':>9}{'Items':>7}{'Items/s':>9}{'LLM calls':>11}{'Misses':>8}{'Errors':>8}{'LLM s':>9}"
+        )
+        for index, elapsed, items, calls, misses, errors, simulated in rows:
+            self.stdout.write(
+                f"{index:<5}{elapsed:>9.2f}{items:>7}{items / elapsed if elapsed else 0:>9.2f}"
+                f"{calls:>11}{misses:>8}{errors:>8}{simulated:>9.1f}"
+            )
+        times = [row[1] for row in rows]
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {options['pipeline']}: median {statistics.median(times):.2f}s over {len(rows)} run(s)"
+        ))
+        if any(row[4] for row in rows):
+            self.stdout.write(self.style.WARNING(
+                'Some prompts were never recorded: re-record after prompt or pipeline changes'
+            ))
+
+        if profiler:
+            profiler.dump_stats(options['profile'])
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(15)
+            self.stdout.write(summary.getvalue())
+            self.stdout.write(self.style.SUCCESS(f"✓ Profile written to {options['profile']}"))
+
+    def _pipeline(self, options):
+        """Callable running the selected pipeline once and returning the number of saved items"""
+        pipeline = options['pipeline']
+
+        if pipeline == 'pdf':
+            from genai.models import ProcessingLog
+            from genai.tasks.task_router import route_pdf_processing_task
+            log = ProcessingLog.objects.filter(pk=options['log_id']).first()
+            if not log or not log.pdf_upload:
+                raise CommandError('--pipeline=pdf needs --log-id of a ProcessingLog with a PDF upload')
+
+            def run():
+                log.status = 'pending'
+                log.success_count = 0
+                log.save()
+                route_pdf_processing_task(log)
+                return log.success_count
+            return run
+
+        if pipeline == 'current_affairs':
+            from genai.tasks.current_affairs import fetch_and_process_current_affairs
+
+            def run():
+                result = fetch_and_process_current_affairs(
+                    options['type'],
+                    skip_scraping=options['skip_scraping'],
+                    send_url_directly=options['send_url_directly'],
+                    concurrency=options['concurrency'],
+                )
+                return len(result.get('processed_items', []))
+            return run
+
+        from genai.models import JobFetch
+        from genai.tasks.job_scraper import scrape_freejobalert
+        job_fetch = JobFetch.objects.select_related('prompt').filter(pk=options['job_fetch']).first()
+        if not job_fetch:
+            raise CommandError('--pipeline=jobs needs --job-fetch of a JobFetch (for its prompt)')
+
+        def run():
+            summary = scrape_freejobalert(options['max_jobs'], job_fetch.prompt.prompt_text, use_llm=True, prune_html=True)
+            return summary.get('inserted', 0)
+        return run
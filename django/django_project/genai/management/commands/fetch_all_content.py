@@ -5,6 +5,7 @@ Usage:
     python manage.py fetch_all_content --type=mcq
     python manage.py fetch_all_content --type=current_affairs
     python manage.py fetch_all_content --type=both --schedule="14:30"
+    python manage.py fetch_all_content --type=both --concurrency=8
 """
 
 from django.core.management.base import BaseCommand
@@ -12,6 +13,7 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from genai.models import ProcessingLog, ContentSource
 from genai.tasks.current_affairs import fetch_and_process_current_affairs
+from genai.utils import llm_telemetry
 import json
 import logging
 from datetime import datetime, time
@@ -42,11 +44,18 @@ class Command(BaseCommand):
             default=None,
             help='Optional ProcessingLog ID to update instead of creating new'
         )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Sources fetched / sent to the LLM in parallel (default: per-provider setting, e.g. GROQ_CONCURRENCY)'
+        )
     
     def handle(self, *args, **options):
         content_type = options['type']
         schedule_time = options.get('schedule')
         log_id = options.get('log_id')
+        concurrency = options.get('concurrency')
         
         print("\n" + "="*70)
         print(f"📋 MANAGEMENT COMMAND STARTED: fetch_all_content")
@@ -93,17 +102,21 @@ class Command(BaseCommand):
                 self.stdout.write('📖 Fetching Current Affairs MCQ content...')
                 print(f"  📞 Calling fetch_and_process_current_affairs('currentaffairs_mcq', skip_scraping={log_entry.skip_scraping}, send_url_directly={log_entry.send_url_directly}, use_playwright={log_entry.use_playwright})...")
                 try:
-                    mcq_result = fetch_and_process_current_affairs(
-                        'currentaffairs_mcq',
-                        skip_scraping=log_entry.skip_scraping,
-                        send_url_directly=log_entry.send_url_directly,
-                        use_playwright=log_entry.use_playwright
-                    )
+                    with llm_telemetry.track(log_entry, task_type='currentaffairs_mcq'):
+                        mcq_result = fetch_and_process_current_affairs(
+                            'currentaffairs_mcq',
+                            skip_scraping=log_entry.skip_scraping,
+                            send_url_directly=log_entry.send_url_directly,
+                            use_playwright=log_entry.use_playwright,
+                            concurrency=concurrency
+                        )
                     print(f"  ✅ MCQ processing completed, result: {mcq_result}")
                     results['currentaffairs_mcq'] = mcq_result
-                    log_entry.mcq_status = '✓ Completed'
+                    source_errors = mcq_result.get('errors', [])
+                    log_entry.mcq_status = f'✓ Completed ({len(source_errors)} source errors)' if source_errors else '✓ Completed'
                     processed_count = len(mcq_result.get('processed_items', []))
                     log_entry.success_count += processed_count
+                    log_entry.error_count += len(source_errors)
                     log_data['currentaffairs_mcq'] = mcq_result
                     self.stdout.write(
                         self.style.SUCCESS(f'  ✓ MCQ: {processed_count} items processed')
@@ -124,17 +137,21 @@ class Command(BaseCommand):
                 self.stdout.write('📰 Fetching Current Affairs Descriptive content...')
                 print(f"  📞 Calling fetch_and_process_current_affairs('currentaffairs_descriptive', skip_scraping={log_entry.skip_scraping}, send_url_directly={log_entry.send_url_directly}, use_playwright={log_entry.use_playwright})...")
                 try:
-                    ca_result = fetch_and_process_current_affairs(
-                        'currentaffairs_descriptive',
-                        skip_scraping=log_entry.skip_scraping,
-                        send_url_directly=log_entry.send_url_directly,
-                        use_playwright=log_entry.use_playwright
-                    )
+                    with llm_telemetry.track(log_entry, task_type='currentaffairs_descriptive'):
+                        ca_result = fetch_and_process_current_affairs(
+                            'currentaffairs_descriptive',
+                            skip_scraping=log_entry.skip_scraping,
+                            send_url_directly=log_entry.send_url_directly,
+                            use_playwright=log_entry.use_playwright,
+                            concurrency=concurrency
+                        )
                     print(f"  ✅ Descriptive processing completed, result: {ca_result}")
                     results['currentaffairs_descriptive'] = ca_result
-                    log_entry.current_affairs_status = '✓ Completed'
+                    source_errors = ca_result.get('errors', [])
+                    log_entry.current_affairs_status = f'✓ Completed ({len(source_errors)} source errors)' if source_errors else '✓ Completed'
                     processed_count = len(ca_result.get('processed_items', []))
                     log_entry.success_count += processed_count
+                    log_entry.error_count += len(source_errors)
                     log_data['currentaffairs_descriptive'] = ca_result
                     self.stdout.write(
                         self.style.SUCCESS(f'  ✓ Current Affairs: {processed_count} items processed')
@@ -0,0 +1,56 @@
+"""
+Management command to run streaming JSON / NDJSON imports in committed chunks
+Usage: python manage.py import_json_stream [--log ID] [--json-import ID] [--resume] [--chunk-size N]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from genai.bulk_import import DEFAULT_CHUNK_SIZE
+from genai.models import JsonImport, ProcessingLog
+from genai.stream_import import StreamingImporter
+
+
+class Command(BaseCommand):
+    help = 'Import queued JsonImport files chunk by chunk, resuming interrupted imports from the last committed chunk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', type=int, help='Run (or resume) this ProcessingLog')
+        parser.add_argument('--json-import', type=int, help='Start or resume the import of this JsonImport')
+        parser.add_argument('--resume', action='store_true',
+                            help='Also pick up running/failed imports (e.g. after a crash)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f'Records per committed chunk (default {DEFAULT_CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        if options['json_import']:
+            try:
+                json_import = JsonImport.objects.get(pk=options['json_import'])
+            except JsonImport.DoesNotExist:
+                raise CommandError(f"JsonImport {options['json_import']} does not exist")
+            importers = [StreamingImporter(json_import, chunk_size=chunk_size)]
+        else:
+            logs = ProcessingLog.objects.filter(task_type='json_import', json_import__isnull=False)
+            if options['log']:
+                logs = logs.filter(pk=options['log'])
+            else:
+                statuses = ['pending', 'running', 'failed'] if options['resume'] else ['pending']
+                logs = logs.filter(status__in=statuses).order_by('created_at')
+            importers = [
+                StreamingImporter(log.json_import, chunk_size=chunk_size, log=log)
+                for log in logs.select_related('json_import')
+            ]
+
+        if not importers:
+            self.stdout.write('No streaming imports to run')
+            return
+
+        for importer in importers:
+            log = importer.run()
+            if log.status == 'completed':
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ Log {log.id}: {log.success_count} records imported, {log.error_count} errors'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(f'✗ Log {log.id}: {log.error_message}'))
@@ -0,0 +1,56 @@
+"""
+Management command to inspect or clear the persistent LLM response cache
+Usage: python manage.py llm_cache [--clear] [--provider=GroqProvider] [--model=...] [--reset-counters]
+"""
+
+from django.core.management.base import BaseCommand
+
+from genai.utils.llm_cache import get_response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show LLM response cache statistics, or drop cached responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete cached responses (all, or those matching --provider / --model)'
+        )
+        parser.add_argument(
+            '--provider',
+            type=str,
+            default=None,
+            help='Provider class name to clear, e.g. GroqProvider'
+        )
+        parser.add_argument(
+            '--model',
+            type=str,
+            default=None,
+            help='Model name to clear'
+        )
+        parser.add_argument(
+            '--reset-counters',
+            action='store_true',
+            help='Reset the hit / miss / store / eviction counters'
+        )
+
+    def handle(self, *args, **options):
+        cache = get_response_cache()
+
+        if options['clear']:
+            removed = cache.clear(provider=options['provider'], model=options['model'])
+            self.stdout.write(self.style.SUCCESS(f'✓ Removed {removed} cached responses'))
+        if options['reset_counters']:
+            cache.reset_counters()
+            self.stdout.write(self.style.SUCCESS('✓ Counters reset'))
+
+        stats = cache.stats()
+        self.stdout.write(f"Cache file: {cache.path}")
+        self.stdout.write(
+            f"Entries: {stats['entries']} ({stats['size_bytes']} / {stats['max_bytes']} bytes)"
+        )
+        self.stdout.write(
+            f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hit_rate']}%  "
+            f"Stores: {stats['stores']}  Evictions: {stats['evictions']}"
+        )
@@ -0,0 +1,42 @@
+"""
+Management command to show LLM provider circuit breakers and latency statistics
+Usage: python manage.py llm_provider_health [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+
+from genai.utils.provider_health import get_provider_health
+
+
+class Command(BaseCommand):
+    help = 'Show per-provider circuit state, error rate, p50/p95 latency, hedges and failovers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Close every circuit and forget the latency history'
+        )
+
+    def handle(self, *args, **options):
+        health = get_provider_health()
+
+        if options['reset']:
+            health.reset()
+            self.stdout.write(self.style.SUCCESS('✓ Provider health reset'))
+            return
+
+        stats = health.stats()
+        if not stats:
+            self.stdout.write('No failover LLM calls recorded yet')
+            return
+
+        for provider in stats:
+            self.stdout.write(
+                f"{provider['name']}: circuit {provider['circuit']}, {provider['calls']} calls, "
+                f"{provider['error_rate']}% errors, p50 {provider['p50']}s, p95 {provider['p95']}s, "
+                f"hedges {provider['hedges']} (backup won {provider['hedge_wins']}), "
+                f"failovers {provider['failovers']}"
+            )
+            if provider['last_error']:
+                self.stdout.write(f"    last error: {provider['last_error'][:200]}")
@@ -0,0 +1,41 @@
+"""
+Management command to show how long LLM calls waited for quota
+Usage: python manage.py llm_rate_limits [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+
+from genai.utils.rate_limiter import get_rate_limiter
+
+
+class Command(BaseCommand):
+    help = 'Show per provider/model rate limiter metrics (quota waits, 429s, retries)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the metrics and refill every bucket'
+        )
+
+    def handle(self, *args, **options):
+        limiter = get_rate_limiter()
+
+        if options['reset']:
+            limiter.reset()
+            self.stdout.write(self.style.SUCCESS('✓ Rate limiter reset'))
+            return
+
+        stats = limiter.stats()
+        if not stats:
+            self.stdout.write('No rate-limited LLM calls recorded yet')
+            return
+
+        for bucket in stats:
+            self.stdout.write(
+                f"{bucket['bucket']}: {bucket['calls']} calls, "
+                f"{bucket['waited_calls']} waited {bucket['wait_seconds']}s (avg {bucket['avg_wait']}s), "
+                f"429s {bucket['rate_limited']}, 5xx {bucket['server_errors']}, "
+                f"retries {bucket['retries']} ({bucket['backoff_seconds']}s backoff), "
+                f"failed {bucket['failures']}"
+            )
@@ -0,0 +1,34 @@
+# Generated by Django 3.0 on 2026-10-18 11:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('genai', '0019_jobfetch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jsonimport',
+            name='json_file',
+            field=models.FileField(blank=True, help_text='Or upload a JSON array / newline-delimited JSON file. Files are imported in streaming chunks by the import_json_stream command.', null=True, upload_to='genai/json_imports/%Y/%m/%d/'),
+        ),
+        migrations.AddField(
+            model_name='processinglog',
+            name='json_import',
+            field=models.ForeignKey(blank=True, help_text='JSON file if this is a streaming import task', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processing_logs', to='genai.JsonImport'),
+        ),
+        migrations.AlterField(
+            model_name='jsonimport',
+            name='json_data',
+            field=models.TextField(blank=True, help_text='Paste JSON array of objects here. Each object represents a record to be imported.'),
+        ),
+        migrations.AlterField(
+            model_name='processinglog',
+            name='task_type',
+            field=models.CharField(choices=[('currentaffairs_mcq_fetch', 'Current Affairs MCQ Fetch from URL'), ('currentaffairs_descriptive_fetch', 'Current Affairs Descriptive Fetch from URL'), ('both', 'Both MCQ & Current Affairs from URL'), ('pdf_currentaffairs_mcq', 'Current Affairs MCQ Generation from PDF'), ('pdf_currentaffairs_descriptive', 'Current Affairs Descriptive Generation from PDF'), ('pdf_to_mcq', 'PDF to Generic MCQ'), ('pdf_to_descriptive', 'PDF to Generic Descriptive'), ('pdf_to_polity', 'PDF to Polity MCQ'), ('pdf_to_economics', 'PDF to Economics MCQ'), ('pdf_to_math', 'PDF to Math MCQ'), ('pdf_to_physics', 'PDF to Physics MCQ'), ('pdf_to_chemistry', 'PDF to Chemistry MCQ'), ('pdf_to_history', 'PDF to History MCQ'), ('pdf_to_geography', 'PDF to Geography MCQ'), ('pdf_to_biology', 'PDF to Biology MCQ'), ('json_import', 'Streaming JSON / NDJSON Import')], max_length=50),
+        ),
+    ]
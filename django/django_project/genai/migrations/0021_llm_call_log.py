@@ -0,0 +1,51 @@
+# Generated by Django 3.0 on 2026-10-18 12:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('genai', '0020_json_import_streaming'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMCallLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(help_text='Provider that answered, e.g. GroqProvider', max_length=50)),
+                ('model', models.CharField(blank=True, default='', max_length=100)),
+                ('call_type', models.CharField(help_text='generate, generate_json or generate_json_stream', max_length=30)),
+                ('task_type', models.CharField(blank=True, default='', max_length=50)),
+                ('subject', models.CharField(blank=True, default='', max_length=50)),
+                ('source_url', models.CharField(blank=True, default='', max_length=500)),
+                ('prompt_tokens', models.IntegerField(default=0)),
+                ('completion_tokens', models.IntegerField(default=0)),
+                ('tokens_estimated', models.BooleanField(default=False, help_text='Token counts estimated from text length (the API reported no usage)')),
+                ('time_to_first_byte', models.FloatField(blank=True, help_text='Seconds until the first response text', null=True)),
+                ('latency', models.FloatField(help_text='Total seconds, including quota waits and retries')),
+                ('retries', models.IntegerField(default=0, help_text='Backoff retries and failovers to another provider')),
+                ('cache_hit', models.BooleanField(default=False)),
+                ('success', models.BooleanField(default=True)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('cost', models.DecimalField(decimal_places=6, default=0, help_text='Estimated USD (LLM_TOKEN_PRICES)', max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processing_log', models.ForeignKey(blank=True, help_text='Task that made the call (empty for calls outside a tracked task)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='llm_calls', to='genai.ProcessingLog')),
+            ],
+            options={
+                'verbose_name': 'LLM Call',
+                'verbose_name_plural': 'LLM Calls',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='llmcalllog',
+            index=models.Index(fields=['-created_at'], name='genai_llmca_created_e74034_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='llmcalllog',
+            index=models.Index(fields=['provider', '-created_at'], name='genai_llmca_provide_747656_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
 import os
@@ -183,6 +184,7 @@ class ProcessingLog(models.Model):
         ('pdf_to_history', 'PDF to History MCQ'),
         ('pdf_to_geography', 'PDF to Geography MCQ'),
         ('pdf_to_biology', 'PDF to Biology MCQ'),
+        ('json_import', 'Streaming JSON / NDJSON Import'),
     ]
     
     STATUS_CHOICES = [
@@ -197,6 +199,7 @@ class ProcessingLog(models.Model):
     
     # Source: Either URL-based or PDF-based
     pdf_upload = models.ForeignKey(PDFUpload, on_delete=models.SET_NULL, null=True, blank=True, help_text="PDF file if this is a PDF processing task")
+    json_import = models.ForeignKey('JsonImport', on_delete=models.SET_NULL, null=True, blank=True, related_name='processing_logs', help_text="JSON file if this is a streaming import task")
     
     # Timing
     started_at = models.DateTimeField(null=True, blank=True)
@@ -346,6 +349,56 @@ class ProcessingLog(models.Model):
         ]
 
 
+class LLMCallLog(models.Model):
+    """One LLM provider call: tokens, latency and cost (recorded by genai/utils/llm_telemetry.py)"""
+
+    processing_log = models.ForeignKey(
+        ProcessingLog,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='llm_calls',
+        help_text="Task that made the call (empty for calls outside a tracked task)"
+    )
+    provider = models.CharField(max_length=50, help_text="Provider that answered, e.g. GroqProvider")
+    model = models.CharField(max_length=100, blank=True, default='')
+    call_type = models.CharField(max_length=30, help_text="generate, generate_json or generate_json_stream")
+
+    # What the call was for
+    task_type = models.CharField(max_length=50, blank=True, default='')
+    subject = models.CharField(max_length=50, blank=True, default='')
+    source_url = models.CharField(max_length=500, blank=True, default='')
+
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    tokens_estimated = models.BooleanField(
+        default=False,
+        help_text="Token counts estimated from text length (the API reported no usage)"
+    )
+
+    time_to_first_byte = models.FloatField(null=True, blank=True, help_text="Seconds until the first response text")
+    latency = models.FloatField(help_text="Total seconds, including quota waits and retries")
+    retries = models.IntegerField(default=0, help_text="Backoff retries and failovers to another provider")
+    cache_hit = models.BooleanField(default=False)
+    success = models.BooleanField(default=True)
+    error_message = models.TextField(blank=True, default='')
+    cost = models.DecimalField(max_digits=12, decimal_places=6, default=0, help_text="Estimated USD (LLM_TOKEN_PRICES)")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.provider} {self.call_type} - {self.latency:.1f}s ({self.created_at.strftime('%Y-%m-%d %H:%M')})"
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "LLM Call"
+        verbose_name_plural = "LLM Calls"
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['provider', '-created_at']),
+        ]
+
+
 class ContentSource(models.Model):
     """Model to store and manage content sources (URLs) for MCQ and Current Affairs"""
     SOURCE_TYPE_CHOICES = [
@@ -529,8 +582,15 @@ class JsonImport(models.Model):
         help_text="Select which bank model table to import data to"
     )
     json_data = models.TextField(
+        blank=True,
         help_text="Paste JSON array of objects here. Each object represents a record to be imported."
     )
+    json_file = models.FileField(
+        upload_to='genai/json_imports/%Y/%m/%d/',
+        blank=True,
+        null=True,
+        help_text="Or upload a JSON array / newline-delimited JSON file. Files are imported in streaming chunks by the import_json_stream command."
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
@@ -540,6 +600,10 @@ class JsonImport(models.Model):
         verbose_name_plural = 'JSON Imports'
         ordering = ['-created_at']
     
+    def clean(self):
+        if not self.json_data and not self.json_file:
+            raise ValidationError("Paste JSON data or upload a JSON file.")
+    
     def __str__(self):
         return f"{self.get_to_table_display()} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"
 
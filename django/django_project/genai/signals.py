@@ -0,0 +1,21 @@
+"""
+Signals for genai app - Invalidate the in-process prompt registry
+(genai.utils.prompt_registry) whenever an LLMPrompt row is saved or deleted.
+
+This process drops its snapshot at once; the shared version other processes
+check is bumped only after commit, so they cannot reload the old rows and
+cache them under the new version.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from genai.models import LLMPrompt
+from genai.utils import prompt_registry
+
+
+@receiver(post_save, sender=LLMPrompt)
+@receiver(post_delete, sender=LLMPrompt)
+def invalidate_prompt_registry(sender, **kwargs):
+    prompt_registry.get_prompt_registry().invalidate()
+    transaction.on_commit(prompt_registry.bump_version)
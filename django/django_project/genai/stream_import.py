@@ -0,0 +1,297 @@
+"""
+Streaming, chunk-committed import of large JSON files into bank models
+
+BulkImporter.parse_json() loads the whole payload with json.loads, so a
+multi-hundred-MB question bank dump sits in memory twice (raw string and
+record list). StreamingImporter instead reads a JsonImport.json_file
+incrementally - either one JSON array of objects or newline-delimited JSON
+(any whitespace-separated sequence of objects) - and hands fixed-size chunks
+of records to BulkImporter.process_records().
+
+Each chunk is written in its own transaction together with its progress on
+the ProcessingLog (byte offset of the last record, counters, touched years),
+so an interrupted import resumes from the last committed chunk and memory
+stays flat regardless of file size.
+
+Usage:
+    log = StreamingImporter(json_import, form_date=date.today()).run()
+"""
+
+import codecs
+import io
+import json
+import logging
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterator, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from bank.services import counters, recompute
+from bank.services.recompute import deferred_recompute
+
+from .bulk_import import BulkImporter, DEFAULT_CHUNK_SIZE
+from .models import ProcessingLog
+
+logger = logging.getLogger(__name__)
+
+ARRAY = 'array'
+STREAM = 'stream'
+
+BLOCK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 32 * 1024 * 1024
+MAX_STORED_ERRORS = 100
+WHITESPACE = ' \t\r\n'
+
+
+def detect_format(fh) -> str:
+    """ARRAY if the first non-blank character of the file is '[', else STREAM"""
+    fh.seek(0)
+    head = fh.read(BLOCK_SIZE)
+    if head.startswith(codecs.BOM_UTF8):
+        head = head[len(codecs.BOM_UTF8):]
+    head = head.lstrip()
+    return ARRAY if head[:1] == b'[' else STREAM
+
+
+def iter_records(fh, offset: int = 0, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[Any, int]]:
+    """
+    Yield (record, end_offset) for every top-level record of a binary file
+
+    end_offset is the byte position just after the record; passing it back as
+    offset continues with the next record. Only the current block and the
+    record being decoded are held in memory.
+    """
+    fmt = detect_format(fh)
+    fh.seek(0)
+    start = len(codecs.BOM_UTF8) if fh.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else 0
+    offset = max(offset, start)
+    fh.seek(offset)
+
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    json_decoder = json.JSONDecoder()
+    expect_open = fmt == ARRAY and offset == start
+    separators = WHITESPACE + (',' if fmt == ARRAY else '')
+    buf = ''
+    base = offset  # byte offset of buf[0]
+    eof = False
+    read_size = block_size
+
+    while True:
+        # Drop separators; they are ASCII, so characters == bytes here
+        i = 0
+        while i < len(buf) and buf[i] in separators:
+            i += 1
+        buf, base = buf[i:], base + i
+
+        if not buf:
+            if eof:
+                if expect_open or fmt == ARRAY:
+                    raise ValueError(f"Unexpected end of JSON array at byte {base}")
+                return
+            block = fh.read(read_size)
+            if block:
+                buf += text_decoder.decode(block)
+            else:
+                buf += text_decoder.decode(b'', final=True)
+                eof = True
+            continue
+
+        if expect_open:
+            if buf[0] != '[':
+                raise ValueError(f"Expected '[' at byte {base}")
+            buf, base, expect_open = buf[1:], base + 1, False
+            continue
+        if fmt == ARRAY and buf[0] == ']':
+            return
+
+        try:
+            record, end = json_decoder.raw_decode(buf)
+            # A value that ends at the buffer edge may continue in the next block
+            complete = end < len(buf) or eof
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ValueError(f"Invalid JSON at byte {base + len(buf[:e.pos].encode('utf-8'))}: {e.msg}")
+            complete = False
+        if not complete:
+            if len(buf) > MAX_RECORD_SIZE:
+                raise ValueError(f"Record at byte {base} is larger than {MAX_RECORD_SIZE} bytes or malformed")
+            block = fh.read(read_size)
+            if block:
+                buf += text_decoder.decode(block)
+                read_size *= 2  # large records: fewer re-parses
+            else:
+                buf += text_decoder.decode(b'', final=True)
+                eof = True
+            continue
+
+        read_size = block_size
+        base += len(buf[:end].encode('utf-8'))
+        buf = buf[end:]
+        yield record, base
+
+
+class StreamingImporter:
+    """Chunked, resumable import of a JsonImport file (JSON array or NDJSON)"""
+
+    def __init__(self, json_import, form_date: date = None, form_time: time = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, log: ProcessingLog = None):
+        self.json_import = json_import
+        self.form_date = form_date
+        self.form_time = form_time or time(10, 0, 0)
+        self.chunk_size = max(int(chunk_size), 1)
+        self.log = log or self.find_or_create_log()
+        self.form_date = self.form_date or self.log.ca_date or date.today()
+        self.progress = self.load_progress()
+
+    def find_or_create_log(self) -> ProcessingLog:
+        """Latest unfinished json_import log of this JsonImport, or a new one"""
+        log = (
+            ProcessingLog.objects
+            .filter(task_type='json_import', json_import=self.json_import)
+            .exclude(status='completed')
+            .order_by('-created_at')
+            .first()
+        )
+        if log is None:
+            log = ProcessingLog.objects.create(
+                task_type='json_import',
+                json_import=self.json_import,
+                ca_date=self.form_date,
+                created_by=self.json_import.created_by,
+            )
+        return log
+
+    def load_progress(self) -> Dict[str, Any]:
+        progress = {}
+        if self.log.log_details:
+            try:
+                progress = json.loads(self.log.log_details)
+            except ValueError:
+                progress = {}
+        progress.setdefault('offset', 0)
+        progress.setdefault('records', 0)
+        progress.setdefault('created', 0)
+        progress.setdefault('updated', 0)
+        progress.setdefault('chunks', 0)
+        progress.setdefault('years', [])
+        progress.setdefault('errors', [])
+        return progress
+
+    def open(self):
+        """Binary file handle for the import; pasted json_data is wrapped as a file"""
+        if self.json_import.json_file:
+            self.json_import.json_file.open('rb')
+            return self.json_import.json_file.file
+        return io.BytesIO((self.json_import.json_data or '').encode('utf-8'))
+
+    def file_size(self, fh) -> int:
+        fh.seek(0, io.SEEK_END)
+        size = fh.tell()
+        fh.seek(0)
+        return size
+
+    def run(self) -> ProcessingLog:
+        """Import from the saved offset to the end of the file; returns the log"""
+        log = self.log
+        if log.status == 'completed':
+            return log
+
+        if self.progress['offset']:
+            print(f"\n📦 [STREAM_IMPORT] Resuming log {log.id} at byte {self.progress['offset']} "
+                  f"({self.progress['records']} records already imported)")
+        else:
+            print(f"\n📦 [STREAM_IMPORT] Starting log {log.id} for {self.json_import.to_table}")
+
+        log.status = 'running'
+        log.started_at = log.started_at or timezone.now()
+        log.error_message = None
+        log.save(update_fields=['status', 'started_at', 'error_message', 'updated_at'])
+
+        importer = BulkImporter(
+            table_name=self.json_import.to_table,
+            json_data='',
+            form_date=self.form_date,
+            form_time=self.form_time,
+            bulk=True,
+            chunk_size=self.chunk_size,
+        )
+        model_class = importer.get_model_class()
+        content_type = counters.content_type_for(model_class)
+
+        fh = self.open()
+        try:
+            log.total_items = self.file_size(fh)
+            with deferred_recompute():
+                chunk, end = [], self.progress['offset']
+                for record, end in iter_records(fh, self.progress['offset']):
+                    chunk.append(record)
+                    if len(chunk) >= self.chunk_size:
+                        self.write_chunk(importer, model_class, chunk, end)
+                        chunk = []
+                if chunk or end != self.progress['offset']:
+                    self.write_chunk(importer, model_class, chunk, end)
+                if content_type and self.progress['years']:
+                    # Years of chunks committed by an earlier, interrupted run
+                    recompute.mark_dirty(content_type, self.progress['years'], rebuild=True,
+                                         rows=self.progress['created'] + self.progress['updated'])
+        except Exception as e:
+            logger.exception(f"Streaming import failed for log {log.id}")
+            log.status = 'failed'
+            log.error_message = f"{e} (resume from byte {self.progress['offset']})"
+            log.save(update_fields=['status', 'error_message', 'updated_at'])
+            print(f"   ❌ {log.error_message}")
+            return log
+        finally:
+            fh.close()
+
+        log.status = 'completed'
+        log.completed_at = timezone.now()
+        log.save(update_fields=['status', 'completed_at', 'updated_at'])
+        print(f"   ✅ Imported {self.progress['records']} records "
+              f"(created {self.progress['created']}, updated {self.progress['updated']}, "
+              f"errors {log.error_count}) in {self.progress['chunks']} chunks")
+        return log
+
+    def write_chunk(self, importer: BulkImporter, model_class, records, end_offset: int) -> None:
+        """Write one chunk and its resume offset in a single transaction"""
+        importer.records = records
+        importer.errors = []
+        importer.chunk_stats = []
+        importer.created_count = importer.updated_count = 0
+        started = datetime.now()
+
+        with transaction.atomic():
+            importer.process_records(model_class)
+
+            progress = self.progress
+            progress['offset'] = end_offset
+            progress['records'] += len(records)
+            progress['created'] += importer.created_count
+            progress['updated'] += importer.updated_count
+            progress['chunks'] += 1
+            years = set(progress['years'])
+            for record in records:
+                if isinstance(record, dict):
+                    years.add(importer.extract_date_from_record(record)[2].year)
+            progress['years'] = sorted(years)
+            room = MAX_STORED_ERRORS - len(progress['errors'])
+            progress['errors'].extend(importer.errors[:max(room, 0)])
+            elapsed = (datetime.now() - started).total_seconds()
+            progress['last_chunk'] = {
+                'rows': len(records),
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(len(records) / elapsed) if elapsed else len(records),
+            }
+
+            log = self.log
+            log.processed_items = end_offset  # bytes, against total_items = file size
+            log.success_count = progress['created'] + progress['updated']
+            log.error_count += len(importer.errors)
+            log.log_details = json.dumps(progress)
+            log.save(update_fields=['total_items', 'processed_items', 'success_count',
+                                    'error_count', 'log_details', 'updated_at'])
+
+        print(f"   [CHUNK {progress['chunks']}] {len(records)} records up to byte {end_offset}"
+              f"/{self.log.total_items} ({self.log.progress_percentage}%), "
+              f"{progress['last_chunk']['rows_per_second']} rows/s")
@@ -10,6 +10,7 @@ from bs4 import BeautifulSoup
 from datetime import datetime, date
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Selenium imports
 try:
@@ -25,10 +26,15 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     logging.warning("Selenium not installed. Install with: pip install selenium webdriver-manager")
 
-from genai.utils.llm_provider import default_llm
+from django.db import connections
+from genai.utils import llm_cassette, llm_telemetry
+from genai.utils.content_compactor import compact_html, compact_text
+from genai.utils.llm_provider import default_llm, get_llm_concurrency
 from genai.config import CURRENT_AFFAIRS_SOURCES, REQUEST_HEADERS, MAX_RETRIES, RETRY_DELAY
-from genai.models import LLMPrompt
+from genai.utils.prompt_registry import get_prompt_registry, format_prompt
 from bank.models import currentaffairs_descriptive, currentaffairs_mcq
+from bank.services import fingerprints, near_duplicates
+from bank.services.recompute import deferred_recompute
 
 logger = logging.getLogger(__name__)
 
@@ -101,12 +107,22 @@ class CurrentAffairsScraper:
         """
         Fetch a webpage - tries Selenium first, then falls back to requests
         
+        Pages are recorded / replayed according to LLM_CASSETTE_MODE
+        (genai/utils/llm_cassette.py).
+        
         Args:
             url: The URL to fetch
         
         Returns:
             HTML content or None
         """
+        try:
+            return llm_cassette.fetch_page(url, lambda: self._fetch_page(url))
+        except llm_cassette.CassetteMiss as e:
+            logger.error(str(e))
+            return None
+    
+    def _fetch_page(self, url: str) -> Optional[str]:
         # Try Selenium first (default choice)
         if SELENIUM_AVAILABLE:
             print(f"    [FETCH] Attempting Selenium (JavaScript support)...")
@@ -296,17 +312,16 @@ class CurrentAffairsScraper:
             print(f"    ❌ Extraction error: {str(e)}")
             return []
     
-    def scrape_from_sources(self, content_type: str = 'currentaffairs_mcq') -> List[Dict[str, Any]]:
+    def get_source_urls(self, content_type: str = 'currentaffairs_mcq') -> List[str]:
         """
-        Scrape current affairs from sources (fetches from genai.ContentSource)
+        Active source URLs for a content type (from genai.ContentSource)
         
         Args:
             content_type: 'currentaffairs_mcq' or 'currentaffairs_descriptive'
         
         Returns:
-            List of scraped content with source URLs
+            List of URLs, or the CURRENT_AFFAIRS_SOURCES fallback when none are configured
         """
-        print(f"\n📋 [SCRAPER] scrape_from_sources() - Starting scrape for content_type: {content_type}")
         try:
             # Fetch active sources from genai.ContentSource model
             from genai.models import ContentSource
@@ -340,30 +355,60 @@ class CurrentAffairsScraper:
             logger.warning(f"Could not fetch from ContentSource: {e}. Using fallback config.")
             sources = CURRENT_AFFAIRS_SOURCES.get(content_type, [])
         
+        return list(sources)
+    
+    def scrape_source(self, source_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one source and combine its articles into a single content block
+        
+        Args:
+            source_url: The URL to scrape
+        
+        Returns:
+            {'title', 'body', 'source_url'} or None when nothing could be fetched
+        """
+        logger.info(f"Scraping {source_url}")
+        html = self.fetch_page(source_url)
+        
+        if not html:
+            print(f"    ✗ Failed to fetch HTML: {source_url}")
+            return None
+        
+        print(f"    ✓ HTML fetched, extracting content...")
+        extracted_items = self.extract_content(html, source_url)  # Pass source_url
+        print(f"    ✓ Extracted {len(extracted_items)} items from URL")
+        
+        # COMBINE all articles from same URL into ONE content block
+        # This ensures 1 URL = 1 LLM call (treating multiple articles as sections)
+        if not extracted_items:
+            return None
+        print(f"    ✓ Combined {len(extracted_items)} items into 1 content block for LLM")
+        return {
+            'title': extracted_items[0]['title'],  # Use first article as main heading
+            'body': '\n\n---\n\n'.join([item['body'] for item in extracted_items]),  # Separate articles with delimiter
+            'source_url': source_url
+        }
+    
+    def scrape_from_sources(self, content_type: str = 'currentaffairs_mcq') -> List[Dict[str, Any]]:
+        """
+        Scrape current affairs from sources (fetches from genai.ContentSource)
+        
+        Args:
+            content_type: 'currentaffairs_mcq' or 'currentaffairs_descriptive'
+        
+        Returns:
+            List of scraped content with source URLs
+        """
+        print(f"\n📋 [SCRAPER] scrape_from_sources() - Starting scrape for content_type: {content_type}")
+        sources = self.get_source_urls(content_type)
+        
         all_content = []
         
         for idx, source_url in enumerate(sources, 1):
             print(f"\n  🔄 [{idx}/{len(sources)}] Fetching from: {source_url}")
-            logger.info(f"Scraping {content_type} from {source_url}")
-            html = self.fetch_page(source_url)
-            
-            if html:
-                print(f"    ✓ HTML fetched, extracting content...")
-                extracted_items = self.extract_content(html, source_url)  # Pass source_url
-                print(f"    ✓ Extracted {len(extracted_items)} items from URL")
-                
-                # COMBINE all articles from same URL into ONE content block
-                # This ensures 1 URL = 1 LLM call (treating multiple articles as sections)
-                if extracted_items:
-                    combined_content = {
-                        'title': extracted_items[0]['title'],  # Use first article as main heading
-                        'body': '\n\n---\n\n'.join([item['body'] for item in extracted_items]),  # Separate articles with delimiter
-                        'source_url': source_url
-                    }
-                    print(f"    ✓ Combined {len(extracted_items)} items into 1 content block for LLM")
-                    all_content.append(combined_content)
-            else:
-                print(f"    ✗ Failed to fetch HTML")
+            combined_content = self.scrape_source(source_url)
+            if combined_content:
+                all_content.append(combined_content)
         
         print(f"\n📋 [SCRAPER] Total content items for processing: {len(all_content)} (1 per source URL)\n")
         return all_content
@@ -378,7 +423,8 @@ class CurrentAffairsProcessor:
     
     def get_prompt_from_database(self, prompt_type: str, source_url: str = None) -> str:
         """
-        Fetch prompt from database for a given source URL and prompt type.
+        Fetch prompt for a given source URL and prompt type from the prompt
+        registry (active LLMPrompt rows, loaded once per process).
         Falls back to default prompt if source-specific not found.
         
         Args:
@@ -389,33 +435,24 @@ class CurrentAffairsProcessor:
             Prompt text from database or None if not found
         """
         print(f"  📋 [PROMPT] get_prompt_from_database() - Type: {prompt_type}, Source: {source_url[:50] if source_url else '(None)'}")
-        try:
-            query = LLMPrompt.objects.filter(
-                prompt_type=prompt_type,
-                is_active=True
-            )
-            
-            # If source_url provided, prioritize source-specific prompt
-            if source_url:
-                prompt = query.filter(source_url=source_url, is_default=False).first()
-                if prompt:
-                    print(f"    ✓ Found SITE-SPECIFIC prompt for {source_url[:50]}")
-                    return prompt.prompt_text
-                print(f"    ⚠ No site-specific prompt found, trying default...")
-            
-            # Fall back to default prompt
-            prompt = query.filter(is_default=True).first()
+        registry = get_prompt_registry()
+        
+        # If source_url provided, prioritize source-specific prompt
+        if source_url:
+            prompt = registry.find(prompt_type=prompt_type, source_url=source_url, is_default=False)
             if prompt:
-                print(f"    ✓ Using DEFAULT prompt for type '{prompt_type}'")
-                return prompt.prompt_text
-            
-            print(f"    ✗ NO PROMPT FOUND for type '{prompt_type}'")
-            return None
+                print(f"    ✓ Found SITE-SPECIFIC prompt for {source_url[:50]}")
+                return prompt.text
+            print(f"    ⚠ No site-specific prompt found, trying default...")
         
-        except Exception as e:
-            print(f"    ❌ ERROR: {str(e)}")
-            logger.error(f"Error fetching prompt from database: {str(e)}")
-            return None
+        # Fall back to default prompt
+        prompt = registry.find(prompt_type=prompt_type, is_default=True)
+        if prompt:
+            print(f"    ✓ Using DEFAULT prompt for type '{prompt_type}'")
+            return prompt.text
+        
+        print(f"    ✗ NO PROMPT FOUND for type '{prompt_type}'")
+        return None
     
     def generate_mcq_prompt(self, title: str, body: str, source_url: str = None, skip_scraping: bool = False, send_url_directly: bool = False) -> str:
         """Generate a prompt for MCQ creation"""
@@ -428,12 +465,7 @@ class CurrentAffairsProcessor:
             db_prompt = self.get_prompt_from_database('mcq', 'skip_scraping_mode')
             if db_prompt:
                 print(f"    ✓ Using SKIP-SCRAPING prompt (LLM will fetch URL)")
-                try:
-                    formatted = db_prompt.format(title=title, content=body)
-                    return formatted
-                except (KeyError, ValueError):
-                    formatted = db_prompt.replace('{title}', title).replace('{content}', body)
-                    return formatted
+                return format_prompt(db_prompt, {'title': title, 'content': body})
         
         # Try to fetch custom prompt from database
         db_prompt = self.get_prompt_from_database('mcq', source_url)
@@ -441,16 +473,10 @@ class CurrentAffairsProcessor:
         if db_prompt:
             print(f"    ✓ Using DATABASE prompt for MCQ generation")
             # Use database prompt with the current article content
-            # Use safe format to avoid KeyError on JSON braces
-            try:
-                formatted = db_prompt.format(title=title, content=body)
-                print(f"    ✓ Prompt formatted successfully (length: {len(formatted)} chars)")
-                return formatted
-            except (KeyError, ValueError):
-                # If format fails, substitute manually
-                formatted = db_prompt.replace('{title}', title).replace('{content}', body)
-                print(f"    ⚠️  Used manual substitution for prompt (length: {len(formatted)} chars)")
-                return formatted
+            # (str.format() rules, or plain placeholder substitution when the JSON braces break format())
+            formatted = format_prompt(db_prompt, {'title': title, 'content': body})
+            print(f"    ✓ Prompt formatted (length: {len(formatted)} chars)")
+            return formatted
         
         # Fall back to default hardcoded prompt
         print(f"    ✓ Using HARDCODED prompt template for MCQ generation")
@@ -520,16 +546,10 @@ Return ONLY a JSON object with this structure:
         if db_prompt:
             print(f"    ✓ Using DATABASE prompt for descriptive generation")
             # Use database prompt with the current article content
-            # Use safe format to avoid KeyError on JSON braces
-            try:
-                formatted = db_prompt.format(title=title, content=body)
-                print(f"    ✓ Prompt formatted successfully (length: {len(formatted)} chars)")
-                return formatted
-            except (KeyError, ValueError):
-                # If format fails, substitute manually
-                formatted = db_prompt.replace('{title}', title).replace('{content}', body)
-                print(f"    ⚠️  Used manual substitution for prompt (length: {len(formatted)} chars)")
-                return formatted
+            # (str.format() rules, or plain placeholder substitution when the JSON braces break format())
+            formatted = format_prompt(db_prompt, {'title': title, 'content': body})
+            print(f"    ✓ Prompt formatted (length: {len(formatted)} chars)")
+            return formatted
         
         # Fall back to default hardcoded prompt
         print(f"    ✓ Using HARDCODED prompt template for descriptive generation")
@@ -602,6 +622,16 @@ Return ONLY a JSON object with this structure:
             logger.error(f"Error processing descriptive content: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _mcq_fingerprint(question_data: Dict[str, Any]) -> int:
+        """Fingerprint of an LLM question, from the same fields save_mcq_to_database() stores"""
+        options = [
+            question_data.get(f'option_{n}', question_data.get(f'option_{letter}', ''))
+            for n, letter in zip('1234', 'abcd')
+        ]
+        return fingerprints.compute(question_data.get('question', ''), options)
+    
+    @deferred_recompute()
     def save_mcq_to_database(self, mcq_data: Dict[str, Any], content_type: str = 'currentaffairs_mcq', source_url: str = None) -> List[Dict]:
         """
         Save generated MCQs to database
@@ -651,6 +681,13 @@ Return ONLY a JSON object with this structure:
                     print(f"      ❌ Error fetching ContentSource: {str(e)}")
             
             questions = mcq_data.get('questions', [])
+            if content_type == 'currentaffairs_mcq':
+                # One fingerprint lookup for the whole batch instead of saving duplicates
+                questions, skipped = fingerprints.filter_new(model, questions, self._mcq_fingerprint)
+                questions, reworded = near_duplicates.filter_new(questions, lambda q: q.get('question', ''))
+                skipped += reworded
+                if skipped:
+                    print(f"    ⏭️  Skipped {skipped} duplicate question(s) ({reworded} near-duplicates)")
             print(f"    📥 Saving {len(questions)} questions...")
             
             for idx, question_data in enumerate(questions, 1):
@@ -776,6 +813,7 @@ Return ONLY a JSON object with this structure:
         print(f"    ✓ Total saved: {len(saved_mcqs)} MCQs\n")
         return saved_mcqs
     
+    @deferred_recompute()
     def save_descriptive_to_database(self, desc_data: Dict[str, Any], source_url: str = None) -> List[Dict]:
         """
         Save generated descriptive content to database
@@ -910,7 +948,143 @@ Return ONLY a JSON object with this structure:
         
         return saved_items
     
-    def run_complete_pipeline(self, content_type: str = 'mcq', skip_scraping: bool = False, send_url_directly: bool = False, use_playwright: bool = False) -> Dict[str, Any]:
+    def prepare_source_content(self, content: Dict[str, Any], skip_scraping: bool = False, send_url_directly: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the body that will be sent to the LLM for one source
+        
+        Args:
+            content: Content item from step 1 of the pipeline
+            skip_scraping: If True, download the whole page via Selenium
+            send_url_directly: If True, send only the URL
+        
+        Returns:
+            The content item with its body filled in, or None if the source could not be fetched
+        """
+        source_url = content.get('source_url')
+        if content.get('prepared'):
+            return content
+        
+        if content.get('needs_scrape'):
+            prepared = self.scraper.scrape_source(source_url)
+            if prepared:
+                prepared['body'] = compact_text(prepared['body'], prepared.get('title') or '', llm=self.llm)
+            return prepared
+        
+        content = dict(content)
+        if send_url_directly:
+            # URL-ONLY MODE: Send only URL string to LLM (empty response is ok)
+            print(f"    🔗 URL-ONLY MODE: Sending URL only to LLM")
+            content['body'] = source_url  # Keep only URL
+            print(f"      ✅ URL ready: {source_url[:60]}...")
+        elif skip_scraping:
+            # SKIP-SCRAPING MODE: Download entire website content
+            print(f"    📥 SKIP-MODE: Downloading entire website content...")
+            try:
+                print(f"      [FETCH] Attempting Selenium...")
+                # Through the cassette, so replay mode never opens a browser
+                html_content = llm_cassette.fetch_page(source_url, lambda: self.scraper.fetch_page_selenium(source_url))
+                
+                if html_content:
+                    print(f"      ✅ Successfully fetched {len(html_content)} bytes")
+                    # Article text without boilerplate, within the model's token budget
+                    content['body'] = compact_html(html_content, source_url, content.get('title') or '', llm=self.llm)
+                    print(f"      ✅ Extracted {len(content['body'])} chars of compacted content")
+                else:
+                    print(f"      ❌ Failed to fetch content")
+                    content['body'] = source_url
+            except Exception as e:
+                print(f"      ⚠️  Fetch error: {str(e)}")
+                content['body'] = source_url
+        return content
+    
+    def _fetch_and_generate(self, content: Dict[str, Any], content_type: str, skip_scraping: bool, send_url_directly: bool) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Worker-thread half of process_sources(): fetch one source and call the LLM"""
+        try:
+            with llm_telemetry.track(task_type=content_type, source_url=content.get('source_url')):
+                prepared = self.prepare_source_content(content, skip_scraping=skip_scraping, send_url_directly=send_url_directly)
+                if prepared is None:
+                    return None, {'error': 'Failed to fetch content'}
+                
+                if content_type == 'currentaffairs_mcq':
+                    processed = self.process_mcq_content(prepared['title'], prepared['body'], prepared['source_url'], skip_scraping=skip_scraping, send_url_directly=send_url_directly)
+                else:
+                    processed = self.process_descriptive_content(prepared['title'], prepared['body'], prepared['source_url'])
+                return prepared, processed
+        finally:
+            # Prompt lookups open a connection per worker thread
+            connections.close_all()
+    
+    def save_processed_content(self, processed: Dict[str, Any], content_type: str, source_url: str = None) -> List[Dict]:
+        """Save one source's LLM response; returns the saved items"""
+        if content_type == 'currentaffairs_mcq':
+            if 'questions' not in processed:
+                print(f"    ⚠ No 'questions' key in response")
+                return []
+            return self.save_mcq_to_database(processed, content_type, source_url)
+        
+        if not processed or processed.get('error'):
+            print(f"    ⚠ No valid response to save")
+            return []
+        saved = self.save_descriptive_to_database(processed, source_url)
+        if saved:
+            print(f"    ✓ Saved {len(saved)} descriptive item(s) to database")
+        return saved
+    
+    def process_sources(self, content_list: List[Dict[str, Any]], content_type: str, results: Dict[str, Any], skip_scraping: bool = False, send_url_directly: bool = False, concurrency: int = None) -> Dict[str, Any]:
+        """
+        Fetch, generate and save every source with bounded parallelism
+        
+        Fetching and the LLM call run on a thread pool of `concurrency` workers
+        (default: the provider's concurrency setting, e.g. GROQ_CONCURRENCY).
+        Saving stays on the calling thread and walks the sources in their
+        original order, so source N is saved while later sources are still
+        being fetched / generated and the database writes are the same as in
+        a sequential run.
+        
+        Args:
+            content_list: Content items from step 1 of the pipeline
+            content_type: 'currentaffairs_mcq' or 'currentaffairs_descriptive'
+            results: Pipeline results dict; processed_items, errors and sources are filled in
+            skip_scraping: If True, download the whole page via Selenium
+            send_url_directly: If True, send only the URL
+            concurrency: Number of worker threads
+        
+        Returns:
+            The results dict
+        """
+        workers = concurrency or get_llm_concurrency(self.llm)
+        workers = max(1, min(workers, len(content_list) or 1))
+        print(f"\n[STEP 2] PROCESSING & SAVING ({len(content_list)} sources, {workers} concurrent)...")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='current-affairs') as executor:
+            futures = [
+                executor.submit(llm_telemetry.propagate(self._fetch_and_generate), content, content_type, skip_scraping, send_url_directly)
+                for content in content_list
+            ]
+            
+            for idx, (content, future) in enumerate(zip(content_list, futures), 1):
+                source_url = content.get('source_url')
+                source_result = {'source_url': source_url, 'status': 'failed', 'saved': 0, 'error': ''}
+                print(f"\n  [{idx}/{len(content_list)}] Saving: {str(source_url)[:60]}...")
+                try:
+                    _, processed = future.result()
+                    if processed.get('error'):
+                        raise RuntimeError(processed['error'])
+                    
+                    saved = self.save_processed_content(processed, content_type, source_url)
+                    results['processed_items'].extend(saved)
+                    source_result['saved'] = len(saved)
+                    source_result['status'] = 'completed' if saved else 'empty'
+                except Exception as e:
+                    print(f"    ❌ ERROR ({source_url}): {str(e)}")
+                    logger.error(f"Error processing content from {source_url}: {str(e)}")
+                    source_result['error'] = str(e)
+                    results['errors'].append(f"{source_url}: {str(e)}")
+                results['sources'].append(source_result)
+        
+        return results
+    
+    def run_complete_pipeline(self, content_type: str = 'mcq', skip_scraping: bool = False, send_url_directly: bool = False, use_playwright: bool = False, concurrency: int = None) -> Dict[str, Any]:
         """
         Run the complete pipeline: scrape -> process -> save
         Or skip scraping and send URLs directly to LLM
@@ -920,6 +1094,7 @@ Return ONLY a JSON object with this structure:
             skip_scraping: If True, download content via Selenium before sending to LLM
             send_url_directly: If True, send URL only to LLM (takes precedence over skip_scraping)
             use_playwright: If True, use Playwright as download engine
+            concurrency: Sources processed in parallel (default: the provider's concurrency setting)
         
         Returns:
             Results dictionary
@@ -940,7 +1115,7 @@ Return ONLY a JSON object with this structure:
             print(f"🎯 USE_PLAYWRIGHT=True ({use_playwright}), routing to Playwright pipeline...")
             print(f"{'='*70}")
             logger.info(f"Routing to Playwright pipeline (use_playwright={use_playwright})")
-            return self.run_playwright(content_type, skip_scraping, send_url_directly)
+            return self.run_playwright(content_type, skip_scraping, send_url_directly, concurrency=concurrency)
         else:
             print(f"\n{'='*70}")
             print(f"🚀 PIPELINE START - Content Type: {content_type}")
@@ -994,10 +1169,18 @@ Return ONLY a JSON object with this structure:
                     print(f"\n⚠ [STEP 1] No content sources found")
                     content_list = []
             else:
-                # Standard scraping mode
-                print(f"\n[STEP 1] SCRAPING...")
-                content_list = self.scraper.scrape_from_sources(content_type)
-                print(f"\n✅ [STEP 1] Scraped {len(content_list)} articles")
+                # Standard scraping mode - pages are fetched by the worker threads in step 2
+                print(f"\n[STEP 1] COLLECTING SOURCES TO SCRAPE...")
+                content_list = [
+                    {
+                        'source_url': source_url,
+                        'title': source_url,
+                        'body': '',
+                        'needs_scrape': True
+                    }
+                    for source_url in self.scraper.get_source_urls(content_type)
+                ]
+                print(f"\n✅ [STEP 1] {len(content_list)} sources to scrape")
             
             logger.info(f"Retrieved {len(content_list)} content items (skip_scraping={skip_scraping})")
             
@@ -1006,75 +1189,17 @@ Return ONLY a JSON object with this structure:
                 'articles_scraped': len(content_list),
                 'processed_items': [],
                 'errors': [],
+                'sources': [],
                 'mode': 'direct-to-llm' if skip_scraping else 'standard'
             }
             
-            # Step 2: Process and Save
-            print(f"\n[STEP 2] PROCESSING & SAVING...")
-            for idx, content in enumerate(content_list, 1):
-                display_title = content.get('title', 'Unknown')[:50]
-                if send_url_directly or skip_scraping:
-                    display_title = content.get('source_url', 'Unknown')[:60]
-                
-                print(f"\n  [{idx}/{len(content_list)}] Processing: {display_title}...")
-                try:
-                    source_url = content.get('source_url')
-                    print(f"    Source URL: {source_url}")
-                    
-                    if send_url_directly:
-                        # URL-ONLY MODE: Send only URL string to LLM (empty response is ok)
-                        print(f"    🔗 URL-ONLY MODE: Sending URL only to LLM")
-                        content['body'] = source_url  # Keep only URL
-                        print(f"      ✅ URL ready: {source_url[:60]}...")
-                    elif skip_scraping:
-                        # SKIP-SCRAPING MODE: Download entire website content
-                        print(f"    📥 SKIP-MODE: Downloading entire website content...")
-                        try:
-                            print(f"      [FETCH] Attempting Selenium...")
-                            html_content = self.scraper.fetch_page_selenium(source_url)
-                            
-                            if html_content:
-                                print(f"      ✅ Successfully fetched {len(html_content)} bytes")
-                                # Extract text from HTML (NO LIMIT)
-                                soup = BeautifulSoup(html_content, 'html.parser')
-                                # Remove script and style elements
-                                for script in soup(["script", "style"]):
-                                    script.decompose()
-                                # Get text
-                                text = soup.get_text(separator=' ', strip=True)
-                                # Clean up whitespace
-                                text = ' '.join(text.split())
-                                content['body'] = text  # ENTIRE content, no limit
-                                print(f"      ✅ Extracted {len(content['body'])} chars of full content")
-                            else:
-                                print(f"      ❌ Failed to fetch content")
-                                content['body'] = source_url
-                        except Exception as e:
-                            print(f"      ⚠️  Fetch error: {str(e)}")
-                            content['body'] = source_url
-                    
-                    if content_type == 'currentaffairs_mcq':
-                        processed = self.process_mcq_content(content['title'], content['body'], source_url, skip_scraping=skip_scraping, send_url_directly=send_url_directly)
-                        if 'questions' in processed:
-                            saved = self.save_mcq_to_database(processed, content_type, source_url)
-                            results['processed_items'].extend(saved)
-                        else:
-                            print(f"    ⚠ No 'questions' key in response")
-                    else:
-                        processed = self.process_descriptive_content(content['title'], content['body'], source_url)
-                        # Save descriptive content to database
-                        if processed and not processed.get('error'):
-                            saved = self.save_descriptive_to_database(processed, source_url)
-                            if saved:
-                                results['processed_items'].extend(saved)
-                                print(f"    ✓ Saved {len(saved)} descriptive item(s) to database")
-                        else:
-                            print(f"    ⚠ No valid response to save")
-                
-                except Exception as e:
-                    print(f"    ❌ ERROR: {str(e)}")
-                    logger.error(f"Error processing content: {str(e)}")
-                    results['errors'].append(str(e))
+            # Step 2: Fetch + LLM concurrently, save in source order
+            self.process_sources(
+                content_list, content_type, results,
+                skip_scraping=skip_scraping,
+                send_url_directly=send_url_directly,
+                concurrency=concurrency
+            )
             
             print(f"\n{'='*70}")
             print(f"✅ PIPELINE COMPLETE")
@@ -1089,11 +1214,11 @@ Return ONLY a JSON object with this structure:
         self,
         content_type: str = 'mcq',
         skip_scraping: bool = False,
-        send_url_directly: bool = False
+        send_url_directly: bool = False,
+        concurrency: int = None
 ) -> Dict[str, Any]:
 
         from genai.models import ContentSource
-        from playwright.sync_api import sync_playwright
         from bs4 import BeautifulSoup
 
         print(f"\n{'='*70}")
@@ -1127,34 +1252,43 @@ Return ONLY a JSON object with this structure:
                 content_list.append({
                     "source_url": str(src.url),
                     "title": f"Direct-to-LLM: {src.url}",
-                    "body": str(src.url)
+                    "body": str(src.url),
+                    "prepared": True
                 })
         else:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-                page = browser.new_page()
+            # Pages go through the cassette like CurrentAffairsScraper.fetch_page(); the
+            # browser is started on the first page that is really downloaded,
+            # so replay mode never launches it
+            browser = {}
 
+            def render(url):
+                if 'page' not in browser:
+                    from playwright.sync_api import sync_playwright
+                    browser['playwright'] = sync_playwright().start()
+                    browser['chromium'] = browser['playwright'].chromium.launch(headless=True, args=["--no-sandbox"])
+                    browser['page'] = browser['chromium'].new_page()
+                page = browser['page']
+                page.goto(url, wait_until="networkidle", timeout=30000)
+                page.wait_for_timeout(2000)
+                return page.content()
+
+            try:
                 for src in sources:
                     url = str(src.url)
                     print(f"  🌐 Fetching (Playwright): {url}")
 
                     try:
-                        page.goto(url, wait_until="networkidle", timeout=30000)
-                        page.wait_for_timeout(2000)
-
-                        html = page.content()
+                        html = llm_cassette.fetch_page(url, lambda: render(url))
 
                         soup = BeautifulSoup(html, "html.parser")
-                        for tag in soup(["script", "style", "noscript"]):
-                            tag.decompose()
-
-                        text = soup.get_text(separator=" ", strip=True)
-                        text = " ".join(text.split())
+                        title = soup.title.string[:200] if soup.title and soup.title.string else url
+                        text = compact_html(html, url, title, llm=self.llm)
 
                         content_list.append({
                             "source_url": url,
-                            "title": soup.title.string[:200] if soup.title else url,
-                            "body": text if skip_scraping else text[:5000]
+                            "title": title,
+                            "body": text,
+                            "prepared": True
                         })
 
                         print(f"    ✅ Extracted {len(text)} chars")
@@ -1164,10 +1298,14 @@ Return ONLY a JSON object with this structure:
                         content_list.append({
                             "source_url": url,
                             "title": url,
-                            "body": url
+                            "body": url,
+                            "prepared": True
                         })
-
-                browser.close()
+            finally:
+                if 'chromium' in browser:
+                    browser['chromium'].close()
+                if 'playwright' in browser:
+                    browser['playwright'].stop()
 
         # STEP 2: PROCESS & SAVE
         results = {
@@ -1175,47 +1313,16 @@ Return ONLY a JSON object with this structure:
             "articles_scraped": len(content_list),
             "processed_items": [],
             "errors": [],
+            "sources": [],
             "mode": "playwright"
         }
 
-        for idx, content in enumerate(content_list, 1):
-            try:
-                print(f"\n  [{idx}/{len(content_list)}] Processing {content['source_url']}")
-
-                if content_type == "currentaffairs_mcq":
-                    processed = self.process_mcq_content(
-                        content["title"],
-                        content["body"],
-                        content["source_url"],
-                        skip_scraping=skip_scraping,
-                        send_url_directly=send_url_directly
-                    )
-
-                    if "questions" in processed:
-                        saved = self.save_mcq_to_database(
-                            processed,
-                            content_type,
-                            content["source_url"]
-                        )
-                        results["processed_items"].extend(saved)
-
-                else:
-                    processed = self.process_descriptive_content(
-                        content["title"],
-                        content["body"],
-                        content["source_url"]
-                    )
-
-                    if processed and not processed.get("error"):
-                        saved = self.save_descriptive_to_database(
-                            processed,
-                            content["source_url"]
-                        )
-                        results["processed_items"].extend(saved)
-
-            except Exception as e:
-                print(f"    ❌ ERROR: {e}")
-                results["errors"].append(str(e))
+        self.process_sources(
+            content_list, content_type, results,
+            skip_scraping=skip_scraping,
+            send_url_directly=send_url_directly,
+            concurrency=concurrency
+        )
 
         print(f"\n{'='*70}")
         print(f"✅ PLAYWRIGHT PIPELINE COMPLETE")
@@ -1226,7 +1333,7 @@ Return ONLY a JSON object with this structure:
         return results
 
 # Utility functions
-def fetch_and_process_current_affairs(content_type: str = 'currentaffairs_mcq', skip_scraping: bool = False, send_url_directly: bool = False, use_playwright: bool = False) -> Dict[str, Any]:
+def fetch_and_process_current_affairs(content_type: str = 'currentaffairs_mcq', skip_scraping: bool = False, send_url_directly: bool = False, use_playwright: bool = False, concurrency: int = None) -> Dict[str, Any]:
     """
     Main function to fetch and process current affairs content
     
@@ -1235,6 +1342,7 @@ def fetch_and_process_current_affairs(content_type: str = 'currentaffairs_mcq',
         skip_scraping: If True, download content via Selenium before sending to LLM
         send_url_directly: If True, send URL only to LLM (takes precedence over skip_scraping)
         use_playwright: If True, use Playwright as download engine
+        concurrency: Sources processed in parallel (default: the provider's concurrency setting)
     
     Returns:
         Processing results
@@ -1255,7 +1363,7 @@ def fetch_and_process_current_affairs(content_type: str = 'currentaffairs_mcq',
         print(f"  ✓ Processor initialized successfully")
         
         print(f"  📞 Calling processor.run_complete_pipeline('{content_type}', skip_scraping={skip_scraping}, send_url_directly={send_url_directly}, use_playwright={use_playwright})...")
-        result = processor.run_complete_pipeline(content_type, skip_scraping=skip_scraping, send_url_directly=send_url_directly, use_playwright=use_playwright)
+        result = processor.run_complete_pipeline(content_type, skip_scraping=skip_scraping, send_url_directly=send_url_directly, use_playwright=use_playwright, concurrency=concurrency)
         print(f"  ✅ Pipeline completed, returning result")
         return result
     except Exception as e:
@@ -14,7 +14,10 @@ except ImportError:  # pragma: no cover - playright is required per design, but
     sync_playwright = None
 
 from bank.models import job as JobModel
+from genai.utils import llm_cassette
+from genai.utils.content_compactor import select_blocks
 from genai.utils.llm_provider import default_llm
+from genai.utils.rate_limiter import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +32,18 @@ CONF_HIGH = Decimal("0.95")
 CONF_MED = Decimal("0.80")
 CONF_LOW = Decimal("0.60")
 MAX_LLM_HTML_CHARS = 15000  # guard to keep payload under provider limits
+JOB_FIELDS_QUERY = (
+    "eligibility qualification age limit application fee amount important dates last date "
+    "selection process vacancy post name advertisement apply online notification"
+)
 
 
 def download_url(url: str, wait_ms: int = 1500, timeout_ms: int = 20000) -> str:
-    """Generic Playwright downloader. Handles JS/redirects; no site logic."""
+    """Generic Playwright downloader. Handles JS/redirects; no site logic. Recorded / replayed per LLM_CASSETTE_MODE."""
+    return llm_cassette.fetch_page(url, lambda: _download_url(url, wait_ms, timeout_ms))
+
+
+def _download_url(url: str, wait_ms: int, timeout_ms: int) -> str:
     if sync_playwright is None:
         raise RuntimeError("Playwright is not installed; please add playwright and browsers.")
 
@@ -216,36 +227,32 @@ def _prune_html_for_llm(html_detail: str) -> str:
         tag.decompose()
 
     main = soup.select_one(".entry-content") or soup.select_one("article") or soup.body or soup
+    budget = estimate_tokens("x" * MAX_LLM_HTML_CHARS)
 
-    fragments: List[str] = []
-
-    # Always include tables
+    # Always include tables (dates, fees and vacancies live there)
+    tables: List[str] = []
+    used = 0
     for tbl in main.find_all("table"):
-        fragments.append(str(tbl))
-        if sum(len(f) for f in fragments) > MAX_LLM_HTML_CHARS:
+        frag = str(tbl)
+        if used + estimate_tokens(frag) > budget:
             break
+        tables.append(frag)
+        used += estimate_tokens(frag)
 
-    # Keep key sections with eligibility/age/fee/important date words
-    keywords = ["eligibility", "qualification", "age", "fee", "important", "selection", "instruction"]
-    for node in main.find_all(["h1", "h2", "h3", "p", "li", "div", "strong", "b"]):
-        text_low = node.get_text(" ", strip=True).lower()
-        if any(kw in text_low for kw in keywords):
-            frag = str(node if node.name in ["table"] else node)
-            fragments.append(frag)
-        if sum(len(f) for f in fragments) > MAX_LLM_HTML_CHARS:
-            break
-
-    # Fallback: first 40 paragraphs/headings for context
-    if sum(len(f) for f in fragments) < MAX_LLM_HTML_CHARS:
-        count = 0
-        for node in main.find_all(["h1", "h2", "h3", "p", "li"]):
-            frag = str(node)
+    # Headings and paragraphs compete for the rest, ranked by relevance to the fields the LLM extracts
+    fragments: List[str] = []
+    texts: List[str] = []
+    for node in main.find_all(["h1", "h2", "h3", "p", "li", "strong", "b"]):
+        if node.find_parent("table"):
+            continue
+        frag = str(node)
+        text = node.get_text(" ", strip=True)
+        if text and frag not in fragments:
             fragments.append(frag)
-            count += 1
-            if count >= 40 or sum(len(f) for f in fragments) > MAX_LLM_HTML_CHARS:
-                break
+            texts.append(text)
+    keep = select_blocks(fragments, JOB_FIELDS_QUERY, budget=max(1, budget - used), texts=texts)
 
-    pruned = "\n".join(fragments)
+    pruned = "\n".join(tables + [fragments[i] for i in keep])
     return pruned[:MAX_LLM_HTML_CHARS]
 
 
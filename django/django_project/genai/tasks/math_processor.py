@@ -4,13 +4,20 @@ Converts math problems and questions into LaTeX format with MCQs
 """
 
 import logging
+import os
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
+from genai.config import MATH_COMBINED_EXTRACTION, OCR_BATCH_SIZE, OCR_RENDER_ZOOM, OCR_PAGE_TRIAGE
+from genai.utils import llm_telemetry, page_triage, parallel_extract, pdf_text_cache
+from genai.utils.document_chunker import chunk_text, run_chunks
 from genai.utils.llm_provider import default_llm
+from genai.utils.prompt_registry import get_prompt_registry, render_prompt
 
 logger = logging.getLogger(__name__)
 
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard')
+
 
 class LaTeXConverter:
     """Converts math expressions to LaTeX format"""
@@ -293,15 +300,79 @@ def batch_process_math_problems(problems: List[str], chapter: str = "General",
 # OCR ENGINES FOR PDF PROCESSING
 # ============================================================================
 
+def render_page(document, page_num: int, zoom: float = OCR_RENDER_ZOOM, clip=None):
+    """
+    Render a page in memory for OCR (no temp files)
+    
+    Args:
+        document: Open PyMuPDF document
+        page_num: 0-indexed page
+        zoom: Scale of the 72 dpi page (2x for better OCR)
+        clip: (x0, y0, x1, y1) region in points, default the whole page
+    
+    Returns:
+        RGB image as a numpy array of shape (height, width, 3), or a PIL
+        image without numpy (enough for Tesseract)
+    """
+    import fitz  # PyMuPDF
+    
+    pix = document[page_num].get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom), clip=fitz.Rect(clip) if clip else None, alpha=False
+    )
+    try:
+        import numpy as np
+    except ImportError:
+        from PIL import Image
+        return Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+
+
 class OCREngine:
-    """Base class for OCR engines"""
+    """
+    Base class for OCR engines
+    
+    Engines recognize pages rendered by render_page(); a page is rendered
+    once and the same image is given to every engine tried on it.
+    """
     
     def __init__(self):
         self.name = "Base OCR"
     
-    def extract_text(self, pdf_path: str, page_num: int = 0) -> Optional[str]:
-        """Extract text from PDF page"""
+    def recognize(self, images: List[Any]) -> List[Optional[str]]:
+        """Text of each image (render_page() output), None where nothing was recognized"""
         raise NotImplementedError
+    
+    def extract_text(self, pdf_path: str, page_num: int = 0, document=None) -> Optional[str]:
+        """Extract text from PDF page (document: an open PyMuPDF document of pdf_path to reuse)"""
+        try:
+            logger.info(f"[{self.name}] Processing page {page_num} of {pdf_path}")
+            pdf_document = self._open(pdf_path, document)
+            try:
+                if page_num >= len(pdf_document):
+                    logger.error(f"[{self.name}] Page {page_num} does not exist (total pages: {len(pdf_document)})")
+                    return None
+                image = render_page(pdf_document, page_num)
+            finally:
+                self._close(pdf_document, document)
+            return self.recognize([image])[0]
+        except ImportError as e:
+            logger.error(f"[{self.name}] Import error: {e}. Install with: pip install PyMuPDF Pillow")
+            return None
+        except Exception as e:
+            logger.error(f"[{self.name}] Extraction error: {e}")
+            return None
+    
+    @staticmethod
+    def _open(pdf_path: str, document=None):
+        """The caller's open PyMuPDF document, or pdf_path opened for this call"""
+        import fitz  # PyMuPDF
+        return document if document is not None else fitz.open(pdf_path)
+    
+    @staticmethod
+    def _close(pdf_document, document=None):
+        """Close what _open() opened; the caller's document stays open"""
+        if pdf_document is not document:
+            pdf_document.close()
 
 
 class PaddleOCREngine(OCREngine):
@@ -337,66 +408,29 @@ class PaddleOCREngine(OCREngine):
                 logger.error(f"[PaddleOCR] Initialization error: {e}")
                 raise
     
-    def extract_text(self, pdf_path: str, page_num: int = 0) -> Optional[str]:
-        """Extract text using PaddleOCR with PyMuPDF (no Poppler needed)"""
+    def recognize(self, images: List[Any]) -> List[Optional[str]]:
+        """Recognize text with PaddleOCR, one image per call on the shared model"""
         try:
             self._initialize()
-            
-            import fitz  # PyMuPDF
-            import tempfile
-            
-            logger.info(f"[PaddleOCR] Processing page {page_num} of {pdf_path}")
-            
-            # Open PDF with PyMuPDF
-            pdf_document = fitz.open(pdf_path)
-            
-            if page_num >= len(pdf_document):
-                logger.error(f"[PaddleOCR] Page {page_num} does not exist (total pages: {len(pdf_document)})")
-                pdf_document.close()
-                return None
-            
-            # Get the specific page and convert to image
-            page = pdf_document[page_num]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better OCR
-            
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                pix.save(tmp.name)
-                temp_image_path = tmp.name
-            
-            pdf_document.close()
-            
-            # Run OCR
-            result = PaddleOCREngine._ocr.ocr(temp_image_path, cls=True)
-            
-            # Extract text
-            text_lines = []
-            if result and result[0]:
-                for line in result[0]:
-                    if line[1][0]:  # line[1][0] is the text
-                        text_lines.append(line[1][0])
-            
-            extracted_text = '\n'.join(text_lines)
-            
-            logger.info(f"[PaddleOCR] Extracted {len(extracted_text)} characters")
-            
-            # Cleanup
-            import os
+            import numpy as np
+        except Exception:
+            return [None] * len(images)
+        
+        texts = []
+        for image in images:
             try:
-                os.remove(temp_image_path)
-            except:
-                pass
-            
-            return extracted_text if extracted_text else None
-            
-        except ImportError as e:
-            logger.error(f"[PaddleOCR] Import error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"[PaddleOCR] Extraction error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+                # PaddleOCR reads OpenCV (BGR) arrays
+                result = PaddleOCREngine._ocr.ocr(np.ascontiguousarray(np.asarray(image)[:, :, ::-1]), cls=True)
+                
+                # Extract text: line[1][0] is the text
+                text_lines = [line[1][0] for line in (result[0] or []) if line[1][0]] if result else []
+                extracted_text = '\n'.join(text_lines)
+                logger.info(f"[PaddleOCR] Extracted {len(extracted_text)} characters")
+                texts.append(extracted_text or None)
+            except Exception as e:
+                logger.error(f"[PaddleOCR] Extraction error: {e}")
+                texts.append(None)
+        return texts
 
 
 class EasyOCREngine(OCREngine):
@@ -432,112 +466,78 @@ class EasyOCREngine(OCREngine):
                 logger.error(f"[EasyOCR] Initialization error: {e}")
                 raise
     
-    def extract_text(self, pdf_path: str, page_num: int = 0) -> Optional[str]:
-        """Extract text using EasyOCR with PyMuPDF (no Poppler needed)"""
+    def recognize(self, images: List[Any]) -> List[Optional[str]]:
+        """Recognize text with EasyOCR, batching images of the same size"""
         try:
             self._initialize()
-            
-            import fitz  # PyMuPDF
             import numpy as np
-            from PIL import Image
-            import io
-            
-            logger.info(f"[EasyOCR] Processing page {page_num} of {pdf_path}")
-            
-            # Open PDF with PyMuPDF
-            pdf_document = fitz.open(pdf_path)
-            
-            if page_num >= len(pdf_document):
-                logger.error(f"[EasyOCR] Page {page_num} does not exist (total pages: {len(pdf_document)})")
-                pdf_document.close()
-                return None
-            
-            # Get the specific page and convert to image
-            page = pdf_document[page_num]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better OCR
-            
-            # Convert pixmap to PIL Image then to numpy array
-            img_data = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_data))
-            image_array = np.array(image)
-            
-            pdf_document.close()
-            
-            # Run OCR
-            result = EasyOCREngine._reader.readtext(image_array, detail=0)
-            
-            extracted_text = '\n'.join(result)
-            
-            logger.info(f"[EasyOCR] Extracted {len(extracted_text)} characters")
-            
-            return extracted_text if extracted_text else None
-            
-        except ImportError as e:
-            logger.error(f"[EasyOCR] Import error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"[EasyOCR] Extraction error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        except Exception:
+            return [None] * len(images)
+        
+        images = [np.asarray(image) for image in images]
+        # readtext_batched() needs equally sized images; pages of a PDF mostly are
+        by_shape: Dict[Tuple[int, ...], List[int]] = {}
+        for index, image in enumerate(images):
+            by_shape.setdefault(image.shape, []).append(index)
+        
+        texts: List[Optional[str]] = [None] * len(images)
+        for indices in by_shape.values():
+            try:
+                if len(indices) > 1 and hasattr(EasyOCREngine._reader, 'readtext_batched'):
+                    results = EasyOCREngine._reader.readtext_batched(
+                        [images[i] for i in indices], detail=0, batch_size=len(indices)
+                    )
+                else:
+                    results = [EasyOCREngine._reader.readtext(images[i], detail=0) for i in indices]
+            except Exception as e:
+                logger.error(f"[EasyOCR] Extraction error: {e}")
+                continue
+            for i, lines in zip(indices, results):
+                extracted_text = '\n'.join(lines)
+                logger.info(f"[EasyOCR] Extracted {len(extracted_text)} characters")
+                texts[i] = extracted_text or None
+        return texts
 
 
 class TesseractOCREngine(OCREngine):
     """Tesseract OCR engine - Traditional OCR"""
     
+    # Windows install location, used when tesseract is not on the system PATH
+    WINDOWS_TESSERACT = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+    _configured = False
+    
     def __init__(self):
         super().__init__()
         self.name = "Tesseract"
     
-    def extract_text(self, pdf_path: str, page_num: int = 0) -> Optional[str]:
-        """Extract text using Tesseract OCR with PyMuPDF (no Poppler needed)"""
-        try:
-            import pytesseract
-            import fitz  # PyMuPDF
-            from PIL import Image
-            import io
-            
+    def _initialize(self):
+        """Point pytesseract at the Tesseract binary (once per process)"""
+        import pytesseract
+        if not TesseractOCREngine._configured:
             # Configure Tesseract path if not in system PATH
-            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-            
-            logger.info(f"[Tesseract] Processing page {page_num} of {pdf_path}")
-            
-            # Open PDF with PyMuPDF
-            pdf_document = fitz.open(pdf_path)
-            
-            if page_num >= len(pdf_document):
-                logger.error(f"[Tesseract] Page {page_num} does not exist (total pages: {len(pdf_document)})")
-                pdf_document.close()
-                return None
-            
-            # Get the specific page
-            page = pdf_document[page_num]
-            
-            # Convert page to image (pixmap)
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better OCR
-            
-            # Convert pixmap to PIL Image
-            img_data = pix.tobytes("png")
-            image = Image.open(io.BytesIO(img_data))
-            
-            # Close PDF
-            pdf_document.close()
-            
-            # Run OCR
-            extracted_text = pytesseract.image_to_string(image)
-            
-            logger.info(f"[Tesseract] Extracted {len(extracted_text)} characters")
-            
-            return extracted_text if extracted_text else None
-            
+            if os.path.exists(self.WINDOWS_TESSERACT):
+                pytesseract.pytesseract.tesseract_cmd = self.WINDOWS_TESSERACT
+            TesseractOCREngine._configured = True
+        return pytesseract
+    
+    def recognize(self, images: List[Any]) -> List[Optional[str]]:
+        """Recognize text with Tesseract, one image per tesseract run"""
+        try:
+            pytesseract = self._initialize()
         except ImportError as e:
             logger.error(f"[Tesseract] Import error: {e}. Install with: pip install pytesseract PyMuPDF Pillow")
-            return None
-        except Exception as e:
-            logger.error(f"[Tesseract] Extraction error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            return [None] * len(images)
+        
+        texts = []
+        for image in images:
+            try:
+                extracted_text = pytesseract.image_to_string(image)
+                logger.info(f"[Tesseract] Extracted {len(extracted_text)} characters")
+                texts.append(extracted_text or None)
+            except Exception as e:
+                logger.error(f"[Tesseract] Extraction error: {e}")
+                texts.append(None)
+        return texts
 
 
 class OCRDispatcher:
@@ -568,56 +568,201 @@ class OCRDispatcher:
         print(f"[TEXT EXTRACTION] Method: OCRDispatcher.extract_text()")
         print(f"[TEXT EXTRACTION] Available OCR engines: {[e.name for e in self.engines]}")
         print(f"{'='*80}\n")
+        return self.extract_pages(pdf_path, [page_num]).get(page_num)
+    
+    def extract_pages(self, pdf_path: str, pages: Iterable[int]) -> Dict[int, Optional[str]]:
+        """
+        Extract text of several pages: direct extraction for all of them,
+        triage, then OCR for the pages that need it
+        
+        Triage (genai/utils/page_triage.py) skips blank and ruled pages, keeps
+        the text layer where it is enough and sends the rest to OCR: only the
+        embedded images of text pages, whole pages at a glyph-sized zoom for
+        scans.  Every step reads through the page text cache and runs on the
+        parallel extraction pool for large requests
+        (see genai/utils/parallel_extract.py), where every worker opens the PDF once.
+        
+        Returns:
+            {page: text or None} for the pages that exist
+        """
+        pages = list(pages)
+        texts: Dict[int, Optional[str]] = {}
+        scanned = pages
         
         # STEP 1: Try direct text extraction first (fast, no OCR needed)
         try:
             import fitz  # PyMuPDF
-            print(f"[STEP 1] Attempting DIRECT TEXT EXTRACTION (no OCR)")
+            print(f"[STEP 1] Attempting DIRECT TEXT EXTRACTION (no OCR) for {len(pages)} page(s)")
             logger.info(f"[OCR Dispatcher] Trying direct text extraction first...")
             
-            pdf_document = fitz.open(pdf_path)
-            if page_num < len(pdf_document):
-                page = pdf_document[page_num]
-                direct_text = page.get_text()
-                pdf_document.close()
-                
-                if direct_text and len(direct_text.strip()) > 50:  # At least 50 chars
-                    print(f"✅ [DIRECT EXTRACTION] SUCCESS - Extracted {len(direct_text)} characters")
-                    print(f"[DIRECT EXTRACTION] OCR NOT NEEDED - Text-based PDF\n")
-                    logger.info(f"[OCR Dispatcher] ✅ Direct extraction succeeded ({len(direct_text)} chars)")
-                    return direct_text
+            total = pdf_text_cache.page_count(pdf_path, lambda: parallel_extract.count_pages(pdf_path))
+            pages = scanned = [p for p in pages if 0 <= p < total]
+            direct = pdf_text_cache.read_pages(
+                pdf_path, pdf_text_cache.extractor_key('pymupdf', fitz), pages,
+                lambda missing: parallel_extract.extract_pages(pdf_path, missing, 'pymupdf')
+            )
+            plans = self._triage(pdf_path, pages) if OCR_PAGE_TRIAGE else {}
+            scanned = []
+            counts: Dict[str, int] = {}
+            for page, direct_text in zip(pages, direct):
+                if page in plans:
+                    strategy = plans[page]['strategy']
+                elif direct_text and len(direct_text.strip()) > 50:  # At least 50 chars
+                    strategy = 'text'
                 else:
-                    print(f"⚠️  [DIRECT EXTRACTION] Minimal text found ({len(direct_text.strip()) if direct_text else 0} chars)")
-                    print(f"[DIRECT EXTRACTION] Proceeding to OCR extraction...\n")
-                    logger.info(f"[OCR Dispatcher] Direct extraction returned minimal text, trying OCR...")
-            else:
-                pdf_document.close()
+                    strategy = 'full'
+                counts[strategy] = counts.get(strategy, 0) + 1
+                if strategy == 'text':
+                    texts[page] = direct_text
+                elif strategy == 'skip':
+                    texts[page] = direct_text if direct_text.strip() else None
+                else:
+                    scanned.append(page)
+                    if strategy == 'regions':
+                        # Kept if OCR of the regions fails
+                        texts[page] = direct_text
+            
+            print(f"✅ [DIRECT EXTRACTION] {counts.get('text', 0)} page(s) have a text layer - OCR NOT NEEDED for them")
+            if plans:
+                print(f"[TRIAGE] {counts.get('regions', 0)} page(s) with image regions, {counts.get('full', 0)} "
+                      f"without a text layer (blank ones are skipped before OCR)")
+            if scanned:
+                print(f"⚠️  [DIRECT EXTRACTION] {len(scanned)} page(s) need OCR, proceeding to OCR...\n")
+                logger.info(f"[OCR Dispatcher] Direct extraction returned minimal text, trying OCR...")
         except Exception as e:
             logger.warning(f"[OCR Dispatcher] Direct extraction failed: {e}, trying OCR...")
         
-        # STEP 2: Fallback to OCR engines
-        print(f"[STEP 2] DIRECT EXTRACTION FAILED - Using OCR Engines")
-        for idx, engine in enumerate(self.engines, 1):
-            print(f"\n[OCR Engine {idx}/{len(self.engines)}] Trying: {engine.name}")
+        if not scanned:
+            return texts
+        
+        # STEP 2: Fallback to OCR engines, whose text is cached per engine chain
+        print(f"[STEP 2] Using OCR Engines for {len(scanned)} page(s)")
+        names = [e.name for e in self.engines]
+        ocr_name = 'ocr:' + '+'.join(names)
+        if OCR_PAGE_TRIAGE:
+            ocr_name += '@' + page_triage.CACHE_NAME
+        extractor = pdf_text_cache.extractor_key(ocr_name)
+        try:
+            ocr_texts = pdf_text_cache.read_pages(
+                pdf_path, extractor, scanned,
+                lambda missing: parallel_extract.extract_pages(pdf_path, missing, 'ocr', engines=names)
+            )
+        except Exception as e:
+            logger.error(f"[OCR Dispatcher] ❌ OCR of {pdf_path} failed: {e}")
+            ocr_texts = [None] * len(scanned)
+        for page, text in zip(scanned, ocr_texts):
+            texts[page] = text or texts.get(page) or None
+        return texts
+    
+    def _triage(self, pdf_path: str, pages: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        page_triage summaries of the pages ({page: summary}), empty if triage failed
+        
+        Pages without a text layer are not rendered here; the OCR step tells
+        blank pages from scans as it renders them.
+        """
+        import json
+        import fitz  # PyMuPDF
+        try:
+            summaries = pdf_text_cache.read_pages(
+                pdf_path, pdf_text_cache.extractor_key(page_triage.CACHE_NAME, fitz), pages,
+                lambda missing: parallel_extract.extract_pages(pdf_path, missing, 'triage')
+            )
+            return {page: json.loads(summary) for page, summary in zip(pages, summaries) if summary}
+        except Exception as e:
+            logger.warning(f"[OCR Dispatcher] Page triage failed: {e}, using the text length")
+            return {}
+
+
+def ocr_pages(engines: List[OCREngine], document, pages: Iterable[int],
+              batch_size: int = OCR_BATCH_SIZE) -> Dict[int, Optional[str]]:
+    """
+    OCR pages of an open PyMuPDF document with the engines in order
+    
+    With OCR_PAGE_TRIAGE every page is triaged first (page_triage.triage_page):
+    blank pages are skipped, pages with a text layer only have their image
+    regions OCRed, and the rest is rendered at a zoom chosen from the glyph
+    size.  Images (whole pages or regions) are rendered once, in memory,
+    batch_size at a time; each engine gets the images still without text, so
+    a fallback engine reuses them instead of rendering again.
+    
+    Returns:
+        {page: text or None}
+    """
+    pages = [p for p in pages if 0 <= p < len(document)]
+    texts: Dict[int, Optional[str]] = {}
+    plans: Dict[int, Dict[str, Any]] = {}
+    jobs: List[Tuple[int, Optional[tuple], float]] = []  # (page, region or None, zoom)
+    page_jobs: Dict[int, List[int]] = {}  # page -> its job indices
+    for page in pages:
+        plan = page_triage.triage_page(document[page]) if OCR_PAGE_TRIAGE else {'strategy': 'full', 'zoom': OCR_RENDER_ZOOM}
+        plans[page] = plan
+        if plan['strategy'] == 'skip':
+            texts[page] = None
+        elif plan['strategy'] == 'text':
+            texts[page] = document[page].get_text()
+        elif plan['strategy'] == 'regions':
+            for region in plan['regions']:
+                page_jobs.setdefault(page, []).append(len(jobs))
+                jobs.append((page, region, plan['zoom']))
+        else:
+            page_jobs.setdefault(page, []).append(len(jobs))
+            jobs.append((page, None, plan['zoom']))
+    
+    results: Dict[int, Optional[str]] = {}  # job index -> text
+    batch_size = max(1, batch_size)
+    for i in range(0, len(jobs), batch_size):
+        images = {
+            j: render_page(document, jobs[j][0], zoom=jobs[j][2], clip=jobs[j][1])
+            for j in range(i, min(i + batch_size, len(jobs)))
+        }
+        pending = list(images)
+        for idx, engine in enumerate(engines, 1):
+            if not pending:
+                break
+            pending_pages = sorted({jobs[j][0] for j in pending})
+            print(f"\n[OCR Engine {idx}/{len(engines)}] {len(pending)} image(s) of page(s) {pending_pages}, trying: {engine.name}")
             logger.info(f"[OCR Dispatcher] Trying {engine.name}...")
-            
             try:
-                text = engine.extract_text(pdf_path, page_num)
-                
-                if text and len(text.strip()) > 0:
-                    print(f"✅ [OCR {engine.name}] SUCCESS - Extracted {len(text)} characters")
-                    logger.info(f"[OCR Dispatcher] ✅ {engine.name} succeeded")
-                    return text
-                else:
-                    print(f"❌ [OCR {engine.name}] FAILED - No text extracted")
-                    logger.warning(f"[OCR Dispatcher] {engine.name} returned empty text")
-            
+                recognized = engine.recognize([images[j] for j in pending])
             except Exception as e:
                 logger.error(f"[OCR Dispatcher] {engine.name} failed: {e}")
                 continue
-        
-        logger.error("[OCR Dispatcher] ❌ All extraction methods failed")
-        return None
+            
+            for j, text in zip(pending, recognized):
+                if text and len(text.strip()) > 0:
+                    results[j] = text
+            done = [j for j in pending if j in results]
+            if done:
+                print(f"✅ [OCR {engine.name}] SUCCESS - {len(done)} image(s)")
+                logger.info(f"[OCR Dispatcher] ✅ {engine.name} succeeded on {len(done)} image(s)")
+            pending = [j for j in pending if j not in results]
+            if pending:
+                print(f"❌ [OCR {engine.name}] FAILED - No text extracted from {len(pending)} image(s)")
+                logger.warning(f"[OCR Dispatcher] {engine.name} returned empty text")
+    
+    for page in pages:
+        if page in texts:
+            continue
+        if plans[page]['strategy'] == 'regions':
+            # Regions OCR failing still leaves the page its text layer
+            texts[page] = page_triage.compose(
+                plans[page]['blocks'], plans[page]['regions'], [results.get(j) for j in page_jobs.get(page, [])]
+            )
+        else:
+            texts[page] = results.get(page_jobs[page][0])
+        if not texts[page]:
+            logger.error(f"[OCR Dispatcher] ❌ All extraction methods failed for page {page}")
+            texts[page] = None
+    return texts
+
+
+# OCR engines by name, for extraction worker processes
+OCR_ENGINES = {
+    'PaddleOCR': PaddleOCREngine,
+    'EasyOCR': EasyOCREngine,
+    'Tesseract': TesseractOCREngine,
+}
 
 
 # ============================================================================
@@ -641,26 +786,16 @@ class MathPDFProcessor:
         print(f"[PROMPT FETCH] Looking for: prompt_type='descriptive', is_default=True")
         
         # Try to get existing default prompt for math classification
-        try:
-            prompt_obj = LLMPrompt.objects.filter(
-                prompt_type='descriptive',
-                is_default=True,
-                is_active=True
-            ).first()
-            
-            if prompt_obj:
-                print(f"✅ [PROMPT FETCH] Found existing prompt in database")
-                print(f"[PROMPT] ID: {prompt_obj.id}")
-                print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
-                print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
-                print(f"[PROMPT] Source URL: {prompt_obj.source_url or 'Default'}")
-                logger.info("[Chapter Classification] Using existing prompt")
-                return prompt_obj.prompt_text
-            else:
-                print(f"⚠️ [PROMPT FETCH] No default prompt found in database")
-        except Exception as e:
-            print(f"❌ [PROMPT FETCH] Error fetching prompt: {e}")
-            logger.warning(f"[Chapter Classification] Error fetching prompt: {e}")
+        prompt_obj = get_prompt_registry().find(prompt_type='descriptive', is_default=True)
+        if prompt_obj:
+            print(f"✅ [PROMPT FETCH] Found existing prompt in database")
+            print(f"[PROMPT] ID: {prompt_obj.id}")
+            print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
+            print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
+            print(f"[PROMPT] Source URL: {prompt_obj.source_url or 'Default'}")
+            logger.info("[Chapter Classification] Using existing prompt")
+            return prompt_obj.text
+        print(f"⚠️ [PROMPT FETCH] No default prompt found in database")
         
         # Create new prompt
         chapter_choices = MathProblemGeneration.get_chapter_choices()
@@ -689,7 +824,6 @@ Rules:
         
         # Try to save it as default prompt
         try:
-            from genai.models import LLMPrompt
             # Check if a default already exists
             existing_default = LLMPrompt.objects.filter(
                 prompt_type='descriptive',
@@ -721,7 +855,7 @@ Rules:
             print(f"{'='*80}\n")
             
             prompt_template = self.get_or_create_chapter_classification_prompt()
-            prompt = prompt_template.replace('{content}', content[:2000])  # Limit content
+            prompt = render_prompt(prompt_template, {'content': content[:2000]})  # Limit content
             
             response = self.llm.generate_json(prompt)
             
@@ -787,40 +921,29 @@ Difficulty Guidelines:
         print(f"[PROMPT FETCH] Looking for: source_url='http://pdfmcqprompt.com'")
         
         # Try to get existing MCQ prompt for PDF processing
-        try:
-            prompt_obj = LLMPrompt.objects.filter(
-                source_url='http://pdfmcqprompt.com',
-                is_active=True
-            ).first()
-            
-            if prompt_obj:
-                print(f"✅ [PROMPT FETCH] Found existing prompt in database")
-                print(f"[PROMPT] ID: {prompt_obj.id}")
-                print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
-                print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
-                print(f"[PROMPT] Source URL: {prompt_obj.source_url}")
-                print(f"[PROMPT] Is Active: {prompt_obj.is_active}")
-                
-                # Check if prompt has correct placeholders for math extraction
-                prompt_text = prompt_obj.prompt_text
-                has_math_placeholders = '{text}' in prompt_text and '{chapter}' in prompt_text and '{difficulty}' in prompt_text
-                has_old_placeholders = '{title}' in prompt_text or '{content}' in prompt_text
-                
-                if has_math_placeholders and not has_old_placeholders:
-                    print(f"✅ [PROMPT] Prompt has correct math placeholders")
-                    logger.info("[MCQ Extraction] Using existing math prompt from database")
-                    return prompt_text
-                else:
-                    print(f"⚠️ [PROMPT] Prompt has wrong placeholders (current affairs format)")
-                    print(f"[PROMPT] Will update to math-specific format")
-                    # Fall through to update the prompt
+        prompt_obj = get_prompt_registry().find(source_url='http://pdfmcqprompt.com')
+        if prompt_obj:
+            print(f"✅ [PROMPT FETCH] Found existing prompt in database")
+            print(f"[PROMPT] ID: {prompt_obj.id}")
+            print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
+            print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
+            print(f"[PROMPT] Source URL: {prompt_obj.source_url}")
+            
+            # Check if prompt has correct placeholders for math extraction
+            placeholders = prompt_obj.placeholders
+            has_math_placeholders = {'text', 'chapter', 'difficulty'} <= placeholders
+            has_old_placeholders = 'title' in placeholders or 'content' in placeholders
+            
+            if has_math_placeholders and not has_old_placeholders:
+                print(f"✅ [PROMPT] Prompt has correct math placeholders")
+                logger.info("[MCQ Extraction] Using existing math prompt from database")
+                return prompt_obj.text
             else:
-                print(f"⚠️ [PROMPT FETCH] No prompt found with source_url='http://pdfmcqprompt.com'")
-                prompt_obj = None  # Will create new one below
-        except Exception as e:
-            print(f"❌ [PROMPT FETCH] Error fetching prompt: {e}")
-            logger.warning(f"[MCQ Extraction] Error fetching prompt: {e}")
-            prompt_obj = None
+                print(f"⚠️ [PROMPT] Prompt has wrong placeholders (current affairs format)")
+                print(f"[PROMPT] Will update to math-specific format")
+                # Fall through to update the prompt
+        else:
+            print(f"⚠️ [PROMPT FETCH] No prompt found with source_url='http://pdfmcqprompt.com'")
         
         # Create default prompt
         print(f"[PROMPT] Creating default MCQ extraction prompt for math problems")
@@ -888,6 +1011,7 @@ IMPORTANT NOTES:
             if prompt_obj:
                 # Update existing prompt with new math-specific format
                 print(f"[PROMPT] Updating existing prompt (ID: {prompt_obj.id}) with math format")
+                prompt_obj = LLMPrompt.objects.get(id=prompt_obj.id)
                 prompt_obj.prompt_text = default_prompt
                 prompt_obj.save()
                 print(f"✅ [PROMPT] Updated existing prompt to math-specific format")
@@ -910,6 +1034,92 @@ IMPORTANT NOTES:
         
         return default_prompt
     
+    def get_or_create_combined_extraction_prompt(self) -> str:
+        """Get or create LLM prompt that classifies chapter / difficulty and extracts MCQs in one call"""
+        from genai.models import LLMPrompt
+        
+        print(f"\n[PROMPT FETCH] Method: get_or_create_combined_extraction_prompt()")
+        print(f"[PROMPT FETCH] Looking for: source_url='http://pdfmcqcombinedprompt.com'")
+        
+        prompt_obj = get_prompt_registry().find(source_url='http://pdfmcqcombinedprompt.com')
+        if prompt_obj:
+            print(f"✅ [PROMPT FETCH] Found existing prompt in database (ID: {prompt_obj.id})")
+            logger.info("[Combined Extraction] Using existing prompt from database")
+            return prompt_obj.text
+        print(f"⚠️ [PROMPT FETCH] No prompt found with source_url='http://pdfmcqcombinedprompt.com'")
+        
+        print(f"[PROMPT] Creating default combined classification + extraction prompt")
+        default_prompt = """You are an expert in mathematics chapter classification, difficulty assessment and in extracting high-quality MCQs from textbook content.
+
+In ONE pass over the content below:
+1. Decide the chapter the content belongs to
+2. Decide its difficulty level
+3. Extract ALL multiple choice questions, OR convert problems without MCQ format into well-structured MCQs
+
+Content:
+{text}
+
+Available Chapters: {chapters}
+Chapter: {chapter}
+Difficulty: {difficulty}
+
+A Chapter or Difficulty value of "auto" means you must decide it yourself; any other value is fixed and must be used as given.
+
+CLASSIFICATION RULES:
+- chapter must be one of the available chapters (if the list is empty, use a short lowercase chapter name)
+- difficulty must be one of: easy, medium, hard
+  - easy: Basic arithmetic, simple equations, direct application
+  - medium: Multi-step problems, moderate complexity, requires thinking
+  - hard: Complex problems, advanced concepts, multiple techniques
+- The top-level chapter / difficulty describe the content as a whole
+- If the content mixes topics or levels, also set "chapter" / "difficulty" on each question
+
+MCQ REQUIREMENTS:
+- Use LaTeX for ALL mathematics: \\( \\) inline, \\[ \\] for displayed equations
+- Each question MUST have exactly 4 options (A, B, C, D); add plausible distractors when fewer are given
+- Explanations must be step-by-step and detailed enough for beginners, with LaTeX for every math step, followed by a short textual explanation of WHY each step is done
+- Question text must be clear and include the necessary given values
+
+Return ONLY a valid JSON object (no markdown, no code blocks):
+{
+    "chapter": "chapter_name",
+    "difficulty": "easy|medium|hard",
+    "confidence": 0.95,
+    "questions": [
+        {
+            "question": "Complete question text with LaTeX: \\\\( formula \\\\)",
+            "option_a": "Option A",
+            "option_b": "Option B",
+            "option_c": "Option C",
+            "option_d": "Option D",
+            "correct_answer": "A",
+            "explanation": "**Step 1:** ...\\n\\n**Step 2:** ...\\n\\n**Textual Understanding:** ...",
+            "chapter": "chapter_name",
+            "difficulty": "easy|medium|hard"
+        }
+    ]
+}
+
+If no extractable/convertible questions are found, still classify the content and return "questions": []
+"""
+        
+        try:
+            if not LLMPrompt.objects.filter(source_url='http://pdfmcqcombinedprompt.com').exists():
+                prompt_obj = LLMPrompt.objects.create(
+                    source_url='http://pdfmcqcombinedprompt.com',
+                    prompt_type='mcq',
+                    prompt_text=default_prompt,
+                    is_default=False,
+                    is_active=True
+                )
+                print(f"✅ [PROMPT] Saved new combined prompt to database (ID: {prompt_obj.id})")
+                logger.info("[Combined Extraction] Created new prompt in database")
+        except Exception as e:
+            print(f"⚠️ [PROMPT] Could not save to database: {e}")
+            logger.warning(f"[Combined Extraction] Could not save prompt: {e}")
+        
+        return default_prompt
+    
     def get_or_create_expression_mcq_prompt(self) -> str:
         """Get or create LLM prompt for MCQ generation from expression (Convert to LaTeX)"""
         from genai.models import LLMPrompt
@@ -918,28 +1128,16 @@ IMPORTANT NOTES:
         print(f"[PROMPT FETCH] Looking for: source_url='http://mcqpromptFOR-MATH-EXPRESSION.com'")
         
         # Try to get existing MCQ prompt for expression processing
-        try:
-            prompt_obj = LLMPrompt.objects.filter(
-                source_url='http://mcqpromptFOR-MATH-EXPRESSION.com',
-                is_active=True
-            ).first()
-            
-            if prompt_obj:
-                print(f"✅ [PROMPT FETCH] Found existing prompt in database")
-                print(f"[PROMPT] ID: {prompt_obj.id}")
-                print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
-                print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
-                print(f"[PROMPT] Source URL: {prompt_obj.source_url}")
-                print(f"[PROMPT] Is Active: {prompt_obj.is_active}")
-                logger.info("[Expression MCQ] Using existing prompt from database")
-                return prompt_obj.prompt_text
-            else:
-                print(f"⚠️ [PROMPT FETCH] No prompt found with source_url='http://mcqpromptFOR-MATH-EXPRESSION.com'")
-                prompt_obj = None
-        except Exception as e:
-            print(f"❌ [PROMPT FETCH] Error fetching prompt: {e}")
-            logger.warning(f"[Expression MCQ] Error fetching prompt: {e}")
-            prompt_obj = None
+        prompt_obj = get_prompt_registry().find(source_url='http://mcqpromptFOR-MATH-EXPRESSION.com')
+        if prompt_obj:
+            print(f"✅ [PROMPT FETCH] Found existing prompt in database")
+            print(f"[PROMPT] ID: {prompt_obj.id}")
+            print(f"[PROMPT] Type: {prompt_obj.prompt_type}")
+            print(f"[PROMPT] Is Default: {prompt_obj.is_default}")
+            print(f"[PROMPT] Source URL: {prompt_obj.source_url}")
+            logger.info("[Expression MCQ] Using existing prompt from database")
+            return prompt_obj.text
+        print(f"⚠️ [PROMPT FETCH] No prompt found with source_url='http://mcqpromptFOR-MATH-EXPRESSION.com'")
         
         # Create default prompt if not found
         print(f"[PROMPT] Creating default expression MCQ prompt")
@@ -1046,18 +1244,20 @@ IMPORTANT NOTES:
             log_entry.save()
             
             # Determine processing mode
-            if config['process_pdf'] and math_problem.pdf_file:
-                print("[MODE] PDF Processing Mode\n")
-                result = self._process_pdf_mode(math_problem, config, log_entry)
-            elif math_problem.expression:
-                print("[MODE] Expression Processing Mode (existing logic)\n")
-                result = self._process_expression_mode(math_problem, config, log_entry)
-            else:
-                raise ValueError("No PDF file or expression provided")
+            with llm_telemetry.track(log_entry, task_type=log_entry.task_type, subject='math'):
+                if config['process_pdf'] and math_problem.pdf_file:
+                    print("[MODE] PDF Processing Mode\n")
+                    result = self._process_pdf_mode(math_problem, config, log_entry)
+                elif math_problem.expression:
+                    print("[MODE] Expression Processing Mode (existing logic)\n")
+                    result = self._process_expression_mode(math_problem, config, log_entry)
+                else:
+                    raise ValueError("No PDF file or expression provided")
             
             # Update log
             if result.get('success'):
                 log_entry.status = 'completed'
+                log_entry.success_count = result.get('mcq_count', 0)
                 log_entry.output_data = json.dumps(result)
                 math_problem.status = 'completed'
             else:
@@ -1098,6 +1298,7 @@ IMPORTANT NOTES:
         """Process using expression field with database prompt and LLM decisions"""
         import json
         from bank.models import math as MathModel
+        from bank.services.recompute import deferred_recompute
         
         print(f"\n[EXPRESSION MODE] Processing math expression")
         print(f"[EXPRESSION MODE] Input: {math_problem.expression[:100]}...")
@@ -1126,9 +1327,11 @@ IMPORTANT NOTES:
         prompt_template = self.get_or_create_expression_mcq_prompt()
         
         # Replace placeholders
-        prompt = prompt_template.replace('{text}', math_problem.expression)
-        prompt = prompt.replace('{chapter}', chapter)
-        prompt = prompt.replace('{difficulty}', difficulty)
+        prompt = render_prompt(prompt_template, {
+            'text': math_problem.expression,
+            'chapter': chapter,
+            'difficulty': difficulty,
+        })
         
         print(f"\n[LLM CALL] Sending expression to LLM...")
         print(f"[LLM CALL] Provider: {self.llm.__class__.__name__}")
@@ -1152,24 +1355,25 @@ IMPORTANT NOTES:
                 
                 # Save all MCQs to bank.math table
                 saved_count = 0
-                for mcq_data in response['questions']:
-                    try:
-                        MathModel.objects.create(
-                            question=mcq_data.get('question', ''),
-                            a=mcq_data.get('option_a', ''),
-                            b=mcq_data.get('option_b', ''),
-                            c=mcq_data.get('option_c', ''),
-                            d=mcq_data.get('option_d', ''),
-                            ans=self._convert_answer_to_int(mcq_data.get('correct_answer', 'A')),
-                            solution=mcq_data.get('explanation', ''),
-                            chapter=chapter,
-                            difficult_level=difficulty,
-                            level=difficulty,
-                        )
-                        saved_count += 1
-                        print(f"    ✓ Saved MCQ to database")
-                    except Exception as e:
-                        print(f"    ✗ Failed to save MCQ: {e}")
+                with deferred_recompute():
+                    for mcq_data in self._new_mcqs(MathModel, response['questions']):
+                        try:
+                            MathModel.objects.create(
+                                question=mcq_data.get('question', ''),
+                                a=mcq_data.get('option_a', ''),
+                                b=mcq_data.get('option_b', ''),
+                                c=mcq_data.get('option_c', ''),
+                                d=mcq_data.get('option_d', ''),
+                                ans=self._convert_answer_to_int(mcq_data.get('correct_answer', 'A')),
+                                solution=mcq_data.get('explanation', ''),
+                                chapter=chapter,
+                                difficult_level=difficulty,
+                                level=difficulty,
+                            )
+                            saved_count += 1
+                            print(f"    ✓ Saved MCQ to database")
+                        except Exception as e:
+                            print(f"    ✗ Failed to save MCQ: {e}")
                 
                 return {
                     'success': True,
@@ -1196,6 +1400,7 @@ IMPORTANT NOTES:
         """Process using PDF file with OCR"""
         import json
         from bank.models import math as MathModel
+        from bank.services.recompute import deferred_recompute
         
         # Initialize OCR
         ocr = OCRDispatcher(
@@ -1223,21 +1428,26 @@ IMPORTANT NOTES:
         all_mcqs = []
         chapter = math_problem.chapter or 'any'  # Initialize with default
         difficulty = math_problem.difficulty  # Initialize with default
+        llm_mode = 'separate'
+        
+        # Convert 1-based user input to 0-based OCR indexing
+        ocr_ranges = [
+            (max(0, page_start - 1), max(0, page_end - 1) if page_end > 0 else page_end)
+            for page_start, page_end in page_ranges
+        ]
+        # Every page is extracted up front, so large PDFs use the whole extraction pool
+        all_pages = sorted({p for ocr_start, ocr_end in ocr_ranges for p in range(ocr_start, ocr_end + 1)})
+        print(f"[OCR] Extracting {len(all_pages)} page(s)...")
+        page_texts = ocr.extract_pages(pdf_path, all_pages)
         
-        for page_start, page_end in page_ranges:
+        for (page_start, page_end), (ocr_start, ocr_end) in zip(page_ranges, ocr_ranges):
             print(f"\n[PROCESSING] Pages {page_start} to {page_end} (user-facing)")
             
-            # Extract text from pages (convert to 0-based for OCR)
-            combined_text = ""
-            # Convert 1-based user input to 0-based OCR indexing
-            ocr_start = max(0, page_start - 1)
-            ocr_end = max(0, page_end - 1) if page_end > 0 else page_end
-            
-            for page_num in range(ocr_start, ocr_end + 1):
-                print(f"  [OCR] Page {page_num + 1} (OCR index: {page_num})...")
-                text = ocr.extract_text(pdf_path, page_num)
-                if text:
-                    combined_text += f"\n\n=== Page {page_num + 1} ===\n\n{text}"
+            # Text of the range's pages, in page order
+            combined_text = "".join(
+                f"\n\n=== Page {page_num + 1} ===\n\n{page_texts[page_num]}"
+                for page_num in range(ocr_start, ocr_end + 1) if page_texts.get(page_num)
+            )
             
             if not combined_text:
                 print(f"  [WARNING] No text extracted from pages {page_start}-{page_end} (user-facing)")
@@ -1245,60 +1455,34 @@ IMPORTANT NOTES:
             
             print(f"  [EXTRACTED] {len(combined_text)} characters total\n")
             
-            # Decide chapter
-            print(f"\n[CHAPTER CLASSIFICATION]")
-            if config['chapter_decide_by_llm']:
-                print(f"[CHAPTER] Mode: LLM-based classification")
-                print(f"[CHAPTER] Method: classify_chapter_by_llm()")
-                chapter_result = self.classify_chapter_by_llm(combined_text)
-                chapter = chapter_result['chapter']
-                print(f"[CHAPTER] LLM classified as: {chapter}")
-            else:
-                chapter = math_problem.chapter or 'any'
-                print(f"[CHAPTER] Mode: Manual/Pre-set")
-                print(f"[CHAPTER] Value: {chapter}")
-            
-            print(f"  [CHAPTER] Using: {chapter}\n")
-            
-            # Decide difficulty
-            print(f"\n[DIFFICULTY CLASSIFICATION]")
-            if config['difficulty_level_decide_by_llm']:
-                print(f"[DIFFICULTY] Mode: LLM-based classification")
-                print(f"[DIFFICULTY] Method: classify_difficulty_by_llm()")
-                difficulty_result = self.classify_difficulty_by_llm(combined_text)
-                difficulty = difficulty_result['difficulty']
-                print(f"[DIFFICULTY] LLM classified as: {difficulty}")
-            else:
-                difficulty = math_problem.difficulty
-                print(f"[DIFFICULTY] Mode: Manual/Pre-set")
-                print(f"[DIFFICULTY] Value: {difficulty}")
-            
-            print(f"  [DIFFICULTY] Using: {difficulty}\n")
-            
-            # Generate MCQs using LLM
-            mcqs = self._extract_mcqs_from_text(combined_text, chapter, difficulty)
+            chapter, difficulty, mcqs, llm_mode = self._classify_and_extract_chunk(
+                combined_text, config,
+                math_problem.chapter or 'any', math_problem.difficulty,
+                processing_log=log_entry, label=f"pages {page_start}-{page_end}"
+            )
             
             print(f"  [MCQS] Extracted {len(mcqs)} MCQs\n")
             
             # Save to database
-            for mcq in mcqs:
-                try:
-                    MathModel.objects.create(
-                        question=mcq.get('question', ''),
-                        a=mcq.get('option_a', ''),
-                        b=mcq.get('option_b', ''),
-                        c=mcq.get('option_c', ''),
-                        d=mcq.get('option_d', ''),
-                        ans=self._convert_answer_to_int(mcq.get('correct_answer', 'A')),
-                        solution=mcq.get('explanation', ''),
-                        chapter=chapter,
-                        difficult_level=difficulty,
-                        level=difficulty,
-                    )
-                    all_mcqs.append(mcq)
-                    print(f"    ✓ Saved MCQ to database")
-                except Exception as e:
-                    print(f"    ✗ Error saving MCQ: {e}")
+            with deferred_recompute():
+                for mcq in self._new_mcqs(MathModel, mcqs):
+                    try:
+                        MathModel.objects.create(
+                            question=mcq.get('question', ''),
+                            a=mcq.get('option_a', ''),
+                            b=mcq.get('option_b', ''),
+                            c=mcq.get('option_c', ''),
+                            d=mcq.get('option_d', ''),
+                            ans=self._convert_answer_to_int(mcq.get('correct_answer', 'A')),
+                            solution=mcq.get('explanation', ''),
+                            chapter=mcq.get('chapter') or chapter,
+                            difficult_level=mcq.get('difficulty') or difficulty,
+                            level=mcq.get('difficulty') or difficulty,
+                        )
+                        all_mcqs.append(mcq)
+                        print(f"    ✓ Saved MCQ to database")
+                    except Exception as e:
+                        print(f"    ✗ Error saving MCQ: {e}")
         
         # Check if any MCQs were generated
         if not all_mcqs:
@@ -1319,6 +1503,7 @@ IMPORTANT NOTES:
             'chapter': chapter,
             'difficulty': difficulty,
             'pages_processed': len(page_ranges),
+            'llm_mode': llm_mode,
             'mcqs': all_mcqs[:5]  # Store first 5 as sample
         }, indent=2)
         
@@ -1326,16 +1511,86 @@ IMPORTANT NOTES:
             'success': True,
             'mcq_count': len(all_mcqs),
             'mode': 'pdf',
+            'llm_mode': llm_mode,
             'chapter': chapter,
             'difficulty': difficulty
         }
     
+    def _classify_and_extract_chunk(self, combined_text: str, config: Dict, default_chapter: str,
+                                    default_difficulty: str, processing_log=None,
+                                    label: str = '') -> Tuple[str, str, List[Dict], str]:
+        """
+        Decide chapter / difficulty and extract MCQs for one page range
+        
+        With config['combined_llm_call'] (default MATH_COMBINED_EXTRACTION) and at
+        least one of chapter / difficulty left to the LLM, a single prompt does all
+        three; if that call fails or returns an unusable response the separate
+        classify_chapter_by_llm() / classify_difficulty_by_llm() /
+        _extract_mcqs_from_text() calls are made instead.  Page ranges over the
+        model's content budget are sent in overlapping chunks (see
+        genai/utils/document_chunker.py) whose status is recorded in
+        processing_log under label.
+        
+        Returns:
+            (chapter, difficulty, mcqs, llm_mode) where llm_mode is 'combined' or 'separate'
+        """
+        decide_chapter = config.get('chapter_decide_by_llm', False)
+        decide_difficulty = config.get('difficulty_level_decide_by_llm', False)
+        
+        if config.get('combined_llm_call', MATH_COMBINED_EXTRACTION) and (decide_chapter or decide_difficulty):
+            result = self.classify_and_extract_mcqs(
+                combined_text,
+                chapter=None if decide_chapter else default_chapter,
+                difficulty=None if decide_difficulty else default_difficulty,
+                processing_log=processing_log, label=label,
+            )
+            if result is not None:
+                print(f"  [CHAPTER] Using: {result['chapter']}")
+                print(f"  [DIFFICULTY] Using: {result['difficulty']}\n")
+                return result['chapter'], result['difficulty'], result['questions'], 'combined'
+            print(f"  [COMBINED] Falling back to separate classification and extraction calls")
+        
+        # Decide chapter
+        print(f"\n[CHAPTER CLASSIFICATION]")
+        if decide_chapter:
+            print(f"[CHAPTER] Mode: LLM-based classification")
+            print(f"[CHAPTER] Method: classify_chapter_by_llm()")
+            chapter_result = self.classify_chapter_by_llm(combined_text)
+            chapter = chapter_result['chapter']
+            print(f"[CHAPTER] LLM classified as: {chapter}")
+        else:
+            chapter = default_chapter
+            print(f"[CHAPTER] Mode: Manual/Pre-set")
+            print(f"[CHAPTER] Value: {chapter}")
+        
+        print(f"  [CHAPTER] Using: {chapter}\n")
+        
+        # Decide difficulty
+        print(f"\n[DIFFICULTY CLASSIFICATION]")
+        if decide_difficulty:
+            print(f"[DIFFICULTY] Mode: LLM-based classification")
+            print(f"[DIFFICULTY] Method: classify_difficulty_by_llm()")
+            difficulty_result = self.classify_difficulty_by_llm(combined_text)
+            difficulty = difficulty_result['difficulty']
+            print(f"[DIFFICULTY] LLM classified as: {difficulty}")
+        else:
+            difficulty = default_difficulty
+            print(f"[DIFFICULTY] Mode: Manual/Pre-set")
+            print(f"[DIFFICULTY] Value: {difficulty}")
+        
+        print(f"  [DIFFICULTY] Using: {difficulty}\n")
+        
+        # Generate MCQs using LLM
+        mcqs = self._extract_mcqs_from_text(combined_text, chapter, difficulty,
+                                            processing_log=processing_log, label=label)
+        
+        return chapter, difficulty, mcqs, 'separate'
+    
     def _get_chunk_ranges(self, pdf_path: str, chunk_size: int) -> List[Tuple[int, int]]:
         """Get page ranges for chunked processing"""
         try:
             from PyPDF2 import PdfReader
-            reader = PdfReader(pdf_path)
-            total_pages = len(reader.pages)
+            total_pages = pdf_text_cache.page_count(pdf_path, lambda: len(PdfReader(pdf_path).pages))
             
             ranges = []
             for i in range(0, total_pages, chunk_size):
@@ -1348,8 +1603,9 @@ IMPORTANT NOTES:
             logger.error(f"Error determining page count: {e}")
             return [(0, 0)]
     
-    def _extract_mcqs_from_text(self, text: str, chapter: str, difficulty: str) -> List[Dict]:
-        """Extract MCQs from text using LLM"""
+    def _extract_mcqs_from_text(self, text: str, chapter: str, difficulty: str,
+                                processing_log=None, label: str = '') -> List[Dict]:
+        """Extract MCQs from text using LLM, one call per chunk of the content budget"""
         print(f"\n{'='*80}")
         print(f"[MCQ EXTRACTION] Starting LLM-based MCQ extraction")
         print(f"[MCQ EXTRACTION] Method: _extract_mcqs_from_text()")
@@ -1363,22 +1619,31 @@ IMPORTANT NOTES:
             # Fetch prompt from database
             prompt_template = self.get_or_create_mcq_extraction_prompt()
             
-            # Replace placeholders in template
-            prompt = prompt_template.replace('{text}', text[:5000])
-            prompt = prompt.replace('{chapter}', chapter)
-            prompt = prompt.replace('{difficulty}', difficulty)
-            
-            print(f"\n[LLM CALL] Sending prompt to LLM...")
-            print(f"[LLM CALL] Provider: {self.llm.__class__.__name__}")
-            print(f"[LLM CALL] Prompt length: {len(prompt)} characters\n")
-            
-            response = self.llm.generate_json(prompt)
+            def run(chunk, emit):
+                # Replace placeholders in template
+                prompt = render_prompt(prompt_template, {
+                    'text': chunk,
+                    'chapter': chapter,
+                    'difficulty': difficulty,
+                })
+                
+                print(f"\n[LLM CALL] Sending prompt to LLM...")
+                print(f"[LLM CALL] Provider: {self.llm.__class__.__name__}")
+                print(f"[LLM CALL] Prompt length: {len(prompt)} characters\n")
+                
+                response = self.llm.generate_json(prompt)
+                
+                print(f"[LLM RESPONSE] Received response from LLM")
+                print(f"[LLM RESPONSE] Response type: {type(response)}")
+                print(f"[LLM RESPONSE] Has 'questions' key: {'questions' in response if response else False}")
+                return response
             
-            print(f"[LLM RESPONSE] Received response from LLM")
-            print(f"[LLM RESPONSE] Response type: {type(response)}")
-            print(f"[LLM RESPONSE] Has 'questions' key: {'questions' in response if response else False}")
+            response = run_chunks(
+                chunk_text(text, llm=self.llm), run, llm=self.llm,
+                processing_log=processing_log, label=label
+            )
             
-            if response and 'questions' in response:
+            if 'error' not in response:
                 question_count = len(response['questions'])
                 print(f"✅ [MCQ EXTRACTION] SUCCESS - Extracted {question_count} MCQs")
                 print(f"[MCQ EXTRACTION] Questions: {[q.get('question', '')[:50] + '...' for q in response['questions'][:3]]}")
@@ -1392,6 +1657,101 @@ IMPORTANT NOTES:
             logger.error(f"Error extracting MCQs: {e}")
             return []
     
+    def classify_and_extract_mcqs(self, text: str, chapter: Optional[str] = None,
+                                  difficulty: Optional[str] = None, processing_log=None,
+                                  label: str = '') -> Optional[Dict[str, Any]]:
+        """
+        Classify chapter / difficulty and extract MCQs with a single LLM call
+        
+        Args:
+            text: OCR text of the page range
+            chapter: Fixed chapter, or None to let the LLM decide
+            difficulty: Fixed difficulty, or None to let the LLM decide
+            processing_log: ProcessingLog to record per-chunk status in
+            label: Name of the page range in that status
+        
+        Returns:
+            {'chapter', 'difficulty', 'questions'} where every question carries its
+            own chapter / difficulty (the chunk's unless the LLM set one), or None
+            when the call failed or the response is unusable.  Text over the
+            content budget is sent in chunks; chapter / difficulty are then the
+            first chunk's.
+        """
+        from genai.models import MathProblemGeneration
+        
+        print(f"\n{'='*80}")
+        print(f"[COMBINED EXTRACTION] Classify + extract in one LLM call")
+        print(f"[COMBINED EXTRACTION] Chapter: {chapter or 'auto'}")
+        print(f"[COMBINED EXTRACTION] Difficulty: {difficulty or 'auto'}")
+        print(f"[COMBINED EXTRACTION] Input text length: {len(text)} characters")
+        print(f"{'='*80}\n")
+        
+        chapters = ', '.join(ch[0] for ch in MathProblemGeneration.get_chapter_choices())
+        
+        def run(chunk, emit):
+            prompt = render_prompt(self.get_or_create_combined_extraction_prompt(), {
+                'text': chunk,
+                'chapters': chapters,
+                'chapter': chapter or 'auto',
+                'difficulty': difficulty or 'auto',
+            })
+            response = self.llm.generate_json(prompt)
+            
+            if not isinstance(response, dict) or not isinstance(response.get('questions'), list):
+                print(f"❌ [COMBINED EXTRACTION] FAILED - LLM did not return a questions array")
+                logger.warning("[COMBINED] Invalid LLM response")
+                raise ValueError('LLM did not return a questions array')
+            
+            chunk_chapter = chapter or str(response.get('chapter') or '').strip()
+            chunk_difficulty = difficulty or str(response.get('difficulty') or '').strip().lower()
+            if not chunk_chapter or chunk_difficulty not in DIFFICULTY_LEVELS:
+                print(f"❌ [COMBINED EXTRACTION] FAILED - missing chapter or difficulty")
+                logger.warning("[COMBINED] LLM response without chapter / difficulty")
+                raise ValueError('LLM response without chapter / difficulty')
+            
+            questions = []
+            for question in response['questions']:
+                if not isinstance(question, dict):
+                    continue
+                # A question's own classification only counts for values the LLM was asked to decide
+                own_chapter = str(question.get('chapter') or '').strip()
+                own_difficulty = str(question.get('difficulty') or '').strip().lower()
+                question['chapter'] = own_chapter if own_chapter and not chapter else chunk_chapter
+                question['difficulty'] = (
+                    own_difficulty if own_difficulty in DIFFICULTY_LEVELS and not difficulty else chunk_difficulty
+                )
+                questions.append(question)
+            return {'chapter': chunk_chapter, 'difficulty': chunk_difficulty, 'questions': questions}
+        
+        try:
+            result = run_chunks(
+                chunk_text(text, llm=self.llm), run, llm=self.llm,
+                processing_log=processing_log, label=label
+            )
+        except Exception as e:
+            logger.error(f"[COMBINED] Extraction error: {e}")
+            return None
+        if 'error' in result:
+            logger.error(f"[COMBINED] Extraction error: {result['error']}")
+            return None
+        
+        print(f"✅ [COMBINED EXTRACTION] Chapter: {result['chapter']}, Difficulty: {result['difficulty']}, "
+              f"{len(result['questions'])} MCQs")
+        return {'chapter': result['chapter'], 'difficulty': result['difficulty'], 'questions': result['questions']}
+    
+    def _new_mcqs(self, model, mcqs: List[Dict]) -> List[Dict]:
+        """Drop MCQs already in the math table or the question banks (exact or near duplicates)"""
+        from bank.services import fingerprints, near_duplicates
+        fresh, skipped = fingerprints.filter_new(
+            model, mcqs,
+            lambda mcq: fingerprints.compute(mcq.get('question', ''), [mcq.get('option_' + k, '') for k in 'abcd'])
+        )
+        fresh, reworded = near_duplicates.filter_new(fresh, lambda mcq: mcq.get('question', ''))
+        skipped += reworded
+        if skipped:
+            print(f"    ⏭️  Skipped {skipped} duplicate MCQ(s) ({reworded} near-duplicates)")
+        return fresh
+    
     def _convert_answer_to_int(self, answer: str) -> int:
         """Convert answer letter to integer"""
         answer_map = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5,
@@ -12,7 +12,13 @@ from pathlib import Path
 
 from genai.utils.llm_provider import default_llm
 from genai.utils.content_analyzer import ContentAnalyzer
+from genai.utils import parallel_extract, pdf_text_cache
+from genai.utils.content_compactor import compact_text
+from genai.utils.document_chunker import chunk_text, plan_questions, run_chunks
+from genai.utils.prompt_registry import render_prompt
 from genai.config import PDF_UPLOAD_PATH, MAX_PDF_SIZE
+from bank.services import fingerprints, near_duplicates
+from bank.services.recompute import deferred_recompute
 
 logger = logging.getLogger(__name__)
 
@@ -49,26 +55,10 @@ class PDFProcessor:
             Extracted text content
         """
         try:
-            text = ""
-            
-            # Try pdfplumber first (better for complex PDFs)
-            if PDFPLUMBER_AVAILABLE:
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page in pdf.pages:
-                        text += page.extract_text() or ""
-                return text
-            
-            # Fallback to PyPDF2
-            elif PYPDF2_AVAILABLE:
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-                return text
-            
-            else:
+            if not PDFPLUMBER_AVAILABLE and not PYPDF2_AVAILABLE:
                 logger.error("No PDF library available")
                 return ""
+            return "".join(self._extract_pages(pdf_path, 0, None))
         
         except Exception as e:
             logger.error(f"Error extracting PDF text: {str(e)}")
@@ -87,27 +77,41 @@ class PDFProcessor:
             Extracted text from specified pages
         """
         try:
-            if PDFPLUMBER_AVAILABLE:
-                text = ""
-                with pdfplumber.open(pdf_path) as pdf:
-                    end = end_page if end_page is not None else len(pdf.pages) - 1
-                    for i in range(start_page, min(end + 1, len(pdf.pages))):
-                        text += pdf.pages[i].extract_text() or ""
-                return text
-            
-            elif PYPDF2_AVAILABLE:
-                text = ""
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    end = end_page if end_page is not None else len(pdf_reader.pages) - 1
-                    for i in range(start_page, min(end + 1, len(pdf_reader.pages))):
-                        text += pdf_reader.pages[i].extract_text()
-                return text
+            if PDFPLUMBER_AVAILABLE or PYPDF2_AVAILABLE:
+                return "".join(self._extract_pages(pdf_path, start_page, end_page))
         
         except Exception as e:
             logger.error(f"Error extracting page range: {str(e)}")
             return ""
     
+    def count_pages(self, pdf_path: str) -> int:
+        """Number of pages (cached per file content)"""
+        def count():
+            if PDFPLUMBER_AVAILABLE:
+                with pdfplumber.open(pdf_path) as pdf:
+                    return len(pdf.pages)
+            with open(pdf_path, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        return pdf_text_cache.page_count(pdf_path, count)
+    
+    def _extract_pages(self, pdf_path: str, start_page: int, end_page: Optional[int]) -> List[str]:
+        """Text of each page in the range, read through the page text cache"""
+        total = self.count_pages(pdf_path)
+        end = end_page if end_page is not None else total - 1
+        pages = range(start_page, min(end + 1, total))
+        
+        # Try pdfplumber first (better for complex PDFs), fallback to PyPDF2
+        if PDFPLUMBER_AVAILABLE:
+            backend, extractor = 'pdfplumber', pdf_text_cache.extractor_key('pdfplumber', pdfplumber)
+        else:
+            backend, extractor = 'pypdf2', pdf_text_cache.extractor_key('pypdf2', PyPDF2)
+        
+        # Missing pages of large PDFs are extracted on the process pool
+        def extract(missing):
+            return parallel_extract.extract_pages(pdf_path, missing, backend)
+        
+        return pdf_text_cache.read_pages(pdf_path, extractor, pages, extract)
+    
     def validate_pdf(self, file_path: str) -> bool:
         """Validate PDF file"""
         if not os.path.exists(file_path):
@@ -151,7 +155,7 @@ class SubjectMCQGenerator:
 
 Chapter: {chapter}
 Topic: {topic}
-Content: {content[:2000]}
+Content: {content}
 
 Create questions that test understanding, not just memorization.
 
@@ -178,7 +182,8 @@ Return ONLY a valid JSON object (no markdown, no explanations) with this exact s
                                start_page: int = 0, end_page: int = None, 
                                num_questions: int = 5, difficulty: str = None,
                                output_format: str = 'json', subject: str = None,
-                               task_type: str = 'pdf_to_mcq') -> Dict[str, Any]:
+                               task_type: str = 'pdf_to_mcq', on_question=None,
+                               processing_log=None) -> Dict[str, Any]:
         """
         Process PDF and generate MCQs for specific chapter/topic
         
@@ -193,9 +198,12 @@ Return ONLY a valid JSON object (no markdown, no explanations) with this exact s
             output_format: Output format (json, list, etc.)
             subject: Subject name for fetching prompt from database
             task_type: Task type (pdf_to_mcq, pdf_to_descriptive, etc.)
+            on_question: If given, the response is streamed and this is called
+                         with each question as soon as it is complete
+            processing_log: ProcessingLog to record per-chunk status in
         
         Returns:
-            Generated MCQs data
+            Generated MCQs data, merged over all chunks of the page range
         """
         try:
             # Validate PDF
@@ -245,91 +253,100 @@ Return ONLY a valid JSON object (no markdown, no explanations) with this exact s
                 prompt_type = 'mcq'
             
             # Fetch prompt from database if subject provided, otherwise use hardcoded prompt
+            prompt_text = None
             if subject:
                 from .task_router import get_llm_prompt_for_task
                 prompt_text = get_llm_prompt_for_task(task_type, subject, prompt_type)
                 if not prompt_text:
                     logger.warning(f"No {prompt_type} prompt found for {subject}, using default prompt")
-                    prompt = self.generate_mcq_prompt(chapter, topic, content, num_questions, difficulty)
-                else:
-                    # Convert 999999 marker to "ALL" for the LLM
-                    num_questions_for_prompt = "ALL" if num_questions == 999999 else num_questions
-                    
-                    # Use database prompt with safe string substitution (not .format() which breaks with JSON braces)
-                    # Include content_type and options_available information for dual-mode support
-                    prompt = prompt_text
-                    
-                    # Safe replacement using string.replace() instead of .format()
-                    # This avoids issues with JSON braces in the template
-                    replacements = {
-                        '{chapter}': str(chapter or ''),
-                        '{topic}': str(topic or ''),
-                        '{content}': str(content[:3000] if content else ''),
-                        '{num_questions}': str(num_questions_for_prompt),
-                        '{difficulty}': str(difficulty or 'medium'),
-                        '{content_type}': str(content_type or 'mcq'),
-                        '{options_available}': str(has_options),
-                    }
-                    
-                    for placeholder, value in replacements.items():
-                        prompt = prompt.replace(placeholder, value)
-            else:
-                prompt = self.generate_mcq_prompt(chapter, topic, content, num_questions, difficulty)
             
-            # Print LLM input
-            print(f"\n{'='*80}")
-            print(f"[LLM INPUT] Sending prompt to LLM")
-            print(f"{'='*80}")
-            print(f"Prompt Type: {prompt_type}")
-            print(f"Task Type: {task_type}")
-            print(f"Subject: {subject}")
-            print(f"Content Type: {content_type.upper()}")
-            print(f"Options Available: {has_options}")
-            print(f"Difficulty: {difficulty or 'medium'}")
-            if num_questions == 999999:
-                print(f"Mode: EXTRACT ALL MCQs from PDF")
-            else:
-                print(f"Num Questions Requested: {num_questions}")
-            print(f"Prompt Length: {len(prompt)} characters")
-            print(f"{'-'*80}")
-            print(f"PROMPT:\n{prompt[:500]}...\n" if len(prompt) > 500 else f"PROMPT:\n{prompt}\n")
-            print(f"{'='*80}\n")
+            # The whole page range is sent, in chunks of the model's content budget.
+            # A fixed number of questions is spread over chunks across the document.
+            chunks = chunk_text(content, llm=self.llm)
+            indices, per_chunk = None, num_questions
+            if num_questions != 999999:
+                indices, per_chunk = plan_questions(len(chunks), num_questions)
             
-            response = self.llm.generate_json(prompt)
-            
-            # Print LLM output
-            print(f"\n{'='*80}")
-            print(f"[LLM OUTPUT] Received response from LLM")
-            print(f"{'='*80}")
-            if response:
-                if isinstance(response, dict):
-                    questions_count = len(response.get('questions', []))
-                    print(f"Response Type: {type(response).__name__}")
-                    print(f"Questions Generated: {questions_count}")
-                    print(f"Response Keys: {list(response.keys())}")
-                    print(f"{'-'*80}")
-                    print(f"RESPONSE (First 500 chars):\n{str(response)[:500]}...\n" if len(str(response)) > 500 else f"RESPONSE:\n{response}\n")
+            def build_prompt(chunk):
+                if not prompt_text:
+                    return self.generate_mcq_prompt(chapter, topic, chunk, per_chunk, difficulty)
+                # Convert 999999 marker to "ALL" for the LLM
+                num_questions_for_prompt = "ALL" if num_questions == 999999 else per_chunk
+                
+                # Use database prompt with safe placeholder substitution (not .format() which breaks with JSON braces)
+                # Include content_type and options_available information for dual-mode support
+                return render_prompt(prompt_text, {
+                    'chapter': str(chapter or ''),
+                    'topic': str(topic or ''),
+                    'content': chunk,
+                    'num_questions': str(num_questions_for_prompt),
+                    'difficulty': str(difficulty or 'medium'),
+                    'content_type': str(content_type or 'mcq'),
+                    'options_available': str(has_options),
+                })
+            
+            def run(chunk, emit):
+                prompt = build_prompt(chunk)
+                
+                # Print LLM input
+                print(f"\n{'='*80}")
+                print(f"[LLM INPUT] Sending prompt to LLM")
+                print(f"{'='*80}")
+                print(f"Prompt Type: {prompt_type}")
+                print(f"Task Type: {task_type}")
+                print(f"Subject: {subject}")
+                print(f"Content Type: {content_type.upper()}")
+                print(f"Options Available: {has_options}")
+                print(f"Difficulty: {difficulty or 'medium'}")
+                if num_questions == 999999:
+                    print(f"Mode: EXTRACT ALL MCQs from PDF")
                 else:
-                    print(f"Response Type: {type(response).__name__}")
-                    print(f"RESPONSE: {response}\n")
-            else:
-                print(f"Response: Empty or None\n")
-            print(f"{'='*80}\n")
-            
-            # Check if response is valid and has questions
-            if not response:
-                logger.error("Empty response from LLM")
-                print(f"  ❌ ERROR: LLM returned empty response")
-                return {"error": "LLM returned empty response", "questions": []}
+                    print(f"Num Questions Requested: {per_chunk}")
+                print(f"Prompt Length: {len(prompt)} characters")
+                print(f"{'-'*80}")
+                print(f"PROMPT:\n{prompt[:500]}...\n" if len(prompt) > 500 else f"PROMPT:\n{prompt}\n")
+                print(f"{'='*80}\n")
+                
+                if emit:
+                    response = self.llm.generate_json_stream(prompt, on_question=emit)
+                else:
+                    response = self.llm.generate_json(prompt)
+                
+                # Print LLM output
+                print(f"\n{'='*80}")
+                print(f"[LLM OUTPUT] Received response from LLM")
+                print(f"{'='*80}")
+                if response:
+                    if isinstance(response, dict):
+                        questions_count = len(response.get('questions', []))
+                        print(f"Response Type: {type(response).__name__}")
+                        print(f"Questions Generated: {questions_count}")
+                        print(f"Response Keys: {list(response.keys())}")
+                        print(f"{'-'*80}")
+                        print(f"RESPONSE (First 500 chars):\n{str(response)[:500]}...\n" if len(str(response)) > 500 else f"RESPONSE:\n{response}\n")
+                    else:
+                        print(f"Response Type: {type(response).__name__}")
+                        print(f"RESPONSE: {response}\n")
+                else:
+                    print(f"Response: Empty or None\n")
+                print(f"{'='*80}\n")
+                
+                if not response:
+                    logger.error("Empty response from LLM")
+                    print(f"  ❌ ERROR: LLM returned empty response")
+                    raise ValueError("LLM returned empty response")
+                return response
             
-            if not isinstance(response, dict):
-                logger.error(f"Invalid response type: {type(response)}")
-                return {"error": "Invalid response format", "questions": []}
+            response = run_chunks(
+                chunks, run, llm=self.llm, processing_log=processing_log,
+                on_question=on_question, indices=indices
+            )
             
-            if 'questions' not in response or not response.get('questions'):
+            # Check if response is valid and has questions
+            if not response.get('questions'):
                 logger.warning(f"No questions in response: {response}")
                 print(f"  ⚠️  WARNING: No questions generated by LLM")
-                return {"error": "No questions generated", "questions": []}
+                return {"error": response.get('error') or "No questions generated", "questions": []}
             
             logger.info(f"Successfully generated {len(response.get('questions', []))} MCQs")
             return response
@@ -361,6 +378,7 @@ Return ONLY a valid JSON object (no markdown, no explanations) with this exact s
                 logger.error(f"No model found for subject: {subject}")
                 return saved_items
             
+            pending_items = []
             for question_data in mcq_data.get('questions', []):
                 try:
                     # Create MCQ record with all available fields
@@ -440,15 +458,34 @@ Return ONLY a valid JSON object (no markdown, no explanations) with this exact s
                             if 'created_by' in field_names:
                                 item_data['created_by'] = created_by
                     
-                    # Create the record
-                    item = subject_table.objects.create(**item_data)
-                    saved_items.append({'id': item.id})
-                    logger.info(f"Saved {subject} MCQ: {item.id}")
-                    print(f"    ✓ Saved question {len(saved_items)}")
+                    pending_items.append(item_data)
                 
                 except Exception as e:
                     logger.error(f"Error saving individual MCQ: {str(e)}")
                     continue
+            
+            # One fingerprint lookup for the whole batch instead of saving duplicates
+            pending_items, skipped = fingerprints.filter_new(
+                subject_table, pending_items, lambda data: fingerprints.for_record(subject_table, data)
+            )
+            pending_items, reworded = near_duplicates.filter_new(pending_items, lambda data: data.get('question'))
+            skipped += reworded
+            if skipped:
+                print(f"    ⏭️  Skipped {skipped} duplicate question(s) ({reworded} near-duplicates)")
+                logger.info(f"Skipped {skipped} duplicate {subject} MCQs")
+            
+            with deferred_recompute():
+                for item_data in pending_items:
+                    try:
+                        # Create the record
+                        item = subject_table.objects.create(**item_data)
+                        saved_items.append({'id': item.id})
+                        logger.info(f"Saved {subject} MCQ: {item.id}")
+                        print(f"    ✓ Saved question {len(saved_items)}")
+                
+                    except Exception as e:
+                        logger.error(f"Error saving individual MCQ: {str(e)}")
+                        continue
         
         except Exception as e:
             logger.error(f"Error saving to subject table: {str(e)}")
@@ -517,7 +554,8 @@ class CurrentAffairsProcessor(SubjectMCQGenerator):
     """Process PDFs for Current Affairs MCQ and Descriptive content"""
     
     def process_currentaffairs_mcq(self, pdf_path: str, num_questions: int = 5, 
-                                    start_page: int = 0, end_page: int = None) -> Dict[str, Any]:
+                                    start_page: int = 0, end_page: int = None,
+                                    on_question=None, processing_log=None) -> Dict[str, Any]:
         """
         Process PDF for Current Affairs MCQ generation
         
@@ -526,9 +564,12 @@ class CurrentAffairsProcessor(SubjectMCQGenerator):
             num_questions: Number of MCQs to generate
             start_page: Starting page (0-indexed)
             end_page: Ending page (inclusive)
+            on_question: If given, the response is streamed and this is called
+                         with each question as soon as it is complete
+            processing_log: ProcessingLog to record per-chunk status in
         
         Returns:
-            Dictionary with questions and metadata
+            Dictionary with questions and metadata, merged over all chunks
         """
         try:
             # Extract PDF content
@@ -549,34 +590,41 @@ class CurrentAffairsProcessor(SubjectMCQGenerator):
                 # Use a default prompt for CA MCQ
                 prompt_text = self._get_default_ca_mcq_prompt()
             
-            # Replace placeholders
-            prompt = prompt_text
-            replacements = {
-                '{title}': 'Current Affairs Article',
-                '{content}': content[:3000],
-                '{num_questions}': str(num_questions),
-            }
-            
-            for placeholder, value in replacements.items():
-                prompt = prompt.replace(placeholder, value)
+            chunks = chunk_text(content, llm=self.llm)
+            indices, per_chunk = plan_questions(len(chunks), num_questions)
             
-            print(f"\n{'='*80}")
-            print(f"[CA MCQ LLM INPUT]")
-            print(f"{'='*80}")
-            print(f"Prompt Length: {len(prompt)} chars\n")
-            
-            # Call LLM
-            response = self.llm.generate_json(prompt)
-            
-            print(f"\n{'='*80}")
-            print(f"[CA MCQ RESPONSE]")
-            print(f"{'='*80}")
-            if response and 'questions' in response:
-                print(f"Questions generated: {len(response.get('questions', []))}\n")
-            else:
-                print(f"No questions in response\n")
+            def run(chunk, emit):
+                # Replace placeholders
+                prompt = render_prompt(prompt_text, {
+                    'title': 'Current Affairs Article',
+                    'content': chunk,
+                    'num_questions': str(per_chunk),
+                })
+                
+                print(f"\n{'='*80}")
+                print(f"[CA MCQ LLM INPUT]")
+                print(f"{'='*80}")
+                print(f"Prompt Length: {len(prompt)} chars\n")
+                
+                # Call LLM
+                if emit:
+                    response = self.llm.generate_json_stream(prompt, on_question=emit)
+                else:
+                    response = self.llm.generate_json(prompt)
+                
+                print(f"\n{'='*80}")
+                print(f"[CA MCQ RESPONSE]")
+                print(f"{'='*80}")
+                if response and 'questions' in response:
+                    print(f"Questions generated: {len(response.get('questions', []))}\n")
+                else:
+                    print(f"No questions in response\n")
+                return response
             
-            return response if response else {"questions": []}
+            return run_chunks(
+                chunks, run, llm=self.llm, processing_log=processing_log,
+                on_question=on_question, indices=indices
+            )
         
         except Exception as e:
             logger.error(f"Error processing CA MCQ: {str(e)}")
@@ -614,14 +662,10 @@ class CurrentAffairsProcessor(SubjectMCQGenerator):
                 prompt_text = self._get_default_ca_descriptive_prompt()
             
             # Replace placeholders
-            prompt = prompt_text
-            replacements = {
-                '{title}': 'Current Affairs Study Material',
-                '{content}': content[:3000],
-            }
-            
-            for placeholder, value in replacements.items():
-                prompt = prompt.replace(placeholder, value)
+            prompt = render_prompt(prompt_text, {
+                'title': 'Current Affairs Study Material',
+                'content': compact_text(content, llm=self.llm),
+            })
             
             print(f"\n{'='*80}")
             print(f"[CA DESCRIPTIVE LLM INPUT]")
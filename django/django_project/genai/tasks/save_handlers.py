@@ -3,9 +3,13 @@ Save handlers for different content types (Subject MCQ, Current Affairs MCQ, Cur
 Manages database saving with proper field mapping, date handling, and category Boolean flags
 """
 
+import time
+
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from bank.models import currentaffairs_mcq, currentaffairs_descriptive
+from bank.services.recompute import deferred_recompute
+from genai.config import LLM_STREAM_SAVE_BATCH
 
 User = get_user_model()
 
@@ -100,6 +104,52 @@ def get_date_and_year(processing_log, response_data=None):
     return ca_date, ca_year
 
 
+class ProgressiveSaver:
+    """
+    Saves streamed questions in small batches while the LLM is still generating
+    
+    Pass add() as the on_question callback of generate_json_stream(); every
+    batch_size questions save_batch({'questions': [...]}) is called and the
+    ProcessingLog progress counters are updated, so saved questions show up
+    in the admin long before the response has finished.  Call flush() when
+    the stream has ended.
+    """
+    
+    def __init__(self, save_batch, processing_log=None, batch_size=LLM_STREAM_SAVE_BATCH):
+        self.save_batch = save_batch
+        self.processing_log = processing_log
+        self.batch_size = max(1, batch_size)
+        self.pending = []
+        self.saved = []
+        self.received = 0
+        self.started = time.time()
+        self.first_saved_after = None
+    
+    def add(self, question):
+        self.received += 1
+        self.pending.append(question)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        saved = self.save_batch({'questions': batch}) or []
+        self.saved.extend(saved)
+        
+        if saved and self.first_saved_after is None:
+            self.first_saved_after = time.time() - self.started
+            print(f"  ⚡ First question saved after {self.first_saved_after:.1f}s")
+        print(f"  💾 Saved {len(saved)}/{len(batch)} streamed questions ({len(self.saved)} so far)")
+        
+        if self.processing_log is not None:
+            self.processing_log.processed_items = len(self.saved)
+            self.processing_log.success_count = len(self.saved)
+            self.processing_log.save(update_fields=['processed_items', 'success_count'])
+
+
+@deferred_recompute()
 def save_currentaffairs_mcq(mcq_data, processing_log, created_by):
     """
     Save Current Affairs MCQ from LLM response to database
@@ -188,6 +238,7 @@ def save_currentaffairs_mcq(mcq_data, processing_log, created_by):
     return saved_items
 
 
+@deferred_recompute()
 def save_currentaffairs_descriptive(desc_data, processing_log, created_by):
     """
     Save Current Affairs Descriptive from LLM response to database
@@ -4,7 +4,7 @@ Extend SubjectMCQGenerator for different subjects
 """
 
 from genai.tasks.pdf_processor import SubjectMCQGenerator
-from genai.models import LLMPrompt
+from genai.utils.prompt_registry import get_prompt_registry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,34 +24,29 @@ class SubjectSpecificProcessor(SubjectMCQGenerator):
         super().__init__(*args, **kwargs)
     
     def get_subject_specific_prompt(self, prompt_type: str = 'mcq') -> str:
-        """Get subject-specific prompt from database"""
+        """Get subject-specific prompt from the prompt registry"""
         print(f"\n{'─'*80}")
         print(f"[PROCESSOR] {self.__class__.__name__}.get_subject_specific_prompt()")
         print(f"  INPUT: prompt_type={prompt_type}")
         
-        try:
-            source_url = f"pdf_{self.SUBJECT_SLUG}_{prompt_type}"
-            print(f"  SEARCHING: source_url={source_url}")
-            
-            prompt = LLMPrompt.objects.get(
-                source_url=source_url,
-                prompt_type=prompt_type,
-                is_active=True
-            )
+        source_url = f"pdf_{self.SUBJECT_SLUG}_{prompt_type}"
+        print(f"  SEARCHING: source_url={source_url}")
+        
+        prompt = get_prompt_registry().find(prompt_type=prompt_type, source_url=source_url)
+        if prompt:
             print(f"  ✅ FOUND: LLMPrompt ID={prompt.id}")
-            print(f"  OUTPUT: prompt_text length={len(prompt.prompt_text)} chars\n")
-            return prompt.prompt_text
-            
-        except LLMPrompt.DoesNotExist:
-            print(f"  ❌ NOT FOUND: Using default prompt")
-            default_prompt = self.generate_mcq_prompt(
-                chapter=self.SUBJECT_NAME,
-                topic="General",
-                content="",
-                num_questions=5
-            )
-            print(f"  OUTPUT: default_prompt length={len(default_prompt)} chars\n")
-            return default_prompt
+            print(f"  OUTPUT: prompt_text length={len(prompt.text)} chars\n")
+            return prompt.text
+        
+        print(f"  ❌ NOT FOUND: Using default prompt")
+        default_prompt = self.generate_mcq_prompt(
+            chapter=self.SUBJECT_NAME,
+            topic="General",
+            content="",
+            num_questions=5
+        )
+        print(f"  OUTPUT: default_prompt length={len(default_prompt)} chars\n")
+        return default_prompt
 
 
 class PolityProcessor(SubjectSpecificProcessor):
@@ -6,8 +6,10 @@ This is the missing bridge between task_type selection and actual processing
 import json
 import logging
 from typing import Dict, Any, Optional
-from genai.models import ProcessingLog, LLMPrompt
+from genai.models import ProcessingLog
 from genai.tasks.pdf_processor import SubjectMCQGenerator, PDFProcessor
+from genai.utils import llm_telemetry
+from genai.utils.prompt_registry import get_prompt_registry
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -55,48 +57,38 @@ def get_processor_for_task_type(task_type: str, subject: Optional[str] = None):
 
 def get_llm_prompt_for_task(task_type: str, subject: str, prompt_type: str = 'mcq'):
     """
-    Get subject-specific LLM prompt from database
+    Get subject-specific LLM prompt, falling back to the default prompt
+    (source_url='') of the same type; read from the prompt registry
     """
     print("\n" + "-"*80)
     print(f"[ROUTER] get_llm_prompt_for_task()")
     print(f"  INPUT: task_type='{task_type}', subject='{subject}', prompt_type='{prompt_type}'")
     print("-"*80)
     
-    try:
-        # Try subject-specific prompt first
-        if task_type.startswith('pdf_to_'):
-            # e.g., pdf_to_mcq_polity or pdf_to_descriptive_computer
-            source_url = f"{task_type}_{subject}"
-        else:
-            source_url = f"pdf_{subject}_{prompt_type}"
-        
-        print(f"  SEARCHING: Prompt with source_url='{source_url}'")
-        
-        prompt = LLMPrompt.objects.get(
-            source_url=source_url,
-            prompt_type=prompt_type,
-            is_active=True
-        )
-        print(f"  FOUND: ✓ Prompt loaded (length: {len(prompt.prompt_text)} chars)")
+    # Try subject-specific prompt first
+    if task_type.startswith('pdf_to_'):
+        # e.g., pdf_to_mcq_polity or pdf_to_descriptive_computer
+        source_url = f"{task_type}_{subject}"
+    else:
+        source_url = f"pdf_{subject}_{prompt_type}"
+    
+    print(f"  SEARCHING: Prompt with source_url='{source_url}'")
+    
+    # Resolved from the in-process registry: no database query per call
+    prompt, matched = get_prompt_registry().resolve(prompt_type, source_url, '')  # '' = default
+    if prompt is None:
+        print(f"  ERROR: ✗ No prompt found for {task_type}/{prompt_type}")
+        logger.warning(f"No prompt found for {task_type}/{prompt_type}")
+        return None
+    
+    if matched == source_url:
+        print(f"  FOUND: ✓ Prompt loaded (length: {len(prompt.text)} chars)")
         print(f"  OUTPUT: Prompt text returned\n")
-        return prompt.prompt_text
-        
-    except LLMPrompt.DoesNotExist:
-        print(f"  NOT FOUND: Specific prompt not found, trying default...")
-        # Fallback to default
-        try:
-            prompt = LLMPrompt.objects.get(
-                source_url='',  # Empty source_url = default
-                prompt_type=prompt_type,
-                is_active=True
-            )
-            print(f"  FOUND: ✓ Default prompt loaded")
-            print(f"  OUTPUT: Default prompt returned\n")
-            return prompt.prompt_text
-        except LLMPrompt.DoesNotExist:
-            print(f"  ERROR: ✗ No prompt found for {task_type}/{prompt_type}")
-            logger.warning(f"No prompt found for {task_type}/{prompt_type}")
-            return None
+    else:
+        print(f"  NOT FOUND: Specific prompt not found, using default")
+        print(f"  FOUND: ✓ Default prompt loaded")
+        print(f"  OUTPUT: Default prompt returned\n")
+    return prompt.text
 
 
 def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
@@ -104,7 +96,15 @@ def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
     Route PDF processing based on task_type and subject
     
     THIS IS THE MISSING FUNCTION THAT USES TASK_TYPE
+    
+    LLM calls made while processing are recorded against processing_log
+    (LLMCallLog, see genai/utils/llm_telemetry.py).
     """
+    with llm_telemetry.track(processing_log, task_type=processing_log.task_type, subject=processing_log.subject):
+        return _route_pdf_processing_task(processing_log)
+
+
+def _route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
     
     print("\n" + "="*80)
     print(f"🚀 [ROUTER] route_pdf_processing_task() - MAIN ENTRY POINT")
@@ -170,7 +170,12 @@ def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
         else:
             print(f"  Full PDF extraction mode")
             content = processor.pdf_processor.extract_text_from_pdf(pdf_path)
-        
+            pdf_upload = processing_log.pdf_upload
+            if content and not pdf_upload.extracted_text:
+                pdf_upload.extracted_text = content
+                pdf_upload.total_pages = processor.pdf_processor.count_pages(pdf_path)
+                pdf_upload.save(update_fields=['extracted_text', 'total_pages'])
+
         if not content:
             raise ValueError("No content extracted from PDF")
         
@@ -189,26 +194,45 @@ def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
         # ==================== HANDLE CURRENT AFFAIRS TASKS ====================
         if task_type == 'pdf_currentaffairs_mcq':
             print(f"[STEP 8] Processing PDF with Current Affairs MCQ processor...")
+            from genai.tasks.save_handlers import ProgressiveSaver, save_currentaffairs_mcq
+            
+            # With ca_auto_date the date comes from the end of the response, so save at the end
+            saver = None
+            if not processing_log.ca_auto_date:
+                saver = ProgressiveSaver(
+                    lambda batch: save_currentaffairs_mcq(
+                        batch,
+                        processing_log=processing_log,
+                        created_by=processing_log.created_by
+                    ),
+                    processing_log=processing_log
+                )
             result = processor.process_currentaffairs_mcq(
                 pdf_path,
                 num_questions=processing_log.num_items or 5,
                 start_page=processing_log.start_page or 0,
-                end_page=processing_log.end_page
+                end_page=processing_log.end_page,
+                on_question=saver.add if saver else None,
+                processing_log=processing_log
             )
             
-            if 'error' in result:
+            if saver:
+                saver.flush()
+            if 'error' in result and not (saver and saver.saved):
                 raise ValueError(result.get('error', 'Processing failed'))
             
             print(f"  ✓ Processing complete\n")
             
             # Save to currentaffairs_mcq table
             print(f"[STEP 9] Saving results to database...")
-            from genai.tasks.save_handlers import save_currentaffairs_mcq
-            saved_items = save_currentaffairs_mcq(
-                result,
-                processing_log=processing_log,
-                created_by=processing_log.created_by
-            )
+            if saver:
+                saved_items = saver.saved
+            else:
+                saved_items = save_currentaffairs_mcq(
+                    result,
+                    processing_log=processing_log,
+                    created_by=processing_log.created_by
+                )
             
             print(f"  ✓ Saved {len(saved_items)} MCQs to database\n")
         
@@ -238,6 +262,28 @@ def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
         
         # ==================== HANDLE SUBJECT-BASED TASKS ====================
         else:
+            # Extract chapter from log_details if available
+            chapter = None
+            if processing_log.log_details:
+                try:
+                    log_data = json.loads(processing_log.log_details)
+                    chapter = log_data.get('chapter')
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            
+            # Questions are saved in batches while the LLM is still streaming the response
+            from genai.tasks.save_handlers import ProgressiveSaver
+            saver = ProgressiveSaver(
+                lambda batch: processor.save_mcqs_to_subject_table(
+                    batch,
+                    subject=subject,
+                    created_by=processing_log.created_by,
+                    chapter=chapter,
+                    difficulty=processing_log.difficulty_level
+                ),
+                processing_log=processing_log
+            )
+            
             # Generate output using processor
             print(f"[STEP 8] Processing PDF with subject processor...")
             result = processor.process_pdf_for_subject(
@@ -250,32 +296,31 @@ def route_pdf_processing_task(processing_log: ProcessingLog) -> Dict[str, Any]:
                 difficulty=processing_log.difficulty_level,
                 output_format=output_format,
                 subject=subject,
-                task_type=processing_log.task_type
+                task_type=processing_log.task_type,
+                on_question=saver.add,
+                processing_log=processing_log
             )
+            saver.flush()
             
-            if 'error' in result:
+            if 'error' in result and not saver.saved:
                 raise ValueError(result.get('error', 'Processing failed'))
             
             print(f"  ✓ Processing complete\n")
             
-            # Extract chapter from log_details if available
-            chapter = None
-            if processing_log.log_details:
-                try:
-                    log_data = json.loads(processing_log.log_details)
-                    chapter = log_data.get('chapter')
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            
             # Save to appropriate table
             print(f"[STEP 9] Saving results to database...")
-            saved_items = processor.save_mcqs_to_subject_table(
-                result,
-                subject=subject,
-                created_by=processing_log.created_by,
-                chapter=chapter,
-                difficulty=processing_log.difficulty_level
-            )
+            if saver.received:
+                saved_items = saver.saved
+            else:
+                saved_items = processor.save_mcqs_to_subject_table(
+                    result,
+                    subject=subject,
+                    created_by=processing_log.created_by,
+                    chapter=chapter,
+                    difficulty=processing_log.difficulty_level
+                )
+            if result.get('truncated'):
+                print(f"  ⚠️  LLM output was cut off; kept the {len(saved_items)} complete question(s)")
             
             print(f"  ✓ Saved {len(saved_items)} items to database\n")
         
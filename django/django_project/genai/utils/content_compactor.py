@@ -0,0 +1,354 @@
+"""
+Content Compaction
+Fit scraped pages and extracted text into a token budget before prompting
+
+Scraped pages used to reach the LLM whole (skip-scraping mode) or cut at a
+fixed length (content[:3000], text[:5000], MAX_LLM_HTML_CHARS), so prompts
+carried menus, footers and cookie banners while text past the cutoff was
+lost.  Compaction runs in three stages:
+
+1. Boilerplate blocks are removed from the DOM: navigation / footer / form
+   elements, blocks whose class or id marks them as cookie banners, share
+   bars or related-article lists, and blocks that are mostly link text or
+   too short to carry content (extract_blocks).
+2. Blocks that keep appearing on different pages of the same site are
+   dropped.  BoilerplateStore remembers block hashes per site in a SQLite
+   file shared by all worker processes.
+3. When what is left is still over the model's token budget
+   (LLM_CONTENT_TOKEN_BUDGETS), blocks are ranked by TF-IDF similarity to
+   the page as a whole and to the task (title, chapter, ...), and the best
+   ones are kept in their original order (select_blocks).
+
+Text that already fits the budget is returned unchanged by compact_text().
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import urlparse
+
+from genai.config import (
+    LLM_CONTENT_TOKEN_BUDGET, LLM_CONTENT_TOKEN_BUDGETS, BOILERPLATE_PATH, BOILERPLATE_MIN_PAGES
+)
+from genai.utils.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Elements that never hold article text
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'footer', 'header', 'aside', 'form', 'iframe', 'svg', 'button']
+# class / id words of banners, menus and link lists
+BOILERPLATE_ATTR = re.compile(
+    r'cookie|consent|gdpr|banner|related|share|social|newsletter|subscribe|breadcrumb|'
+    r'sidebar|widget|menu|comment|advert|promo|popup|modal|footer|navbar', re.I
+)
+# Containers checked against BOILERPLATE_ATTR (never html / body / main / article)
+ATTR_CHECKED_TAGS = ['div', 'section', 'ul', 'ol', 'span', 'table', 'p']
+BLOCK_TAGS = ['p', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'blockquote', 'pre',
+              'dd', 'dt', 'div', 'section', 'article', 'main', 'figcaption']
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+MIN_WORDS = 6             # shorter blocks are labels, buttons, bylines (table rows: 2)
+MAX_LINK_DENSITY = 0.5    # share of a block's text inside <a> above which it is a link list
+QUERY_WEIGHT = 2.0        # relevance to the task vs. to the page as a whole
+BOILERPLATE_TTL = 90 * 24 * 3600
+
+TERM = re.compile(r'[^\W_]{3,}|\d{2,}', re.UNICODE)
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has have him his how its may new now
+old see two who did get let put say she too use that with this from they will would there their what
+about which when make like time just know take into year your some could them than then these other
+been were also more most such only over very after before where while should each those being same
+""".split())
+
+
+def content_budget(llm=None) -> int:
+    """Tokens of source content allowed in one prompt to llm's model (LLM_CONTENT_TOKEN_BUDGETS)"""
+    model = getattr(llm, 'model', None) if llm is not None else None
+    return int(LLM_CONTENT_TOKEN_BUDGETS.get(model or '', LLM_CONTENT_TOKEN_BUDGET))
+
+
+def _terms(text: str) -> List[str]:
+    return [t for t in TERM.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _vector(counts: Counter, idf: Dict[str, float], default_idf: float) -> Dict[str, float]:
+    """Sublinear tf-idf, L2-normalised"""
+    vector = {t: (1 + math.log(c)) * idf.get(t, default_idf) for t, c in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {t: w / norm for t, w in vector.items()} if norm else {}
+
+
+def _dot(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(t, 0.0) for t, w in a.items())
+
+
+def rank_blocks(blocks: Sequence[str], query: str = '') -> List[float]:
+    """
+    Relevance score of each block
+
+    Cosine similarity of the block's tf-idf vector (idf over these blocks
+    only) to the centroid of all blocks, plus QUERY_WEIGHT times its
+    similarity to the query.
+    """
+    docs = [Counter(_terms(block)) for block in blocks]
+    n = len(docs)
+    df = Counter(t for doc in docs for t in doc)
+    idf = {t: math.log((n + 1) / (c + 1)) + 1 for t, c in df.items()}
+    default_idf = math.log(n + 1) + 1
+    vectors = [_vector(doc, idf, default_idf) for doc in docs]
+
+    centroid = Counter()
+    for vector in vectors:
+        centroid.update(vector)
+    norm = math.sqrt(sum(w * w for w in centroid.values())) or 1.0
+    centroid = {t: w / norm for t, w in centroid.items()}
+    query_vector = _vector(Counter(_terms(query or '')), idf, default_idf)
+
+    return [_dot(v, centroid) + QUERY_WEIGHT * _dot(v, query_vector) for v in vectors]
+
+
+def select_blocks(blocks: Sequence[str], query: str = '', budget: int = None,
+                  texts: Sequence[str] = None) -> List[int]:
+    """
+    Indices of the blocks to keep within a token budget, in document order
+
+    Args:
+        blocks: What will be sent (text, or HTML fragments)
+        query: Task text the blocks should be relevant to
+        budget: Token budget (default: LLM_CONTENT_TOKEN_BUDGET)
+        texts: Plain text of each block for ranking, when blocks are HTML
+
+    Returns:
+        Every index when all blocks fit, else the best-ranked blocks that fit
+    """
+    budget = budget or LLM_CONTENT_TOKEN_BUDGET
+    costs = [estimate_tokens(block) for block in blocks]
+    if sum(costs) <= budget:
+        return list(range(len(blocks)))
+
+    scores = rank_blocks(texts if texts is not None else blocks, query)
+    chosen = []
+    used = 0
+    for index in sorted(range(len(blocks)), key=lambda i: -scores[i]):
+        if used + costs[index] <= budget:
+            chosen.append(index)
+            used += costs[index]
+    return sorted(chosen)
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Paragraphs of text; paragraphs over max_tokens are split into lines, then sentences"""
+    blocks = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        pieces = [paragraph]
+        if estimate_tokens(paragraph) > max_tokens:
+            pieces = paragraph.split('\n')
+        for piece in pieces:
+            if estimate_tokens(piece) > max_tokens:
+                blocks.extend(re.split(r'(?<=[.!?।])\s+', piece))
+            else:
+                blocks.append(piece)
+    return [block.strip() for block in blocks if block.strip()]
+
+
+def compact_text(text: str, query: str = '', budget: int = None, llm=None) -> str:
+    """
+    Fit plain text into a token budget, keeping its most relevant paragraphs
+
+    Args:
+        text: Extracted text (PDF pages, combined articles, ...)
+        query: Task text to rank paragraphs against (chapter, topic, title)
+        budget: Token budget (default: content_budget(llm))
+        llm: Provider whose model picks the budget
+
+    Returns:
+        text unchanged when it fits, else the selected paragraphs in order
+    """
+    budget = budget or content_budget(llm)
+    if not text or estimate_tokens(text) <= budget:
+        return text or ''
+
+    blocks = split_text(text, max(50, budget // 8))
+    keep = select_blocks(blocks, query, budget)
+    compacted = '\n\n'.join(blocks[i] for i in keep) or text[:budget * 4]
+    print(f"[COMPACT] {len(text)} → {len(compacted)} chars ({len(keep)}/{len(blocks)} paragraphs, budget {budget} tokens)")
+    return compacted
+
+
+def extract_blocks(html: str) -> Tuple[str, List[str]]:
+    """
+    Content blocks of an HTML page, without boilerplate
+
+    Returns:
+        (page title, [block text, ...]) - headings are joined to the block that follows them
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html or '', 'html.parser')
+    title = soup.title.get_text(' ', strip=True) if soup.title else ''
+
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(ATTR_CHECKED_TAGS):
+        if getattr(tag, 'decomposed', False) or tag.attrs is None:
+            continue
+        marker = ' '.join(tag.get('class') or []) + ' ' + (tag.get('id') or '')
+        if BOILERPLATE_ATTR.search(marker):
+            tag.decompose()
+
+    blocks = []
+    seen = set()
+    heading = ''
+    for element in soup.find_all(BLOCK_TAGS):
+        if element.find(BLOCK_TAGS):
+            continue
+        text = ' '.join(element.get_text(' ', strip=True).split())
+        if not text:
+            continue
+        link_chars = sum(len(a.get_text(' ', strip=True)) for a in element.find_all('a'))
+        if link_chars / len(text) > MAX_LINK_DENSITY:
+            continue
+        if element.name in HEADING_TAGS:
+            heading = text
+            continue
+        if len(text.split()) < (2 if element.name == 'tr' else MIN_WORDS):
+            continue
+        if heading:
+            text = f"{heading}\n{text}"
+            heading = ''
+        if text not in seen:
+            seen.add(text)
+            blocks.append(text)
+    return title, blocks
+
+
+def _block_hash(text: str) -> str:
+    return hashlib.sha1(' '.join(text.lower().split()).encode('utf-8')).hexdigest()[:16]
+
+
+class BoilerplateStore:
+    """Blocks seen per site, in a SQLite file shared by all worker processes"""
+
+    def __init__(self, path: str = BOILERPLATE_PATH, min_pages: int = BOILERPLATE_MIN_PAGES):
+        self.path = path
+        self.min_pages = min_pages
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (site TEXT NOT NULL, page TEXT NOT NULL, PRIMARY KEY (site, page));
+                CREATE TABLE IF NOT EXISTS blocks (
+                    site TEXT NOT NULL, hash TEXT NOT NULL, pages INTEGER NOT NULL, last_seen REAL NOT NULL,
+                    PRIMARY KEY (site, hash)
+                );
+            """)
+            self._local.conn = conn
+        return conn
+
+    def filter(self, url: str, blocks: List[str]) -> List[str]:
+        """
+        Record the page's blocks and drop those seen on min_pages pages of its site
+
+        A page is counted once per URL, and nothing is dropped if every
+        block would be.
+        """
+        site = urlparse(url or '').netloc.lower()
+        if not site or not blocks:
+            return blocks
+        hashes = [_block_hash(block) for block in blocks]
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                page = hashlib.sha1(url.encode('utf-8')).hexdigest()
+                if conn.execute('INSERT OR IGNORE INTO pages (site, page) VALUES (?, ?)', (site, page)).rowcount:
+                    conn.executemany(
+                        'INSERT INTO blocks (site, hash, pages, last_seen) VALUES (?, ?, 1, ?) '
+                        'ON CONFLICT(site, hash) DO UPDATE SET pages = pages + 1, last_seen = excluded.last_seen',
+                        [(site, h, now) for h in set(hashes)]
+                    )
+                    conn.execute('DELETE FROM blocks WHERE site = ? AND last_seen < ?', (site, now - BOILERPLATE_TTL))
+                counts = {}
+                unique = list(set(hashes))
+                for start in range(0, len(unique), 500):
+                    chunk = unique[start:start + 500]
+                    counts.update(conn.execute(
+                        f"SELECT hash, pages FROM blocks WHERE site = ? AND hash IN ({','.join('?' * len(chunk))})",
+                        [site] + chunk
+                    ).fetchall())
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Boilerplate store unavailable: {str(e)}")
+            return blocks
+
+        kept = [block for block, h in zip(blocks, hashes) if counts.get(h, 0) < self.min_pages]
+        return kept or blocks
+
+
+def compact_html(html: str, url: str = None, query: str = '', budget: int = None, llm=None) -> str:
+    """
+    Article text of a scraped page within a token budget
+
+    Args:
+        html: Page HTML
+        url: Page URL; blocks repeated across pages of its site are dropped
+        query: Task text to rank blocks against (the page title is added)
+        budget: Token budget (default: content_budget(llm))
+        llm: Provider whose model picks the budget
+
+    Returns:
+        Selected blocks in page order, separated by blank lines
+    """
+    budget = budget or content_budget(llm)
+    title, blocks = extract_blocks(html)
+    found = len(blocks)
+    if url:
+        blocks = get_boilerplate_store().filter(url, blocks)
+    keep = select_blocks(blocks, f"{query or ''} {title}", budget)
+    compacted = '\n\n'.join(blocks[i] for i in keep)
+    if not compacted:
+        # No block survived the heuristics (unusual markup): fall back to the page text
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html or '', 'html.parser')
+        for tag in soup(BOILERPLATE_TAGS):
+            tag.decompose()
+        return compact_text(soup.get_text('\n', strip=True), f"{query or ''} {title}", budget)
+    print(
+        f"[COMPACT] {len(html or '')} chars HTML → {len(compacted)} chars "
+        f"({found} blocks, {found - len(blocks)} site boilerplate, {len(keep)} kept, budget {budget} tokens)"
+    )
+    return compacted
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_boilerplate_store() -> BoilerplateStore:
+    """Process-wide BoilerplateStore"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = BoilerplateStore()
+        return _default_store
@@ -0,0 +1,351 @@
+"""
+Document Chunking
+Whole-document MCQ generation: token-budgeted chunks, concurrent LLM calls, merged results
+
+A prompt only holds the model's content budget (content_budget), so a long
+PDF used to contribute its first few pages and nothing else.  Here the text
+is cut into chunks the size of that budget:
+
+- chunk_text() cuts at question / section / page boundaries (BOUNDARY) and
+  repeats the last LLM_CHUNK_OVERLAP_TOKENS of every chunk at the start of
+  the next, so a question split by a cut is seen whole at least once
+- run_chunks() sends the chunks through the LLM layer on a thread pool of
+  the provider's concurrency, records each chunk's status in the task's
+  ProcessingLog (log_details['chunks']) and merges the answers
+- ResultMerger drops the questions that come back twice from overlap
+  regions, exactly (fingerprints) or reworded (MinHash, near_duplicates)
+
+Text that fits the budget is one chunk and one call, as before.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.db import connections
+
+from genai.config import LLM_CHUNK_OVERLAP_TOKENS, LLM_CHUNK_MAX
+from genai.utils import llm_telemetry
+from genai.utils.content_compactor import content_budget, split_text
+from genai.utils.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Lines that start a new unit: page markers, numbered questions, headings
+BOUNDARY = re.compile(
+    r'^[ \t]*(?:'
+    r'=== Page \d+ ===|'
+    r'(?:Q(?:uestion)?\.?[ \t]*)?\d{1,4}[ \t]*[.):][ \t]+\S|'
+    r'Q(?:uestion)?[ \t]*\d{1,4}\b|'
+    r'(?:Chapter|Section|Unit|Exercise|Lesson|Part|Topic)[ \t]+[\dIVXLC]+\b|'
+    r'#{1,6}[ \t]'
+    r')',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def split_units(text: str, max_tokens: int) -> List[str]:
+    """Text cut before every BOUNDARY line; units over max_tokens are split further"""
+    starts = [0] + [m.start() for m in BOUNDARY.finditer(text) if m.start() > 0]
+    units = []
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        unit = text[start:end].strip()
+        if not unit:
+            continue
+        if estimate_tokens(unit) <= max_tokens:
+            units.append(unit)
+            continue
+        for piece in split_text(unit, max_tokens):
+            # A single sentence over the budget is cut by length
+            while estimate_tokens(piece) > max_tokens:
+                units.append(piece[:max_tokens * 4])
+                piece = piece[max_tokens * 4:]
+            if piece.strip():
+                units.append(piece)
+    return units
+
+
+def chunk_text(text: str, budget: int = None, overlap: int = LLM_CHUNK_OVERLAP_TOKENS, llm=None) -> List[str]:
+    """
+    Cut text into chunks of at most budget tokens
+
+    Args:
+        text: Document text
+        budget: Tokens per chunk (default: content_budget(llm))
+        overlap: Tokens of each chunk's end repeated at the start of the next
+        llm: Provider whose model picks the budget
+
+    Returns:
+        [text] when it fits, else the chunks in document order
+    """
+    budget = budget or content_budget(llm)
+    if not text or estimate_tokens(text) <= budget:
+        return [text] if text else []
+
+    overlap = max(0, min(overlap, budget // 2))
+    units = split_units(text, max(1, budget - overlap))
+    costs = [estimate_tokens(unit) for unit in units]
+    chunks = []
+    start = 0
+    while start < len(units):
+        end, used = start, 0
+        while end < len(units) and (end == start or used + costs[end] <= budget):
+            used += costs[end]
+            end += 1
+        chunks.append('\n\n'.join(units[start:end]))
+        if end >= len(units):
+            break
+        # Step back over the trailing units that fit in the overlap, always moving forward
+        back, carried = end, 0
+        while back - 1 > start and carried + costs[back - 1] <= overlap:
+            back -= 1
+            carried += costs[back]
+        start = back
+    return chunks
+
+
+def spread(total: int, wanted: int) -> List[int]:
+    """wanted chunk indices out of total, evenly spread over the document"""
+    if wanted >= total:
+        return list(range(total))
+    if wanted <= 1:
+        return [0]
+    return sorted({round(i * (total - 1) / (wanted - 1)) for i in range(wanted)})
+
+
+def plan_questions(total: int, num_questions: int) -> Tuple[Optional[List[int]], int]:
+    """
+    Which chunks to ask for how many questions, for a fixed number of questions
+
+    Returns:
+        (chunk indices spread over the document, questions per chunk);
+        (None, num_questions) for a single chunk
+    """
+    if total <= 1:
+        return None, num_questions
+    per_chunk = max(1, math.ceil(num_questions / total))
+    return spread(total, math.ceil(num_questions / per_chunk)), per_chunk
+
+
+def _options_of(question: Dict[str, Any]) -> List[str]:
+    options = question.get('options')
+    if isinstance(options, dict):
+        return [str(v) for v in options.values()]
+    if isinstance(options, list):
+        return [str(v) for v in options]
+    return [str(v) for k, v in sorted(question.items()) if k.startswith('option') and v]
+
+
+class ResultMerger:
+    """Questions of all chunks without the duplicates from overlap regions (thread-safe)"""
+
+    def __init__(self):
+        from bank.services.near_duplicates import NearDuplicateIndex
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._index = NearDuplicateIndex()
+        self._count = 0
+        self.accepted: Dict[int, List[Dict[str, Any]]] = {}
+        self.duplicates = 0
+
+    def add(self, chunk: int, question: Dict[str, Any]) -> bool:
+        """Keep question unless an earlier one matches it; returns whether it was kept"""
+        from bank.services import fingerprints, near_duplicates
+        if not isinstance(question, dict):
+            return False
+        text = str(question.get('question', ''))
+        key = fingerprints.compute(text, _options_of(question))
+        sig = near_duplicates.signature(text)
+        with self._lock:
+            # Reworded copies only come from the overlap with another chunk;
+            # similar questions within one chunk are left to the save path
+            reworded = sig is not None and any(
+                table != str(chunk) for table, _row, _score in self._index.query(sig)
+            )
+            if key in self._seen or reworded:
+                self.duplicates += 1
+                return False
+            self._seen.add(key)
+            if sig is not None:
+                self._index.add(str(chunk), self._count, sig)
+            self._count += 1
+            self.accepted.setdefault(chunk, []).append(question)
+            return True
+
+    @property
+    def questions(self) -> List[Dict[str, Any]]:
+        """Kept questions in document order"""
+        with self._lock:
+            return [q for chunk in sorted(self.accepted) for q in self.accepted[chunk]]
+
+
+class ChunkTracker:
+    """
+    Per-chunk status in ProcessingLog.log_details['chunks'], saved as chunks start and finish
+
+    The run's chunk_summary goes to log_details['chunk_summary'], keyed by label.
+    """
+
+    def __init__(self, processing_log=None, label: str = ''):
+        self.processing_log = processing_log
+        self.label = label
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._summary: Optional[Dict[str, Any]] = None
+
+    def register(self, chunks: List[str], indices: List[int], skipped: List[int] = ()):
+        """Chunks about to be sent (pending) and chunks left out (skipped)"""
+        for status, group in (('pending', indices), ('skipped', skipped)):
+            for index in group:
+                self._entries[index] = {
+                    'chunk': f"{self.label}#{index + 1}" if self.label else index + 1,
+                    'tokens': estimate_tokens(chunks[index]),
+                    'status': status,
+                }
+        self._save()
+
+    def summarize(self, summary: Dict[str, Any]):
+        with self._lock:
+            self._summary = summary
+        self._save()
+
+    def update(self, index: int, **fields):
+        with self._lock:
+            self._entries[index].update(fields)
+        self._save()
+
+    def _save(self):
+        if self.processing_log is None:
+            return
+        with self._lock:
+            try:
+                details = json.loads(self.processing_log.log_details or '{}')
+                if not isinstance(details, dict):
+                    details = {'log': details}
+            except ValueError:
+                details = {'log': self.processing_log.log_details}
+            # Entries of earlier page ranges / calls of the same task are kept
+            own = {entry['chunk'] for entry in self._entries.values()}
+            entries = [entry for entry in details.get('chunks', []) if entry.get('chunk') not in own]
+            entries.extend(self._entries[i] for i in sorted(self._entries))
+            details['chunks'] = entries
+            if self._summary is not None:
+                summaries = details.get('chunk_summary')
+                if not isinstance(summaries, dict):
+                    summaries = {}
+                summaries[self.label or 'all'] = self._summary
+                details['chunk_summary'] = summaries
+            self.processing_log.log_details = json.dumps(details)
+            try:
+                self.processing_log.save(update_fields=['log_details'])
+            except Exception as e:
+                logger.warning(f"Chunk status not saved: {str(e)}")
+
+
+def run_chunks(chunks: List[str], run: Callable[[str, Optional[Callable]], Optional[Dict[str, Any]]],
+               llm=None, processing_log=None, on_question: Callable = None, label: str = '',
+               concurrency: int = None, indices: List[int] = None) -> Dict[str, Any]:
+    """
+    Send every chunk through the LLM layer and merge the answers
+
+    Args:
+        chunks: chunk_text() output
+        run: run(chunk, emit) -> response dict with a 'questions' list; when
+             streaming, emit is the on_question callback to pass to
+             generate_json_stream(), else None
+        llm: Provider whose concurrency sizes the thread pool
+        processing_log: ProcessingLog to record per-chunk status in
+        on_question: Called once per merged (non-duplicate) question as soon as
+                     it is complete; calls are serialized
+        label: Prefix of the chunk names in the status (e.g. the page range)
+        concurrency: Worker threads (default: the provider's concurrency)
+        indices: Chunks to send (default: all, at most LLM_CHUNK_MAX; the
+                 rest are recorded as 'skipped')
+
+    Returns:
+        The first chunk's response with 'questions' replaced by the merged
+        questions, plus 'truncated' if any chunk was cut off and
+        'chunk_summary'; {'error': ..., 'questions': []} when every chunk failed
+    """
+    from genai.utils.llm_provider import get_llm_concurrency
+
+    skipped = []
+    if indices is None:
+        indices = list(range(len(chunks)))
+        if LLM_CHUNK_MAX and len(indices) > LLM_CHUNK_MAX:
+            logger.warning(f"{len(indices)} chunks, sending the first {LLM_CHUNK_MAX} (LLM_CHUNK_MAX)")
+            indices, skipped = indices[:LLM_CHUNK_MAX], indices[LLM_CHUNK_MAX:]
+    merger = ResultMerger()
+    tracker = ChunkTracker(processing_log, label)
+    tracker.register(chunks, indices, skipped)
+    emit_lock = threading.Lock()
+    responses: Dict[int, Dict[str, Any]] = {}
+    errors: Dict[int, str] = {}
+
+    workers = max(1, min(len(indices), concurrency or get_llm_concurrency(llm)))
+
+    def process(index: int):
+        started = time.time()
+        try:
+            tracker.update(index, status='running')
+            if on_question:
+                def emit(question):
+                    if merger.add(index, question):
+                        with emit_lock:
+                            on_question(question)
+            else:
+                emit = None
+            try:
+                response = run(chunks[index], emit)
+                if not isinstance(response, dict) or not isinstance(response.get('questions'), list):
+                    error = response.get('error') if isinstance(response, dict) else None
+                    raise ValueError(error or 'Invalid response format')
+            except Exception as e:
+                errors[index] = str(e)
+                tracker.update(index, status='failed', error=str(e)[:300], seconds=round(time.time() - started, 1))
+                return
+            if not on_question:
+                for question in response['questions']:
+                    merger.add(index, question)
+            responses[index] = response
+            tracker.update(
+                index, status='done', questions=len(response['questions']),
+                kept=len(merger.accepted.get(index, [])), seconds=round(time.time() - started, 1),
+            )
+        finally:
+            if workers > 1:
+                # Status saves and prompt lookups open a connection per pool thread
+                connections.close_all()
+
+    if len(indices) > 1:
+        print(f"[CHUNKS] {len(indices)} chunk(s) of up to {max(estimate_tokens(chunks[i]) for i in indices)} tokens, "
+              f"{workers} worker(s)")
+    if workers == 1:
+        for index in indices:
+            process(index)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(llm_telemetry.propagate(process), indices))
+
+    summary = {
+        'chunks': len(indices), 'failed': len(errors), 'skipped': len(skipped), 'duplicates': merger.duplicates,
+    }
+    tracker.summarize(summary)
+    if not responses:
+        first_error = errors[min(errors)] if errors else 'No content'
+        return {'error': first_error, 'questions': []}
+
+    result = dict(responses[min(responses)])
+    result['questions'] = merger.questions
+    if any(r.get('truncated') for r in responses.values()):
+        result['truncated'] = True
+    result['chunk_summary'] = summary
+    if len(indices) > 1:
+        print(f"[CHUNKS] Merged {len(result['questions'])} question(s) from {len(responses)}/{len(indices)} chunk(s), "
+              f"{merger.duplicates} duplicate(s) from overlaps dropped")
+    return result
@@ -0,0 +1,156 @@
+"""
+Incremental JSON Question Parser
+Pulls complete questions out of a streamed LLM response as soon as they close
+
+The MCQ prompts ask for {"questions": [{...}, {...}, ...], ...}.  Feeding the
+streamed text into QuestionStreamParser yields every element of the
+"questions" array the moment its closing brace arrives, so callers can save
+question 1 while the model is still writing question 20.  A bare top-level
+array ([{...}, ...]) and markdown code fences around the JSON are handled
+too.
+
+finish() returns the whole parsed response.  When the output was cut off
+(token limit, dropped connection) it returns the questions that did close
+instead of nothing, flagged with "truncated": True.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS_KEY = 'questions'
+
+
+def parse_json_text(text: str) -> Any:
+    """
+    Parse an LLM JSON answer: as-is, inside a markdown fence, or between the outer braces
+
+    Returns:
+        The parsed value, or None when none of them is valid JSON
+    """
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    fence = re.search(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+    if fence:
+        try:
+            return json.loads(fence.group(1).strip())
+        except json.JSONDecodeError:
+            pass
+
+    start, end = text.find('{'), text.rfind('}')
+    if start != -1 and end > start:
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+class QuestionStreamParser:
+    """Emits each element of the "questions" array as soon as it is complete"""
+
+    def __init__(self, key: str = QUESTIONS_KEY):
+        self.key = key
+        self.text = ''
+        self.questions = []
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._array_depth = None   # stack depth inside the questions array
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Add streamed text
+
+        Returns:
+            Questions completed by this chunk (possibly empty)
+        """
+        if not chunk:
+            return []
+        self.text += chunk
+        completed = []
+        text = self.text
+        stack = self._stack
+
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(stack) == 1 and self._array_depth is None:
+                        self._last_string = text[self._string_start:pos]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos + 1
+            elif char in '{[':
+                if char == '[' and self._array_depth is None and (
+                        not stack or (stack == ['{'] and self._last_string == self.key)):
+                    stack.append(char)
+                    self._array_depth = len(stack)
+                    continue
+                stack.append(char)
+                if self._array_depth is not None and len(stack) == self._array_depth + 1:
+                    self._item_start = pos
+            elif char in '}]':
+                if not stack:
+                    continue
+                stack.pop()
+                if self._array_depth is None:
+                    continue
+                if len(stack) == self._array_depth and self._item_start is not None:
+                    item = self._decode(text[self._item_start:pos + 1])
+                    self._item_start = None
+                    if isinstance(item, dict):
+                        self.questions.append(item)
+                        completed.append(item)
+                elif len(stack) < self._array_depth:
+                    # questions array closed; later keys (categories, ...) are read by finish()
+                    self._array_depth = -1
+
+        self._pos = len(text)
+        return completed
+
+    def _decode(self, fragment: str):
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed streamed question: {str(e)}")
+            return None
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        The complete response once the stream has ended
+
+        Returns:
+            The parsed JSON object; a bare array becomes {"questions": [...]}.
+            If the text does not parse (e.g. cut off at the token limit) the
+            questions emitted so far are returned with "truncated": True.
+        """
+        parsed = parse_json_text(self.text)
+        if isinstance(parsed, list):
+            return {self.key: [q for q in parsed if isinstance(q, dict)]}
+        if isinstance(parsed, dict):
+            return parsed
+        if self.questions:
+            print(f"[STREAM] Response incomplete, keeping {len(self.questions)} complete question(s)")
+            logger.warning(f"Truncated LLM response, kept {len(self.questions)} complete questions")
+            return {self.key: list(self.questions), 'truncated': True}
+        return {}
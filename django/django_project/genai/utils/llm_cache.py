@@ -0,0 +1,225 @@
+"""
+LLM Response Cache
+Persistent SQLite store behind CachedLLMProvider (see llm_provider.py)
+
+Re-running a failed ProcessingLog, re-processing the same PDF page range or
+re-fetching an unchanged ContentSource sends byte-identical prompts to the
+API again.  ResponseCache keeps the responses in one local SQLite file so
+those calls are answered without the network:
+
+- entries are keyed on provider, model, temperature, max tokens, the call
+  type and a SHA-256 of the prompt (see make_key)
+- every entry expires LLM_CACHE_TTL seconds after it was stored
+- the file is size-bounded: once the stored responses exceed
+  LLM_CACHE_MAX_BYTES the least recently read entries are evicted
+- hit / miss / store / eviction counters live in the same file, so the
+  numbers on the processing dashboard cover every worker process
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from genai.config import LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ('hits', 'misses', 'stores', 'evictions')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def make_key(provider: str, model: str, temperature: Any, max_tokens: Any,
+             kind: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Cache key of one LLM call
+
+    Args:
+        provider: Provider class name, e.g. 'GroqProvider'
+        model: Model name sent to the API
+        temperature: Sampling temperature
+        max_tokens: Output token limit (None when the provider has none)
+        kind: 'generate' or 'generate_json'
+        prompt: The full prompt text
+        options: Extra keyword arguments passed through to the API
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    payload = json.dumps(
+        [provider, model, temperature, max_tokens, kind, prompt_hash, options or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of LLM responses in a SQLite file"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            (name, amount)
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None on a miss"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT value, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._count(conn, 'misses')
+                return None
+            conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._count(conn, 'hits')
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            return None
+
+    def set(self, key: str, value: Any, provider: str = '', model: str = '',
+            ttl: Optional[int] = None):
+        """Store a response and evict least recently used entries over the size limit"""
+        now = time.time()
+        data = json.dumps(value)
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses '
+                    '(key, provider, model, value, size, created_at, expires_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, provider, model or '', data, len(data), now, now + ttl, now)
+                )
+                self._count(conn, 'stores')
+                self._evict(conn, now)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        evicted = conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,)).rowcount
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            stale = []
+            for key, size in conn.execute('SELECT key, size FROM responses ORDER BY last_access'):
+                stale.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany('DELETE FROM responses WHERE key = ?', stale)
+            evicted += len(stale)
+        if evicted:
+            self._count(conn, 'evictions', evicted)
+
+    def delete(self, key: str):
+        try:
+            self._connect().execute('DELETE FROM responses WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache delete failed: {str(e)}")
+
+    def clear(self, provider: str = None, model: str = None) -> int:
+        """Drop cached responses (all, or one provider / model); returns the number removed"""
+        clauses, params = [], []
+        if provider:
+            clauses.append('provider = ?')
+            params.append(provider)
+        if model:
+            clauses.append('model = ?')
+            params.append(model)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self._connect().execute(f'DELETE FROM responses{where}', params).rowcount
+
+    def reset_counters(self):
+        self._connect().execute('DELETE FROM counters')
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current size, for the processing dashboard"""
+        result = {name: 0 for name in COUNTERS}
+        result.update(entries=0, size_bytes=0, max_bytes=self.max_bytes, hit_rate=0.0)
+        try:
+            conn = self._connect()
+            result.update(conn.execute('SELECT name, value FROM counters').fetchall())
+            entries, size = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache stats failed: {str(e)}")
+            return result
+        lookups = result['hits'] + result['misses']
+        result.update(
+            entries=entries,
+            size_bytes=size,
+            hit_rate=round(100.0 * result['hits'] / lookups, 1) if lookups else 0.0,
+        )
+        return result
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide ResponseCache using the LLM_CACHE_* settings"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -0,0 +1,229 @@
+"""
+LLM Cassettes
+Recorded LLM calls and downloaded pages in a SQLite file, for offline replay
+
+With LLM_CASSETTE_MODE=record, every real API call made through
+get_llm_provider() (RecordingLLMProvider) and every page downloaded by the
+current affairs and job scrapers is stored here together with how long it
+took.  With LLM_CASSETTE_MODE=replay, get_llm_provider() returns a
+ReplayLLMProvider and the scrapers read pages from the file, so
+route_pdf_processing_task, run_complete_pipeline and scrape_freejobalert run
+without the network:
+
+- calls are looked up by call type and a SHA-256 of the prompt (prompt_key),
+  whatever provider made the recording
+- latency is simulated from LLM_REPLAY_LATENCY (see parse_latency)
+- LLM_REPLAY_ERROR_RATE of the calls fail with a 429 / 5xx error, so the
+  backoff and failover paths can be exercised
+- the random draws depend on LLM_REPLAY_SEED, the prompt and how often it
+  was replayed, not on thread timing, so runs are repeatable
+
+See the benchmark_pipeline management command.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from genai.config import LLM_CASSETTE_MODE, LLM_CASSETTE_PATH
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    response TEXT NOT NULL,
+    latency REAL NOT NULL,
+    first_byte REAL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    html TEXT NOT NULL,
+    latency REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+"""
+
+
+class CassetteMiss(LookupError):
+    """Replay asked for a call or page that was never recorded"""
+
+
+def prompt_key(kind: str, prompt: str) -> str:
+    """
+    Cassette key of one LLM call
+
+    Streamed and plain JSON calls share recordings, like the response cache.
+    """
+    if kind == 'generate_json_stream':
+        kind = 'generate_json'
+    return hashlib.sha256(f"{kind}\n{prompt}".encode('utf-8')).hexdigest()
+
+
+def parse_latency(spec: str) -> Callable[[Any, float], float]:
+    """
+    Simulated latency of a replayed call
+
+    Args:
+        spec: 'recorded[:SCALE]' - the recorded latency, optionally scaled
+              'none'             - answer immediately
+              'fixed:S'          - always S seconds
+              'uniform:A,B'      - uniform between A and B seconds
+              'normal:MEAN,SD'   - normal distribution, clamped at 0
+              'lognormal:MEDIAN,SIGMA' - log-normal, the usual shape of API latencies
+
+    Returns:
+        sample(rng, recorded_latency) -> seconds
+    """
+    name, _, args = (spec or 'recorded').strip().lower().partition(':')
+    try:
+        values = [float(v) for v in args.split(',') if v.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid latency distribution: {spec}")
+
+    if name == 'recorded':
+        scale = values[0] if values else 1.0
+        return lambda rng, recorded: recorded * scale
+    if name == 'none':
+        return lambda rng, recorded: 0.0
+    if name == 'fixed' and len(values) == 1:
+        return lambda rng, recorded: values[0]
+    if name == 'uniform' and len(values) == 2:
+        return lambda rng, recorded: rng.uniform(values[0], values[1])
+    if name == 'normal' and len(values) == 2:
+        return lambda rng, recorded: max(0.0, rng.gauss(values[0], values[1]))
+    if name == 'lognormal' and len(values) == 2:
+        return lambda rng, recorded: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+
+class Cassette:
+    """Recorded LLM calls and pages in a SQLite file"""
+
+    def __init__(self, path: str = LLM_CASSETTE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get_call(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            'SELECT response, latency, first_byte, provider, model FROM calls WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        response, latency, first_byte, provider, model = row
+        return {
+            'response': json.loads(response),
+            'latency': latency,
+            'first_byte': first_byte,
+            'provider': provider,
+            'model': model,
+        }
+
+    def record_call(self, kind: str, prompt: str, response: Any, latency: float,
+                    first_byte: float = None, provider: str = '', model: str = ''):
+        """Store one call; a later recording of the same prompt replaces the earlier one"""
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO calls (key, kind, provider, model, prompt, response, latency, first_byte, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (prompt_key(kind, prompt), kind, provider or '', model or '', prompt,
+                 json.dumps(response), latency, first_byte, time.time())
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Cassette could not record call: {str(e)}")
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute('SELECT html, latency FROM pages WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        return {'html': row[0], 'latency': row[1]}
+
+    def record_page(self, url: str, html: str, latency: float):
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO pages (url, html, latency, recorded_at) VALUES (?, ?, ?, ?)',
+                (url, html, latency, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Cassette could not record page: {str(e)}")
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM calls')
+        conn.execute('DELETE FROM pages')
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        calls, latency = conn.execute('SELECT COUNT(*), AVG(latency) FROM calls').fetchone()
+        pages = conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+        by_provider = dict(conn.execute('SELECT provider, COUNT(*) FROM calls GROUP BY provider').fetchall())
+        return {
+            'path': self.path,
+            'calls': calls,
+            'pages': pages,
+            'avg_latency': round(latency or 0, 3),
+            'providers': by_provider,
+        }
+
+
+def fetch_page(url: str, fetch: Callable[[], Optional[str]]) -> Optional[str]:
+    """
+    Download a page through the cassette
+
+    Args:
+        url: Page URL (the cassette key)
+        fetch: Downloads the page when not replaying
+
+    Returns:
+        fetch()'s HTML; in replay mode the recorded HTML, after the recorded
+        download time (raises CassetteMiss when the page was never recorded)
+    """
+    if LLM_CASSETTE_MODE == 'replay':
+        page = get_cassette().get_page(url)
+        if page is None:
+            raise CassetteMiss(f"No recorded page for {url}")
+        time.sleep(page['latency'])
+        return page['html']
+
+    started = time.time()
+    html = fetch()
+    if LLM_CASSETTE_MODE == 'record' and html:
+        get_cassette().record_page(url, html, time.time() - started)
+    return html
+
+
+_default_cassette = None
+_default_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Process-wide Cassette at LLM_CASSETTE_PATH"""
+    global _default_cassette
+    with _default_lock:
+        if _default_cassette is None:
+            _default_cassette = Cassette()
+        return _default_cassette
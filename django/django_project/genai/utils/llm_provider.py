@@ -5,23 +5,63 @@ Handles interaction with Gemini Pro, OpenAI and other LLM APIs
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Any, Optional, Callable
 from genai.config import (
     DEFAULT_LLM_PROVIDER,
     GROQ_API_KEY, GROQ_MODEL, GROQ_TEMPERATURE, GROQ_MAX_OUTPUT_TOKENS,
     GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE, GEMINI_MAX_OUTPUT_TOKENS,
-    OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE
+    OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE,
+    GROQ_CONCURRENCY, GEMINI_CONCURRENCY, OPENAI_CONCURRENCY,
+    GROQ_RPM, GROQ_TPM, GEMINI_RPM, GEMINI_TPM, OPENAI_RPM, OPENAI_TPM,
+    LLM_RATE_LIMIT_ENABLED, LLM_COMPLETION_TOKEN_ESTIMATE,
+    LLM_FAILOVER_ENABLED, LLM_FAILOVER_ORDER, LLM_HEDGE_ENABLED,
+    LLM_STREAMING_ENABLED,
+    LLM_CACHE_ENABLED, LLM_TELEMETRY_ENABLED,
+    LLM_CASSETTE_MODE, LLM_REPLAY_LATENCY, LLM_REPLAY_ERROR_RATE, LLM_REPLAY_SEED, LLM_REPLAY_CONCURRENCY
 )
 
+from genai.utils import llm_telemetry
+from genai.utils.json_stream import QuestionStreamParser
+
 logger = logging.getLogger(__name__)
 
+JSON_INSTRUCTION = """
+
+IMPORTANT: Your response MUST be valid JSON only. Do not include any markdown formatting or explanations."""
+
+
+def _salvage_questions(response_text: str) -> Dict[str, Any]:
+    """Complete questions from an unparseable (e.g. truncated) JSON response, or {}"""
+    parser = QuestionStreamParser()
+    parser.feed(response_text or '')
+    return parser.finish()
+
+
 class LLMProvider:
     """Base class for LLM providers"""
     
+    # Calls that may be in flight at once (see get_llm_concurrency)
+    concurrency = 1
+    # Requests / tokens per minute for RateLimitedLLMProvider (0 = unlimited)
+    rpm = 0
+    tpm = 0
+    
     def __init__(self, model: str = None):
         self.model = model or GEMINI_MODEL
         self.temperature = GEMINI_TEMPERATURE
     
+    @property
+    def name(self) -> str:
+        """Provider class name; wrappers report the provider they wrap"""
+        inner = self.__dict__.get('provider')
+        if isinstance(inner, LLMProvider):
+            return inner.name
+        return self.__class__.__name__
+    
     def generate(self, prompt: str, **kwargs) -> str:
         """Generate text from a prompt"""
         raise NotImplementedError
@@ -29,6 +69,49 @@ class LLMProvider:
     def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate JSON response from the model"""
         raise NotImplementedError
+    
+    # Providers whose generate_stream() yields text as it is generated
+    supports_streaming = False
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield the response text in chunks (default: the whole response at once)"""
+        yield self.generate(prompt, **kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable[[Dict[str, Any]], None] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Generate a JSON response, reporting each question as soon as it is complete
+        
+        Args:
+            prompt: The prompt to send to the model
+            on_question: Called with every element of the response's "questions"
+                         array as soon as it has been generated
+            **kwargs: Additional parameters
+        
+        Returns:
+            The full JSON response. If generation stops early (token limit,
+            dropped connection after some questions arrived), the complete
+            questions with "truncated": True.
+        """
+        if not self.supports_streaming or not LLM_STREAMING_ENABLED:
+            response = self.generate_json(prompt, **kwargs)
+            if on_question and isinstance(response, dict):
+                for question in response.get('questions') or []:
+                    on_question(question)
+            return response
+        
+        parser = QuestionStreamParser()
+        try:
+            for chunk in self.generate_stream(prompt + JSON_INSTRUCTION, **kwargs):
+                llm_telemetry.note_first_byte()
+                for question in parser.feed(chunk):
+                    if on_question:
+                        on_question(question)
+        except Exception as e:
+            if not parser.questions:
+                raise
+            logger.error(f"{self.name} stream failed after {len(parser.questions)} questions: {str(e)}")
+            print(f"[STREAM] ❌ Stream failed after {len(parser.questions)} question(s): {str(e)}")
+        return parser.finish()
 
 
 class GroqProvider(LLMProvider):
@@ -40,6 +123,9 @@ class GroqProvider(LLMProvider):
         self.model = model
         self.temperature = GROQ_TEMPERATURE
         self.max_output_tokens = GROQ_MAX_OUTPUT_TOKENS
+        self.concurrency = GROQ_CONCURRENCY
+        self.rpm = GROQ_RPM
+        self.tpm = GROQ_TPM
         
         try:
             from groq import Groq
@@ -83,6 +169,7 @@ class GroqProvider(LLMProvider):
                 **kwargs
             )
             response_content = chat_completion.choices[0].message.content
+            llm_telemetry.note_usage(chat_completion)
             
             print(f"\n{'='*80}")
             print(f"[GROQ RESPONSE]")
@@ -151,7 +238,35 @@ IMPORTANT: Your response MUST be valid JSON only. Do not include any markdown fo
             pass
         
         logger.error(f"Failed to parse JSON response: {response_text}")
-        return {}
+        return _salvage_questions(response_text)
+    
+    supports_streaming = True
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Stream text from the Groq API
+        
+        Args:
+            prompt: The prompt to send to the model
+            **kwargs: Additional parameters
+        
+        Yields:
+            Response text as it is generated
+        """
+        print(f"[GROQ STREAM] Model: {self.model}, Prompt Length: {len(prompt)} chars")
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_output_tokens,
+            temperature=self.temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            stream=True,
+            **kwargs
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 
 class GeminiProvider(LLMProvider):
@@ -163,6 +278,9 @@ class GeminiProvider(LLMProvider):
         self.model = model
         self.temperature = GEMINI_TEMPERATURE
         self.max_output_tokens = GEMINI_MAX_OUTPUT_TOKENS
+        self.concurrency = GEMINI_CONCURRENCY
+        self.rpm = GEMINI_RPM
+        self.tpm = GEMINI_TPM
         
         try:
             import google.generativeai as genai
@@ -195,6 +313,7 @@ class GeminiProvider(LLMProvider):
                     **kwargs
                 }
             )
+            llm_telemetry.note_usage(response)
             return response.text
         
         except Exception as e:
@@ -213,7 +332,24 @@ IMPORTANT: Your response MUST be valid JSON only. Do not include any markdown fo
             return json.loads(response_text)
         except json.JSONDecodeError:
             logger.error(f"Failed to parse JSON response: {response_text}")
-            return {}
+            return _salvage_questions(response_text)
+    
+    supports_streaming = True
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text from the Gemini API"""
+        response = self.client.generate_content(
+            prompt,
+            generation_config={
+                'temperature': self.temperature,
+                'max_output_tokens': self.max_output_tokens,
+                **kwargs
+            },
+            stream=True
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
 
 
 class OpenAIProvider(LLMProvider):
@@ -224,6 +360,9 @@ class OpenAIProvider(LLMProvider):
         self.api_key = api_key
         self.model = model
         self.temperature = OPENAI_TEMPERATURE
+        self.concurrency = OPENAI_CONCURRENCY
+        self.rpm = OPENAI_RPM
+        self.tpm = OPENAI_TPM
         
         try:
             import openai
@@ -259,6 +398,7 @@ class OpenAIProvider(LLMProvider):
                 params["response_format"] = {"type": "json_object"}
             
             response = self.client.ChatCompletion.create(**params)
+            llm_telemetry.note_usage(response)
             
             return response.choices[0].message["content"]
         
@@ -273,12 +413,30 @@ class OpenAIProvider(LLMProvider):
             return json.loads(response_text)
         except json.JSONDecodeError:
             logger.error(f"Failed to parse JSON response: {response_text}")
-            return {}
+            return _salvage_questions(response_text)
+    
+    supports_streaming = True
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text from the OpenAI API"""
+        response = self.client.ChatCompletion.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+            stream=True,
+            **kwargs
+        )
+        for chunk in response:
+            content = chunk.choices[0].delta.get("content")
+            if content:
+                yield content
 
 
 class MockLLMProvider(LLMProvider):
     """Mock provider for testing without API calls"""
     
+    concurrency = 4
+    
     def generate(self, prompt: str, **kwargs) -> str:
         """Return mock data for testing"""
         return "Mock response for testing"
@@ -292,19 +450,582 @@ class MockLLMProvider(LLMProvider):
         }
 
 
-def get_llm_provider(provider: str = None, **kwargs) -> LLMProvider:
+class ReplayError(Exception):
+    """Error injected by ReplayLLMProvider; carries an HTTP status like the SDK exceptions"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"Injected replay error (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class ReplayLLMProvider(LLMProvider):
+    """
+    Serves LLM calls recorded by RecordingLLMProvider, without the network
+    
+    Calls are looked up by prompt hash in the cassette
+    (genai/utils/llm_cassette.py) and answered after a simulated latency.
+    A fraction of the calls fail with 429 / 5xx errors when error_rate is
+    set.  Prompts that were never recorded raise CassetteMiss.
+    """
+    
+    supports_streaming = True
+    ERROR_STATUSES = (429, 500, 503)
+    
+    def __init__(self, cassette=None, latency: str = LLM_REPLAY_LATENCY, error_rate: float = LLM_REPLAY_ERROR_RATE,
+                 seed: int = LLM_REPLAY_SEED, concurrency: int = LLM_REPLAY_CONCURRENCY, model: str = 'replay'):
+        from genai.utils.llm_cassette import get_cassette, parse_latency
+        self.cassette = cassette or get_cassette()
+        self.model = model
+        self.temperature = None
+        self.concurrency = concurrency
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._replays = {}
+        # Counters for benchmark reports
+        self.calls = 0
+        self.misses = 0
+        self.injected_errors = 0
+        self.simulated_seconds = 0.0
+    
+    def configure(self, latency: str = None, error_rate: float = None, seed: int = None):
+        """Change the simulation settings and reset the counters"""
+        from genai.utils.llm_cassette import parse_latency
+        if latency is not None:
+            self.latency = latency
+            self.sample_latency = parse_latency(latency)
+        if error_rate is not None:
+            self.error_rate = error_rate
+        if seed is not None:
+            self.seed = seed
+        with self._lock:
+            self._replays = {}
+            self.calls = self.misses = self.injected_errors = 0
+            self.simulated_seconds = 0.0
+    
+    def _replay(self, kind: str, prompt: str):
+        """(recorded call, simulated latency); raises ReplayError / CassetteMiss"""
+        from genai.utils.llm_cassette import CassetteMiss, prompt_key
+        key = prompt_key(kind, prompt)
+        with self._lock:
+            count = self._replays[key] = self._replays.get(key, 0) + 1
+            self.calls += 1
+        # Draws depend on the prompt and its replay count, not on thread timing
+        rng = random.Random(f"{self.seed}:{key}:{count}")
+        
+        entry = self.cassette.get_call(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            raise CassetteMiss(f"No recorded {kind} call for prompt {key[:12]} ({len(prompt)} chars)")
+        
+        delay = self.sample_latency(rng, entry['latency'])
+        if self.error_rate and rng.random() < self.error_rate:
+            delay *= rng.random()
+            with self._lock:
+                self.injected_errors += 1
+                self.simulated_seconds += delay
+            time.sleep(delay)
+            raise ReplayError(rng.choice(self.ERROR_STATUSES))
+        with self._lock:
+            self.simulated_seconds += delay
+        return entry, delay
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Recorded text response"""
+        entry, delay = self._replay('generate', prompt)
+        time.sleep(delay)
+        return entry['response']
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Recorded JSON response"""
+        entry, delay = self._replay('generate_json', prompt)
+        time.sleep(delay)
+        return entry['response']
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable[[Dict[str, Any]], None] = None, **kwargs) -> Dict[str, Any]:
+        """Recorded JSON response, its questions spread over the simulated latency like a stream"""
+        entry, delay = self._replay('generate_json_stream', prompt)
+        response = entry['response']
+        questions = (response.get('questions') or []) if isinstance(response, dict) else []
+        # Same share of the call before the first byte as in the recording
+        share = 1.0
+        if entry['first_byte'] is not None and entry['latency']:
+            share = min(1.0, entry['first_byte'] / entry['latency'])
+        first_byte = delay * share if questions else delay
+        time.sleep(first_byte)
+        llm_telemetry.note_first_byte()
+        for question in questions:
+            time.sleep((delay - first_byte) / len(questions))
+            if on_question:
+                on_question(question)
+        return response
+
+
+class CachedLLMProvider(LLMProvider):
+    """
+    Wraps any LLMProvider with the persistent response cache
+
+    Identical calls (same provider, model, temperature, max tokens and
+    prompt) are answered from genai/utils/llm_cache.py instead of the API.
+    Every generate()/generate_json() call also accepts:
+
+        cache_bypass=True   - call the API, neither read nor store the cache
+        cache_refresh=True  - call the API and overwrite the cached response
+        cache_ttl=<seconds> - lifetime of the stored response
+
+    Empty responses and unparseable JSON ({}) are never stored, so a bad
+    answer is retried on the next call rather than replayed.
+    """
+    
+    def __init__(self, provider: LLMProvider, cache=None):
+        from genai.utils.llm_cache import get_response_cache
+        self.provider = provider
+        self.cache = cache or get_response_cache()
+    
+    def __getattr__(self, name):
+        # model, temperature, max_output_tokens, client, ... of the wrapped provider
+        return getattr(self.__dict__['provider'], name)
+    
+    @property
+    def concurrency(self):
+        return get_llm_concurrency(self.provider)
+    
+    def _key(self, kind: str, prompt: str, kwargs: Dict[str, Any]) -> str:
+        from genai.utils.llm_cache import make_key
+        return make_key(
+            self.provider.name,
+            getattr(self.provider, 'model', None),
+            getattr(self.provider, 'temperature', None),
+            getattr(self.provider, 'max_output_tokens', None),
+            kind,
+            prompt,
+            kwargs,
+        )
+    
+    def _call(self, kind: str, prompt: str, kwargs: Dict[str, Any], on_question: Callable = None):
+        bypass = kwargs.pop('cache_bypass', False)
+        refresh = kwargs.pop('cache_refresh', False)
+        ttl = kwargs.pop('cache_ttl', None)
+        method = getattr(self.provider, kind)
+        if kind == 'generate_json_stream':
+            # Streamed and plain JSON calls share cache entries
+            call = lambda: method(prompt, on_question=on_question, **kwargs)
+            kind = 'generate_json'
+        else:
+            call = lambda: method(prompt, **kwargs)
+        
+        if bypass:
+            return call()
+        
+        key = self._key(kind, prompt, kwargs)
+        if not refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"[LLM CACHE] Hit ({self.name}, {len(prompt)} chars prompt)")
+                llm_telemetry.note_cache_hit()
+                if on_question and isinstance(cached, dict):
+                    for question in cached.get('questions') or []:
+                        on_question(question)
+                return cached
+        
+        result = call()
+        # Truncated responses are kept for this call only
+        if result and not (isinstance(result, dict) and result.get('truncated')):
+            self.cache.set(
+                key, result,
+                provider=self.name,
+                model=getattr(self.provider, 'model', ''),
+                ttl=ttl,
+            )
+        return result
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text, served from the cache when the same call was made before"""
+        return self._call('generate', prompt, kwargs)
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate JSON, served from the cache when the same call was made before"""
+        return self._call('generate_json', prompt, kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable = None, **kwargs) -> Dict[str, Any]:
+        """Stream JSON questions; a cached response is replayed question by question"""
+        return self._call('generate_json_stream', prompt, kwargs, on_question=on_question)
+
+
+class RecordingLLMProvider(LLMProvider):
+    """
+    Wraps a real LLMProvider and stores every successful call in the cassette
+    
+    The prompt, response, latency and (for streamed calls) time to the first
+    question are kept for ReplayLLMProvider (genai/utils/llm_cassette.py).
+    """
+    
+    def __init__(self, provider: LLMProvider, cassette=None):
+        from genai.utils.llm_cassette import get_cassette
+        self.provider = provider
+        self.cassette = cassette or get_cassette()
+    
+    def __getattr__(self, name):
+        # model, temperature, max_output_tokens, rpm, tpm, client, ... of the wrapped provider
+        return getattr(self.__dict__['provider'], name)
+    
+    @property
+    def concurrency(self):
+        return get_llm_concurrency(self.provider)
+    
+    def _call(self, kind: str, prompt: str, kwargs: Dict[str, Any], on_question: Callable = None):
+        started = time.time()
+        first_byte = []
+        if kind == 'generate_json_stream':
+            def forward(question):
+                if not first_byte:
+                    first_byte.append(time.time() - started)
+                if on_question:
+                    on_question(question)
+            result = self.provider.generate_json_stream(prompt, on_question=forward, **kwargs)
+        else:
+            result = getattr(self.provider, kind)(prompt, **kwargs)
+        
+        if result is not None:
+            self.cassette.record_call(
+                kind, prompt, result, time.time() - started,
+                first_byte=first_byte[0] if first_byte else None,
+                provider=self.provider.name,
+                model=getattr(self.provider, 'model', ''),
+            )
+        return result
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text and record the call"""
+        return self._call('generate', prompt, kwargs)
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate JSON and record the call"""
+        return self._call('generate_json', prompt, kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable = None, **kwargs) -> Dict[str, Any]:
+        """Stream JSON questions and record the call"""
+        return self._call('generate_json_stream', prompt, kwargs, on_question=on_question)
+
+
+class RateLimitedLLMProvider(LLMProvider):
+    """
+    Wraps any LLMProvider with the shared rate limiter
+
+    Before each call the provider's requests-per-minute and tokens-per-minute
+    buckets (rpm / tpm, from <PROVIDER>_RPM / <PROVIDER>_TPM) must have room
+    for the estimated prompt tokens plus LLM_COMPLETION_TOKEN_ESTIMATE; the
+    estimate is corrected from the response length afterwards.  Calls that
+    fail with 429 / 5xx are retried with exponential backoff and jitter.
+    """
+    
+    def __init__(self, provider: LLMProvider, limiter=None):
+        from genai.utils.rate_limiter import get_rate_limiter
+        self.provider = provider
+        self.limiter = limiter or get_rate_limiter()
+        self.bucket = f"{provider.name}:{getattr(provider, 'model', '')}"
+    
+    def __getattr__(self, name):
+        # model, temperature, max_output_tokens, client, ... of the wrapped provider
+        return getattr(self.__dict__['provider'], name)
+    
+    @property
+    def concurrency(self):
+        return get_llm_concurrency(self.provider)
+    
+    def _call(self, kind: str, prompt: str, kwargs: Dict[str, Any]):
+        from genai.utils.rate_limiter import estimate_tokens
+        method = getattr(self.provider, kind)
+        completion = LLM_COMPLETION_TOKEN_ESTIMATE
+        max_tokens = getattr(self.provider, 'max_output_tokens', None)
+        if max_tokens:
+            completion = min(completion, max_tokens)
+        
+        def attempt():
+            reserved = estimate_tokens(prompt) + completion
+            waited = self.limiter.acquire(self.bucket, self.provider.rpm, self.provider.tpm, reserved)
+            if waited >= 1:
+                print(f"[RATE LIMIT] {self.bucket}: waited {waited:.1f}s for quota")
+            result = method(prompt, **kwargs)
+            if self.provider.tpm:
+                text = result if isinstance(result, str) else json.dumps(result)
+                self.limiter.adjust(self.bucket, estimate_tokens(prompt) + estimate_tokens(text) - reserved)
+            return result
+        
+        return self.limiter.with_backoff(self.bucket, attempt)
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text once the provider's quota allows it"""
+        return self._call('generate', prompt, kwargs)
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate JSON once the provider's quota allows it"""
+        return self._call('generate_json', prompt, kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable = None, **kwargs) -> Dict[str, Any]:
+        """Stream JSON questions once the provider's quota allows it"""
+        # The stream only raises before its first question, so retrying cannot duplicate questions
+        return self._call('generate_json_stream', prompt, dict(kwargs, on_question=on_question))
+
+
+class TelemetryLLMProvider(LLMProvider):
+    """
+    Wraps any LLMProvider with per-call telemetry
+
+    Every call is stored as an LLMCallLog row (genai/utils/llm_telemetry.py):
+    provider and model that answered, prompt / completion tokens, time to
+    first byte, total latency, retries, cache hit and estimated cost.  Calls
+    made inside llm_telemetry.track(log_entry) are linked to that
+    ProcessingLog.
+    """
+    
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+    
+    def __getattr__(self, name):
+        # model, temperature, max_output_tokens, client, ... of the wrapped provider
+        return getattr(self.__dict__['provider'], name)
+    
+    @property
+    def concurrency(self):
+        return get_llm_concurrency(self.provider)
+    
+    def _call(self, kind: str, prompt: str, kwargs: Dict[str, Any]):
+        with llm_telemetry.call(self.provider, kind, prompt) as outcome:
+            outcome['result'] = getattr(self.provider, kind)(prompt, **kwargs)
+        return outcome['result']
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text, recording the call"""
+        return self._call('generate', prompt, kwargs)
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate JSON, recording the call"""
+        return self._call('generate_json', prompt, kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable = None, **kwargs) -> Dict[str, Any]:
+        """Stream JSON questions, recording the call"""
+        return self._call('generate_json_stream', prompt, dict(kwargs, on_question=on_question))
+
+
+# Threads running hedged calls; the losing call of a hedge keeps its thread until the API answers
+_hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='llm-hedge')
+
+
+class FailoverLLMProvider(LLMProvider):
+    """
+    Tries several providers in priority order
+
+    Each provider has a circuit breaker (genai/utils/provider_health.py):
+    providers that keep failing are skipped until their cooldown has passed,
+    and a failed call moves on to the next provider.  With hedging, when the
+    first provider has not answered within its recent p95 latency the same
+    prompt is also sent to the next one and whichever answers first wins.
+    Latencies and failures are stored persistently, so the hedge deadlines
+    and open circuits carry over between runs and processes.
+    """
+    
+    def __init__(self, providers: List[LLMProvider], hedge: bool = LLM_HEDGE_ENABLED, health=None):
+        from genai.utils.provider_health import get_provider_health
+        self.providers = list(providers)
+        self.hedge = hedge
+        self.health = health or get_provider_health()
+    
+    def __getattr__(self, name):
+        # model, temperature, ... of the primary provider
+        return getattr(self.__dict__['providers'][0], name)
+    
+    @property
+    def name(self) -> str:
+        return self.providers[0].name
+    
+    @property
+    def concurrency(self):
+        return get_llm_concurrency(self.providers[0])
+    
+    def _candidates(self) -> List[LLMProvider]:
+        available = [p for p in self.providers if self.health.available(p.name)]
+        # Every circuit open: still try them all rather than fail outright
+        return available or self.providers
+    
+    def _timed_call(self, provider: LLMProvider, kind: str, prompt: str, kwargs: Dict[str, Any]):
+        started = time.time()
+        try:
+            result = getattr(provider, kind)(prompt, **kwargs)
+        except Exception as e:
+            self.health.record_failure(provider.name, time.time() - started, e)
+            raise
+        self.health.record_success(provider.name, time.time() - started)
+        llm_telemetry.note_served(provider.name, getattr(provider, 'model', None))
+        return result
+    
+    def _hedged_call(self, primary: LLMProvider, secondary: LLMProvider, kind: str, prompt: str, kwargs: Dict[str, Any]):
+        """Run primary; add secondary after primary's p95 (or when primary fails); first success wins"""
+        delay = self.health.hedge_delay(primary.name)
+        futures = {_hedge_executor.submit(llm_telemetry.propagate(self._timed_call), primary, kind, prompt, kwargs): primary}
+        done, pending = wait(futures, timeout=delay)
+        
+        if not done:
+            print(f"[FAILOVER] {primary.name} slower than {delay:.1f}s, hedging with {secondary.name}")
+            self.health.record(primary.name, 'hedges')
+            futures[_hedge_executor.submit(llm_telemetry.propagate(self._timed_call), secondary, kind, prompt, kwargs)] = secondary
+            pending = set(futures)
+        
+        last_error = None
+        while True:
+            for future in done:
+                if future.exception() is None:
+                    if futures[future] is secondary:
+                        self.health.record(secondary.name, 'hedge_wins')
+                    return future.result()
+                last_error = future.exception()
+            if not pending:
+                if secondary not in futures.values():
+                    # Primary failed before the deadline: fall over to the secondary now
+                    self.health.record(secondary.name, 'failovers')
+                    llm_telemetry.note_retry()
+                    future = _hedge_executor.submit(llm_telemetry.propagate(self._timed_call), secondary, kind, prompt, kwargs)
+                    futures[future] = secondary
+                    pending = {future}
+                else:
+                    raise last_error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    
+    def _call(self, kind: str, prompt: str, kwargs: Dict[str, Any], hedge: bool = True):
+        candidates = self._candidates()
+        last_error = None
+        start = 0
+        
+        if hedge and self.hedge and len(candidates) > 1:
+            try:
+                return self._hedged_call(candidates[0], candidates[1], kind, prompt, kwargs)
+            except Exception as e:
+                last_error = e
+                start = 2
+        
+        for index, provider in enumerate(candidates[start:], start):
+            if index:
+                print(f"[FAILOVER] Trying {provider.name} after: {str(last_error)[:200]}")
+                self.health.record(provider.name, 'failovers')
+                llm_telemetry.note_retry()
+            try:
+                return self._timed_call(provider, kind, prompt, kwargs)
+            except Exception as e:
+                logger.warning(f"{provider.name} failed: {str(e)}")
+                last_error = e
+        raise last_error
+    
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text from the first provider that answers"""
+        return self._call('generate', prompt, kwargs)
+    
+    def generate_json(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate JSON from the first provider that answers"""
+        return self._call('generate_json', prompt, kwargs)
+    
+    def generate_json_stream(self, prompt: str, on_question: Callable = None, **kwargs) -> Dict[str, Any]:
+        """Stream JSON questions from the first provider that answers (never hedged: one stream feeds on_question)"""
+        return self._call('generate_json_stream', prompt, dict(kwargs, on_question=on_question), hedge=False)
+
+
+def get_llm_concurrency(llm: Optional[LLMProvider]) -> int:
+    """
+    Number of concurrent calls to make through a provider
+    
+    Args:
+        llm: Provider instance (wrapped providers report the inner provider's setting)
+    
+    Returns:
+        Worker count, at least 1
+    """
+    return max(1, int(getattr(llm, 'concurrency', 1) or 1))
+
+
+def get_llm_provider(provider: str = None, cache: bool = None, rate_limit: bool = None, failover: bool = None,
+                     telemetry: bool = None, **kwargs) -> LLMProvider:
     """
     Get an LLM provider instance
     
     Args:
-        provider: 'groq' (default), 'gemini', 'openai', 'mock', etc.
+        provider: 'groq' (default), 'gemini', 'openai', 'mock', 'replay', etc.
+                  With LLM_CASSETTE_MODE=replay every provider is 'replay'
+                  (ReplayLLMProvider); with LLM_CASSETTE_MODE=record real
+                  calls are recorded (RecordingLLMProvider).
+        cache: Wrap the provider in CachedLLMProvider
+               (default: LLM_CACHE_ENABLED; never for 'mock')
+        rate_limit: Wrap the provider in RateLimitedLLMProvider
+                    (default: LLM_RATE_LIMIT_ENABLED; never for 'mock')
+        failover: Add the other providers in LLM_FAILOVER_ORDER that have an
+                  API key configured as backups (FailoverLLMProvider)
+                  (default: LLM_FAILOVER_ENABLED; never for 'mock')
+        telemetry: Wrap the provider in TelemetryLLMProvider
+                   (default: LLM_TELEMETRY_ENABLED; never for 'mock')
+        cache and failover default to off for 'replay'
         **kwargs: Additional parameters for the provider
     
     Returns:
         LLMProvider instance
     """
     provider = provider or DEFAULT_LLM_PROVIDER
+    if LLM_CASSETTE_MODE == 'replay':
+        provider = 'replay'
+    is_mock = provider.lower() == "mock"
+    # Replay stands in for the API: no cache or backup providers, but injected
+    # 429 / 5xx errors still go through the rate limiter's backoff (replay has no quota)
+    offline = is_mock or provider.lower() == "replay"
+    if cache is None:
+        cache = LLM_CACHE_ENABLED and not offline
+    if rate_limit is None:
+        rate_limit = LLM_RATE_LIMIT_ENABLED and not is_mock
+    if failover is None:
+        failover = LLM_FAILOVER_ENABLED and not offline
+    if telemetry is None:
+        telemetry = LLM_TELEMETRY_ENABLED and not is_mock
+    
+    def build(name, **options):
+        instance = _create_provider(name, **options)
+        if LLM_CASSETTE_MODE == 'record' and not offline:
+            # Inside the rate limiter: one recording per API call, without quota waits
+            instance = RecordingLLMProvider(instance)
+        return RateLimitedLLMProvider(instance) if rate_limit else instance
+    
+    instance = build(provider, **kwargs)
+    if failover:
+        chain = [instance]
+        for name in LLM_FAILOVER_ORDER:
+            if name == provider.lower() or not _has_api_key(name):
+                continue
+            try:
+                backup = build(name)
+            except Exception as e:
+                logger.info(f"Backup provider {name} not available: {str(e)}")
+                continue
+            # The SDK fallback in _create_provider can return a class already in the chain
+            if all(backup.name != p.name for p in chain):
+                chain.append(backup)
+        if len(chain) > 1:
+            instance = FailoverLLMProvider(chain)
     
+    # Cache outside the rate limiter, so cache hits do not use up quota
+    if cache:
+        instance = CachedLLMProvider(instance)
+    # Telemetry outermost, so cache hits are recorded too
+    if telemetry:
+        instance = TelemetryLLMProvider(instance)
+    return instance
+
+
+def _has_api_key(provider: str) -> bool:
+    """Whether the provider's API key is set to something other than the config placeholder"""
+    key = {'groq': GROQ_API_KEY, 'gemini': GEMINI_API_KEY, 'openai': OPENAI_API_KEY}.get(provider)
+    return bool(key) and not key.startswith('your-')
+
+
+def _create_provider(provider: str, **kwargs) -> LLMProvider:
+    """Instantiate one provider, falling back to the next one when its SDK is missing"""
     if provider.lower() == "groq":
         try:
             return GroqProvider(**kwargs)
@@ -321,6 +1042,8 @@ def get_llm_provider(provider: str = None, **kwargs) -> LLMProvider:
         return OpenAIProvider(**kwargs)
     elif provider.lower() == "mock":
         return MockLLMProvider(**kwargs)
+    elif provider.lower() == "replay":
+        return ReplayLLMProvider(**kwargs)
     else:
         raise ValueError(f"Unknown provider: {provider}")
 
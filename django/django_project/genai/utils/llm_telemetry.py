@@ -0,0 +1,295 @@
+"""
+LLM Call Telemetry
+One LLMCallLog row per LLM call: tokens, latency, retries, cache hits and cost
+
+TelemetryLLMProvider (the outermost layer built by get_llm_provider) times
+every call and writes the row.  The layers below it report what only they
+can see into the current call's CallRecord:
+
+    CachedLLMProvider        -> note_cache_hit()
+    RateLimitedLLMProvider   -> note_retry()        (via RateLimiter.with_backoff)
+    FailoverLLMProvider      -> note_served(), note_retry() on failover
+    GroqProvider, ...        -> note_usage(response) with the API's token counts
+    generate_json_stream()   -> note_first_byte()
+
+Rows are linked to the ProcessingLog of the task making the call through
+track(), which labels every call made inside it (context variables, so
+concurrent tasks in different threads keep their own labels):
+
+    with llm_telemetry.track(log_entry, task_type='currentaffairs_mcq'):
+        processor.process_sources(...)
+
+Threads started inside a tracked block inherit the labels only when their
+target is wrapped with propagate(fn).
+"""
+
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from genai.config import LLM_TOKEN_PRICES
+
+logger = logging.getLogger(__name__)
+
+# Labels of the enclosing track() blocks: processing_log_id, task_type, subject, source_url
+_labels = contextvars.ContextVar('genai_llm_labels', default={})
+# CallRecord of the LLM call in progress
+_current = contextvars.ContextVar('genai_llm_call', default=None)
+
+
+class CallRecord:
+    """What the provider layers report about one call"""
+
+    __slots__ = ('started', 'provider', 'model', 'prompt_tokens', 'completion_tokens',
+                 'has_usage', 'first_byte', 'retries', 'cache_hit')
+
+    def __init__(self):
+        self.started = time.time()
+        self.provider = None
+        self.model = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.has_usage = False
+        self.first_byte = None
+        self.retries = 0
+        self.cache_hit = False
+
+
+@contextmanager
+def track(processing_log=None, **labels):
+    """
+    Label the LLM calls made inside the block
+
+    Args:
+        processing_log: ProcessingLog (or its id) the calls belong to
+        **labels: task_type, subject and/or source_url
+    """
+    current = dict(_labels.get())
+    if processing_log is not None:
+        current['processing_log_id'] = getattr(processing_log, 'pk', processing_log)
+    current.update({key: value for key, value in labels.items() if value})
+    token = _labels.set(current)
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+def propagate(fn: Callable) -> Callable:
+    """fn running with the caller's labels and current call, for executor.submit / Thread targets"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+def note_retry():
+    record = _current.get()
+    if record:
+        record.retries += 1
+
+
+def note_cache_hit():
+    record = _current.get()
+    if record:
+        record.cache_hit = True
+
+
+def note_first_byte():
+    record = _current.get()
+    if record and record.first_byte is None:
+        record.first_byte = time.time() - record.started
+
+
+def note_served(provider: str, model: str = None):
+    """The provider whose answer is returned (the first success of a hedged call wins)"""
+    record = _current.get()
+    if record and record.provider is None:
+        record.provider = provider
+        record.model = model
+
+
+def usage_from_response(response) -> Optional[Tuple[int, int]]:
+    """(prompt tokens, completion tokens) reported by a Groq / OpenAI / Gemini response, or None"""
+    usage = getattr(response, 'usage', None)
+    if usage is None and isinstance(response, dict):
+        usage = response.get('usage')
+    if usage is not None:
+        get = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, None)
+        if get('prompt_tokens') is not None:
+            return int(get('prompt_tokens') or 0), int(get('completion_tokens') or 0)
+
+    metadata = getattr(response, 'usage_metadata', None)
+    if metadata is not None and getattr(metadata, 'prompt_token_count', None) is not None:
+        return int(metadata.prompt_token_count or 0), int(getattr(metadata, 'candidates_token_count', 0) or 0)
+    return None
+
+
+def note_usage(response):
+    """Add the token counts of an API response (both calls of a hedge are billed)"""
+    record = _current.get()
+    if not record:
+        return
+    try:
+        usage = usage_from_response(response)
+    except Exception:
+        usage = None
+    if usage:
+        record.prompt_tokens += usage[0]
+        record.completion_tokens += usage[1]
+        record.has_usage = True
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Decimal:
+    """USD cost from LLM_TOKEN_PRICES (0 for models without a price)"""
+    prices = LLM_TOKEN_PRICES.get(model or '')
+    if not prices:
+        return Decimal(0)
+    cost = (prompt_tokens * float(prices[0]) + completion_tokens * float(prices[1])) / 1000000
+    return Decimal(str(round(cost, 6)))
+
+
+@contextmanager
+def call(provider, kind: str, prompt: str):
+    """
+    Time one LLM call and store its LLMCallLog row
+
+    Yields a dict; put the call's result in it under 'result' so token
+    counts can be estimated when the API reported none.  Nested calls
+    (a provider used inside another call) are not recorded twice.
+    """
+    if _current.get() is not None:
+        yield {}
+        return
+
+    record = CallRecord()
+    token = _current.set(record)
+    outcome = {}
+    error = None
+    try:
+        yield outcome
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _current.reset(token)
+        latency = time.time() - record.started
+        _save(provider, kind, prompt, outcome.get('result'), record, latency, error)
+
+
+def _save(provider, kind: str, prompt: str, result: Any, record: CallRecord, latency: float, error: Optional[Exception]):
+    """Write the LLMCallLog row; telemetry never fails the call"""
+    try:
+        from genai.models import LLMCallLog
+        from genai.utils.rate_limiter import estimate_tokens
+
+        prompt_tokens, completion_tokens = record.prompt_tokens, record.completion_tokens
+        estimated = False
+        if record.cache_hit:
+            prompt_tokens = completion_tokens = 0
+        elif not record.has_usage:
+            estimated = True
+            prompt_tokens = estimate_tokens(prompt)
+            if result is not None:
+                text = result if isinstance(result, str) else json.dumps(result)
+                completion_tokens = estimate_tokens(text)
+
+        model = record.model or getattr(provider, 'model', '') or ''
+        labels = _labels.get()
+        LLMCallLog.objects.create(
+            processing_log_id=labels.get('processing_log_id'),
+            provider=record.provider or provider.name,
+            model=model,
+            call_type=kind,
+            task_type=labels.get('task_type', '')[:50],
+            subject=labels.get('subject', '')[:50],
+            source_url=labels.get('source_url', '')[:500],
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=estimated,
+            # Non-streamed responses arrive all at once
+            time_to_first_byte=record.first_byte if record.first_byte is not None else latency,
+            latency=latency,
+            retries=record.retries,
+            cache_hit=record.cache_hit,
+            success=error is None,
+            error_message=str(error)[:1000] if error else '',
+            cost=estimate_cost(model, prompt_tokens, completion_tokens),
+        )
+    except Exception as e:
+        logger.warning(f"LLM telemetry not recorded: {str(e)}")
+
+
+def stats(days: int = 14) -> Dict[str, Any]:
+    """
+    Aggregates of the last `days` days of LLMCallLog rows, for the processing dashboard
+
+    Returns:
+        {'totals': {...}, 'providers': [p50 / p95 latency per provider],
+         'task_types': [tokens per saved item per task type], 'days': [cost per day]}
+    """
+    from django.db.models import Count, F, Q, Sum
+    from django.db.models.functions import TruncDate
+    from django.utils import timezone
+    from genai.models import LLMCallLog, ProcessingLog
+    from genai.utils.provider_health import percentile
+
+    calls = LLMCallLog.objects.filter(created_at__gte=timezone.now() - timedelta(days=days))
+    tokens = Sum(F('prompt_tokens') + F('completion_tokens'))
+    totals = calls.aggregate(
+        calls=Count('id'), tokens=tokens, cost=Sum('cost'), retries=Sum('retries'),
+        cache_hits=Count('id', filter=Q(cache_hit=True)),
+        failures=Count('id', filter=Q(success=False)),
+    )
+
+    # Cache hits answer in microseconds and would hide the API latency
+    latencies = {}
+    first_bytes = {}
+    for provider, latency, first_byte in calls.filter(cache_hit=False, success=True).values_list(
+            'provider', 'latency', 'time_to_first_byte'):
+        latencies.setdefault(provider, []).append(latency)
+        if first_byte is not None:
+            first_bytes.setdefault(provider, []).append(first_byte)
+    providers = [
+        {
+            'provider': provider,
+            'calls': len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'ttfb_p50': percentile(first_bytes.get(provider, []), 50),
+        }
+        for provider, values in sorted(latencies.items())
+    ]
+
+    # Tokens per saved MCQ / item: billed tokens of a task type over what its tasks saved
+    billed = calls.filter(cache_hit=False, processing_log__isnull=False)
+    saved = dict(
+        ProcessingLog.objects.filter(id__in=billed.values('processing_log_id'))
+        .values_list('task_type').annotate(saved=Sum('success_count')).order_by()
+    )
+    task_types = []
+    for row in billed.values('processing_log__task_type').annotate(tokens=tokens, cost=Sum('cost')).order_by('processing_log__task_type'):
+        task_type = row['processing_log__task_type']
+        task_types.append({
+            'task_type': task_type,
+            'tokens': row['tokens'] or 0,
+            'saved': saved.get(task_type) or 0,
+            'tokens_per_item': (row['tokens'] or 0) / saved[task_type] if saved.get(task_type) else None,
+            'cost': row['cost'],
+        })
+
+    per_day = list(
+        calls.annotate(day=TruncDate('created_at')).values('day')
+        .annotate(calls=Count('id'), tokens=tokens, cost=Sum('cost'))
+        .order_by('-day')
+    )
+
+    return {'days_covered': days, 'totals': totals, 'providers': providers,
+            'task_types': task_types, 'days': per_day}
@@ -0,0 +1,195 @@
+"""
+PDF Page Triage
+Cheapest sufficient extraction strategy per page, decided before any OCR
+
+OCRDispatcher used to OCR every page with under 50 characters of text at a
+fixed 2x zoom and never looked at pages with a text layer.  Math books mix
+text pages, pages with formulas embedded as images, scans and blank or ruled
+pages, so triage_page() measures each page from PyMuPDF data first:
+
+- text-layer characters and the median font size of its spans
+- image area ratio and the bounding boxes of the images drawn on the page
+- for pages without text, a coarse grayscale render: ink ratio (rows of
+  ruled lines ignored) and the height of its text line bands
+
+and picks one of:
+
+- 'skip'    blank or ruled page, nothing to read
+- 'text'    the text layer is enough (also scans that carry an OCR layer)
+- 'regions' text layer plus OCR of its embedded images only (formulas)
+- 'full'    full-page OCR, at a zoom chosen from the glyph size so that
+            text renders about OCR_TARGET_GLYPH_PX pixels high
+
+Bump REVISION when the decision changes; cached triage and OCR text are
+keyed on it (CACHE_NAME).
+"""
+
+import json
+import logging
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+from genai.config import OCR_TARGET_GLYPH_PX, OCR_MIN_ZOOM, OCR_MAX_ZOOM, OCR_RENDER_ZOOM
+
+logger = logging.getLogger(__name__)
+
+REVISION = 1
+CACHE_NAME = f"triage{REVISION}:{OCR_TARGET_GLYPH_PX}px:{OCR_MIN_ZOOM}-{OCR_MAX_ZOOM}"
+
+TEXT_MIN_CHARS = 50          # text layer worth keeping (the dispatcher's old threshold)
+SCAN_IMAGE_RATIO = 0.6       # an image this large is a scanned page
+REGION_MIN_SIZE = (24, 8)    # points; smaller images are bullets and rules
+REGION_MAX_COUNT = 12        # more images than this: OCR the whole page instead
+REGION_PADDING = 2           # points around an image region
+
+TRIAGE_ZOOM = 0.5            # 36 dpi render for the ink checks
+DARK_LEVEL = 160             # gray levels below this are ink
+BLANK_INK_RATIO = 0.0015     # less ink than this is a blank page (or a page number)
+RULE_RUN_RATIO = 0.5         # an unbroken dark run this wide is a ruled line, not text
+MAX_BAND_PT = 48             # taller ink bands are pictures, not text lines
+
+# Gray level -> b'1' (ink) / b'0', to measure dark runs with bytes operations
+_INK = bytes(0x31 if level < DARK_LEVEL else 0x30 for level in range(256))
+
+
+def zoom_for_glyph(glyph_pt: Optional[float]) -> float:
+    """Render zoom that makes glyph_pt tall text OCR_TARGET_GLYPH_PX pixels high"""
+    if not glyph_pt:
+        return OCR_RENDER_ZOOM
+    return round(max(OCR_MIN_ZOOM, min(OCR_MAX_ZOOM, OCR_TARGET_GLYPH_PX / glyph_pt)), 2)
+
+
+def _ink_profile(page) -> Tuple[float, Optional[float]]:
+    """(ink ratio, median text line height in points) of a coarse grayscale render"""
+    import fitz  # PyMuPDF
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(TRIAGE_ZOOM, TRIAGE_ZOOM), colorspace=fitz.csGRAY, alpha=False)
+    width, height, samples = pix.width, pix.height, pix.samples
+    if not width or not height:
+        return 0.0, None
+
+    # Dark pixels per row; ruled lines (one long unbroken run) and sparse
+    # specks / margin rules are not ink, text has gaps between glyphs
+    min_row_ink = max(2, width // 100)
+    rows = []
+    for y in range(height):
+        row = samples[y * pix.stride:y * pix.stride + width].translate(_INK)
+        dark = row.count(b'1')
+        if dark < min_row_ink or max(map(len, row.split(b'0'))) >= width * RULE_RUN_RATIO:
+            dark = 0
+        rows.append(dark)
+    ink = sum(rows) / (width * height)
+
+    bands, run = [], 0
+    for dark in rows + [0]:
+        if dark:
+            run += 1
+        elif run:
+            bands.append(run)
+            run = 0
+    heights = [band / TRIAGE_ZOOM for band in bands if band / TRIAGE_ZOOM <= MAX_BAND_PT]
+    return ink, statistics.median(heights) if heights else None
+
+
+def _regions(page, images: List[Dict[str, Any]]) -> List[Tuple[float, float, float, float]]:
+    """Padded bounding boxes of the images worth OCRing, in reading order"""
+    area = page.rect
+    boxes = []
+    for image in images:
+        x0, y0, x1, y1 = image['bbox']
+        if x1 - x0 < REGION_MIN_SIZE[0] or y1 - y0 < REGION_MIN_SIZE[1]:
+            continue
+        boxes.append((
+            max(area.x0, x0 - REGION_PADDING), max(area.y0, y0 - REGION_PADDING),
+            min(area.x1, x1 + REGION_PADDING), min(area.y1, y1 + REGION_PADDING),
+        ))
+    return sorted(set(boxes), key=lambda box: (round(box[1]), box[0]))
+
+
+def triage_page(page, raster: bool = True) -> Dict[str, Any]:
+    """
+    Measure a page and pick its extraction strategy
+
+    Args:
+        page: PyMuPDF page
+        raster: Render pages without a text layer to tell blank pages from
+                scans; without it they are all 'full' (decided again by the
+                OCR worker, which renders them anyway)
+
+    Returns:
+        {'strategy', 'zoom', 'text_chars', 'image_ratio', 'ink_ratio',
+         'regions': [bbox, ...], 'blocks': [(y0, x0, text), ...]}
+    """
+    layout = page.get_text('dict')
+    page_area = abs(page.rect) or 1
+
+    blocks, sizes = [], []
+    text_chars = 0
+    for block in layout.get('blocks', []):
+        if block.get('type') != 0:
+            continue
+        lines = []
+        for line in block.get('lines', []):
+            spans = line.get('spans', [])
+            for span in spans:
+                chars = len(span.get('text', '').strip())
+                text_chars += chars
+                sizes.extend([span.get('size', 0)] * min(chars, 50))
+            lines.append(''.join(span.get('text', '') for span in spans))
+        text = '\n'.join(lines).strip()
+        if text:
+            x0, y0 = block['bbox'][:2]
+            blocks.append((y0, x0, text))
+
+    try:
+        images = [info for info in page.get_image_info() if info.get('bbox')]
+    except AttributeError:  # PyMuPDF < 1.18.11
+        images = []
+    image_area = 0.0
+    for info in images:
+        x0, y0, x1, y1 = info['bbox']
+        image_area += max(0, x1 - x0) * max(0, y1 - y0)
+    image_ratio = min(1.0, image_area / page_area)
+
+    glyph_pt = statistics.median(sizes) if sizes else None
+    result = {
+        'text_chars': text_chars, 'image_ratio': round(image_ratio, 3), 'ink_ratio': None,
+        'regions': [], 'blocks': blocks, 'zoom': zoom_for_glyph(glyph_pt),
+    }
+
+    if text_chars >= TEXT_MIN_CHARS:
+        regions = _regions(page, images)
+        if image_ratio >= SCAN_IMAGE_RATIO or not regions:
+            result['strategy'] = 'text'
+        elif len(regions) > REGION_MAX_COUNT:
+            result['strategy'] = 'full'
+        else:
+            result['strategy'] = 'regions'
+            result['regions'] = regions
+        return result
+
+    if not raster:
+        result['strategy'] = 'full'
+        return result
+    ink, line_pt = _ink_profile(page)
+    result['ink_ratio'] = round(ink, 4)
+    if ink < BLANK_INK_RATIO:
+        result['strategy'] = 'skip'
+    else:
+        result['strategy'] = 'full'
+        result['zoom'] = zoom_for_glyph(glyph_pt or line_pt)
+    return result
+
+
+def summary(triage: Dict[str, Any]) -> str:
+    """triage_page() result without the layout, as JSON for the page text cache"""
+    return json.dumps({key: value for key, value in triage.items() if key not in ('regions', 'blocks')})
+
+
+def compose(blocks: List[Tuple[float, float, str]], regions: List[Tuple[float, float, float, float]],
+            region_texts: List[Optional[str]]) -> str:
+    """Page text with the OCR text of image regions placed among the text blocks by position"""
+    parts = list(blocks) + [
+        (box[1], box[0], text.strip()) for box, text in zip(regions, region_texts) if text and text.strip()
+    ]
+    return '\n'.join(text for _y, _x, text in sorted(parts, key=lambda part: (round(part[0]), part[1])))
@@ -0,0 +1,315 @@
+"""
+Parallel PDF Page Extraction
+Page text of large PDFs extracted on a process pool
+
+Text extraction (pdfplumber / PyPDF2 / PyMuPDF) and OCR are CPU bound, so
+threads do not help; extract_pages() shards the requested pages into
+contiguous ranges and runs them on PDF_EXTRACT_WORKERS processes:
+
+- every worker opens the document once and keeps the handle for all the
+  shards of that PDF it runs, instead of one open per page
+- pools outlive the call: a worker keeps its OCR models loaded across PDFs
+  and tasks, and OCR shards are recognized in batches (ocr_pages)
+- worker memory is capped: each worker is replaced after
+  PDF_EXTRACT_TASKS_PER_WORKER shards (before Python 3.11, which has no
+  max_tasks_per_child, the whole pool is replaced once it has run that many
+  shards per worker) and, where the OS allows it, limited to
+  PDF_EXTRACT_WORKER_MEMORY_MB of address space; a shard that fails (or a
+  worker that dies) is retried in the calling process
+- fewer than PDF_EXTRACT_MIN_PAGES pages (or one worker) run serially in the
+  calling process, where starting a pool would cost more than it saves
+
+The result is {page: text}, the shape pdf_text_cache.read_pages() expects,
+so cached pages are never sent to the pool.  Callers join the texts in page
+order.  See the benchmark_pdf_extraction management command.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from genai.config import (
+    PDF_EXTRACT_WORKERS, PDF_OCR_WORKERS, PDF_EXTRACT_MIN_PAGES,
+    PDF_EXTRACT_WORKER_MEMORY_MB, PDF_EXTRACT_TASKS_PER_WORKER,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('pdfplumber', 'pypdf2', 'pymupdf', 'triage', 'ocr')
+SHARDS_PER_WORKER = 4  # smaller shards even out slow (image heavy) page ranges
+
+# Worker process state: the open document and how to read a page from it
+_worker = {}
+
+# Calling process state: (backend, engines, workers) -> live pool
+_pools: Dict[tuple, ProcessPoolExecutor] = {}
+_pool_shards: Dict[tuple, int] = {}  # shards run per pool, when recycled here
+_pools_lock = threading.Lock()
+
+# ProcessPoolExecutor(max_tasks_per_child=) and shutdown(cancel_futures=)
+CHILD_RECYCLING = sys.version_info >= (3, 11)
+CANCEL_FUTURES = sys.version_info >= (3, 9)
+
+
+class _Reader:
+    """One open document and a page -> text function for a backend"""
+
+    def __init__(self, pdf_path: str, backend: str, engines: Sequence[str] = ()):
+        self.pdf_path = pdf_path
+        self.backend = backend
+        self.modified = os.stat(pdf_path).st_mtime_ns
+        self._file = None
+        self.engines = []
+        if backend == 'pdfplumber':
+            import pdfplumber
+            self.document = pdfplumber.open(pdf_path)
+        elif backend == 'pypdf2':
+            import PyPDF2
+            self._file = open(pdf_path, 'rb')
+            self.document = PyPDF2.PdfReader(self._file)
+        elif backend in ('pymupdf', 'triage', 'ocr'):
+            import fitz  # PyMuPDF
+            self.document = fitz.open(pdf_path)
+            if backend == 'ocr':
+                _ensure_django()
+                from genai.tasks.math_processor import OCR_ENGINES, ocr_pages
+                # Engines are per-process singletons, their models load once
+                self.engines = [OCR_ENGINES[name]() for name in engines]
+                self._ocr_pages = ocr_pages
+        else:
+            raise ValueError(f"Unknown extraction backend: {backend}")
+
+    def __len__(self) -> int:
+        return len(self.document) if self.backend in ('pymupdf', 'triage', 'ocr') else len(self.document.pages)
+
+    def page_text(self, page: int) -> Optional[str]:
+        if self.backend == 'pdfplumber':
+            pdf_page = self.document.pages[page]
+            text = pdf_page.extract_text() or ''
+            # pdfplumber keeps parsed objects per page; drop them to bound memory
+            close = getattr(pdf_page, 'close', None) or getattr(pdf_page, 'flush_cache', None)
+            if close:
+                close()
+            return text
+        if self.backend == 'pypdf2':
+            return self.document.pages[page].extract_text() or ''
+        if self.backend == 'pymupdf':
+            return self.document[page].get_text()
+        if self.backend == 'triage':
+            from genai.utils import page_triage
+            return page_triage.summary(page_triage.triage_page(self.document[page], raster=False))
+        return self.texts([page]).get(page)
+
+    def texts(self, pages: Sequence[int]) -> Dict[int, Optional[str]]:
+        """{page: text} of several pages; OCR renders and recognizes them in batches"""
+        if self.backend == 'ocr':
+            return self._ocr_pages(self.engines, self.document, pages)
+        return {page: self.page_text(page) for page in pages}
+
+    def close(self):
+        try:
+            self.document.close()
+        except Exception:
+            pass
+        if self._file:
+            self._file.close()
+
+
+def _ensure_django():
+    """OCR engines live in genai.tasks; spawned workers have to set Django up first"""
+    from django.apps import apps
+    if not apps.ready and os.environ.get('DJANGO_SETTINGS_MODULE'):
+        import django
+        django.setup()
+
+
+def _cap_memory(megabytes: int):
+    if megabytes <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows: workers are only recycled
+        return
+    limit = megabytes * 1024 * 1024
+    try:
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not cap extraction worker memory: {e}")
+
+
+def _init_worker(memory_mb: int):
+    _cap_memory(memory_mb)
+
+
+def _run_shard(pdf_path: str, backend: str, engines: Sequence[str], pages: Sequence[int]) -> List[Tuple[int, Optional[str]]]:
+    # The worker's document stays open until it is given a shard of another PDF
+    reader = _worker.get('reader')
+    current = (pdf_path, backend, os.stat(pdf_path).st_mtime_ns)
+    if reader is None or (reader.pdf_path, reader.backend, reader.modified) != current:
+        if reader is not None:
+            reader.close()
+        reader = _worker['reader'] = _Reader(pdf_path, backend, engines)
+    return list(reader.texts(pages).items())
+
+
+def _extract_serial(pdf_path: str, pages: Sequence[int], backend: str, engines: Sequence[str]) -> Dict[int, Optional[str]]:
+    reader = _Reader(pdf_path, backend, engines)
+    try:
+        return reader.texts(pages)
+    finally:
+        reader.close()
+
+
+def _get_pool(backend: str, engines: Sequence[str], workers: int) -> Tuple[tuple, ProcessPoolExecutor]:
+    key = (backend, tuple(engines), workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            options = {}
+            if CHILD_RECYCLING and PDF_EXTRACT_TASKS_PER_WORKER:
+                options['max_tasks_per_child'] = PDF_EXTRACT_TASKS_PER_WORKER
+            # Recycling workers needs a fresh interpreter per worker (spawn / forkserver)
+            pool = _pools[key] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker, initargs=(PDF_EXTRACT_WORKER_MEMORY_MB,), **options
+            )
+            _pool_shards[key] = 0
+        return key, pool
+
+
+def _discard_pool(key: tuple):
+    with _pools_lock:
+        pool = _pools.pop(key, None)
+        _pool_shards.pop(key, None)
+    if pool is not None:
+        if CANCEL_FUTURES:
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pool.shutdown(wait=False)
+
+
+def _count_shards(key: tuple, workers: int, count: int):
+    """Replace the pool once its workers have run PDF_EXTRACT_TASKS_PER_WORKER shards each (Python < 3.11)"""
+    if CHILD_RECYCLING or not PDF_EXTRACT_TASKS_PER_WORKER:
+        return
+    with _pools_lock:
+        if key not in _pool_shards:
+            return
+        _pool_shards[key] += count
+        due = _pool_shards[key] >= PDF_EXTRACT_TASKS_PER_WORKER * workers
+    if due:
+        _discard_pool(key)
+
+
+@atexit.register
+def shutdown_pools():
+    """Stop every extraction pool of this process"""
+    for key in list(_pools):
+        _discard_pool(key)
+
+
+def count_pages(pdf_path: str, backend: str = 'pymupdf') -> int:
+    """Number of pages, as the backend sees them"""
+    reader = _Reader(pdf_path, 'pymupdf' if backend in ('triage', 'ocr') else backend)
+    try:
+        return len(reader)
+    finally:
+        reader.close()
+
+
+def shard(pages: Sequence[int], count: int) -> List[List[int]]:
+    """pages cut into at most count contiguous runs of near-equal size"""
+    pages = list(pages)
+    count = max(1, min(count, len(pages)))
+    size, extra = divmod(len(pages), count)
+    shards, start = [], 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(pages[start:end])
+        start = end
+    return [s for s in shards if s]
+
+
+def default_workers(backend: str) -> int:
+    configured = PDF_OCR_WORKERS if backend == 'ocr' else PDF_EXTRACT_WORKERS
+    return max(1, configured or os.cpu_count() or 1)
+
+
+def extract_pages(pdf_path: str, pages: Iterable[int], backend: str, workers: int = None,
+                  engines: Sequence[str] = (), min_pages: int = None) -> Dict[int, str]:
+    """
+    Text of the given pages, on a process pool for large requests
+
+    Args:
+        pdf_path: PDF file
+        pages: 0-indexed page numbers
+        backend: 'pdfplumber', 'pypdf2', 'pymupdf' (direct text), 'triage'
+                 (page_triage summaries as JSON) or 'ocr'
+        workers: Processes (default: PDF_EXTRACT_WORKERS / PDF_OCR_WORKERS, 0 = CPU count)
+        engines: OCR engine names tried in order ('PaddleOCR', 'EasyOCR', 'Tesseract')
+        min_pages: Fewer pages run serially (default: PDF_EXTRACT_MIN_PAGES)
+
+    Returns:
+        {page: text}; pages that could not be extracted (OCR found nothing)
+        are left out
+    """
+    pages = list(pages)
+    workers = workers or default_workers(backend)
+    min_pages = PDF_EXTRACT_MIN_PAGES if min_pages is None else min_pages
+    if not pages:
+        return {}
+
+    started = time.time()
+    if workers <= 1 or len(pages) < max(2, min_pages):
+        texts = _extract_serial(pdf_path, pages, backend, engines)
+        mode = 'serial'
+    else:
+        texts = _extract_parallel(pdf_path, pages, backend, engines, workers)
+        mode = f"{workers} workers"
+    elapsed = time.time() - started
+    logger.info(f"[EXTRACT] {len(pages)} page(s) with {backend} ({mode}) in {elapsed:.1f}s")
+    return {page: text for page, text in texts.items() if text is not None}
+
+
+def _extract_parallel(pdf_path: str, pages: List[int], backend: str, engines: Sequence[str],
+                      workers: int) -> Dict[int, Optional[str]]:
+    shards = shard(pages, workers * SHARDS_PER_WORKER)
+    workers = min(workers, len(shards))
+    texts: Dict[int, Optional[str]] = {}
+    failed: List[int] = []
+    broken = False
+
+    key = None
+    try:
+        key, pool = _get_pool(backend, engines, workers)
+        futures = [(pool.submit(_run_shard, pdf_path, backend, tuple(engines), s), s) for s in shards]
+        for future, pages_of_shard in futures:
+            try:
+                texts.update(future.result())
+            except BrokenProcessPool:
+                broken = True
+                failed.extend(pages_of_shard)
+            except Exception as e:
+                logger.warning(f"[EXTRACT] Shard of {len(pages_of_shard)} page(s) failed: {e}")
+                failed.extend(pages_of_shard)
+    except (OSError, RuntimeError, TypeError, BrokenProcessPool) as e:
+        logger.warning(f"[EXTRACT] Process pool unavailable ({e}), extracting serially")
+        failed = [page for page in pages if page not in texts]
+    if broken and key is not None:
+        # A dead worker breaks the whole pool; the next call starts a new one
+        _discard_pool(key)
+    elif key is not None:
+        _count_shards(key, workers, len(shards))
+
+    if failed:
+        logger.warning(f"[EXTRACT] Retrying {len(failed)} page(s) in the calling process")
+        texts.update(_extract_serial(pdf_path, failed, backend, engines))
+    return texts
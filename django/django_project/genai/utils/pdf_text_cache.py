@@ -0,0 +1,226 @@
+"""
+PDF Page Text Cache
+Extracted text of every PDF page, keyed by the file's content
+
+route_pdf_processing_task extracted the whole PDF and the processor then
+extracted its page range again; OCRDispatcher re-read (and re-OCRed) every
+page on every run.  PageTextCache keeps the text of each page in one local
+SQLite file so every extraction after the first is a lookup:
+
+- pages are keyed on the SHA-256 of the file, the 0-indexed page number and
+  the extractor with its library version (see extractor_key), so the same
+  file uploaded twice shares its pages and a library upgrade re-extracts
+- page counts are stored per file too, for chunking without opening it
+- read_pages() extracts only the pages that are missing, in one pass
+
+Bump EXTRACTOR_REVISION when extraction code changes what it returns.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from genai.config import PDF_TEXT_CACHE_ENABLED, PDF_TEXT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+EXTRACTOR_REVISION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    digest TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (digest, extractor, page)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT PRIMARY KEY,
+    pages INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+# (path, size, mtime) -> SHA-256, so a file is hashed once per process
+_digests: Dict[tuple, str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """Hex SHA-256 of a file's content"""
+    stat = os.stat(path)
+    marker = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(marker)
+    if digest:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+    with _digests_lock:
+        _digests[marker] = digest
+    return digest
+
+
+def extractor_key(name: str, module=None) -> str:
+    """
+    Cache key part naming how the text was extracted
+
+    Args:
+        name: Extractor, e.g. 'pdfplumber' or 'ocr:PaddleOCR+Tesseract'
+        module: Library doing the extraction; its version is part of the key
+    """
+    version = getattr(module, '__version__', None) or getattr(module, 'VersionBind', None) or ''
+    return f"{name}/{version}#{EXTRACTOR_REVISION}"
+
+
+class PageTextCache:
+    """Text of PDF pages in a SQLite file"""
+
+    def __init__(self, path: str = PDF_TEXT_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get_pages(self, digest: str, extractor: str, pages: Iterable[int]) -> Dict[int, str]:
+        """Cached text of the given pages, {page: text}; missing pages are left out"""
+        pages = list(pages)
+        if not pages:
+            return {}
+        found = {}
+        try:
+            conn = self._connect()
+            # Stay under SQLite's bound parameter limit
+            for i in range(0, len(pages), 500):
+                batch = pages[i:i + 500]
+                found.update(conn.execute(
+                    f"SELECT page, text FROM pages WHERE digest = ? AND extractor = ? "
+                    f"AND page IN ({','.join('?' * len(batch))})",
+                    [digest, extractor] + batch
+                ).fetchall())
+        except sqlite3.Error as e:
+            logger.warning(f"PDF text cache read failed: {str(e)}")
+        return found
+
+    def put_pages(self, digest: str, extractor: str, pages: Dict[int, str]):
+        if not pages:
+            return
+        now = time.time()
+        try:
+            self._connect().executemany(
+                'INSERT OR REPLACE INTO pages (digest, extractor, page, text, created_at) VALUES (?, ?, ?, ?, ?)',
+                [(digest, extractor, page, text, now) for page, text in pages.items()]
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"PDF text cache write failed: {str(e)}")
+
+    def get_page_count(self, digest: str) -> Optional[int]:
+        try:
+            row = self._connect().execute('SELECT pages FROM documents WHERE digest = ?', (digest,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"PDF text cache read failed: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def set_page_count(self, digest: str, pages: int):
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO documents (digest, pages, created_at) VALUES (?, ?, ?)',
+                (digest, pages, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"PDF text cache write failed: {str(e)}")
+
+    def clear(self, digest: str = None) -> int:
+        """Drop cached pages (all, or one file's); returns the number removed"""
+        conn = self._connect()
+        if digest:
+            conn.execute('DELETE FROM documents WHERE digest = ?', (digest,))
+            return conn.execute('DELETE FROM pages WHERE digest = ?', (digest,)).rowcount
+        conn.execute('DELETE FROM documents')
+        return conn.execute('DELETE FROM pages').rowcount
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        pages, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(LENGTH(text)), 0) FROM pages').fetchone()
+        documents = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        return {'path': self.path, 'documents': documents, 'pages': pages, 'text_chars': size}
+
+
+def read_pages(pdf_path: str, extractor: str, pages: Iterable[int],
+               extract: Callable[[List[int]], Dict[int, str]]) -> List[str]:
+    """
+    Text of the given pages, in order, reading through the cache
+
+    Args:
+        pdf_path: PDF file
+        extractor: extractor_key() of the extraction
+        pages: 0-indexed page numbers
+        extract: extract(missing_pages) -> {page: text}; pages it leaves out
+                 (failed extractions) are not cached and read as ''
+
+    Returns:
+        One string per requested page
+    """
+    pages = list(pages)
+    if not PDF_TEXT_CACHE_ENABLED:
+        texts = extract(pages)
+        return [texts.get(page) or '' for page in pages]
+
+    cache = get_page_text_cache()
+    digest = file_digest(pdf_path)
+    texts = cache.get_pages(digest, extractor, pages)
+    missing = [page for page in pages if page not in texts]
+    if missing:
+        extracted = {page: text for page, text in extract(missing).items() if text is not None}
+        cache.put_pages(digest, extractor, extracted)
+        texts.update(extracted)
+        logger.info(f"PDF text cache: {len(pages) - len(missing)} page(s) cached, {len(missing)} extracted")
+    return [texts.get(page) or '' for page in pages]
+
+
+def page_count(pdf_path: str, count: Callable[[], int]) -> int:
+    """Number of pages of a PDF; count() opens the file when it is not cached"""
+    if not PDF_TEXT_CACHE_ENABLED:
+        return count()
+    cache = get_page_text_cache()
+    digest = file_digest(pdf_path)
+    pages = cache.get_page_count(digest)
+    if pages is None:
+        pages = count()
+        cache.set_page_count(digest, pages)
+    return pages
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_page_text_cache() -> PageTextCache:
+    """Process-wide PageTextCache at PDF_TEXT_CACHE_PATH"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PageTextCache()
+        return _default_cache
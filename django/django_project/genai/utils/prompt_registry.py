@@ -0,0 +1,256 @@
+"""
+LLM Prompt Registry
+Active LLMPrompt rows loaded once per process, with pre-parsed templates
+
+Every prompt lookup (task_router.get_llm_prompt_for_task, the current affairs
+and subject processors, the math prompt getters) used to query LLMPrompt and
+then run a chain of str.replace() calls over a template that can be many KB.
+
+PromptRegistry loads all active rows in one query and indexes them by
+(source_url, prompt_type), so the subject-specific -> default fallback chain
+is resolved in memory.  Staleness is tracked with a version token in the
+shared Django cache: the post_save / post_delete receivers in genai.signals
+replace it with a new random token on every LLMPrompt change, and each
+process reloads on its next lookup once its snapshot no longer matches.  A
+token rather than a counter, because the cache may cull the key: a counter
+would restart at a value some process already holds, a missing token is
+simply replaced by one no process has seen.
+
+Templates are compiled once (PromptTemplate) into literal segments and
+{placeholder} slots, so rendering is a single join over the template:
+
+    render_prompt(text, {'content': body, 'num_questions': '5'})
+    format_prompt(text, {'title': title, 'content': body})   # str.format() rules
+"""
+
+import logging
+import re
+import string
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'genai:prompts:version'
+
+# Compiled templates kept for prompt text that is not a database row (hard-coded defaults)
+MAX_COMPILED = 256
+
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Matches any source_url / prompt_type / is_default in PromptRegistry.find()
+ANY = object()
+
+
+class PromptTemplate:
+    """A prompt text split into literal segments and {placeholder} slots"""
+
+    __slots__ = ('id', 'source_url', 'prompt_type', 'is_default', 'text',
+                 'placeholders', '_segments', '_format_segments', '_format_fields')
+
+    def __init__(self, text: str, id: int = None, source_url: str = None,
+                 prompt_type: str = None, is_default: bool = False):
+        self.id = id
+        self.source_url = source_url
+        self.prompt_type = prompt_type
+        self.is_default = is_default
+        self.text = text
+
+        # Odd positions are placeholder names, even positions literal text
+        self._segments = PLACEHOLDER.split(text)
+        self.placeholders = frozenset(self._segments[1::2])
+
+        # str.format() view of the same text: None when format() would raise
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError:
+            parsed = None
+        if parsed is not None and all(
+                field is None or (PLACEHOLDER.fullmatch('{%s}' % field) and not spec and not conversion)
+                for _, field, spec, conversion in parsed):
+            self._format_segments = [(literal, field) for literal, field, _, _ in parsed]
+            self._format_fields = frozenset(field for _, field in self._format_segments if field)
+        else:
+            self._format_segments = None
+            self._format_fields = None
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """
+        Substitute {name} placeholders, like a chain of str.replace() calls
+
+        Placeholders without a value are left as they are, and so are braces
+        that are not placeholders (JSON examples in the prompt).
+        """
+        segments = self._segments
+        parts = [segments[0]]
+        for index in range(1, len(segments), 2):
+            name = segments[index]
+            parts.append(str(values[name]) if name in values else '{%s}' % name)
+            parts.append(segments[index + 1])
+        return ''.join(parts)
+
+    def format(self, values: Dict[str, Any]) -> str:
+        """
+        str.format(**values) when it would succeed ({{ }} become { }), else render(values)
+
+        This is the "try .format(), fall back to .replace()" rule the current
+        affairs prompts have always used.
+        """
+        if self._format_segments is None or not self._format_fields <= values.keys():
+            return self.render(values)
+        parts = []
+        for literal, field in self._format_segments:
+            parts.append(literal)
+            if field:
+                parts.append(str(values[field]))
+        return ''.join(parts)
+
+
+class PromptRegistry:
+    """In-process snapshot of the active LLMPrompt rows"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._templates = []          # in LLMPrompt Meta ordering
+        self._by_key = {}             # (source_url, prompt_type) -> [PromptTemplate]
+        self._compiled = {}           # prompt text -> PromptTemplate
+        self.loads = 0
+
+    def _current_version(self) -> str:
+        try:
+            version = cache.get(VERSION_KEY)
+            if version is None:
+                version = _new_version()
+                if not cache.add(VERSION_KEY, version, None):
+                    # Another process set it first
+                    version = cache.get(VERSION_KEY, version)
+            return version
+        except Exception as e:
+            logger.warning(f"Prompt registry version unavailable: {str(e)}")
+            return self._version if self._version is not None else ''
+
+    def _snapshot(self) -> List[PromptTemplate]:
+        version = self._current_version()
+        if version == self._version:
+            return self._templates
+        with self._lock:
+            if version != self._version:
+                self._load(version)
+        return self._templates
+
+    def _load(self, version: str):
+        from genai.models import LLMPrompt
+        try:
+            rows = list(LLMPrompt.objects.filter(is_active=True).values_list(
+                'id', 'source_url', 'prompt_type', 'is_default', 'prompt_text'
+            ))
+        except Exception as e:
+            # Leave the version unset so the next lookup tries again
+            logger.warning(f"Prompt registry could not load prompts: {str(e)}")
+            return
+
+        templates = [
+            PromptTemplate(text, id=pk, source_url=source_url, prompt_type=prompt_type, is_default=is_default)
+            for pk, source_url, prompt_type, is_default, text in rows
+        ]
+        by_key = {}
+        for template in templates:
+            by_key.setdefault((template.source_url, template.prompt_type), []).append(template)
+
+        self._templates, self._by_key = templates, by_key
+        self._compiled = {template.text: template for template in templates}
+        self._version = version
+        self.loads += 1
+        logger.info(f"[Prompt Registry] Loaded {len(templates)} active prompts (version {version})")
+
+    def find(self, prompt_type=ANY, source_url=ANY, is_default=ANY) -> Optional[PromptTemplate]:
+        """
+        First active prompt matching every given field, in LLMPrompt ordering
+
+        The in-memory equivalent of
+        LLMPrompt.objects.filter(is_active=True, <fields>).first()
+        """
+        templates = self._snapshot()
+        if prompt_type is not ANY and source_url is not ANY:
+            templates = self._by_key.get((source_url, prompt_type), ())
+        for template in templates:
+            if prompt_type is not ANY and template.prompt_type != prompt_type:
+                continue
+            if source_url is not ANY and template.source_url != source_url:
+                continue
+            if is_default is not ANY and template.is_default != is_default:
+                continue
+            return template
+        return None
+
+    def resolve(self, prompt_type: str, *source_urls) -> Tuple[Optional[PromptTemplate], Optional[str]]:
+        """
+        First prompt of prompt_type found along a fallback chain of source URLs
+
+        Returns:
+            (template, matched source_url), or (None, None)
+        """
+        for source_url in source_urls:
+            template = self.find(prompt_type=prompt_type, source_url=source_url)
+            if template:
+                return template, source_url
+        return None, None
+
+    def compile(self, text: str) -> PromptTemplate:
+        """Compiled template of any prompt text (database rows are already compiled)"""
+        template = self._compiled.get(text)
+        if template is None:
+            template = PromptTemplate(text)
+            if len(self._compiled) >= MAX_COMPILED + len(self._templates):
+                self._compiled = {t.text: t for t in self._templates}
+            self._compiled[text] = template
+        return template
+
+    def invalidate(self):
+        """Reload this process's snapshot on the next lookup"""
+        self._version = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self._version,
+            'prompts': len(self._templates),
+            'compiled': len(self._compiled),
+            'loads': self.loads,
+        }
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def bump_version():
+    """Mark every process's prompt snapshot stale (called after an LLMPrompt save / delete commits)"""
+    cache.set(VERSION_KEY, _new_version(), None)
+    get_prompt_registry().invalidate()
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide PromptRegistry"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = PromptRegistry()
+        return _default_registry
+
+
+def render_prompt(text: str, values: Dict[str, Any]) -> str:
+    """Substitute {name} placeholders of a prompt text (see PromptTemplate.render)"""
+    return get_prompt_registry().compile(text).render(values)
+
+
+def format_prompt(text: str, values: Dict[str, Any]) -> str:
+    """str.format() a prompt text, falling back to placeholder substitution (see PromptTemplate.format)"""
+    return get_prompt_registry().compile(text).format(values)
@@ -0,0 +1,263 @@
+"""
+LLM Provider Health
+Persistent latency / error statistics and circuit breakers for FailoverLLMProvider
+
+Every call made through FailoverLLMProvider (llm_provider.py) records its
+latency and outcome here, in a local SQLite file shared by all worker
+processes, so routing decisions survive restarts:
+
+- circuit breaker: after LLM_BREAKER_FAILURES consecutive failures a
+  provider is skipped for LLM_BREAKER_COOLDOWN seconds; after the cooldown
+  one caller is let through as a probe (half-open) and its result closes or
+  re-opens the circuit
+- hedge deadline: the p95 of the provider's last LATENCY_WINDOW successful
+  calls; until LLM_HEDGE_MIN_SAMPLES calls have been seen,
+  LLM_HEDGE_DEFAULT_DELAY is used
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from genai.config import (
+    LLM_HEALTH_PATH, LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN,
+    LLM_HEDGE_DEFAULT_DELAY, LLM_HEDGE_MIN_SAMPLES
+)
+
+logger = logging.getLogger(__name__)
+
+# Successful call latencies kept per provider for the percentiles
+LATENCY_WINDOW = 200
+
+# Never hedge sooner than this, whatever the percentiles say
+MIN_HEDGE_DELAY = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS providers (
+    name TEXT PRIMARY KEY,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    opened_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS latencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS latencies_name ON latencies (name, id);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT NOT NULL,
+    counter TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (name, counter)
+);
+"""
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class ProviderHealth:
+    """Circuit breakers and latency history of LLM providers in a SQLite file"""
+
+    def __init__(self, path: str = LLM_HEALTH_PATH, failure_threshold: int = LLM_BREAKER_FAILURES,
+                 cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, conn: sqlite3.Connection, name: str, counter: str, amount: int = 1):
+        conn.execute(
+            'INSERT INTO counters (name, counter, value) VALUES (?, ?, ?) '
+            'ON CONFLICT(name, counter) DO UPDATE SET value = value + excluded.value',
+            (name, counter, amount)
+        )
+
+    def record(self, name: str, counter: str, amount: int = 1):
+        """Add to one of the provider's counters (hedges, hedge_wins, ...)"""
+        try:
+            self._count(self._connect(), name, counter, amount)
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health update failed: {str(e)}")
+
+    def available(self, name: str) -> bool:
+        """
+        Whether a call may be sent to the provider now
+
+        Closed circuits always allow the call.  Once an open circuit's
+        cooldown has passed, the first caller gets True and the circuit stays
+        open for everyone else until that probe call is recorded.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT opened_until FROM providers WHERE name = ?', (name,)
+                ).fetchone()
+                opened_until = row[0] if row else 0
+                allowed = not opened_until or opened_until <= now
+                if opened_until and allowed:
+                    # Half-open: let this caller probe, hold the others back
+                    conn.execute(
+                        'UPDATE providers SET opened_until = ? WHERE name = ?',
+                        (now + self.cooldown, name)
+                    )
+                conn.execute('COMMIT')
+                return allowed
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health unavailable: {str(e)}")
+            return True
+
+    def record_success(self, name: str, seconds: float):
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO providers (name, consecutive_failures, opened_until, updated_at) '
+                'VALUES (?, 0, 0, ?) ON CONFLICT(name) DO UPDATE SET '
+                'consecutive_failures = 0, opened_until = 0, updated_at = excluded.updated_at',
+                (name, time.time())
+            )
+            conn.execute('INSERT INTO latencies (name, seconds) VALUES (?, ?)', (name, seconds))
+            conn.execute(
+                'DELETE FROM latencies WHERE name = ? AND id < ('
+                'SELECT MIN(id) FROM (SELECT id FROM latencies WHERE name = ? ORDER BY id DESC LIMIT ?))',
+                (name, name, LATENCY_WINDOW)
+            )
+            self._count(conn, name, 'calls')
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health update failed: {str(e)}")
+
+    def record_failure(self, name: str, seconds: float, error: Exception):
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT consecutive_failures FROM providers WHERE name = ?', (name,)
+                ).fetchone()
+                failures = (row[0] if row else 0) + 1
+                opened_until = now + self.cooldown if failures >= self.failure_threshold else 0
+                conn.execute(
+                    'INSERT OR REPLACE INTO providers '
+                    '(name, consecutive_failures, opened_until, last_error, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (name, failures, opened_until, str(error)[:500], now)
+                )
+                self._count(conn, name, 'calls')
+                self._count(conn, name, 'failures')
+                if opened_until:
+                    self._count(conn, name, 'circuit_opened')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            if opened_until:
+                print(f"[FAILOVER] Circuit open for {name} ({failures} consecutive failures, retry in {self.cooldown:.0f}s)")
+                logger.warning(f"Circuit open for {name} after {failures} consecutive failures")
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health update failed: {str(e)}")
+
+    def latencies(self, name: str) -> List[float]:
+        try:
+            rows = self._connect().execute(
+                'SELECT seconds FROM latencies WHERE name = ? ORDER BY id DESC LIMIT ?',
+                (name, LATENCY_WINDOW)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health read failed: {str(e)}")
+            return []
+        return [row[0] for row in rows]
+
+    def hedge_delay(self, name: str) -> float:
+        """Seconds to wait for the provider before hedging (its recent p95)"""
+        samples = self.latencies(name)
+        if len(samples) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY
+        return max(MIN_HEDGE_DELAY, percentile(samples, 95))
+
+    def reset(self):
+        conn = self._connect()
+        for table in ('providers', 'latencies', 'counters'):
+            conn.execute(f'DELETE FROM {table}')
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-provider calls, error rate, latency percentiles and circuit state"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            names = [row[0] for row in conn.execute(
+                'SELECT name FROM providers UNION SELECT name FROM counters ORDER BY 1'
+            )]
+            circuits = {
+                row[0]: row[1:] for row in conn.execute(
+                    'SELECT name, consecutive_failures, opened_until, last_error FROM providers'
+                )
+            }
+            counters = conn.execute('SELECT name, counter, value FROM counters').fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Provider health stats failed: {str(e)}")
+            return []
+
+        result = []
+        for name in names:
+            entry = {
+                'name': name, 'calls': 0, 'failures': 0, 'circuit_opened': 0,
+                'hedges': 0, 'hedge_wins': 0, 'failovers': 0,
+            }
+            entry.update({counter: value for n, counter, value in counters if n == name})
+            consecutive, opened_until, last_error = circuits.get(name, (0, 0, ''))
+            samples = self.latencies(name)
+            p50, p95 = percentile(samples, 50), percentile(samples, 95)
+            entry.update(
+                error_rate=round(100.0 * entry['failures'] / entry['calls'], 1) if entry['calls'] else 0.0,
+                p50=round(p50, 2) if p50 is not None else None,
+                p95=round(p95, 2) if p95 is not None else None,
+                consecutive_failures=consecutive,
+                circuit='open' if opened_until > now else ('half-open' if opened_until else 'closed'),
+                last_error=last_error,
+            )
+            result.append(entry)
+        return result
+
+
+_default_health = None
+_default_lock = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealth:
+    """Process-wide ProviderHealth using the LLM_HEALTH_PATH / LLM_BREAKER_* settings"""
+    global _default_health
+    with _default_lock:
+        if _default_health is None:
+            _default_health = ProviderHealth()
+        return _default_health
@@ -0,0 +1,282 @@
+"""
+LLM Rate Limiter
+Token buckets shared by every worker process, plus retry with backoff
+
+Each provider/model pair gets two buckets in one local SQLite file:
+
+- requests: refills at <PROVIDER>_RPM requests per minute
+- tokens:   refills at <PROVIDER>_TPM tokens per minute; a call reserves
+            its estimated prompt tokens plus an estimated completion, and
+            the reservation is corrected once the response length is known
+
+acquire() blocks until both buckets can pay for the call.  The SQLite file
+(BEGIN IMMEDIATE) is the lock, so PDF tasks, the job scraper and the current
+affairs threads all draw from the same quota.  with_backoff() retries calls
+that fail with 429 / 5xx using exponential backoff with full jitter, honouring
+Retry-After when the SDK exposes it.
+
+Time spent waiting for quota and the 429 / 5xx / retry counts are stored per
+bucket (stats()) and shown on the processing dashboard, so worker counts
+can be tuned to the actual quota.
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from genai.config import (
+    LLM_RATE_LIMIT_PATH, MAX_RETRIES, RETRY_DELAY, LLM_BACKOFF_MAX_DELAY
+)
+from genai.utils import llm_telemetry
+
+logger = logging.getLogger(__name__)
+
+# Longest single sleep before the buckets are re-read (other processes may refund tokens)
+MAX_POLL_INTERVAL = 5.0
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    requests REAL NOT NULL,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    bucket TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (bucket, name)
+);
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text (~4 characters per token for English prompts)"""
+    return len(text or '') // 4 + 1
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of an SDK exception (groq / openai / google), if it carries one"""
+    for attr in ('status_code', 'http_status', 'code'):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'status_code', None)
+    if isinstance(value, int):
+        return value
+    message = str(error).lower()
+    if '429' in message or 'rate limit' in message or 'too many requests' in message:
+        return 429
+    return None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on the exception's response, if present"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets in a SQLite file"""
+
+    def __init__(self, path: str = LLM_RATE_LIMIT_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _add(self, conn: sqlite3.Connection, bucket: str, name: str, amount: float = 1):
+        conn.execute(
+            'INSERT INTO metrics (bucket, name, value) VALUES (?, ?, ?) '
+            'ON CONFLICT(bucket, name) DO UPDATE SET value = value + excluded.value',
+            (bucket, name, amount)
+        )
+
+    def record(self, bucket: str, name: str, amount: float = 1):
+        """Add to one of the bucket's metrics (calls, retries, rate_limited, ...)"""
+        try:
+            self._add(self._connect(), bucket, name, amount)
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter metric update failed: {str(e)}")
+
+    def _try_take(self, bucket: str, rpm: int, tpm: int, tokens: int) -> float:
+        """Take one request and `tokens` tokens; returns 0 on success, else seconds to wait"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT requests, tokens, updated_at FROM buckets WHERE name = ?', (bucket,)
+            ).fetchone()
+            if row is None:
+                requests_left, tokens_left = float(rpm or 0), float(tpm or 0)
+            else:
+                elapsed = max(0.0, now - row[2])
+                requests_left = min(rpm, row[0] + elapsed * rpm / 60.0) if rpm else 0.0
+                tokens_left = min(tpm, row[1] + elapsed * tpm / 60.0) if tpm else 0.0
+
+            # A single call larger than the whole bucket only has to wait for a full bucket
+            need_tokens = min(tokens, tpm) if tpm else 0
+            wait = 0.0
+            if rpm and requests_left < 1:
+                wait = max(wait, (1 - requests_left) * 60.0 / rpm)
+            if tpm and tokens_left < need_tokens:
+                wait = max(wait, (need_tokens - tokens_left) * 60.0 / tpm)
+
+            if not wait:
+                requests_left -= 1 if rpm else 0
+                tokens_left -= tokens if tpm else 0
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (name, requests, tokens, updated_at) VALUES (?, ?, ?, ?)',
+                (bucket, requests_left, tokens_left, now)
+            )
+            conn.execute('COMMIT')
+            return wait
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def acquire(self, bucket: str, rpm: int, tpm: int, tokens: int = 0) -> float:
+        """
+        Block until the bucket can pay for one request of `tokens` tokens
+
+        Args:
+            bucket: Bucket name, e.g. 'GroqProvider:openai/gpt-oss-120b'
+            rpm: Requests per minute (0 = unlimited)
+            tpm: Tokens per minute (0 = unlimited)
+            tokens: Estimated prompt + completion tokens of the call
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not rpm and not tpm:
+            return 0.0
+        started = time.time()
+        while True:
+            try:
+                wait = self._try_take(bucket, rpm, tpm, tokens)
+            except sqlite3.Error as e:
+                # Never block LLM calls on a broken limiter file
+                logger.warning(f"Rate limiter unavailable, not throttling: {str(e)}")
+                return time.time() - started
+            if not wait:
+                break
+            time.sleep(min(wait, MAX_POLL_INTERVAL))
+
+        waited = time.time() - started
+        try:
+            conn = self._connect()
+            self._add(conn, bucket, 'calls')
+            if waited >= 0.01:
+                self._add(conn, bucket, 'waited_calls')
+                self._add(conn, bucket, 'wait_seconds', waited)
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter metric update failed: {str(e)}")
+        return waited
+
+    def adjust(self, bucket: str, tokens: int):
+        """Charge (positive) or refund (negative) tokens once the real usage is known"""
+        if not tokens:
+            return
+        try:
+            self._connect().execute(
+                'UPDATE buckets SET tokens = tokens - ? WHERE name = ?', (tokens, bucket)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter adjust failed: {str(e)}")
+
+    def with_backoff(self, bucket: str, func: Callable[[], Any],
+                     max_retries: int = MAX_RETRIES, base_delay: float = RETRY_DELAY) -> Any:
+        """
+        Call func(), retrying 429 / 5xx failures with exponential backoff and full jitter
+
+        Other exceptions, and the last retryable one, are raised unchanged.
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                status = error_status(e)
+                if status not in RETRYABLE_STATUS:
+                    raise
+                self.record(bucket, 'rate_limited' if status == 429 else 'server_errors')
+                if attempt >= max_retries:
+                    self.record(bucket, 'failures')
+                    raise
+
+                delay = random.uniform(0, min(LLM_BACKOFF_MAX_DELAY, base_delay * (2 ** attempt)))
+                delay = max(delay, retry_after(e) or 0)
+                attempt += 1
+                print(f"[RATE LIMIT] {bucket}: HTTP {status}, retry {attempt}/{max_retries} in {delay:.1f}s")
+                logger.warning(f"{bucket}: HTTP {status}, retry {attempt}/{max_retries} in {delay:.1f}s")
+                self.record(bucket, 'retries')
+                llm_telemetry.note_retry()
+                self.record(bucket, 'backoff_seconds', delay)
+                time.sleep(delay)
+
+    def reset(self):
+        """Forget bucket levels and metrics"""
+        conn = self._connect()
+        conn.execute('DELETE FROM buckets')
+        conn.execute('DELETE FROM metrics')
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-bucket metrics, for the processing dashboard"""
+        try:
+            rows = self._connect().execute(
+                'SELECT bucket, name, value FROM metrics ORDER BY bucket'
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter stats failed: {str(e)}")
+            return []
+
+        buckets = {}
+        for bucket, name, value in rows:
+            entry = buckets.setdefault(bucket, {
+                'bucket': bucket, 'calls': 0, 'waited_calls': 0, 'wait_seconds': 0.0,
+                'retries': 0, 'backoff_seconds': 0.0, 'rate_limited': 0,
+                'server_errors': 0, 'failures': 0,
+            })
+            entry[name] = value if name.endswith('seconds') else int(value)
+        for entry in buckets.values():
+            calls = entry['calls']
+            entry['avg_wait'] = round(entry['wait_seconds'] / calls, 2) if calls else 0.0
+            entry['wait_seconds'] = round(entry['wait_seconds'], 1)
+            entry['backoff_seconds'] = round(entry['backoff_seconds'], 1)
+        return list(buckets.values())
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide RateLimiter using the LLM_RATE_LIMIT_PATH setting"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
@@ -23,6 +23,7 @@ from genai.tasks.pdf_processor import process_subject_pdf
 from genai.tasks.math_processor import process_math_problem, batch_process_math_problems
 from genai.models import ProcessingLog, MathProblemGeneration, LLMPrompt
 from genai.forms import MathPDFProcessingForm
+from genai.config import MATH_COMBINED_EXTRACTION
 
 logger = logging.getLogger(__name__)
 
@@ -312,9 +313,29 @@ def processing_dashboard(request):
     # Get latest task
     latest_task = ProcessingLog.objects.first()
     
+    # LLM response cache counters (shared by all worker processes)
+    from genai.utils.llm_cache import get_response_cache
+    llm_cache_stats = get_response_cache().stats()
+    
+    # Time spent waiting for LLM quota, per provider / model
+    from genai.utils.rate_limiter import get_rate_limiter
+    llm_rate_limits = get_rate_limiter().stats()
+    
+    # Circuit breakers, latency percentiles and hedging per provider
+    from genai.utils.provider_health import get_provider_health
+    llm_provider_health = get_provider_health().stats()
+    
+    # Tokens, latency and cost recorded per LLM call (LLMCallLog)
+    from genai.utils import llm_telemetry
+    llm_usage = llm_telemetry.stats()
+    
     context = {
         'recent_logs': recent_logs,
         'stats': stats,
+        'llm_cache_stats': llm_cache_stats,
+        'llm_rate_limits': llm_rate_limits,
+        'llm_provider_health': llm_provider_health,
+        'llm_usage': llm_usage,
         'latest_task': latest_task,
         'title': 'Processing Dashboard',
     }
@@ -449,6 +470,7 @@ def math_pdf_processing_form(request, pk):
             config = {
                 'chapter_decide_by_llm': form.cleaned_data['chapter_decide_by_llm'],
                 'difficulty_level_decide_by_llm': form.cleaned_data['difficulty_level_decide_by_llm'],
+                'combined_llm_call': form.cleaned_data['combined_llm_call'],
                 'use_paddle_ocr': form.cleaned_data['use_paddle_ocr'],
                 'use_easy_ocr': form.cleaned_data['use_easy_ocr'],
                 'use_tesseract': form.cleaned_data['use_tesseract'],
@@ -517,6 +539,7 @@ def math_pdf_processing_form(request, pk):
             'process_pdf': bool(math_problem.pdf_file),
             'chapter_decide_by_llm': not bool(math_problem.chapter),
             'difficulty_level_decide_by_llm': False,
+            'combined_llm_call': MATH_COMBINED_EXTRACTION,
             'use_paddle_ocr': False,  # Disabled by default - has DLL issues
             'use_easy_ocr': False,     # Disabled by default - has DLL issues
             'use_tesseract': True,     # Enabled by default - works reliably